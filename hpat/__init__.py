@@ -1,5 +1,7 @@
 from __future__ import print_function, division, absolute_import
 
+__version__ = '0.23.1'
+
 import numba
 from numba import *
 import hpat.dict_ext
@@ -9,19 +11,24 @@ import hpat.distributed_api
 from hpat.distributed_api import dist_time
 from hpat.dict_ext import DictIntInt, DictInt32Int32, dict_int_int_type, dict_int32_int32_type
 from hpat.str_ext import string_type
-from hpat.str_arr_ext import string_array_type
+from hpat.str_arr_ext import string_array_type, dict_str_arr_type
 from numba.types import List
-from hpat.utils import cprint, distribution_report
+from hpat.utils import cprint, distribution_report, op_stats_report
+from hpat.compile_profiler import compile_report
 import hpat.compiler
 import hpat.io
 import hpat.pd_timestamp_ext
 import hpat.config
 import hpat.timsort
-
-if hpat.config._has_xenon:
-    from hpat.xenon_ext import read_xenon, xe_connect, xe_open, xe_close
+import hpat.caching
+import sys as _sys
 
 multithread_mode = False
+# time HiFrames operators and collectives at runtime (see op_stats_report)
+instrument_mode = False
+# record a Chrome trace of operators, I/O and collectives on every process,
+# written to HPAT_TRACE_FILE (default hpat_trace.json) when exiting
+trace_mode = False
 
 
 def jit(signature_or_function=None, **options):
@@ -29,6 +36,9 @@ def jit(signature_or_function=None, **options):
     if 'nopython' not in options:
         options['nopython'] = True
 
+    # HPAT has its own cache to include HPAT options in the index key
+    cache = options.pop('cache', False)
+
     _locals = options.pop('locals', {})
 
     # put pivots in locals TODO: generalize numba.jit options
@@ -50,4 +60,53 @@ def jit(signature_or_function=None, **options):
     # this is for previous version of pipeline manipulation (numba hpat_req <0.38)
     # from .compiler import add_hpat_stages
     # return numba.jit(signature_or_function, user_pipeline_funcs=[add_hpat_stages], **options)
-    return numba.jit(signature_or_function, pipeline_class=hpat.compiler.HPATPipeline, **options)
+    if not cache:
+        return numba.jit(signature_or_function, pipeline_class=hpat.compiler.HPATPipeline, **options)
+
+    # cache has to be set before any compilation, so signatures are compiled
+    # here instead of numba.jit
+    sigs = None
+    if not (signature_or_function is None or callable(signature_or_function)):
+        sigs = signature_or_function
+        if not isinstance(sigs, (list, tuple)):
+            sigs = [sigs]
+
+    def wrapper(func):
+        disp = numba.jit(pipeline_class=hpat.compiler.HPATPipeline, **options)(func)
+        hpat.caching.enable_caching(disp, _locals)
+        if sigs is not None:
+            for sig in sigs:
+                disp.compile(sig)
+            disp.disable_compile()
+        return disp
+
+    if signature_or_function is not None and sigs is None:
+        return wrapper(signature_or_function)
+    return wrapper
+
+
+# attributes of optional backends, imported on first access
+_lazy_ext_attrs = {
+    'read_xenon': 'xenon',
+    'xe_connect': 'xenon',
+    'xe_open': 'xenon',
+    'xe_close': 'xenon',
+}
+
+
+class _HPATModule(type(_sys)):
+    """hpat module type that loads optional extensions on attribute access
+    (module level __getattr__ is not available before Python 3.7)
+    """
+    def __getattr__(self, name):
+        ext = _lazy_ext_attrs.get(name)
+        mod = hpat.config.load_extension(ext) if ext is not None else None
+        if mod is None:
+            raise AttributeError(
+                "module 'hpat' has no attribute '{}'".format(name))
+        val = getattr(mod, name)
+        setattr(self, name, val)
+        return val
+
+
+_sys.modules[__name__].__class__ = _HPATModule
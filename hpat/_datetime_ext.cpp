@@ -2,6 +2,10 @@
 #define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
 #include <numpy/arrayobject.h>
 #include <iostream>
+#include <vector>
+#include <string>
+#include <cstring>
+#include <algorithm>
 
 extern "C" {
 
@@ -58,6 +62,11 @@ int convert_datetimestruct_to_datetime(PANDAS_DATETIMEUNIT base,
 void* np_datetime_date_array_from_packed_ints(uint64_t *dt_data,
                                     int64_t n_elems, PyObject* dt_date_class);
 
+int64_t dt_parse_str_arr(uint64_t* offsets, const char* data, int64_t n,
+                         const char* fmt, int64_t fmt_len, int64_t* out);
+void* np_datetime64_D_array_from_packed_ints(uint64_t *dt_data,
+                                             int64_t n_elems);
+
 PyMODINIT_FUNC PyInit_hdatetime_ext(void) {
     PyObject *m;
     static struct PyModuleDef moduledef = {
@@ -79,6 +88,10 @@ PyMODINIT_FUNC PyInit_hdatetime_ext(void) {
                              PyLong_FromVoidPtr((void*)(&parse_iso_8601_datetime)));
      PyObject_SetAttrString(m, "convert_datetimestruct_to_datetime",
                               PyLong_FromVoidPtr((void*)(&convert_datetimestruct_to_datetime)));
+    PyObject_SetAttrString(m, "dt_parse_str_arr",
+                             PyLong_FromVoidPtr((void*)(&dt_parse_str_arr)));
+    PyObject_SetAttrString(m, "np_datetime64_D_array_from_packed_ints",
+                             PyLong_FromVoidPtr((void*)(&np_datetime64_D_array_from_packed_ints)));
 
     return m;
 }
@@ -740,4 +753,256 @@ int convert_datetimestruct_to_datetime(PANDAS_DATETIMEUNIT base,
     return 0;
 }
 
+// fast path of datetime string parsing: strings with a fixed layout are
+// parsed with digit arithmetic at fixed positions, the general ISO 8601
+// parser is used for the others
+
+// fixed layout of datetime strings, from a strptime-like format
+struct dt_layout_lit
+{
+    int pos;
+    char c;
+};
+
+struct dt_layout
+{
+    // positions of fields, -1 if absent
+    int year, month, day, hour, min, sec, frac;
+    // length without fraction digits (1 to 9 digits up to the end)
+    int len;
+    // length of the prefix with only date fields (memoized), 0 if none
+    int date_end;
+    std::vector<dt_layout_lit> lits;
+};
+
+// values of the previous element, reused for repeated values and dates
+struct dt_memo
+{
+    const char* prev;
+    int64_t prev_len;
+    int64_t prev_out;
+    const char* prev_date;
+    int64_t prev_days;
+};
+
+// layouts tried on a sample of strings if no format is given
+static const char* dt_detect_formats[] = {
+    "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y%m%d"};
+#define DT_DETECT_SAMPLE 64
+
+static bool dt_layout_from_format(const char* fmt, int64_t fmt_len,
+                                  dt_layout* L)
+{
+    L->year = L->month = L->day = L->hour = L->min = L->sec = L->frac = -1;
+    L->lits.clear();
+    int pos = 0;
+    for (int64_t i = 0; i < fmt_len; i++) {
+        // fraction digits run to the end of the string
+        if (L->frac != -1)
+            return false;
+        if (fmt[i] != '%' || (i + 1 < fmt_len && fmt[i+1] == '%')) {
+            if (fmt[i] == '%')
+                i++;
+            dt_layout_lit lit = {pos, fmt[i]};
+            L->lits.push_back(lit);
+            pos++;
+            continue;
+        }
+        if (++i == fmt_len)
+            return false;
+        switch (fmt[i]) {
+            case 'Y': L->year = pos; pos += 4; break;
+            case 'm': L->month = pos; pos += 2; break;
+            case 'd': L->day = pos; pos += 2; break;
+            case 'H': L->hour = pos; pos += 2; break;
+            case 'M': L->min = pos; pos += 2; break;
+            case 'S': L->sec = pos; pos += 2; break;
+            case 'f': L->frac = pos; break;
+            default: return false;
+        }
+    }
+    if (L->year == -1 || L->month == -1 || L->day == -1)
+        return false;
+    L->len = pos;
+    int date_end = std::max(L->year + 4, std::max(L->month + 2, L->day + 2));
+    int time_start = L->len;
+    int time_fields[] = {L->hour, L->min, L->sec, L->frac};
+    for (int f : time_fields)
+        if (f != -1)
+            time_start = std::min(time_start, f);
+    L->date_end = date_end <= time_start ? date_end : 0;
+    return true;
+}
+
+static inline bool dt_digits(const char* s, int k, int* out)
+{
+    int v = 0;
+    for (int i = 0; i < k; i++) {
+        unsigned d = (unsigned char)s[i] - '0';
+        if (d > 9)
+            return false;
+        v = v * 10 + d;
+    }
+    *out = v;
+    return true;
+}
+
+// days since 1970-01-01 of a proleptic Gregorian date
+static inline int64_t dt_days_from_civil(int64_t y, int64_t m, int64_t d)
+{
+    y -= m <= 2;
+    int64_t era = (y >= 0 ? y : y - 399) / 400;
+    int64_t yoe = y - era * 400;
+    int64_t doy = (153 * (m + (m > 2 ? -3 : 9)) + 2) / 5 + d - 1;
+    int64_t doe = yoe * 365 + yoe / 4 - yoe / 100 + doy;
+    return era * 146097 + doe - 719468;
+}
+
+static bool dt_parse_fixed(const char* s, int64_t len, const dt_layout& L,
+                           dt_memo* memo, int64_t* out)
+{
+    if (memo->prev != NULL && len == memo->prev_len
+            && memcmp(s, memo->prev, len) == 0) {
+        *out = memo->prev_out;
+        return true;
+    }
+    if (L.frac == -1 ? len != L.len : (len <= L.len || len > L.len + 9))
+        return false;
+    for (const dt_layout_lit& lit : L.lits)
+        if (s[lit.pos] != lit.c)
+            return false;
+
+    int64_t days;
+    if (L.date_end != 0 && memo->prev_date != NULL
+            && memcmp(s, memo->prev_date, L.date_end) == 0) {
+        days = memo->prev_days;
+    }
+    else {
+        int y, m, d;
+        if (!dt_digits(s + L.year, 4, &y) || !dt_digits(s + L.month, 2, &m)
+                || !dt_digits(s + L.day, 2, &d))
+            return false;
+        if (m < 1 || m > 12 || d < 1
+                || d > days_per_month_table[is_leapyear(y)][m - 1])
+            return false;
+        days = dt_days_from_civil(y, m, d);
+        if (L.date_end != 0) {
+            memo->prev_date = s;
+            memo->prev_days = days;
+        }
+    }
+
+    int h = 0, mi = 0, sec = 0;
+    if (L.hour != -1 && (!dt_digits(s + L.hour, 2, &h) || h > 23))
+        return false;
+    if (L.min != -1 && (!dt_digits(s + L.min, 2, &mi) || mi > 59))
+        return false;
+    if (L.sec != -1 && (!dt_digits(s + L.sec, 2, &sec) || sec > 59))
+        return false;
+    int64_t ns = 0;
+    if (L.frac != -1) {
+        int k = len - L.len;
+        for (int i = 0; i < 9; i++) {
+            unsigned d = 0;
+            if (i < k) {
+                d = (unsigned char)s[L.len + i] - '0';
+                if (d > 9)
+                    return false;
+            }
+            ns = ns * 10 + d;
+        }
+    }
+
+    *out = (((days * 24 + h) * 60 + mi) * 60 + sec) * 1000000000LL + ns;
+    memo->prev = s;
+    memo->prev_len = len;
+    memo->prev_out = *out;
+    return true;
+}
+
+static int64_t dt_parse_general(const char* s, int64_t len)
+{
+    // null terminated copy, error messages of the parser print the string
+    std::string str(s, len);
+    pandas_datetimestruct dts;
+    memset(&dts, 0, sizeof(dts));
+    int out_local = 0, out_tzoffset = 0;
+    npy_datetime val;
+    if (parse_iso_8601_datetime(&str[0], (int)len, &dts, &out_local,
+                                &out_tzoffset) != 0
+            || convert_datetimestruct_to_datetime(PANDAS_FR_ns, &dts, &val) != 0)
+        return NPY_MIN_INT64;  // NaT
+    return val;
+}
+
+static bool dt_detect_layout(uint64_t* offsets, const char* data, int64_t n,
+                             dt_layout* L)
+{
+    int64_t n_sample = std::min<int64_t>(n, DT_DETECT_SAMPLE);
+    if (n_sample == 0)
+        return false;
+    for (const char* fmt : dt_detect_formats) {
+        dt_layout_from_format(fmt, strlen(fmt), L);
+        dt_memo memo = {NULL, 0, 0, NULL, 0};
+        int64_t out;
+        int64_t i = 0;
+        while (i < n_sample && dt_parse_fixed(data + offsets[i],
+                        offsets[i+1] - offsets[i], *L, &memo, &out))
+            i++;
+        if (i == n_sample)
+            return true;
+    }
+    return false;
+}
+
+// parse datetime strings of a string array to nanoseconds since epoch.
+// The layout is given by fmt (strptime directives %Y %m %d %H %M %S %f) or
+// detected from a sample if fmt is empty. Invalid strings are NaT, strings
+// that don't match a given format are NaT as well (no ISO 8601 fallback).
+// Returns -1 if fmt is not a supported format, 0 otherwise.
+int64_t dt_parse_str_arr(uint64_t* offsets, const char* data, int64_t n,
+                         const char* fmt, int64_t fmt_len, int64_t* out)
+{
+    dt_layout L;
+    if (fmt_len > 0 && !dt_layout_from_format(fmt, fmt_len, &L))
+        return -1;
+    bool has_layout = fmt_len > 0 || dt_detect_layout(offsets, data, n, &L);
+    dt_memo memo = {NULL, 0, 0, NULL, 0};
+    for (int64_t i = 0; i < n; i++) {
+        const char* s = data + offsets[i];
+        int64_t len = offsets[i+1] - offsets[i];
+        if (has_layout && dt_parse_fixed(s, len, L, &memo, &out[i]))
+            continue;
+        out[i] = fmt_len > 0 ? NPY_MIN_INT64 : dt_parse_general(s, len);
+    }
+    return 0;
+}
+
+// given an array of packed integers for datetime.date (pd_timestamp_ext format),
+// create and return a datetime64[D] numpy array
+void* np_datetime64_D_array_from_packed_ints(uint64_t *dt_data, int64_t n_elems)
+{
+#define CHECK(expr, msg) if(!(expr)){std::cerr << msg << std::endl; PyGILState_Release(gilstate); return NULL;}
+    auto gilstate = PyGILState_Ensure();
+
+    npy_intp dims[] = {n_elems};
+    PyObject* days = PyArray_SimpleNew(1, dims, NPY_INT64);
+    CHECK(days, "allocating numpy array failed");
+
+    npy_int64* out = (npy_int64*)PyArray_DATA((PyArrayObject*)days);
+    for(int64_t i = 0; i < n_elems; ++i) {
+        uint64_t dt = dt_data[i];
+        out[i] = dt_days_from_civil(dt >> 32, (dt >> 16) & 0xFFFF, dt & 0xFFFF);
+    }
+
+    PyObject* ret = PyObject_CallMethod(days, "view", "s", "datetime64[D]");
+    Py_DECREF(days);
+    CHECK(ret, "viewing numpy array as datetime64[D] failed");
+
+    PyGILState_Release(gilstate);
+    return ret;
+#undef CHECK
+}
+
 } // extern "C"
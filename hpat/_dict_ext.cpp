@@ -9,6 +9,7 @@
 #include <boost/preprocessor/list/for_each_product.hpp>
 #include <boost/preprocessor/tuple/to_list.hpp>
 #include <cmath>
+#include "_str_arena.h"
 
 void* init_dict_int_int();
 void dict_int_int_setitem(std::unordered_map<int64_t, int64_t>* m, int64_t index, int64_t value);
@@ -52,27 +53,55 @@ bool dict_int32_int32_not_empty(std::unordered_map<int, int>* m);
 #define DE_PTR(x) BOOST_PP_IIF(IS_STR(x), *, )
 #define GET_PTR(x) BOOST_PP_IIF(IS_STR(x), &, )
 
+// string keys are stored in an arena hash map instead of a node per key
+template <class K, class V>
+struct dict_map
+{
+    typedef std::unordered_map<K, V> type;
+};
+
+template <class V>
+struct dict_map<std::string, V>
+{
+    typedef StrArenaMap<V> type;
+};
+
+#define MAP_TYP(key_typ, val_typ) \
+    dict_map<C_TYPE(key_typ), C_TYPE(val_typ)>::type
+
+template <class K, class V>
+bool dict_contains(std::unordered_map<K, V>* m, const K& key)
+{
+    return m->find(key) != m->end();
+}
+
+template <class V>
+bool dict_contains(StrArenaMap<V>* m, const std::string& key)
+{
+    return m->contains(key);
+}
+
 // definition of dict functions
 #define DEF_DICT(key_typ, val_typ) \
 /* create dictionary */ \
 void* BOOST_PP_CAT(init_dict_##key_typ, _##val_typ)() { \
-    return new std::unordered_map<C_TYPE(key_typ), C_TYPE(val_typ)>(); \
+    return new MAP_TYP(key_typ, val_typ)(); \
 } \
 /* setitem */ \
 void BOOST_PP_CAT(dict_setitem_##key_typ, _##val_typ) \
-(std::unordered_map<C_TYPE(key_typ), C_TYPE(val_typ)>* m, IN_TYP(key_typ) index, IN_TYP(val_typ) value) \
+(MAP_TYP(key_typ, val_typ)* m, IN_TYP(key_typ) index, IN_TYP(val_typ) value) \
 { \
     (*m)[DE_PTR(key_typ)index] = DE_PTR(val_typ)value; \
 } \
 /* in */ \
 bool BOOST_PP_CAT(dict_in_##key_typ, _##val_typ)\
-(IN_TYP(key_typ) val, std::unordered_map<C_TYPE(key_typ), C_TYPE(val_typ)>* m)\
+(IN_TYP(key_typ) val, MAP_TYP(key_typ, val_typ)* m)\
 { \
-    return (m->find(DE_PTR(key_typ)val) != m->end()); \
+    return dict_contains(m, DE_PTR(key_typ)val); \
 } \
 /* getitem */ \
 IN_TYP(val_typ) BOOST_PP_CAT(dict_getitem_##key_typ, _##val_typ) \
-(std::unordered_map<C_TYPE(key_typ), C_TYPE(val_typ)>* m, IN_TYP(key_typ) index) \
+(MAP_TYP(key_typ, val_typ)* m, IN_TYP(key_typ) index) \
 { \
     return GET_PTR(val_typ)m->at(DE_PTR(key_typ)index); \
 } \
@@ -8,6 +8,10 @@
 #include <vector>
 #include <tuple>
 #include <random>
+#include <string>
+#include <cstdio>
+#include <cstdlib>
+#include <unordered_map>
 
 #define ROOT_PE 0
 
@@ -61,6 +65,138 @@ void permutation_array_index(unsigned char *lhs, int64_t len, int64_t elem_size,
                              unsigned char *rhs, int64_t *p, int64_t p_len);
 int hpat_finalize();
 void fix_i_malloc();
+
+int hpat_stats_set_enabled(int enabled);
+void hpat_stats_begin(int op_id);
+int hpat_stats_begin_named(const char* name);
+void hpat_stats_end(int op_id);
+const char* hpat_stats_op_name(int op_id);
+int64_t hpat_stats_num_ops();
+void hpat_stats_get(double* times, int64_t* bytes, int64_t* counts, int64_t n);
+void hpat_stats_reset();
+void hpat_trace_start();
+void hpat_trace_set_op_name(int op_id, const char* name);
+static void hpat_trace_write();
+
+// runtime stats of operators (hpat.instrument_mode)
+// op ids of collectives, same order as distributed_api._collective_op_names
+// HiFrames node ids are assigned by name at runtime and start after these
+enum HPAT_STATS_OPS {
+    STATS_ALLTOALLV = 0,
+    STATS_ALLTOALL,
+    STATS_GATHERV,
+    STATS_GATHER,
+    STATS_BCAST,
+    STATS_ALLGATHER,
+    STATS_ALLREDUCE,
+    STATS_EXSCAN,
+    STATS_ISEND,
+    STATS_IRECV,
+    STATS_WAIT,
+    STATS_RESHAPE,
+    STATS_PERMUTATION,
+    STATS_NUM_COLLECTIVES
+};
+
+static bool hpat_stats_enabled = false;
+static std::vector<double> hpat_stats_time;
+static std::vector<int64_t> hpat_stats_bytes;
+static std::vector<int64_t> hpat_stats_count;
+// total bytes sent by collectives, used for bytes of HiFrames nodes
+static int64_t hpat_stats_total_bytes = 0;
+// begin time and total bytes of running HiFrames nodes
+static std::vector<std::tuple<int, double, int64_t> > hpat_stats_stack;
+
+// timeline trace of operators (hpat.trace_mode)
+// complete events are kept in a ring buffer and written to a Chrome trace
+// file in hpat_finalize
+struct TraceEvent {
+    int op_id;
+    double start;
+    double dur;
+};
+
+static bool hpat_trace_enabled = false;
+static std::vector<TraceEvent> hpat_trace_buffer;
+// total number of events recorded (including overwritten ones)
+static int64_t hpat_trace_num_events = 0;
+// start time of trace, aligned across processes
+static double hpat_trace_t0 = 0.0;
+static std::vector<std::string> hpat_op_names;
+// ids of HiFrames nodes by name, assigned on first use in the process so that
+// compiled (and cached) code doesn't depend on compile-time ids
+static std::unordered_map<std::string, int> hpat_op_ids;
+
+static void hpat_trace_record(int op_id, double start, double end)
+{
+    TraceEvent &e = hpat_trace_buffer[
+        hpat_trace_num_events % hpat_trace_buffer.size()];
+    e.op_id = op_id;
+    e.start = start - hpat_trace_t0;
+    e.dur = end - start;
+    hpat_trace_num_events++;
+}
+
+static inline bool hpat_op_timing_enabled()
+{
+    return hpat_stats_enabled || hpat_trace_enabled;
+}
+
+static void hpat_stats_record(int op_id, double time, int64_t bytes)
+{
+    if ((size_t)op_id >= hpat_stats_time.size())
+    {
+        hpat_stats_time.resize(op_id+1, 0.0);
+        hpat_stats_bytes.resize(op_id+1, 0);
+        hpat_stats_count.resize(op_id+1, 0);
+    }
+    hpat_stats_time[op_id] += time;
+    hpat_stats_bytes[op_id] += bytes;
+    hpat_stats_count[op_id] += 1;
+}
+
+// times a collective call in its scope and counts bytes sent
+struct StatsTimer {
+    int op_id;
+    int64_t bytes;
+    double start;
+    StatsTimer(int _op_id, int64_t _bytes) : op_id(_op_id), bytes(_bytes)
+    {
+        if (hpat_op_timing_enabled())
+            start = MPI_Wtime();
+    }
+    ~StatsTimer()
+    {
+        if (!hpat_op_timing_enabled())
+            return;
+        double end = MPI_Wtime();
+        if (hpat_stats_enabled)
+        {
+            hpat_stats_record(op_id, end-start, bytes);
+            hpat_stats_total_bytes += bytes;
+        }
+        if (hpat_trace_enabled)
+            hpat_trace_record(op_id, start, end);
+    }
+};
+
+static int64_t stats_type_bytes(int64_t count, int type_enum)
+{
+    if (!hpat_stats_enabled)
+        return 0;
+    return count * get_elem_size(type_enum);
+}
+
+static int64_t stats_counts_bytes(int* counts, int type_enum)
+{
+    if (!hpat_stats_enabled)
+        return 0;
+    int n_pes = hpat_dist_get_size();
+    int64_t total = 0;
+    for (int i=0; i<n_pes; i++)
+        total += counts[i];
+    return total * get_elem_size(type_enum);
+}
 int hpat_dummy_ptr[64];
 void* hpat_get_dummy_ptr() {
     return hpat_dummy_ptr;
@@ -152,6 +288,27 @@ PyMODINIT_FUNC PyInit_hdist(void) {
     PyObject_SetAttrString(m, "fix_i_malloc",
                             PyLong_FromVoidPtr((void*)(&fix_i_malloc)));
 
+    PyObject_SetAttrString(m, "hpat_stats_set_enabled",
+                            PyLong_FromVoidPtr((void*)(&hpat_stats_set_enabled)));
+    PyObject_SetAttrString(m, "hpat_stats_begin",
+                            PyLong_FromVoidPtr((void*)(&hpat_stats_begin)));
+    PyObject_SetAttrString(m, "hpat_stats_begin_named",
+                            PyLong_FromVoidPtr((void*)(&hpat_stats_begin_named)));
+    PyObject_SetAttrString(m, "hpat_stats_end",
+                            PyLong_FromVoidPtr((void*)(&hpat_stats_end)));
+    PyObject_SetAttrString(m, "hpat_stats_op_name",
+                            PyLong_FromVoidPtr((void*)(&hpat_stats_op_name)));
+    PyObject_SetAttrString(m, "hpat_stats_num_ops",
+                            PyLong_FromVoidPtr((void*)(&hpat_stats_num_ops)));
+    PyObject_SetAttrString(m, "hpat_stats_get",
+                            PyLong_FromVoidPtr((void*)(&hpat_stats_get)));
+    PyObject_SetAttrString(m, "hpat_stats_reset",
+                            PyLong_FromVoidPtr((void*)(&hpat_stats_reset)));
+    PyObject_SetAttrString(m, "hpat_trace_start",
+                            PyLong_FromVoidPtr((void*)(&hpat_trace_start)));
+    PyObject_SetAttrString(m, "hpat_trace_set_op_name",
+                            PyLong_FromVoidPtr((void*)(&hpat_trace_set_op_name)));
+
     // add actual int value to module
     PyObject_SetAttrString(m, "mpi_req_num_bytes",
                             PyLong_FromSize_t(get_mpi_req_num_bytes()));
@@ -230,6 +387,7 @@ int hpat_barrier()
 
 void hpat_dist_reduce(char *in_ptr, char *out_ptr, int op_enum, int type_enum)
 {
+    StatsTimer timer(STATS_ALLREDUCE, stats_type_bytes(1, type_enum));
     // printf("reduce value: %d\n", value);
     MPI_Datatype mpi_typ = get_MPI_typ(type_enum);
     MPI_Op mpi_op = get_MPI_op(op_enum);
@@ -277,6 +435,7 @@ void hpat_dist_reduce(char *in_ptr, char *out_ptr, int op_enum, int type_enum)
 
 int hpat_dist_arr_reduce(void* out, int64_t* shapes, int ndims, int op_enum, int type_enum)
 {
+    StatsTimer timer(STATS_ALLREDUCE, 0);
     int i;
     // printf("ndims:%d shape: ", ndims);
     // for(i=0; i<ndims; i++)
@@ -289,6 +448,7 @@ int hpat_dist_arr_reduce(void* out, int64_t* shapes, int ndims, int op_enum, int
     MPI_Datatype mpi_typ = get_MPI_typ(type_enum);
     MPI_Op mpi_op = get_MPI_op(op_enum);
     int elem_size = get_elem_size(type_enum);
+    timer.bytes = stats_type_bytes(total_size, type_enum);
     void* res_buf = malloc(total_size*elem_size);
     MPI_Allreduce(out, res_buf, total_size, mpi_typ, mpi_op, MPI_COMM_WORLD);
     memcpy(out, res_buf, total_size*elem_size);
@@ -299,6 +459,7 @@ int hpat_dist_arr_reduce(void* out, int64_t* shapes, int ndims, int op_enum, int
 
 int hpat_dist_exscan_i4(int value)
 {
+    StatsTimer timer(STATS_EXSCAN, hpat_stats_enabled ? sizeof(value) : 0);
     // printf("sum value: %d\n", value);
     int out=0;
     MPI_Exscan(&value, &out, 1, MPI_INT, MPI_SUM, MPI_COMM_WORLD);
@@ -307,6 +468,7 @@ int hpat_dist_exscan_i4(int value)
 
 int64_t hpat_dist_exscan_i8(int64_t value)
 {
+    StatsTimer timer(STATS_EXSCAN, hpat_stats_enabled ? sizeof(value) : 0);
     // printf("sum value: %lld\n", value);
     int64_t out=0;
     MPI_Exscan(&value, &out, 1, MPI_LONG_LONG_INT, MPI_SUM, MPI_COMM_WORLD);
@@ -315,6 +477,7 @@ int64_t hpat_dist_exscan_i8(int64_t value)
 
 float hpat_dist_exscan_f4(float value)
 {
+    StatsTimer timer(STATS_EXSCAN, hpat_stats_enabled ? sizeof(value) : 0);
     // printf("sum value: %f\n", value);
     float out=0;
     MPI_Exscan(&value, &out, 1, MPI_FLOAT, MPI_SUM, MPI_COMM_WORLD);
@@ -323,6 +486,7 @@ float hpat_dist_exscan_f4(float value)
 
 double hpat_dist_exscan_f8(double value)
 {
+    StatsTimer timer(STATS_EXSCAN, hpat_stats_enabled ? sizeof(value) : 0);
     // printf("sum value: %lf\n", value);
     double out=0;
     MPI_Exscan(&value, &out, 1, MPI_DOUBLE, MPI_SUM, MPI_COMM_WORLD);
@@ -331,6 +495,7 @@ double hpat_dist_exscan_f8(double value)
 
 MPI_Request hpat_dist_irecv(void* out, int size, int type_enum, int pe, int tag, bool cond)
 {
+    StatsTimer timer(STATS_IRECV, 0);
     MPI_Request mpi_req_recv(MPI_REQUEST_NULL);
     // printf("irecv size:%d pe:%d tag:%d, cond:%d\n", size, pe, tag, cond);
     // fflush(stdout);
@@ -346,6 +511,7 @@ MPI_Request hpat_dist_irecv(void* out, int size, int type_enum, int pe, int tag,
 
 MPI_Request hpat_dist_isend(void* out, int size, int type_enum, int pe, int tag, bool cond)
 {
+    StatsTimer timer(STATS_ISEND, cond ? stats_type_bytes(size, type_enum) : 0);
     MPI_Request mpi_req_recv(MPI_REQUEST_NULL);
     // printf("isend size:%d pe:%d tag:%d, cond:%d\n", size, pe, tag, cond);
     // fflush(stdout);
@@ -361,6 +527,7 @@ MPI_Request hpat_dist_isend(void* out, int size, int type_enum, int pe, int tag,
 
 int hpat_dist_wait(MPI_Request req, bool cond)
 {
+    StatsTimer timer(STATS_WAIT, 0);
     if (cond)
         MPI_Wait(&req, MPI_STATUS_IGNORE);
     return 0;
@@ -368,6 +535,7 @@ int hpat_dist_wait(MPI_Request req, bool cond)
 
 void allgather(void* out_data, int size, void* in_data, int type_enum)
 {
+    StatsTimer timer(STATS_ALLGATHER, stats_type_bytes(size, type_enum));
     MPI_Datatype mpi_typ = get_MPI_typ(type_enum);
     MPI_Allgather(in_data, size, mpi_typ, out_data, size, mpi_typ, MPI_COMM_WORLD);
     return;
@@ -381,6 +549,7 @@ void req_array_setitem(MPI_Request * req_arr, int64_t ind, MPI_Request req)
 
 void hpat_dist_waitall(int size, MPI_Request *req_arr)
 {
+    StatsTimer timer(STATS_WAIT, 0);
     MPI_Waitall(size, req_arr, MPI_STATUSES_IGNORE);
     return;
 }
@@ -461,6 +630,7 @@ int64_t hpat_dist_get_item_pointer(int64_t ind, int64_t start, int64_t count)
 
 void c_gather_scalar(void* send_data, void* recv_data, int typ_enum)
 {
+    StatsTimer timer(STATS_GATHER, stats_type_bytes(1, typ_enum));
     MPI_Datatype mpi_typ = get_MPI_typ(typ_enum);
     MPI_Gather(send_data, 1, mpi_typ, recv_data, 1, mpi_typ, ROOT_PE,
            MPI_COMM_WORLD);
@@ -469,6 +639,7 @@ void c_gather_scalar(void* send_data, void* recv_data, int typ_enum)
 
 void c_gatherv(void* send_data, int sendcount, void* recv_data, int* recv_counts, int* displs, int typ_enum)
 {
+    StatsTimer timer(STATS_GATHERV, stats_type_bytes(sendcount, typ_enum));
     MPI_Datatype mpi_typ = get_MPI_typ(typ_enum);
     MPI_Gatherv(send_data, sendcount, mpi_typ, recv_data, recv_counts, displs, mpi_typ, ROOT_PE,
            MPI_COMM_WORLD);
@@ -477,6 +648,7 @@ void c_gatherv(void* send_data, int sendcount, void* recv_data, int* recv_counts
 
 void c_bcast(void* send_data, int sendcount, int typ_enum)
 {
+    StatsTimer timer(STATS_BCAST, stats_type_bytes(sendcount, typ_enum));
     MPI_Datatype mpi_typ = get_MPI_typ(typ_enum);
     MPI_Bcast(send_data, sendcount, mpi_typ, ROOT_PE, MPI_COMM_WORLD);
     return;
@@ -485,6 +657,7 @@ void c_bcast(void* send_data, int sendcount, int typ_enum)
 void c_alltoallv(void* send_data, void* recv_data, int* send_counts,
                 int* recv_counts, int* send_disp, int* recv_disp, int typ_enum)
 {
+    StatsTimer timer(STATS_ALLTOALLV, stats_counts_bytes(send_counts, typ_enum));
     MPI_Datatype mpi_typ = get_MPI_typ(typ_enum);
     MPI_Alltoallv(send_data, send_counts, send_disp, mpi_typ,
         recv_data, recv_counts, recv_disp, mpi_typ, MPI_COMM_WORLD);
@@ -492,6 +665,8 @@ void c_alltoallv(void* send_data, void* recv_data, int* send_counts,
 
 void c_alltoall(void* send_data, void* recv_data, int count, int typ_enum)
 {
+    StatsTimer timer(STATS_ALLTOALL,
+        stats_type_bytes((int64_t)count * hpat_dist_get_size(), typ_enum));
     MPI_Datatype mpi_typ = get_MPI_typ(typ_enum);
     MPI_Alltoall(send_data, count, mpi_typ, recv_data, count, mpi_typ, MPI_COMM_WORLD);
 }
@@ -517,12 +692,234 @@ int hpat_finalize()
     int is_finalized;
     MPI_Finalized(&is_finalized);
     if (!is_finalized) {
+        if (hpat_trace_enabled)
+            hpat_trace_write();
         // printf("finalizing\n");
         MPI_Finalize();
     }
     return 0;
 }
 
+int hpat_stats_set_enabled(int enabled)
+{
+    int prev = hpat_stats_enabled;
+    hpat_stats_enabled = enabled != 0;
+    return prev;
+}
+
+void hpat_stats_begin(int op_id)
+{
+    if (!hpat_op_timing_enabled())
+        return;
+    hpat_stats_stack.push_back(
+        std::make_tuple(op_id, MPI_Wtime(), hpat_stats_total_bytes));
+}
+
+// begin timing HiFrames node 'name', returns its id for hpat_stats_end
+// (-1 if timing is disabled)
+int hpat_stats_begin_named(const char* name)
+{
+    if (!hpat_op_timing_enabled())
+        return -1;
+    auto it = hpat_op_ids.find(name);
+    int op_id;
+    if (it != hpat_op_ids.end())
+        op_id = it->second;
+    else
+    {
+        op_id = std::max((int)hpat_op_names.size(), (int)STATS_NUM_COLLECTIVES);
+        hpat_op_names.resize(op_id+1);
+        hpat_op_names[op_id] = name;
+        hpat_op_ids[name] = op_id;
+    }
+    hpat_stats_begin(op_id);
+    return op_id;
+}
+
+const char* hpat_stats_op_name(int op_id)
+{
+    if (op_id < 0 || (size_t)op_id >= hpat_op_names.size())
+        return "";
+    return hpat_op_names[op_id].c_str();
+}
+
+void hpat_stats_end(int op_id)
+{
+    if (op_id < 0 || !hpat_op_timing_enabled() || hpat_stats_stack.empty())
+        return;
+    int begin_id;
+    double start;
+    int64_t start_bytes;
+    std::tie(begin_id, start, start_bytes) = hpat_stats_stack.back();
+    hpat_stats_stack.pop_back();
+    if (begin_id != op_id)
+    {
+        std::cerr << "invalid operator stats end " << op_id
+                  << " (expected " << begin_id << ")" << std::endl;
+        return;
+    }
+    double end = MPI_Wtime();
+    // bytes of a node are the bytes sent by collectives inside it
+    if (hpat_stats_enabled)
+        hpat_stats_record(op_id, end-start, hpat_stats_total_bytes-start_bytes);
+    if (hpat_trace_enabled)
+        hpat_trace_record(op_id, start, end);
+}
+
+int64_t hpat_stats_num_ops()
+{
+    return (int64_t)hpat_stats_time.size();
+}
+
+void hpat_stats_get(double* times, int64_t* bytes, int64_t* counts, int64_t n)
+{
+    for (int64_t i=0; i<n; i++)
+    {
+        bool valid = (size_t)i < hpat_stats_time.size();
+        times[i] = valid ? hpat_stats_time[i] : 0.0;
+        bytes[i] = valid ? hpat_stats_bytes[i] : 0;
+        counts[i] = valid ? hpat_stats_count[i] : 0;
+    }
+}
+
+void hpat_trace_start()
+{
+    if (hpat_trace_enabled)
+        return;
+    int64_t size = 1 << 20;
+    char* size_env = getenv("HPAT_TRACE_BUFFER_SIZE");
+    if (size_env != NULL && atoll(size_env) > 0)
+        size = atoll(size_env);
+    hpat_trace_buffer.resize(size);
+    hpat_trace_num_events = 0;
+    // align clocks: processes start the trace together, and use root's
+    // start time if MPI_Wtime is synchronized
+    MPI_Barrier(MPI_COMM_WORLD);
+    hpat_trace_t0 = MPI_Wtime();
+    int *is_global;
+    int flag;
+    MPI_Comm_get_attr(MPI_COMM_WORLD, MPI_WTIME_IS_GLOBAL, &is_global, &flag);
+    if (flag && *is_global)
+        MPI_Bcast(&hpat_trace_t0, 1, MPI_DOUBLE, ROOT_PE, MPI_COMM_WORLD);
+    hpat_trace_enabled = true;
+}
+
+void hpat_trace_set_op_name(int op_id, const char* name)
+{
+    if ((size_t)op_id >= hpat_op_names.size())
+        hpat_op_names.resize(op_id+1);
+    hpat_op_names[op_id] = name;
+}
+
+static std::string hpat_trace_op_name(int op_id)
+{
+    std::string name;
+    if ((size_t)op_id < hpat_op_names.size())
+        name = hpat_op_names[op_id];
+    if (name.empty())
+        return "op" + std::to_string(op_id);
+    std::string escaped;
+    for (char c : name)
+    {
+        if (c == '"' || c == '\\')
+            escaped += '\\';
+        escaped += c;
+    }
+    return escaped;
+}
+
+// gather events to root and write one Chrome trace JSON file
+// (chrome://tracing or Perfetto) with a timeline row per process
+static void hpat_trace_write()
+{
+    hpat_trace_enabled = false;
+    int rank = hpat_dist_get_rank();
+    int n_pes = hpat_dist_get_size();
+    int64_t cap = hpat_trace_buffer.size();
+    int64_t first = std::max((int64_t)0, hpat_trace_num_events - cap);
+    int64_t n_events = hpat_trace_num_events - first;
+    std::vector<TraceEvent> events(n_events);
+    for (int64_t i=0; i<n_events; i++)
+        events[i] = hpat_trace_buffer[(first+i) % cap];
+
+    // event counts can exceed MPI's int counts, so events are sent to root
+    // in chunks with point-to-point messages
+    std::vector<int64_t> recv_counts(n_pes);
+    MPI_Gather(&n_events, 1, MPI_LONG_LONG_INT, recv_counts.data(), 1,
+               MPI_LONG_LONG_INT, ROOT_PE, MPI_COMM_WORLD);
+    MPI_Datatype event_type;
+    MPI_Type_contiguous(sizeof(TraceEvent), MPI_BYTE, &event_type);
+    MPI_Type_commit(&event_type);
+    const int64_t chunk = INT_MAX;
+    std::vector<int64_t> displs(n_pes, 0);
+    std::vector<TraceEvent> all_events;
+    if (rank == ROOT_PE)
+    {
+        for (int i=1; i<n_pes; i++)
+            displs[i] = displs[i-1] + recv_counts[i-1];
+        all_events.resize(displs[n_pes-1] + recv_counts[n_pes-1]);
+        std::copy(events.begin(), events.end(),
+                  all_events.begin() + displs[ROOT_PE]);
+        for (int pe=0; pe<n_pes; pe++)
+        {
+            if (pe == ROOT_PE)
+                continue;
+            for (int64_t off=0; off<recv_counts[pe]; off+=chunk)
+                MPI_Recv(all_events.data() + displs[pe] + off,
+                         (int)std::min(chunk, recv_counts[pe]-off), event_type,
+                         pe, 0, MPI_COMM_WORLD, MPI_STATUS_IGNORE);
+        }
+    }
+    else
+    {
+        for (int64_t off=0; off<n_events; off+=chunk)
+            MPI_Send(events.data() + off, (int)std::min(chunk, n_events-off),
+                     event_type, ROOT_PE, 0, MPI_COMM_WORLD);
+    }
+    MPI_Type_free(&event_type);
+    if (rank != ROOT_PE)
+        return;
+    const char* fname = getenv("HPAT_TRACE_FILE");
+    if (fname == NULL)
+        fname = "hpat_trace.json";
+    FILE* f = fopen(fname, "w");
+    if (f == NULL)
+    {
+        std::cerr << "cannot open trace file " << fname << std::endl;
+        return;
+    }
+    fprintf(f, "{\"traceEvents\": [\n");
+    for (int pe=0; pe<n_pes; pe++)
+        fprintf(f, "%s{\"name\": \"process_name\", \"ph\": \"M\", \"pid\": %d, "
+                   "\"args\": {\"name\": \"rank %d\"}}", pe == 0 ? "" : ",\n",
+                pe, pe);
+    for (int pe=0; pe<n_pes; pe++)
+    {
+        int64_t start = displs[pe];
+        int64_t end = start + recv_counts[pe];
+        for (int64_t i=start; i<end; i++)
+        {
+            const TraceEvent &e = all_events[i];
+            // timestamps are in microseconds
+            fprintf(f, ",\n{\"name\": \"%s\", \"ph\": \"X\", \"pid\": %d, "
+                       "\"tid\": 0, \"ts\": %.3f, \"dur\": %.3f}",
+                    hpat_trace_op_name(e.op_id).c_str(), pe, e.start*1e6,
+                    e.dur*1e6);
+        }
+    }
+    fprintf(f, "\n]}\n");
+    fclose(f);
+}
+
+void hpat_stats_reset()
+{
+    hpat_stats_time.clear();
+    hpat_stats_bytes.clear();
+    hpat_stats_count.clear();
+    hpat_stats_stack.clear();
+    hpat_stats_total_bytes = 0;
+}
+
 void permutation_int(int64_t* output, int n)
 {
      MPI_Bcast(output, n, MPI_INT64_T, 0, MPI_COMM_WORLD);
@@ -620,6 +1017,7 @@ void apply_permutation(unsigned char *v, int64_t elem_size,
 void permutation_array_index(unsigned char *lhs, int64_t len, int64_t elem_size,
                              unsigned char *rhs, int64_t *p, int64_t p_len)
 {
+    StatsTimer timer(STATS_PERMUTATION, hpat_stats_enabled ? len * elem_size : 0);
     if (len != p_len) {
         std::cerr << "Array length and permutation index length should match!\n";
         return;
@@ -683,6 +1081,7 @@ void oneD_reshape_shuffle(char* output,
                           int64_t out_lower_dims_size,
                           int64_t in_lower_dims_size)
 {
+    StatsTimer timer(STATS_RESHAPE, 0);
     int num_pes = hpat_dist_get_size();
     int rank = hpat_dist_get_rank();
 
@@ -728,6 +1127,7 @@ void oneD_reshape_shuffle(char* output,
             curr_recv_offset += recv_counts[i];
         }
     }
+    timer.bytes = hpat_stats_enabled ? curr_send_offset : 0;
     // printf("rank:%d send %lld %lld recv %lld %lld\n", rank, send_counts[0], send_counts[1], recv_counts[0], recv_counts[1]);
     // printf("send %d recv %d send_disp %d recv_disp %d\n", send_counts[0], recv_counts[0], send_disp[0], recv_disp[0]);
     // printf("data %lld %lld\n", ((int64_t*)input)[0], ((int64_t*)input)[1]);
@@ -29,11 +29,14 @@ int64_t pq_read_single_file(std::shared_ptr<FileReader>, int64_t column_idx, uin
 int pq_read_parallel_single_file(std::shared_ptr<FileReader>, int64_t column_idx,
                 uint8_t* out_data, int out_dtype, int64_t start, int64_t count);
 int64_t pq_read_string_single_file(std::shared_ptr<FileReader>, int64_t column_idx,
-                                uint32_t **out_offsets, uint8_t **out_data,
-    std::vector<uint32_t> *offset_vec=NULL, std::vector<uint8_t> *data_vec=NULL);
+                                uint64_t **out_offsets, uint8_t **out_data,
+    std::vector<uint64_t> *offset_vec=NULL, std::vector<uint8_t> *data_vec=NULL);
 int pq_read_string_parallel_single_file(std::shared_ptr<FileReader>, int64_t column_idx,
-        uint32_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count,
-        std::vector<uint32_t> *offset_vec=NULL, std::vector<uint8_t> *data_vec=NULL);
+        uint64_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count,
+        std::vector<uint64_t> *offset_vec=NULL, std::vector<uint8_t> *data_vec=NULL);
+int64_t pq_read_string_dict_single_file(std::shared_ptr<FileReader>, int64_t column_idx,
+        int32_t *out_codes, int64_t start, int64_t count,
+        std::vector<uint64_t> *dict_offsets, std::vector<uint8_t> *dict_data);
 
 }  // extern "C"
 
@@ -49,9 +52,14 @@ int64_t pq_read(FileReaderVec *readers, int64_t column_idx,
 int pq_read_parallel(FileReaderVec *readers, int64_t column_idx,
                 uint8_t* out_data, int out_dtype, int64_t start, int64_t count);
 int pq_read_string(FileReaderVec *readers, int64_t column_idx,
-                                    uint32_t **out_offsets, uint8_t **out_data);
+                                    uint64_t **out_offsets, uint8_t **out_data);
 int pq_read_string_parallel(FileReaderVec *readers, int64_t column_idx,
-        uint32_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count);
+        uint64_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count);
+int64_t pq_read_string_dict(FileReaderVec *readers, int64_t column_idx,
+        int32_t *out_codes, uint64_t **out_offsets, uint8_t **out_data);
+int64_t pq_read_string_dict_parallel(FileReaderVec *readers, int64_t column_idx,
+        int32_t *out_codes, uint64_t **out_offsets, uint8_t **out_data,
+        int64_t start, int64_t count);
 
 static PyMethodDef parquet_cpp_methods[] = {
     {
@@ -84,6 +92,10 @@ PyMODINIT_FUNC PyInit_parquet_cpp(void) {
                             PyLong_FromVoidPtr((void*)(&pq_read_string)));
     PyObject_SetAttrString(m, "read_string_parallel",
                             PyLong_FromVoidPtr((void*)(&pq_read_string_parallel)));
+    PyObject_SetAttrString(m, "read_string_dict",
+                            PyLong_FromVoidPtr((void*)(&pq_read_string_dict)));
+    PyObject_SetAttrString(m, "read_string_dict_parallel",
+                            PyLong_FromVoidPtr((void*)(&pq_read_string_dict_parallel)));
 
     return m;
 }
@@ -300,7 +312,7 @@ int pq_read_parallel(FileReaderVec *readers, int64_t column_idx,
 }
 
 int pq_read_string(FileReaderVec *readers, int64_t column_idx,
-                                    uint32_t **out_offsets, uint8_t **out_data)
+                                    uint64_t **out_offsets, uint8_t **out_data)
 {
 
     if (readers->size() == 0) {
@@ -312,9 +324,9 @@ int pq_read_string(FileReaderVec *readers, int64_t column_idx,
     {
         // std::cout << "pq path is dir" << '\n';
 
-        std::vector<uint32_t> offset_vec;
+        std::vector<uint64_t> offset_vec;
         std::vector<uint8_t> data_vec;
-        int32_t last_offset = 0;
+        int64_t last_offset = 0;
         int64_t res = 0;
         for (size_t i=0; i<readers->size(); i++)
         {
@@ -322,7 +334,7 @@ int pq_read_string(FileReaderVec *readers, int64_t column_idx,
             if (n_vals==-1)
                 continue;
 
-            int size = offset_vec.size();
+            int64_t size = offset_vec.size();
             for(int64_t i=1; i<=n_vals+1; i++)
                 offset_vec[size-i] += last_offset;
             last_offset = offset_vec[size-1];
@@ -331,10 +343,10 @@ int pq_read_string(FileReaderVec *readers, int64_t column_idx,
         }
         offset_vec.push_back(last_offset);
 
-        *out_offsets = new uint32_t[offset_vec.size()];
+        *out_offsets = new uint64_t[offset_vec.size()];
         *out_data = new uint8_t[data_vec.size()];
 
-        memcpy(*out_offsets, offset_vec.data(), offset_vec.size()*sizeof(uint32_t));
+        memcpy(*out_offsets, offset_vec.data(), offset_vec.size()*sizeof(uint64_t));
         memcpy(*out_data, data_vec.data(), data_vec.size());
         // for(int i=0; i<offset_vec.size(); i++)
         //     std::cout << (*out_offsets)[i] << ' ';
@@ -350,7 +362,7 @@ int pq_read_string(FileReaderVec *readers, int64_t column_idx,
 }
 
 int pq_read_string_parallel(FileReaderVec *readers, int64_t column_idx,
-        uint32_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count)
+        uint64_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count)
 {
     // printf("read parquet parallel str file: %s column: %lld start: %lld count: %lld\n",
     //                                 file_name->c_str(), column_idx, start, count);
@@ -375,7 +387,7 @@ int pq_read_string_parallel(FileReaderVec *readers, int64_t column_idx,
         }
 
         int64_t res = 0;
-        std::vector<uint32_t> offset_vec;
+        std::vector<uint64_t> offset_vec;
         std::vector<uint8_t> data_vec;
 
         // read data
@@ -389,7 +401,7 @@ int pq_read_string_parallel(FileReaderVec *readers, int64_t column_idx,
                 pq_read_string_parallel_single_file(readers->at(file_ind), column_idx,
                     NULL, NULL, start, rows_to_read, &offset_vec, &data_vec);
 
-                int size = offset_vec.size();
+                int64_t size = offset_vec.size();
                 for(int64_t i=1; i<=rows_to_read+1; i++)
                     offset_vec[size-i] += last_offset;
                 last_offset = offset_vec[size-1];
@@ -405,10 +417,10 @@ int pq_read_string_parallel(FileReaderVec *readers, int64_t column_idx,
         }
         offset_vec.push_back(last_offset);
 
-        *out_offsets = new uint32_t[offset_vec.size()];
+        *out_offsets = new uint64_t[offset_vec.size()];
         *out_data = new uint8_t[data_vec.size()];
 
-        memcpy(*out_offsets, offset_vec.data(), offset_vec.size()*sizeof(uint32_t));
+        memcpy(*out_offsets, offset_vec.data(), offset_vec.size()*sizeof(uint64_t));
         memcpy(*out_data, data_vec.data(), data_vec.size());
         return res;
     }
@@ -419,3 +431,51 @@ int pq_read_string_parallel(FileReaderVec *readers, int64_t column_idx,
     }
     return 0;
 }
+
+// reads codes of rows [start, start+count) into out_codes and returns the
+// number of dictionary values, the dictionary is per file (values can repeat
+// across files)
+int64_t pq_read_string_dict_parallel(FileReaderVec *readers, int64_t column_idx,
+        int32_t *out_codes, uint64_t **out_offsets, uint8_t **out_data,
+        int64_t start, int64_t count)
+{
+    std::vector<uint64_t> dict_offsets(1, 0);
+    std::vector<uint8_t> dict_data;
+
+    if (readers->size() == 0)
+        printf("empty parquet dataset\n");
+
+    // skip whole files if no need to read any rows
+    size_t file_ind = 0;
+    int64_t read_rows = 0;
+    while (read_rows<count && file_ind<readers->size())
+    {
+        int64_t file_size = pq_get_size_single_file(readers->at(file_ind), column_idx);
+        if (start >= file_size)
+        {
+            start -= file_size;
+            file_ind++;
+            continue;
+        }
+        int64_t rows_to_read = std::min(count-read_rows, file_size-start);
+        pq_read_string_dict_single_file(readers->at(file_ind), column_idx,
+            out_codes+read_rows, start, rows_to_read, &dict_offsets, &dict_data);
+        read_rows += rows_to_read;
+        start = 0;  // start becomes 0 after reading non-empty first chunk
+        file_ind++;
+    }
+
+    *out_offsets = new uint64_t[dict_offsets.size()];
+    *out_data = new uint8_t[dict_data.size()];
+    memcpy(*out_offsets, dict_offsets.data(), dict_offsets.size()*sizeof(uint64_t));
+    memcpy(*out_data, dict_data.data(), dict_data.size());
+    return dict_offsets.size()-1;
+}
+
+int64_t pq_read_string_dict(FileReaderVec *readers, int64_t column_idx,
+        int32_t *out_codes, uint64_t **out_offsets, uint8_t **out_data)
+{
+    int64_t count = pq_get_size(readers, column_idx);
+    return pq_read_string_dict_parallel(readers, column_idx, out_codes,
+                                        out_offsets, out_data, 0, count);
+}
@@ -20,6 +20,30 @@ double small_get_nth_parallel(std::vector<T> &my_array, int64_t total_size,
 template <class T>
 double get_nth_parallel(std::vector<T> &my_array, int64_t k, int myrank, int n_pes, int type_enum);
 
+template <class T>
+std::vector<std::pair<T, T> > get_lower_upper_kths_parallel(
+        std::vector<T> &my_array, int64_t total_size, int myrank, int n_pes,
+        const std::vector<int64_t> &ks, int type_enum);
+
+template <class T>
+void get_nths_parallel(std::vector<T> &my_array, int64_t total_size,
+                       const std::vector<int64_t> &ks, double* vals,
+                       int myrank, int n_pes, int type_enum);
+
+template <class T>
+void small_get_nths_parallel(std::vector<T> &my_array, int64_t total_size,
+                             int myrank, int n_pes,
+                             const std::vector<int64_t> &ks, double* vals,
+                             int type_enum);
+
+void quantiles_parallel(void* data, int64_t local_size, double* quantiles,
+                        double* out, int64_t n_q, int type_enum,
+                        int parallel);
+template<class T>
+void quantiles_parallel_T(T* data, int64_t local_size, double* quantiles,
+                          double* out, int64_t n_q, int type_enum,
+                          bool parallel);
+
 double quantile_parallel(void* data, int64_t local_size, int64_t total_size, double quantile, int type_enum);
 template<class T>
 double quantile_parallel_int(T* data, int64_t local_size, double at, int type_enum, int myrank, int n_pes);
@@ -36,6 +60,8 @@ PyMODINIT_FUNC PyInit_quantile_alg(void) {
 
     PyObject_SetAttrString(m, "quantile_parallel",
                             PyLong_FromVoidPtr((void*)(&quantile_parallel)));
+    PyObject_SetAttrString(m, "quantiles_parallel",
+                            PyLong_FromVoidPtr((void*)(&quantiles_parallel)));
     return m;
 }
 
@@ -112,6 +138,93 @@ double quantile_parallel_float(T* data, int64_t local_size, double quantile, int
     return res1 + (res2 - res1) * fraction;
 }
 
+/*
+ * Multiple quantiles of data with a single copy of local data and shared
+ * selection rounds for all order statistics (e.g. for describe()).
+ * NaNs are ignored, output is NaN for empty data.
+ */
+void quantiles_parallel(void* data, int64_t local_size, double* quantiles,
+                        double* out, int64_t n_q, int type_enum, int parallel)
+{
+    bool is_parallel = parallel != 0;
+    if (type_enum == 0)
+        return quantiles_parallel_T((char *)data, local_size, quantiles, out, n_q, type_enum, is_parallel);
+    if (type_enum == 1)
+        return quantiles_parallel_T((unsigned char *)data, local_size, quantiles, out, n_q, type_enum, is_parallel);
+    if (type_enum == 2)
+        return quantiles_parallel_T((int *)data, local_size, quantiles, out, n_q, type_enum, is_parallel);
+    if (type_enum == 3)
+        return quantiles_parallel_T((uint32_t *)data, local_size, quantiles, out, n_q, type_enum, is_parallel);
+    if (type_enum == 4)
+        return quantiles_parallel_T((int64_t *)data, local_size, quantiles, out, n_q, type_enum, is_parallel);
+    if (type_enum == 5)
+        return quantiles_parallel_T((float*)data, local_size, quantiles, out, n_q, type_enum, is_parallel);
+    if (type_enum == 6)
+        return quantiles_parallel_T((double*)data, local_size, quantiles, out, n_q, type_enum, is_parallel);
+    if (type_enum == 7)
+        return quantiles_parallel_T((uint64_t*)data, local_size, quantiles, out, n_q, type_enum, is_parallel);
+
+    printf("unknown quantile data type");
+    for (int64_t i=0; i<n_q; i++)
+        out[i] = -1.0;
+}
+
+template<class T>
+void quantiles_parallel_T(T* data, int64_t local_size, double* quantiles,
+                          double* out, int64_t n_q, int type_enum,
+                          bool parallel)
+{
+    int myrank = 0, n_pes = 1;
+    if (parallel)
+    {
+        MPI_Comm_size(MPI_COMM_WORLD, &n_pes);
+        MPI_Comm_rank(MPI_COMM_WORLD, &myrank);
+    }
+    // copy local data once, without NaNs
+    std::vector<T> my_array;
+    my_array.reserve(local_size);
+    for (int64_t i=0; i<local_size; i++)
+        if (!std::isnan(data[i]))
+            my_array.push_back(data[i]);
+    int64_t my_size = my_array.size();
+    int64_t total_size = my_size;
+    if (parallel)
+        MPI_Allreduce(&my_size, &total_size, 1, MPI_LONG_LONG_INT, MPI_SUM, MPI_COMM_WORLD);
+
+    if (total_size == 0)
+    {
+        for (int64_t i=0; i<n_q; i++)
+            out[i] = std::nan("");
+        return;
+    }
+
+    // order statistics needed for linear interpolation of all quantiles
+    std::vector<int64_t> ks;
+    for (int64_t i=0; i<n_q; i++)
+    {
+        int64_t k1 = (int64_t)(quantiles[i] * (total_size-1));
+        ks.push_back(k1);
+        ks.push_back(std::min(k1+1, total_size-1));
+    }
+    std::sort(ks.begin(), ks.end());
+    ks.erase(std::unique(ks.begin(), ks.end()), ks.end());
+
+    std::vector<double> vals(ks.size());
+    get_nths_parallel(my_array, total_size, ks, vals.data(), myrank, n_pes, type_enum);
+
+    for (int64_t i=0; i<n_q; i++)
+    {
+        double at = quantiles[i] * (total_size-1);
+        int64_t k1 = (int64_t)at;
+        int64_t k2 = std::min(k1+1, total_size-1);
+        double fraction = at - (double)k1;
+        double res1 = vals[std::lower_bound(ks.begin(), ks.end(), k1) - ks.begin()];
+        double res2 = vals[std::lower_bound(ks.begin(), ks.end(), k2) - ks.begin()];
+        // linear method, TODO: support other methods
+        out[i] = res1 + (res2 - res1) * fraction;
+    }
+}
+
 // _h5_typ_table = {
 //     int8:0,
 //     uint8:1,
@@ -338,6 +451,248 @@ double small_get_nth_parallel(std::vector<T> &my_array, int64_t total_size,
     MPI_Bcast(&res, 1, mpi_typ, root, MPI_COMM_WORLD);
     return res;
 }
+/*
+ * k-th elements for all (sorted, unique) ks, sample gathering, bound
+ * selection, counting and filtering rounds are shared by all ks.
+ * The value ranges that contain the ks are merged into disjoint clusters,
+ * elements of all clusters are selected in one pass, and every cluster
+ * continues with all of its ks together.
+ */
+template <class T>
+void get_nths_parallel(std::vector<T> &my_array, int64_t total_size,
+                       const std::vector<int64_t> &ks, double* vals,
+                       int myrank, int n_pes, int type_enum)
+{
+    int64_t threshold = (int64_t) pow(10.0, 7.0); // 100 million
+    if (total_size < threshold || n_pes==1)
+    {
+        small_get_nths_parallel(my_array, total_size, myrank, n_pes, ks, vals, type_enum);
+        return;
+    }
+    size_t n_k = ks.size();
+    std::vector<std::pair<T, T> > kths = get_lower_upper_kths_parallel(
+        my_array, total_size, myrank, n_pes, ks, type_enum);
+    // number of elements in the three sets of each k in one pass
+    std::vector<int64_t> local_nums(3*n_k, 0);
+    std::vector<int64_t> nums(3*n_k, 0);
+    for(auto val: my_array)
+    {
+        for(size_t i=0; i<n_k; i++)
+        {
+            if (val<kths[i].first)
+                local_nums[3*i]++;
+            else if (val<kths[i].second)
+                local_nums[3*i+1]++;
+            else
+                local_nums[3*i+2]++;
+        }
+    }
+    MPI_Allreduce(local_nums.data(), nums.data(), 3*n_k, MPI_LONG_LONG_INT, MPI_SUM, MPI_COMM_WORLD);
+
+    // value range [lo, hi) of the set that has each k and the number of
+    // elements less than lo
+    std::vector<size_t> pending;
+    std::vector<T> lo(n_k), hi(n_k);
+    std::vector<bool> has_lo(n_k), has_hi(n_k);
+    std::vector<int64_t> below(n_k);
+    for(size_t i=0; i<n_k; i++)
+    {
+        int64_t k = ks[i];
+        int64_t l0_num = nums[3*i], l1_num = nums[3*i+1], l2_num = nums[3*i+2];
+        assert(l0_num + l1_num + l2_num == total_size);
+        // bounds are data values, smallest values of middle and last sets
+        if (k == l0_num && l1_num > 0)
+        {
+            vals[i] = kths[i].first;
+            continue;
+        }
+        if (k == l0_num + l1_num)
+        {
+            vals[i] = kths[i].second;
+            continue;
+        }
+        has_lo[i] = k >= l0_num;
+        has_hi[i] = k < l0_num + l1_num;
+        lo[i] = has_hi[i] ? kths[i].first : kths[i].second;
+        hi[i] = (k < l0_num) ? kths[i].first : kths[i].second;
+        below[i] = has_hi[i] ? (has_lo[i] ? l0_num : 0) : l0_num + l1_num;
+        pending.push_back(i);
+    }
+    // merge overlapping ranges into disjoint clusters, in order of lo
+    std::sort(pending.begin(), pending.end(), [&](size_t a, size_t b) {
+        if (has_lo[a] != has_lo[b])
+            return !has_lo[a];
+        return has_lo[a] && lo[a] < lo[b];
+    });
+    std::vector<T> c_lo, c_hi;
+    std::vector<bool> c_has_lo, c_has_hi;
+    std::vector<int64_t> c_below;
+    std::vector<std::vector<size_t> > c_inds;
+    for(auto i: pending)
+    {
+        size_t n_c = c_lo.size();
+        if (n_c > 0 && (!c_has_hi[n_c-1] || !has_lo[i] || lo[i] < c_hi[n_c-1]))
+        {
+            if (!has_hi[i])
+                c_has_hi[n_c-1] = false;
+            else if (hi[i] > c_hi[n_c-1])
+                c_hi[n_c-1] = hi[i];
+        }
+        else
+        {
+            c_lo.push_back(lo[i]);
+            c_hi.push_back(hi[i]);
+            c_has_lo.push_back(has_lo[i]);
+            c_has_hi.push_back(has_hi[i]);
+            c_below.push_back(below[i]);
+            c_inds.push_back(std::vector<size_t>());
+        }
+        c_inds.back().push_back(i);
+    }
+    size_t n_c = c_lo.size();
+    if (n_c == 0)
+        return;
+
+    // elements of all clusters in one pass
+    std::vector<std::vector<T> > c_arrays(n_c);
+    for(auto val: my_array)
+    {
+        for(size_t c=0; c<n_c; c++)
+        {
+            if ((!c_has_lo[c] || val>=c_lo[c]) && (!c_has_hi[c] || val<c_hi[c]))
+            {
+                c_arrays[c].push_back(val);
+                break;
+            }
+        }
+    }
+    std::vector<int64_t> local_c_sizes(n_c), c_sizes(n_c);
+    for(size_t c=0; c<n_c; c++)
+        local_c_sizes[c] = c_arrays[c].size();
+    MPI_Allreduce(local_c_sizes.data(), c_sizes.data(), n_c, MPI_LONG_LONG_INT, MPI_SUM, MPI_COMM_WORLD);
+
+    for(size_t c=0; c<n_c; c++)
+    {
+        std::sort(c_inds[c].begin(), c_inds[c].end());
+        std::vector<int64_t> new_ks;
+        for(auto i: c_inds[c])
+            new_ks.push_back(ks[i] - c_below[c]);
+        std::vector<double> c_vals(new_ks.size());
+        // no reduction (e.g. many equal values), finish on root
+        if (c_sizes[c] == total_size)
+            small_get_nths_parallel(c_arrays[c], c_sizes[c], myrank, n_pes, new_ks, c_vals.data(), type_enum);
+        else
+            get_nths_parallel(c_arrays[c], c_sizes[c], new_ks, c_vals.data(), myrank, n_pes, type_enum);
+        for(size_t j=0; j<new_ks.size(); j++)
+            vals[c_inds[c][j]] = c_vals[j];
+    }
+}
+
+template <class T>
+std::vector<std::pair<T, T> > get_lower_upper_kths_parallel(
+        std::vector<T> &my_array, int64_t total_size, int myrank, int n_pes,
+        const std::vector<int64_t> &ks, int type_enum)
+{
+    // one sample is gathered and bounds of all ks are broadcast together
+    MPI_Datatype mpi_typ = get_MPI_typ(type_enum);
+    int64_t local_size = my_array.size();
+    size_t n_k = ks.size();
+    std::default_random_engine r_engine(myrank);
+    std::uniform_real_distribution<double> uniform_dist(0.0, 1.0);
+
+    int64_t sample_size = (int64_t) (pow(10.0, 5.0)/n_pes); // 100000 total
+    int my_sample_size = (int) std::min(sample_size, local_size);
+
+    std::vector<T> my_sample;
+    for(int64_t i=0; i<my_sample_size; i++)
+    {
+        int64_t index = (int64_t) (local_size*uniform_dist(r_engine));
+        my_sample.push_back(my_array[index]);
+    }
+    std::vector<T> all_sample_vec;
+    std::vector<int> rcounts(n_pes);
+    std::vector<int> displs(n_pes);
+    int total_sample_size = 0;
+    MPI_Gather(&my_sample_size, 1, MPI_INT, rcounts.data(), 1, MPI_INT, root, MPI_COMM_WORLD);
+    if (myrank == root)
+    {
+        for(int i=0; i<n_pes; i++)
+        {
+            displs[i] = total_sample_size;
+            total_sample_size += rcounts[i];
+        }
+        all_sample_vec.resize(total_sample_size);
+    }
+    MPI_Gatherv(my_sample.data(), my_sample_size, mpi_typ, all_sample_vec.data(), rcounts.data(), displs.data(), mpi_typ, root, MPI_COMM_WORLD);
+
+    // bounds as [k1_0, k2_0, k1_1, k2_1, ...]
+    std::vector<T> bounds(2*n_k);
+    if (myrank == root)
+    {
+        std::sort(all_sample_vec.begin(), all_sample_vec.end());
+        for(size_t i=0; i<n_k; i++)
+        {
+            int local_k = (int) (ks[i]*(total_sample_size/(double)total_size));
+            int k1 = (int) (local_k - sqrt(total_sample_size * log(total_size)));
+            int k2 = (int) (local_k + sqrt(total_sample_size * log(total_size)));
+            k1 = std::max(k1, 0);
+            k2 = std::min(k2, total_sample_size-1);
+            bounds[2*i] = all_sample_vec[k1];
+            bounds[2*i+1] = all_sample_vec[k2];
+        }
+    }
+    MPI_Bcast(bounds.data(), 2*n_k, mpi_typ, root, MPI_COMM_WORLD);
+    std::vector<std::pair<T, T> > res;
+    for(size_t i=0; i<n_k; i++)
+        res.push_back(std::make_pair(bounds[2*i], bounds[2*i+1]));
+    return res;
+}
+
+template <class T>
+void small_get_nths_parallel(std::vector<T> &my_array, int64_t total_size,
+                             int myrank, int n_pes,
+                             const std::vector<int64_t> &ks, double* vals,
+                             int type_enum)
+{
+    // gather data on root once, select ks in increasing order on the
+    // remaining part of data, and broadcast all values together
+    size_t n_k = ks.size();
+    std::vector<T> all_data_vec;
+    std::vector<T>* data_vec = &my_array;
+    if (n_pes != 1)
+    {
+        MPI_Datatype mpi_typ = get_MPI_typ(type_enum);
+        int my_data_size = my_array.size();
+        int total_data_size = 0;
+        std::vector<int> rcounts(n_pes);
+        std::vector<int> displs(n_pes);
+        MPI_Gather(&my_data_size, 1, MPI_INT, rcounts.data(), 1, MPI_INT, root, MPI_COMM_WORLD);
+        if (myrank == root)
+        {
+            for(int i=0; i<n_pes; i++)
+            {
+                displs[i] = total_data_size;
+                total_data_size += rcounts[i];
+            }
+            all_data_vec.resize(total_data_size);
+        }
+        MPI_Gatherv(my_array.data(), my_data_size, mpi_typ, all_data_vec.data(), rcounts.data(), displs.data(), mpi_typ, root, MPI_COMM_WORLD);
+        data_vec = &all_data_vec;
+    }
+    if (myrank == root)
+    {
+        auto start = data_vec->begin();
+        for(size_t i=0; i<n_k; i++)
+        {
+            std::nth_element(start, data_vec->begin() + ks[i], data_vec->end());
+            vals[i] = (*data_vec)[ks[i]];
+            start = data_vec->begin() + ks[i] + 1;
+        }
+    }
+    if (n_pes != 1)
+        MPI_Bcast(vals, n_k, MPI_DOUBLE, root, MPI_COMM_WORLD);
+}
+
 /*
     // T ep = log(sample_size)/ log(total_size);
     /for (size_t i = 0; i < local_size; i++) {
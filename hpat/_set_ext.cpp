@@ -1,20 +1,23 @@
 #include <Python.h>
-#include <unordered_set>
 #include <iostream>
 #include <limits>
 #include <string>
+#include "_str_arena.h"
 
+// string sets keep keys in an arena (see _str_arena.h), iterators are
+// indices of keys in insertion order
 
-std::unordered_set<std::string>* init_set_string();
-void insert_set_string(std::unordered_set<std::string>* str_set, std::string* val);
-int64_t len_set_string(std::unordered_set<std::string>* str_set);
-bool set_in_string(std::string* val, std::unordered_set<std::string>* str_set);
-int64_t num_total_chars_set_string(std::unordered_set<std::string>* str_set);
-void populate_str_arr_from_set(std::unordered_set<std::string>* str_set,
-                                uint32_t *offsets, char *data);
-void* set_iterator_string(std::unordered_set<std::string>* str_set);
-bool set_itervalid_string(std::unordered_set<std::string>::iterator * itp, std::unordered_set<std::string>* str_set);
-std::string* set_nextval_string(std::unordered_set<std::string>::iterator * itp);
+StrArenaSet* init_set_string();
+void insert_set_string(StrArenaSet* str_set, std::string* val);
+void insert_set_chars(StrArenaSet* str_set, const char* data, int64_t len);
+int64_t len_set_string(StrArenaSet* str_set);
+bool set_in_string(std::string* val, StrArenaSet* str_set);
+int64_t num_total_chars_set_string(StrArenaSet* str_set);
+void populate_str_arr_from_set(StrArenaSet* str_set, uint64_t *offsets,
+                                                                char *data);
+void* set_iterator_string(StrArenaSet* str_set);
+bool set_itervalid_string(int64_t* itp, StrArenaSet* str_set);
+std::string* set_nextval_string(int64_t* itp, StrArenaSet* str_set);
 
 PyMODINIT_FUNC PyInit_hset_ext(void) {
     PyObject *m;
@@ -28,6 +31,8 @@ PyMODINIT_FUNC PyInit_hset_ext(void) {
                             PyLong_FromVoidPtr((void*)(&init_set_string)));
     PyObject_SetAttrString(m, "insert_set_string",
                             PyLong_FromVoidPtr((void*)(&insert_set_string)));
+    PyObject_SetAttrString(m, "insert_set_chars",
+                            PyLong_FromVoidPtr((void*)(&insert_set_chars)));
     PyObject_SetAttrString(m, "len_set_string",
                             PyLong_FromVoidPtr((void*)(&len_set_string)));
     PyObject_SetAttrString(m, "set_in_string",
@@ -46,65 +51,57 @@ PyMODINIT_FUNC PyInit_hset_ext(void) {
     return m;
 }
 
-std::unordered_set<std::string>* init_set_string()
+StrArenaSet* init_set_string()
 {
-    return new std::unordered_set<std::string>();
+    return new StrArenaSet();
 }
 
-void insert_set_string(std::unordered_set<std::string>* str_set, std::string* val)
+void insert_set_string(StrArenaSet* str_set, std::string* val)
 {
-    str_set->insert(*val);
+    bool inserted;
+    str_set->insert(val->data(), val->size(), &inserted);
 }
 
-int64_t len_set_string(std::unordered_set<std::string>* str_set)
+void insert_set_chars(StrArenaSet* str_set, const char* data, int64_t len)
+{
+    bool inserted;
+    str_set->insert(data, len, &inserted);
+}
+
+int64_t len_set_string(StrArenaSet* str_set)
 {
     return str_set->size();
 }
 
-bool set_in_string(std::string* val, std::unordered_set<std::string>* str_set)
+bool set_in_string(std::string* val, StrArenaSet* str_set)
 {
-    return (str_set->find(*val) != str_set->end());
+    return str_set->find(val->data(), val->size()) != -1;
 }
 
-int64_t num_total_chars_set_string(std::unordered_set<std::string>* str_set)
+int64_t num_total_chars_set_string(StrArenaSet* str_set)
 {
-    int64_t total_len = 0;
-    for (auto it=str_set->cbegin(); it != str_set->cend(); ++it)
-        total_len += (*it).size();
-    return total_len;
+    return str_set->num_total_chars();
 }
 
-void populate_str_arr_from_set(std::unordered_set<std::string>* str_set,
-                                uint32_t *offsets, char *data)
+void populate_str_arr_from_set(StrArenaSet* str_set, uint64_t *offsets,
+                                                                char *data)
 {
-    uint32_t curr_data_ind = 0;
-    uint32_t index = 0;
-    for (auto it=str_set->cbegin(); it != str_set->cend(); ++it)
-    {
-        uint32_t len = (*it).length();
-        // std::cout << "start " << start << " len " << len << std::endl;
-        memcpy(&data[curr_data_ind], (*it).c_str(), len);
-        offsets[index] = curr_data_ind;
-        curr_data_ind += len;
-        index++;
-    }
-    offsets[index] = curr_data_ind;
+    str_set->to_string_array(offsets, data);
 }
 
-void* set_iterator_string(std::unordered_set<std::string>* str_set)
+void* set_iterator_string(StrArenaSet* str_set)
 {
-    std::unordered_set<std::string>::iterator * itp = new std::unordered_set<std::string>::iterator(str_set->begin());
-    return itp;
+    return new int64_t(0);
 }
 
-bool set_itervalid_string(std::unordered_set<std::string>::iterator * itp, std::unordered_set<std::string>* str_set)
+bool set_itervalid_string(int64_t* itp, StrArenaSet* str_set)
 {
-    return (*itp) != str_set->end();
+    return *itp < str_set->size();
 }
 
-std::string* set_nextval_string(std::unordered_set<std::string>::iterator * itp)
+std::string* set_nextval_string(int64_t* itp, StrArenaSet* str_set)
 {
-    std::string* res = new std::string(*(*itp));
-    (*itp)++;
-    return res;
-}
\ No newline at end of file
+    int64_t ind = (*itp)++;
+    return new std::string(str_set->key_data(ind),
+                           str_set->entries[ind].length);
+}
@@ -0,0 +1,151 @@
+#ifndef _STR_ARENA_H_INCLUDED
+#define _STR_ARENA_H_INCLUDED
+
+#include <cstdint>
+#include <cstring>
+#include <deque>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+// Open addressing hash set of strings. Characters of all keys are stored
+// in one growable arena in insertion order and every key is a
+// (hash, offset, length) entry, so inserts don't allocate a node per key
+// and keys can be copied to a string array (offsets and data) directly.
+class StrArenaSet
+{
+public:
+    struct Entry
+    {
+        uint64_t hash;
+        uint64_t offset;
+        uint64_t length;
+    };
+
+    std::vector<char> arena;
+    std::vector<Entry> entries;
+
+    StrArenaSet() : slots(16, -1), mask(15) {}
+
+    int64_t size() const { return entries.size(); }
+
+    uint64_t num_total_chars() const { return arena.size(); }
+
+    const char* key_data(int64_t ind) const
+    {
+        return arena.data() + entries[ind].offset;
+    }
+
+    int64_t find(const char* data, int64_t len) const
+    {
+        // index of key, -1 if not found
+        return slots[find_slot(hash_chars(data, len), data, len)];
+    }
+
+    int64_t insert(const char* data, int64_t len, bool* inserted)
+    {
+        // index of key, added to the end of the arena if new
+        uint64_t hash = hash_chars(data, len);
+        uint64_t slot = find_slot(hash, data, len);
+        *inserted = slots[slot] == -1;
+        if (!*inserted)
+            return slots[slot];
+        int64_t ind = entries.size();
+        Entry e = {hash, (uint64_t)arena.size(), (uint64_t)len};
+        entries.push_back(e);
+        arena.insert(arena.end(), data, data + len);
+        slots[slot] = ind;
+        // keep load factor under 1/2
+        if (2 * entries.size() > slots.size())
+            grow();
+        return ind;
+    }
+
+    void to_string_array(uint64_t* offsets, char* data) const
+    {
+        // keys are contiguous in the arena already
+        memcpy(data, arena.data(), arena.size());
+        for (size_t i = 0; i < entries.size(); i++)
+            offsets[i] = entries[i].offset;
+        offsets[entries.size()] = arena.size();
+    }
+
+private:
+    std::vector<int64_t> slots;
+    uint64_t mask;
+
+    static uint64_t hash_chars(const char* data, int64_t len)
+    {
+        // FNV-1a
+        uint64_t h = 14695981039346656037ULL;
+        for (int64_t i = 0; i < len; i++)
+        {
+            h ^= (unsigned char)data[i];
+            h *= 1099511628211ULL;
+        }
+        return h;
+    }
+
+    uint64_t find_slot(uint64_t hash, const char* data, int64_t len) const
+    {
+        // slot of key or empty slot where it should be inserted
+        uint64_t slot = hash & mask;
+        while (slots[slot] != -1)
+        {
+            const Entry& e = entries[slots[slot]];
+            if (e.hash == hash && e.length == (uint64_t)len
+                    && memcmp(arena.data() + e.offset, data, len) == 0)
+                break;
+            slot = (slot + 1) & mask;
+        }
+        return slot;
+    }
+
+    void grow()
+    {
+        // rehash with stored hashes, keys are not touched
+        slots.assign(2 * slots.size(), -1);
+        mask = slots.size() - 1;
+        for (size_t i = 0; i < entries.size(); i++)
+        {
+            uint64_t slot = entries[i].hash & mask;
+            while (slots[slot] != -1)
+                slot = (slot + 1) & mask;
+            slots[slot] = i;
+        }
+    }
+};
+
+// string map on top of the arena set, values are indexed by key index
+// (deque keeps references to values valid when new keys are added)
+template <class V>
+class StrArenaMap
+{
+public:
+    StrArenaSet keys;
+    std::deque<V> values;
+
+    V& operator[](const std::string& key)
+    {
+        bool inserted;
+        int64_t ind = keys.insert(key.data(), key.size(), &inserted);
+        if (inserted)
+            values.emplace_back();
+        return values[ind];
+    }
+
+    bool contains(const std::string& key) const
+    {
+        return keys.find(key.data(), key.size()) != -1;
+    }
+
+    V& at(const std::string& key)
+    {
+        int64_t ind = keys.find(key.data(), key.size());
+        if (ind == -1)
+            throw std::out_of_range("key not found in dictionary");
+        return values[ind];
+    }
+};
+
+#endif // _STR_ARENA_H_INCLUDED
@@ -4,26 +4,44 @@
 #include <string>
 #include <iostream>
 #include <vector>
+#include <algorithm>
+#include <cstring>
+#include <atomic>
+#include <thread>
 
 
 #ifdef USE_BOOST_REGEX
 #include <boost/regex.hpp>
 using boost::regex;
 using boost::regex_search;
+namespace regex_constants = boost::regex_constants;
 #else
 #include <regex>
 using std::regex;
 using std::regex_search;
+namespace regex_constants = std::regex_constants;
 #endif
 
+#include <unordered_map>
+
+// modes of matching patterns against string array elements, same values as
+// hiframes_str_match
+#define STR_MATCH_CONTAINS 0
+#define STR_MATCH_STARTSWITH 1
+#define STR_MATCH_ENDSWITH 2
+#define STR_MATCH_FULLMATCH 3
+
 #ifndef _WIN32
 #include <glob.h>
 #endif
 
 extern "C" {
 
+// 64-bit offsets so an array can hold more than 4 GB of characters
+typedef uint64_t offset_t;
+
 struct str_arr_payload {
-    uint32_t *offsets;
+    offset_t *offsets;
     char* data;
 };
 
@@ -42,20 +60,21 @@ void* str_substr_int(std::string* str, int64_t index);
 int64_t str_to_int64(std::string* str);
 double str_to_float64(std::string* str);
 int64_t get_str_len(std::string* str);
-void string_array_from_sequence(PyObject * obj, int64_t * no_strings, uint32_t ** offset_table, char ** buffer);
-void* np_array_from_string_array(int64_t no_strings, uint32_t * offset_table, char * buffer);
-void allocate_string_array(uint32_t **offsets, char **data, int64_t num_strings,
+void string_arrays_from_sequences(PyObject ** objs, int64_t n_cols,
+        int64_t * no_strings, offset_t ** offset_tables, char ** buffers);
+void* np_array_from_string_array(int64_t no_strings, offset_t * offset_table, char * buffer);
+void allocate_string_array(offset_t **offsets, char **data, int64_t num_strings,
                                                             int64_t total_size);
 
-void setitem_string_array(uint32_t *offsets, char *data, std::string* str,
+void setitem_string_array(offset_t *offsets, char *data, std::string* str,
                                                                 int64_t index);
-void set_string_array_range(uint32_t *out_offsets, char *out_data,
-                            uint32_t *in_offsets, char *in_data,
+void set_string_array_range(offset_t *out_offsets, char *out_data,
+                            offset_t *in_offsets, char *in_data,
                             int64_t start_str_ind, int64_t start_chars_ind,
                             int64_t num_strs, int64_t num_chars);
-void convert_len_arr_to_offset(uint32_t *offsets, int64_t num_strs);
-char* getitem_string_array(uint32_t *offsets, char *data, int64_t index);
-void* getitem_string_array_std(uint32_t *offsets, char *data, int64_t index);
+void convert_len_arr_to_offset(offset_t *offsets, int64_t num_strs);
+char* getitem_string_array(offset_t *offsets, char *data, int64_t index);
+void* getitem_string_array_std(offset_t *offsets, char *data, int64_t index);
 void print_str(std::string* str);
 void print_char(char c);
 void print_int(int64_t val);
@@ -70,7 +89,40 @@ void* str_from_float32(float in);
 void* str_from_float64(double in);
 void del_str(std::string* in_str);
 int64_t hash_str(std::string* in_str);
-void c_glob(uint32_t **offsets, char **data, int64_t* num_strings,
+int64_t hash_chars(const char* data, int64_t len);
+int str_view_compare(const char* data1, int64_t len1, const char* data2,
+                                                            int64_t len2);
+int64_t str_view_find(const char* data, int64_t len, const char* pat,
+                                                            int64_t pat_len);
+bool str_view_contains_regex(const char* data, int64_t len, regex* e);
+void str_arr_match_literal(offset_t* offsets, const char* data, int64_t n,
+                    const char* pat, int64_t pat_len, int64_t mode, bool* out);
+void str_arr_match_regex(offset_t* offsets, const char* data, int64_t n,
+                                        regex* e, int64_t mode, bool* out);
+void str_arr_case(offset_t* out_offsets, char* out_data, offset_t* offsets,
+                                const char* data, int64_t n, bool upper);
+void str_arr_len(offset_t* offsets, const char* data, int64_t n, int64_t* out);
+void str_arr_strip_ranges(offset_t* offsets, const char* data, int64_t n,
+                            int64_t side, int64_t* starts, int64_t* lens);
+void str_arr_slice_ranges(offset_t* offsets, const char* data, int64_t n,
+                            int64_t start, int64_t stop, bool has_start,
+                            bool has_stop, int64_t* starts, int64_t* lens);
+void str_arr_split_ranges(offset_t* offsets, const char* data, int64_t n,
+                            const char* sep, int64_t sep_len, int64_t maxsplit,
+                            int64_t ind, int64_t* starts, int64_t* lens);
+void str_arr_copy_ranges(offset_t* out_offsets, char* out_data,
+                            const char* data, int64_t n, int64_t* starts,
+                            int64_t* lens);
+int64_t str_arr_replace_chars(offset_t* offsets, const char* data, int64_t n,
+                            const char* pat, int64_t pat_len, int64_t repl_len,
+                            int64_t max_repl);
+void str_arr_replace(offset_t* out_offsets, char* out_data, offset_t* offsets,
+                            const char* data, int64_t n, const char* pat,
+                            int64_t pat_len, const char* repl,
+                            int64_t repl_len, int64_t max_repl);
+void setitem_string_array_chars(offset_t *offsets, char *data,
+                                const char* str, int64_t len, int64_t index);
+void c_glob(offset_t **offsets, char **data, int64_t* num_strings,
                                                             std::string* path);
 
 
@@ -117,8 +169,8 @@ PyMODINIT_FUNC PyInit_hstr_ext(void) {
                             PyLong_FromVoidPtr((void*)(&str_to_float64)));
     PyObject_SetAttrString(m, "get_str_len",
                             PyLong_FromVoidPtr((void*)(&get_str_len)));
-    PyObject_SetAttrString(m, "string_array_from_sequence",
-                            PyLong_FromVoidPtr((void*)(&string_array_from_sequence)));
+    PyObject_SetAttrString(m, "string_arrays_from_sequences",
+                            PyLong_FromVoidPtr((void*)(&string_arrays_from_sequences)));
     PyObject_SetAttrString(m, "np_array_from_string_array",
                             PyLong_FromVoidPtr((void*)(&np_array_from_string_array)));
     PyObject_SetAttrString(m, "allocate_string_array",
@@ -157,6 +209,36 @@ PyMODINIT_FUNC PyInit_hstr_ext(void) {
                             PyLong_FromVoidPtr((void*)(&del_str)));
     PyObject_SetAttrString(m, "hash_str",
                             PyLong_FromVoidPtr((void*)(&hash_str)));
+    PyObject_SetAttrString(m, "hash_chars",
+                            PyLong_FromVoidPtr((void*)(&hash_chars)));
+    PyObject_SetAttrString(m, "str_view_compare",
+                            PyLong_FromVoidPtr((void*)(&str_view_compare)));
+    PyObject_SetAttrString(m, "str_view_find",
+                            PyLong_FromVoidPtr((void*)(&str_view_find)));
+    PyObject_SetAttrString(m, "str_view_contains_regex",
+                            PyLong_FromVoidPtr((void*)(&str_view_contains_regex)));
+    PyObject_SetAttrString(m, "str_arr_match_literal",
+                            PyLong_FromVoidPtr((void*)(&str_arr_match_literal)));
+    PyObject_SetAttrString(m, "str_arr_match_regex",
+                            PyLong_FromVoidPtr((void*)(&str_arr_match_regex)));
+    PyObject_SetAttrString(m, "str_arr_case",
+                            PyLong_FromVoidPtr((void*)(&str_arr_case)));
+    PyObject_SetAttrString(m, "str_arr_len",
+                            PyLong_FromVoidPtr((void*)(&str_arr_len)));
+    PyObject_SetAttrString(m, "str_arr_strip_ranges",
+                            PyLong_FromVoidPtr((void*)(&str_arr_strip_ranges)));
+    PyObject_SetAttrString(m, "str_arr_slice_ranges",
+                            PyLong_FromVoidPtr((void*)(&str_arr_slice_ranges)));
+    PyObject_SetAttrString(m, "str_arr_split_ranges",
+                            PyLong_FromVoidPtr((void*)(&str_arr_split_ranges)));
+    PyObject_SetAttrString(m, "str_arr_copy_ranges",
+                            PyLong_FromVoidPtr((void*)(&str_arr_copy_ranges)));
+    PyObject_SetAttrString(m, "str_arr_replace_chars",
+                            PyLong_FromVoidPtr((void*)(&str_arr_replace_chars)));
+    PyObject_SetAttrString(m, "str_arr_replace",
+                            PyLong_FromVoidPtr((void*)(&str_arr_replace)));
+    PyObject_SetAttrString(m, "setitem_string_array_chars",
+                            PyLong_FromVoidPtr((void*)(&setitem_string_array_chars)));
     PyObject_SetAttrString(m, "c_glob",
                             PyLong_FromVoidPtr((void*)(&c_glob)));
     return m;
@@ -190,8 +272,370 @@ void del_str(std::string* in_str)
 
 int64_t hash_str(std::string* in_str)
 {
-    std::size_t h1 = std::hash<std::string>{}(*in_str);
-    return (int64_t)h1;
+    // same hash as string views to route equal values to the same process
+    return hash_chars(in_str->data(), in_str->length());
+}
+
+int64_t hash_chars(const char* data, int64_t len)
+{
+    // 64-bit FNV-1a
+    uint64_t h = 14695981039346656037ULL;
+    for (int64_t i=0; i<len; i++)
+    {
+        h ^= (unsigned char)data[i];
+        h *= 1099511628211ULL;
+    }
+    return (int64_t)h;
+}
+
+int str_view_compare(const char* data1, int64_t len1, const char* data2,
+                                                            int64_t len2)
+{
+    int res = memcmp(data1, data2, std::min(len1, len2));
+    if (res != 0)
+        return res;
+    return (len1 > len2) - (len1 < len2);
+}
+
+int64_t str_view_find(const char* data, int64_t len, const char* pat,
+                                                            int64_t pat_len)
+{
+    // find first character with memchr and compare the rest
+    if (pat_len == 0)
+        return 0;
+    if (pat_len > len)
+        return -1;
+    const char* curr = data;
+    const char* last = data + len - pat_len;
+    while (curr <= last)
+    {
+        curr = (const char*)memchr(curr, pat[0], last - curr + 1);
+        if (curr == NULL)
+            return -1;
+        if (memcmp(curr + 1, pat + 1, pat_len - 1) == 0)
+            return curr - data;
+        curr++;
+    }
+    return -1;
+}
+
+bool str_view_contains_regex(const char* data, int64_t len, regex* e)
+{
+    return regex_search(data, data + len, *e);
+}
+
+void str_arr_match_literal(offset_t* offsets, const char* data, int64_t n,
+                    const char* pat, int64_t pat_len, int64_t mode, bool* out)
+{
+    // sets out[i] if string i matches pat, other values are unchanged so
+    // alternatives can be matched one after another
+    if (mode == STR_MATCH_CONTAINS)
+    {
+        if (pat_len == 0)
+        {
+            std::fill(out, out + n, true);
+            return;
+        }
+        // search the whole character buffer and find the string of each
+        // match from offsets, instead of a search per string
+        const char* end = data + offsets[n];
+        const char* curr = data + offsets[0];
+        int64_t i = 0;
+        while (i < n)
+        {
+            int64_t pos = str_view_find(curr, end - curr, pat, pat_len);
+            if (pos == -1)
+                return;
+            offset_t start = (curr - data) + pos;
+            while (offsets[i + 1] <= start)
+                i++;
+            if (out[i] || start + pat_len <= offsets[i + 1])
+            {
+                // string matched, continue from next string
+                out[i] = true;
+                i++;
+                curr = data + offsets[i];
+            }
+            else
+                curr = data + start + 1;
+        }
+        return;
+    }
+
+    for (int64_t i = 0; i < n; i++)
+    {
+        const char* str = data + offsets[i];
+        int64_t len = offsets[i + 1] - offsets[i];
+        if (len < pat_len)
+            continue;
+        if (mode == STR_MATCH_STARTSWITH)
+            out[i] |= memcmp(str, pat, pat_len) == 0;
+        else if (mode == STR_MATCH_ENDSWITH)
+            out[i] |= memcmp(str + len - pat_len, pat, pat_len) == 0;
+        else
+            out[i] |= len == pat_len && memcmp(str, pat, pat_len) == 0;
+    }
+}
+
+void str_arr_match_regex(offset_t* offsets, const char* data, int64_t n,
+                                        regex* e, int64_t mode, bool* out)
+{
+    // only candidates with out[i] set are searched (e.g. strings containing
+    // a literal required by the pattern), out[i] is cleared if no match
+    regex_constants::match_flag_type flags = regex_constants::match_default;
+    if (mode == STR_MATCH_STARTSWITH)
+        flags = regex_constants::match_continuous;
+    for (int64_t i = 0; i < n; i++)
+        if (out[i])
+            out[i] = regex_search(data + offsets[i], data + offsets[i + 1],
+                                                                *e, flags);
+}
+
+// Series.str kernels: output lengths are computed first to allocate the
+// output string array, then characters are written directly to its buffer.
+// Lengths and slices count UTF-8 code points, case mapping and whitespace
+// are ASCII.
+
+static bool is_ascii_space(char c)
+{
+    return c == ' ' || (c >= '\t' && c <= '\r');
+}
+
+static bool is_utf8_start(char c)
+{
+    return ((unsigned char)c & 0xC0) != 0x80;
+}
+
+static int64_t utf8_num_code_points(const char* str, int64_t len)
+{
+    int64_t count = 0;
+    for (int64_t i = 0; i < len; i++)
+        count += is_utf8_start(str[i]);
+    return count;
+}
+
+static int64_t utf8_byte_index(const char* str, int64_t len, int64_t ind)
+{
+    // byte position of code point ind (len if past the end)
+    int64_t count = -1;
+    for (int64_t i = 0; i < len; i++)
+        if (is_utf8_start(str[i]) && ++count == ind)
+            return i;
+    return len;
+}
+
+void str_arr_case(offset_t* out_offsets, char* out_data, offset_t* offsets,
+                                const char* data, int64_t n, bool upper)
+{
+    std::copy(offsets, offsets + n + 1, out_offsets);
+    char lo = upper ? 'a' : 'A';
+    char hi = upper ? 'z' : 'Z';
+    for (offset_t i = offsets[0]; i < offsets[n]; i++)
+    {
+        char c = data[i];
+        out_data[i] = (c >= lo && c <= hi) ? c ^ 0x20 : c;
+    }
+}
+
+void str_arr_len(offset_t* offsets, const char* data, int64_t n, int64_t* out)
+{
+    for (int64_t i = 0; i < n; i++)
+        out[i] = utf8_num_code_points(data + offsets[i],
+                                      offsets[i + 1] - offsets[i]);
+}
+
+void str_arr_strip_ranges(offset_t* offsets, const char* data, int64_t n,
+                            int64_t side, int64_t* starts, int64_t* lens)
+{
+    // side is 1 for left, 2 for right and 3 for both
+    for (int64_t i = 0; i < n; i++)
+    {
+        offset_t start = offsets[i];
+        offset_t end = offsets[i + 1];
+        if (side & 1)
+            while (start < end && is_ascii_space(data[start]))
+                start++;
+        if (side & 2)
+            while (end > start && is_ascii_space(data[end - 1]))
+                end--;
+        starts[i] = start;
+        lens[i] = end - start;
+    }
+}
+
+void str_arr_slice_ranges(offset_t* offsets, const char* data, int64_t n,
+                            int64_t start, int64_t stop, bool has_start,
+                            bool has_stop, int64_t* starts, int64_t* lens)
+{
+    // Python slice [start:stop] semantics on code points
+    for (int64_t i = 0; i < n; i++)
+    {
+        const char* str = data + offsets[i];
+        int64_t len = offsets[i + 1] - offsets[i];
+        int64_t n_cp = utf8_num_code_points(str, len);
+        int64_t s = has_start ? start : 0;
+        int64_t e = has_stop ? stop : n_cp;
+        if (s < 0)
+            s = std::max(s + n_cp, (int64_t)0);
+        if (e < 0)
+            e = std::max(e + n_cp, (int64_t)0);
+        s = std::min(s, n_cp);
+        e = std::min(e, n_cp);
+        if (e <= s)
+        {
+            starts[i] = offsets[i];
+            lens[i] = 0;
+            continue;
+        }
+        int64_t s_byte = (n_cp == len) ? s : utf8_byte_index(str, len, s);
+        int64_t e_byte = (n_cp == len) ? e : utf8_byte_index(str, len, e);
+        starts[i] = offsets[i] + s_byte;
+        lens[i] = e_byte - s_byte;
+    }
+}
+
+static int64_t find_token(const char* str, int64_t len, const char* sep,
+                          int64_t sep_len, int64_t maxsplit, int64_t ind,
+                          int64_t* tok_start, int64_t* tok_len)
+{
+    // find token ind of str split by sep (runs of whitespace if sep_len is
+    // 0) with at most maxsplit splits (no limit if negative). Returns ind+1
+    // if found, otherwise the number of tokens.
+    int64_t k = 0;
+    int64_t pos = 0;
+    while (true)
+    {
+        int64_t end = len;
+        if (sep_len == 0)
+        {
+            while (pos < len && is_ascii_space(str[pos]))
+                pos++;
+            if (pos == len)
+                return k;
+            if (maxsplit < 0 || k < maxsplit)
+            {
+                end = pos;
+                while (end < len && !is_ascii_space(str[end]))
+                    end++;
+            }
+        }
+        else if (maxsplit < 0 || k < maxsplit)
+        {
+            int64_t found = str_view_find(str + pos, len - pos, sep, sep_len);
+            if (found != -1)
+                end = pos + found;
+        }
+        if (k == ind)
+        {
+            *tok_start = pos;
+            *tok_len = end - pos;
+            return k + 1;
+        }
+        k++;
+        if (end == len)
+            return k;
+        pos = end + sep_len;
+    }
+}
+
+void str_arr_split_ranges(offset_t* offsets, const char* data, int64_t n,
+                            const char* sep, int64_t sep_len, int64_t maxsplit,
+                            int64_t ind, int64_t* starts, int64_t* lens)
+{
+    // token ind of every string (negative counts from the end), empty if
+    // there is no such token
+    for (int64_t i = 0; i < n; i++)
+    {
+        const char* str = data + offsets[i];
+        int64_t len = offsets[i + 1] - offsets[i];
+        int64_t tok_start = 0;
+        int64_t tok_len = 0;
+        int64_t k = ind;
+        if (k < 0)
+            k += find_token(str, len, sep, sep_len, maxsplit, INT64_MAX,
+                            &tok_start, &tok_len);
+        if (k >= 0)
+            find_token(str, len, sep, sep_len, maxsplit, k, &tok_start,
+                       &tok_len);
+        starts[i] = offsets[i] + tok_start;
+        lens[i] = tok_len;
+    }
+}
+
+void str_arr_copy_ranges(offset_t* out_offsets, char* out_data,
+                            const char* data, int64_t n, int64_t* starts,
+                            int64_t* lens)
+{
+    offset_t curr = 0;
+    for (int64_t i = 0; i < n; i++)
+    {
+        out_offsets[i] = curr;
+        memcpy(out_data + curr, data + starts[i], lens[i]);
+        curr += lens[i];
+    }
+    out_offsets[n] = curr;
+}
+
+int64_t str_arr_replace_chars(offset_t* offsets, const char* data, int64_t n,
+                            const char* pat, int64_t pat_len, int64_t repl_len,
+                            int64_t max_repl)
+{
+    // total number of characters after replacing (non-overlapping) matches
+    // of pat with a string of repl_len characters, at most max_repl per
+    // string if not negative. Empty patterns are not replaced.
+    if (pat_len == 0)
+        max_repl = 0;
+    int64_t total = offsets[n] - offsets[0];
+    for (int64_t i = 0; i < n; i++)
+    {
+        const char* str = data + offsets[i];
+        int64_t len = offsets[i + 1] - offsets[i];
+        int64_t pos = 0;
+        int64_t count = 0;
+        while (max_repl < 0 || count < max_repl)
+        {
+            int64_t found = str_view_find(str + pos, len - pos, pat, pat_len);
+            if (found == -1)
+                break;
+            count++;
+            pos += found + pat_len;
+        }
+        total += count * (repl_len - pat_len);
+    }
+    return total;
+}
+
+void str_arr_replace(offset_t* out_offsets, char* out_data, offset_t* offsets,
+                            const char* data, int64_t n, const char* pat,
+                            int64_t pat_len, const char* repl,
+                            int64_t repl_len, int64_t max_repl)
+{
+    if (pat_len == 0)
+        max_repl = 0;
+    offset_t curr = 0;
+    for (int64_t i = 0; i < n; i++)
+    {
+        out_offsets[i] = curr;
+        const char* str = data + offsets[i];
+        int64_t len = offsets[i + 1] - offsets[i];
+        int64_t pos = 0;
+        int64_t count = 0;
+        while (max_repl < 0 || count < max_repl)
+        {
+            int64_t found = str_view_find(str + pos, len - pos, pat, pat_len);
+            if (found == -1)
+                break;
+            memcpy(out_data + curr, str + pos, found);
+            curr += found;
+            memcpy(out_data + curr, repl, repl_len);
+            curr += repl_len;
+            count++;
+            pos += found + pat_len;
+        }
+        memcpy(out_data + curr, str + pos, len - pos);
+        curr += len - pos;
+    }
+    out_offsets[n] = curr;
 }
 
 void dtor_string_array(str_arr_payload* in_str_arr, int64_t size, void* in)
@@ -292,40 +736,46 @@ int64_t get_str_len(std::string* str)
     return str->length();
 }
 
-void allocate_string_array(uint32_t **offsets, char **data, int64_t num_strings,
+void allocate_string_array(offset_t **offsets, char **data, int64_t num_strings,
                                                             int64_t total_size)
 {
     // std::cout << "allocating string array: " << num_strings << " " <<
     //                                                 total_size << std::endl;
-    *offsets = new uint32_t[num_strings+1];
+    *offsets = new offset_t[num_strings+1];
     *data = new char[total_size];
     (*offsets)[0] = 0;
-    (*offsets)[num_strings] = (uint32_t)total_size;  // in case total chars is read from here
+    (*offsets)[num_strings] = (offset_t)total_size;  // in case total chars is read from here
     // *data = (char*) new std::string("gggg");
     return;
 }
 
-void setitem_string_array(uint32_t *offsets, char *data, std::string* str,
+void setitem_string_array(offset_t *offsets, char *data, std::string* str,
                                                                 int64_t index)
 {
     // std::cout << "setitem str: " << *str << " " << index << std::endl;
+    setitem_string_array_chars(offsets, data, str->c_str(), str->length(),
+                                                                    index);
+    return;
+}
+
+void setitem_string_array_chars(offset_t *offsets, char *data,
+                                const char* str, int64_t len, int64_t index)
+{
     if (index==0)
         offsets[index] = 0;
-    uint32_t start = offsets[index];
-    uint32_t len = str->length();
-    // std::cout << "start " << start << " len " << len << std::endl;
-    memcpy(&data[start], str->c_str(), len);
-    offsets[index+1] = start+len;
+    offset_t start = offsets[index];
+    memcpy(&data[start], str, len);
+    offsets[index+1] = start + (offset_t)len;
     return;
 }
 
-void set_string_array_range(uint32_t *out_offsets, char *out_data,
-                            uint32_t *in_offsets, char *in_data,
+void set_string_array_range(offset_t *out_offsets, char *out_data,
+                            offset_t *in_offsets, char *in_data,
                             int64_t start_str_ind, int64_t start_chars_ind,
                             int64_t num_strs, int64_t num_chars)
 {
     // printf("%d %d\n", start_str_ind, start_chars_ind); fflush(stdout);
-    uint32_t curr_offset = 0;
+    offset_t curr_offset = 0;
     if (start_str_ind!=0)
         curr_offset = out_offsets[start_str_ind];
 
@@ -333,7 +783,7 @@ void set_string_array_range(uint32_t *out_offsets, char *out_data,
     for (size_t i=0; i<num_strs; i++)
     {
         out_offsets[start_str_ind+i] = curr_offset;
-        int32_t len = in_offsets[i+1]-in_offsets[i];
+        offset_t len = in_offsets[i+1]-in_offsets[i];
         curr_offset += len;
     }
     out_offsets[start_str_ind+num_strs] = curr_offset;
@@ -342,24 +792,30 @@ void set_string_array_range(uint32_t *out_offsets, char *out_data,
     return;
 }
 
-void convert_len_arr_to_offset(uint32_t *offsets, int64_t num_strs)
+void convert_len_arr_to_offset(offset_t *offsets, int64_t num_strs)
 {
-    uint32_t curr_offset = 0;
+    // string lengths are communicated as uint32 and received into the front
+    // of the offset buffer. Widen them in place (backwards, since an offset
+    // overlaps lengths with larger indices) and then take the prefix sum.
+    uint32_t *lens = (uint32_t*)offsets;
+    for(int64_t i=num_strs-1; i>=0; i--)
+        offsets[i] = (offset_t)lens[i];
+    offset_t curr_offset = 0;
     for(int64_t i=0; i<num_strs; i++)
     {
-        uint32_t val = offsets[i];
+        offset_t val = offsets[i];
         offsets[i] = curr_offset;
         curr_offset += val;
     }
     offsets[num_strs] = curr_offset;
 }
 
-char* getitem_string_array(uint32_t *offsets, char *data, int64_t index)
+char* getitem_string_array(offset_t *offsets, char *data, int64_t index)
 {
     // printf("getitem string arr index: %d offsets: %d %d", index,
     //                                  offsets[index], offsets[index+1]);
-    uint32_t size = offsets[index+1]-offsets[index]+1;
-    uint32_t start = offsets[index];
+    offset_t size = offsets[index+1]-offsets[index]+1;
+    offset_t start = offsets[index];
     char* res = new char[size];
     res[size-1] = '\0';
     memcpy(res, &data[start], size-1);
@@ -367,23 +823,26 @@ char* getitem_string_array(uint32_t *offsets, char *data, int64_t index)
     return res;
 }
 
-void* getitem_string_array_std(uint32_t *offsets, char *data, int64_t index)
+void* getitem_string_array_std(offset_t *offsets, char *data, int64_t index)
 {
     // printf("getitem string arr index: %d offsets: %d %d", index,
     //                                  offsets[index], offsets[index+1]);
-    uint32_t size = offsets[index+1]-offsets[index];
-    uint32_t start = offsets[index];
+    offset_t size = offsets[index+1]-offsets[index];
+    offset_t start = offsets[index];
     return new std::string(&data[start], size);
 }
 
 void* compile_regex(std::string* pat)
 {
-    // printf("compiling\n");
-    // regex rr2("3");
-    // printf("1 compiling\n");
-    // regex * rr = new regex(*pat);
-    // printf("done compiling\n");
-    return new regex(*pat);
+    // compiled patterns are cached since construction is expensive and
+    // the same pattern is usually compiled in every call of a function
+    static std::unordered_map<std::string, regex*> regex_cache;
+    auto it = regex_cache.find(*pat);
+    if (it != regex_cache.end())
+        return it->second;
+    regex* e = new regex(*pat, regex::ECMAScript | regex::optimize);
+    regex_cache[*pat] = e;
+    return e;
 }
 
 bool str_contains_regex(std::string* str, regex* e)
@@ -442,69 +901,181 @@ void* str_from_float64(double in)
 #define PyString_FromStringAndSize(str, sz) PyUnicode_FromStringAndSize(str, sz)
 #endif
 
-/// @brief create a concatenated string and offset table from a pandas series of strings
-/// @note strings in returned buffer will not be 0-terminated.
-/// @param[out] buffer newly allocated buffer with concatenated strings, or NULL
-/// @param[out] no_strings number of strings concatenated, value < 0 indicates an error
-/// @param[out] offset_table newly allocated array of no_strings+1 integers
-///                          first no_strings entries denote offsets, last entry indicates size of output array
-/// @param[in]  obj Python Sequence object, intended to be a pandas series of string
-void string_array_from_sequence(PyObject * obj, int64_t * no_strings, uint32_t ** offset_table, char ** buffer)
+// string column prepared for copying into a string array. Element pointers
+// and offsets of object arrays are collected with the GIL held, characters
+// of all kinds of columns are copied without it.
+struct str_col_src
 {
-#define CHECK(expr, msg) if(!(expr)){std::cerr << msg << std::endl; PyGILState_Release(gilstate); return;}
-
-    auto gilstate = PyGILState_Ensure();
+    int64_t kind;  // 0: object array, 1: offsets and data buffers,
+                   // 2: offsets and data of categories and codes
+    int64_t n;
+    PyObject* owner;  // keeps arrays and string objects alive
+    std::vector<const char*> ptrs;
+    const offset_t* src_offsets;
+    const char* src_data;
+    const int64_t* codes;
+    offset_t* offsets;
+    char* data;
+};
 
-    *no_strings = -1;
-    *offset_table = NULL;
-    *buffer = NULL;
+static bool prepare_str_col(PyObject* obj, str_col_src* col)
+{
+    // get_str_col_buffers normalizes Series, Arrow-backed and categorical
+    // columns, see str_arr_ext.py
+    PyObject* mod = PyImport_ImportModule("hpat.str_arr_ext");
+    if (mod == NULL)
+        return false;
+    PyObject* res = PyObject_CallMethod(mod, "get_str_col_buffers", "O", obj);
+    Py_DECREF(mod);
+    if (res == NULL)
+        return false;
+    col->owner = res;
+    col->kind = PyLong_AsLongLong(PyTuple_GET_ITEM(res, 0));
+    PyArrayObject* arr1 = (PyArrayObject*)PyTuple_GET_ITEM(res, 1);
+
+    if (col->kind == 0) {
+        // first pass over objects: UTF-8 pointers (cached in the objects)
+        // and offsets
+        int64_t n = PyArray_SIZE(arr1);
+        PyObject** objs = (PyObject**)PyArray_DATA(arr1);
+        col->n = n;
+        col->ptrs.resize(n);
+        col->offsets = new offset_t[n+1];
+        offset_t len = 0;
+        for (int64_t i = 0; i < n; i++) {
+            col->offsets[i] = len;
+            if (!PyUnicode_Check(objs[i])) {
+                PyErr_SetString(PyExc_TypeError, "expecting a string");
+                return false;
+            }
+            Py_ssize_t s_len;
+            col->ptrs[i] = PyUnicode_AsUTF8AndSize(objs[i], &s_len);
+            if (col->ptrs[i] == NULL)
+                return false;
+            len += s_len;
+        }
+        col->offsets[n] = len;
+        return true;
+    }
 
-    CHECK(PySequence_Check(obj), "expecting a PySequence");
-    CHECK(no_strings && offset_table && buffer, "output arguments must not be NULL");
+    PyArrayObject* arr2 = (PyArrayObject*)PyTuple_GET_ITEM(res, 2);
+    col->src_offsets = (const offset_t*)PyArray_DATA(arr1);
+    col->src_data = (const char*)PyArray_DATA(arr2);
+    if (col->kind == 1) {
+        col->n = PyArray_SIZE(arr1) - 1;
+    }
+    else {
+        PyArrayObject* arr3 = (PyArrayObject*)PyTuple_GET_ITEM(res, 3);
+        col->codes = (const int64_t*)PyArray_DATA(arr3);
+        col->n = PyArray_SIZE(arr3);
+    }
+    return true;
+}
 
-    Py_ssize_t n = PyObject_Size(obj);
-    if(n == 0 ) {
-        // empty sequence, this is not an error, need to set size
-        PyGILState_Release(gilstate);
-        no_strings = 0;
-        return;
+static void fill_str_col(str_col_src* col)
+{
+    int64_t n = col->n;
+    if (col->kind == 0) {
+        col->data = new char[col->offsets[n]];
+        for (int64_t i = 0; i < n; i++)
+            memcpy(col->data + col->offsets[i], col->ptrs[i],
+                   col->offsets[i+1] - col->offsets[i]);
+    }
+    else if (col->kind == 1) {
+        col->offsets = new offset_t[n+1];
+        memcpy(col->offsets, col->src_offsets, (n+1) * sizeof(offset_t));
+        col->data = new char[col->offsets[n]];
+        memcpy(col->data, col->src_data, col->offsets[n]);
     }
+    else {
+        // offsets from category lengths, then characters
+        // (negative codes are missing values, stored as empty strings)
+        col->offsets = new offset_t[n+1];
+        offset_t len = 0;
+        for (int64_t i = 0; i < n; i++) {
+            col->offsets[i] = len;
+            int64_t c = col->codes[i];
+            if (c >= 0)
+                len += col->src_offsets[c+1] - col->src_offsets[c];
+        }
+        col->offsets[n] = len;
+        col->data = new char[len];
+        for (int64_t i = 0; i < n; i++) {
+            int64_t c = col->codes[i];
+            if (c >= 0)
+                memcpy(col->data + col->offsets[i],
+                       col->src_data + col->src_offsets[c],
+                       col->offsets[i+1] - col->offsets[i]);
+        }
+    }
+}
 
-    // if obj is a pd.Series, get the numpy array for better performance
-    // TODO: check actual Series class
-    if (PyObject_HasAttrString(obj, "values"))
-    {
-        obj = PyObject_GetAttrString(obj, "values");
+static void fill_str_cols(std::vector<str_col_src>& cols)
+{
+    // one column per thread at a time
+    size_t n_threads = std::min<size_t>(cols.size(),
+                            std::max(1u, std::thread::hardware_concurrency()));
+    std::atomic<size_t> next(0);
+    auto worker = [&cols, &next]() {
+        size_t i;
+        while ((i = next++) < cols.size())
+            fill_str_col(&cols[i]);
+    };
+    std::vector<std::thread> threads;
+    for (size_t t = 1; t < n_threads; t++)
+        threads.emplace_back(worker);
+    worker();
+    for (auto& t : threads)
+        t.join();
+}
+
+/// @brief  Create StringArrays from string columns (Series or arrays of
+/// str objects, Arrow-backed string arrays or categoricals of strings).
+/// Characters of all columns are copied in parallel with the GIL released.
+/// On error, a Python exception is set and outputs are empty arrays.
+/// @param[in] objs columns
+/// @param[in] n_cols number of columns
+/// @param[out] no_strings number of strings of every column
+/// @param[out] offset_tables offsets of every column
+/// @param[out] buffers characters of every column
+void string_arrays_from_sequences(PyObject ** objs, int64_t n_cols,
+                                  int64_t * no_strings,
+                                  offset_t ** offset_tables, char ** buffers)
+{
+    auto gilstate = PyGILState_Ensure();
+
+    std::vector<str_col_src> cols(n_cols);
+    bool ok = true;
+    for (int64_t i = 0; i < n_cols; i++) {
+        cols[i].owner = NULL;
+        cols[i].offsets = NULL;
+        cols[i].data = NULL;
+        if (ok)
+            ok = prepare_str_col(objs[i], &cols[i]);
     }
 
-    uint32_t * offsets = new uint32_t[n+1];
-    std::vector<const char *> tmp_store(n);
-    size_t len = 0;
-    for(Py_ssize_t i = 0; i < n; ++i) {
-        offsets[i] = len;
-        PyObject * s = PySequence_GetItem(obj, i);
-        CHECK(s, "getting element failed");
-        CHECK(PyString_Check(s), "expecting a string");
-        tmp_store[i] = PyString_AsString(s);
-        CHECK(tmp_store[i], "string conversion failed");
-        len += strlen(tmp_store[i]);
-        Py_DECREF(s);
+    if (ok) {
+        Py_BEGIN_ALLOW_THREADS
+        fill_str_cols(cols);
+        Py_END_ALLOW_THREADS
     }
-    offsets[n] = len;
 
-    char * outbuf = new char[len];
-    for(Py_ssize_t i = 0; i < n; ++i) {
-        memcpy(outbuf+offsets[i], tmp_store[i], offsets[i+1]-offsets[i]);
+    for (int64_t i = 0; i < n_cols; i++) {
+        Py_XDECREF(cols[i].owner);
+        if (!ok) {
+            delete[] cols[i].offsets;
+            delete[] cols[i].data;
+            cols[i].n = 0;
+            cols[i].offsets = new offset_t[1];
+            cols[i].offsets[0] = 0;
+            cols[i].data = new char[0];
+        }
+        no_strings[i] = cols[i].n;
+        offset_tables[i] = cols[i].offsets;
+        buffers[i] = cols[i].data;
     }
 
     PyGILState_Release(gilstate);
-
-    *offset_table = offsets;
-    *no_strings = n;
-    *buffer = outbuf;
-
-    return;
-#undef CHECK
 }
 
 /// @brief  From a StringArray create a numpy array of string objects
@@ -512,7 +1083,7 @@ void string_array_from_sequence(PyObject * obj, int64_t * no_strings, uint32_t *
 /// @param[in] no_strings number of strings found in buffer
 /// @param[in] offset_table offsets for strings in buffer
 /// @param[in] buffer with concatenated strings (from StringArray)
-void* np_array_from_string_array(int64_t no_strings, uint32_t * offset_table, char * buffer)
+void* np_array_from_string_array(int64_t no_strings, offset_t * offset_table, char * buffer)
 {
 #define CHECK(expr, msg) if(!(expr)){std::cerr << msg << std::endl; PyGILState_Release(gilstate); return NULL;}
     auto gilstate = PyGILState_Ensure();
@@ -537,7 +1108,7 @@ void* np_array_from_string_array(int64_t no_strings, uint32_t * offset_table, ch
 }
 
 // glob support
-void c_glob(uint32_t **offsets, char **data, int64_t* num_strings,
+void c_glob(offset_t **offsets, char **data, int64_t* num_strings,
                                                             std::string* path)
 {
     // std::cout << "glob: " << *path << std::endl;
@@ -558,16 +1129,16 @@ void c_glob(uint32_t **offsets, char **data, int64_t* num_strings,
     }
 
     *num_strings = globBuf.gl_pathc;
-    *offsets = new uint32_t[globBuf.gl_pathc+1];
+    *offsets = new offset_t[globBuf.gl_pathc+1];
     size_t total_size = 0;
 
     for (unsigned int i=0; i<globBuf.gl_pathc; i++)
     {
-        (*offsets)[i] = (uint32_t)total_size;
+        (*offsets)[i] = (offset_t)total_size;
         size_t curr_size = strlen(globBuf.gl_pathv[i]);
         total_size += curr_size;
     }
-    (*offsets)[globBuf.gl_pathc] = (uint32_t) total_size;
+    (*offsets)[globBuf.gl_pathc] = (offset_t) total_size;
 
     *data = new char[total_size];
     for (unsigned int i=0; i<globBuf.gl_pathc; i++)
@@ -17,10 +17,10 @@ void read_xenon_col_parallel(xe_connection_t xe_connection, xe_dataset_t xe_data
                     uint64_t col_id, uint8_t* arr, uint64_t* xe_typ_enums,
                     uint64_t start, uint64_t count);
 void read_xenon_col_str(xe_connection_t xe_connection, xe_dataset_t xe_dataset,
-                        uint64_t col_id, uint32_t **out_offsets,
+                        uint64_t col_id, uint64_t **out_offsets,
                         uint8_t **out_data, uint64_t* xe_typ_enums);
 void read_xenon_col_str_parallel(xe_connection_t xe_connection, xe_dataset_t xe_dataset,
-                        uint64_t col_id, uint32_t **out_offsets,
+                        uint64_t col_id, uint64_t **out_offsets,
                         uint8_t **out_data, uint64_t* xe_typ_enums,
                         uint64_t start, uint64_t count);
 
@@ -248,7 +248,7 @@ void read_xenon_col_parallel(xe_connection_t xe_connection, xe_dataset_t xe_data
 }
 
 void read_xenon_col_str(xe_connection_t xe_connection, xe_dataset_t xe_dataset,
-                        uint64_t col_id, uint32_t **out_offsets,
+                        uint64_t col_id, uint64_t **out_offsets,
                         uint8_t **out_data, uint64_t* xe_typ_enums)
 {
 #define CHECK(expr, msg) if(!(expr)){std::cerr << msg << std::endl; return;}
@@ -268,9 +268,9 @@ void read_xenon_col_str(xe_connection_t xe_connection, xe_dataset_t xe_dataset,
     //                             'float32': 4, 'float64': 5, 'DECIMAL': 6,
     //                              'bool_': 7, 'string': 8, 'BLOB': 9}
 
-    *out_offsets = new uint32_t[status.nrows+1];
-    uint32_t* curr_offset = *out_offsets;
-    uint32_t curr_len = 0;
+    *out_offsets = new uint64_t[status.nrows+1];
+    uint64_t* curr_offset = *out_offsets;
+    uint64_t curr_len = 0;
     std::vector<uint8_t> data_vec;
 
     uint8_t *data_arr = (uint8_t *) malloc(READ_BUF_SIZE * sizeof(uint8_t));
@@ -313,7 +313,7 @@ void read_xenon_col_str(xe_connection_t xe_connection, xe_dataset_t xe_dataset,
 }
 
 void read_xenon_col_str_parallel(xe_connection_t xe_connection, xe_dataset_t xe_dataset,
-                        uint64_t col_id, uint32_t **out_offsets,
+                        uint64_t col_id, uint64_t **out_offsets,
                         uint8_t **out_data, uint64_t* xe_typ_enums,
                         uint64_t start, uint64_t count)
 {
@@ -340,9 +340,9 @@ void read_xenon_col_str_parallel(xe_connection_t xe_connection, xe_dataset_t xe_
     //                             'float32': 4, 'float64': 5, 'DECIMAL': 6,
     //                              'bool_': 7, 'string': 8, 'BLOB': 9}
 
-    *out_offsets = new uint32_t[count+1];
-    uint32_t* curr_offset = *out_offsets;
-    uint32_t curr_len = 0;
+    *out_offsets = new uint64_t[count+1];
+    uint64_t* curr_offset = *out_offsets;
+    uint64_t curr_len = 0;
     std::vector<uint8_t> data_vec;
 
     uint8_t *data_arr = (uint8_t *) malloc(READ_BUF_SIZE * sizeof(uint8_t));
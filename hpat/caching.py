@@ -0,0 +1,165 @@
+from __future__ import print_function, division, absolute_import
+
+import numba
+from numba import compiler
+from numba.caching import FunctionCache, CompileResultCacheImpl
+import hpat
+from hpat import config, distributed_api
+from hpat.distributed_api import MPI_ROOT
+
+
+@numba.njit(cache=True)
+def _get_rank():  # pragma: no cover
+    return distributed_api.get_rank()
+
+
+@numba.njit(cache=True)
+def _bcast_status(status):  # pragma: no cover
+    return distributed_api.bcast_scalar(status)
+
+
+# compile status of root rank sent to the other ranks
+_STATUS_SAVED = 1  # result is in the cache (loaded or saved by root)
+_STATUS_FAILED = 0  # root failed to compile, other ranks compile themselves
+
+
+def _load_hdf5():
+    import hpat.pio_lower
+
+def _load_file_io():
+    hpat.io.register_file_io_symbols()
+
+def _load_parquet():
+    hpat.parquet_pio.register_parquet_symbols()
+
+def _load_ros():
+    import hpat.ros
+
+def _load_opencv():
+    import hpat.cv_ext
+
+def _load_xenon():
+    import hpat.xenon_ext
+    hpat.xenon_ext.register_xenon_symbols()
+
+# optional backend -> (availability, native symbol prefixes, loader)
+_native_backends = {
+    'hdf5': (config._has_h5py, ('hpat_h5_', 'h5g_'), _load_hdf5),
+    'file_io': (config._has_h5py, ('get_file_size', 'file_read', 'file_write'),
+                _load_file_io),
+    'parquet': (config._has_pyarrow,
+                ('pq_', 'get_arrow_readers', 'del_arrow_readers'),
+                _load_parquet),
+    'ros': (config._has_ros, ('open_bag', 'get_msg_count', 'get_image_dims',
+                              'read_images'), _load_ros),
+    'opencv': (config._has_opencv, ('cv_',), _load_opencv),
+    'xenon': (config._has_xenon, ('c_read_xenon', 'get_column_size_xenon',
+                                  'c_xe_'), _load_xenon),
+}
+
+
+def get_native_backends(library):
+    """optional backends with native symbols referenced in compiled library
+    """
+    declared = set(f.name for f in library._final_module.functions
+                   if f.is_declaration)
+    backends = []
+    for name, (available, prefixes, _) in _native_backends.items():
+        if available and any(s.startswith(prefixes) for s in declared):
+            backends.append(name)
+    return backends
+
+
+def ensure_native_symbols(backends):
+    """register C symbols of backends before linking cached object code,
+    since the passes that normally register them don't run when loading from
+    cache (native modules of optional backends are loaded lazily)
+    """
+    for name in backends:
+        _native_backends[name][2]()
+
+
+class HPATCacheImpl(CompileResultCacheImpl):
+    """store optional backends used along with the compile result
+    """
+    def reduce(self, cres):
+        return (get_native_backends(cres.library), cres._reduce())
+
+    def rebuild(self, target_context, payload):
+        backends, reduced = payload
+        ensure_native_symbols(backends)
+        return compiler.CompileResult._rebuild(target_context, *reduced)
+
+
+def get_options_key(_locals):
+    """key for jit options that change the generated code (locals, pivots and
+    distribution flags). The locals dict is modified by the passes so it has
+    to be taken before compilation.
+    """
+    return tuple(sorted((k, repr(v)) for k, v in _locals.items()))
+
+
+class HPATCache(FunctionCache):
+    """Numba's function cache extended with HPAT version, jit options and
+    global modes that change the generated code in the index key. Root rank
+    compiles and saves first while other ranks wait for it, so that only one
+    process compiles a new signature.
+    """
+    _impl_class = HPATCacheImpl
+
+    def __init__(self, py_func, options_key):
+        super(HPATCache, self).__init__(py_func)
+        self._options_key = options_key
+        self._root_pending = False
+
+    def _index_key(self, sig, codegen):
+        key = super(HPATCache, self)._index_key(sig, codegen)
+        return key + (hpat.__version__, self._options_key,
+                      hpat.instrument_mode, hpat.trace_mode,
+                      config._box_str_arrow, config._box_date_dt64)
+
+    def load_overload(self, sig, target_context):
+        # root sends the status exactly once per signature: after load hit,
+        # after save, or after a failed compile (see end_compile).
+        # Other ranks wait for it before loading.
+        if _get_rank() != MPI_ROOT:
+            if _bcast_status(_STATUS_FAILED) == _STATUS_FAILED:
+                return None
+            return super(HPATCache, self).load_overload(sig, target_context)
+        data = super(HPATCache, self).load_overload(sig, target_context)
+        if data is None:
+            self._root_pending = True
+        else:
+            _bcast_status(_STATUS_SAVED)
+        return data
+
+    def save_overload(self, sig, data):
+        # other ranks only compile if root's result was not cachable
+        if _get_rank() == MPI_ROOT:
+            try:
+                super(HPATCache, self).save_overload(sig, data)
+            finally:
+                self._root_pending = False
+                _bcast_status(_STATUS_SAVED)
+
+    def end_compile(self):
+        """release waiting ranks if root's compilation raised an error
+        """
+        if self._root_pending:
+            self._root_pending = False
+            _bcast_status(_STATUS_FAILED)
+
+
+def enable_caching(dispatcher, _locals):
+    cache = HPATCache(dispatcher.py_func, get_options_key(_locals))
+    dispatcher._cache = cache
+    _compile = dispatcher.compile
+
+    def compile(sig):
+        try:
+            return _compile(sig)
+        finally:
+            cache.end_compile()
+
+    dispatcher.compile = compile
+    return dispatcher
@@ -0,0 +1,162 @@
+"""
+Compile-time profiler for HPATPipeline. Records wall time and IR size for
+every pipeline stage, and the time spent in compilations nested in the
+stages (compile_to_numba_ir, agg functions, sort kernels, nested HPAT
+functions). Times are exclusive: nested compilations are not counted in the
+stage (or nested compilation) that triggered them.
+Enabled by setting HPAT_PROFILE_COMPILE=1 or calling enable().
+"""
+from __future__ import print_function, division, absolute_import
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from numba.parfor import Parfor
+
+_enabled = os.environ.get('HPAT_PROFILE_COMPILE', '0') != '0'
+
+# function qualname -> list of (arg types, list of StageProfile) per compile
+compile_profiles = OrderedDict()
+
+# stages and nested compilations currently running, innermost last
+_frames = []
+
+
+class StageProfile(object):
+    def __init__(self, name):
+        self.name = name
+        # time excluding nested compilations
+        self.time = 0.0
+        self.total_time = 0.0
+        self.num_blocks = 0
+        self.num_stmts = 0
+        self.num_parfors = 0
+        # kind -> [count, time]
+        self.nested = OrderedDict()
+
+    def add_nested(self, kind, t):
+        rec = self.nested.setdefault(kind, [0, 0.0])
+        rec[0] += 1
+        rec[1] += t
+
+    def __repr__(self):  # pragma: no cover
+        return "StageProfile({}, {:.4f}s)".format(self.name, self.time)
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    compile_profiles.clear()
+
+
+def get_ir_size(blocks):
+    """number of blocks, statements and parfors (including parfor bodies)
+    """
+    num_blocks = num_stmts = num_parfors = 0
+    for block in blocks.values():
+        num_blocks += 1
+        for stmt in block.body:
+            num_stmts += 1
+            if isinstance(stmt, Parfor):
+                num_parfors += 1
+                num_stmts += len(stmt.init_block.body)
+                b, s, p = get_ir_size(stmt.loop_body)
+                num_blocks += b
+                num_stmts += s
+                num_parfors += p
+    return num_blocks, num_stmts, num_parfors
+
+
+class _Frame(object):
+    def __init__(self, stage):
+        self.stage = stage
+        self.child_time = 0.0
+        self.t0 = time.time()
+
+    def end(self):
+        """pop the frame and return its total and exclusive times
+        """
+        _frames.pop()
+        total = time.time() - self.t0
+        if _frames:
+            _frames[-1].child_time += total
+        return total, total - self.child_time
+
+
+@contextmanager
+def nested(kind):
+    """time a compilation of 'kind' nested in the running stage
+    """
+    if not _frames:
+        yield
+        return
+    frame = _Frame(_frames[-1].stage)
+    _frames.append(frame)
+    try:
+        yield
+    finally:
+        _, exclusive = frame.end()
+        frame.stage.add_nested(kind, exclusive)
+
+
+def add_stage_profiling(pm, pipeline):
+    """replace stages of current pipeline in pm with timed versions
+    """
+    name = pm.pipeline_order[-1]
+    profiles = []
+    fname = pipeline.func_id.func_qualname
+    compile_profiles.setdefault(fname, []).append((pipeline.args, profiles))
+    pm.pipeline_stages[name] = [
+        (_timed_stage(func, desc, pipeline, profiles), desc)
+        for func, desc in pm.pipeline_stages[name]]
+
+
+def _timed_stage(func, desc, pipeline, profiles):
+    def stage():
+        prof = StageProfile(desc)
+        profiles.append(prof)
+        # stages of a nested HPAT compilation are reported for their own
+        # function and recorded as nested in the outer stage
+        outer = _frames[-1].stage if _frames else None
+        frame = _Frame(prof)
+        _frames.append(frame)
+        try:
+            return func()
+        finally:
+            prof.total_time, prof.time = frame.end()
+            if outer is not None:
+                outer.add_nested('HPAT compile', prof.time)
+            if pipeline.func_ir is not None:
+                (prof.num_blocks, prof.num_stmts,
+                    prof.num_parfors) = get_ir_size(pipeline.func_ir.blocks)
+    return stage
+
+
+def compile_report():
+    """print per-stage compile time and IR size of profiled functions
+    """
+    for fname, compiles in compile_profiles.items():
+        for args, profiles in compiles:
+            total = sum(p.time for p in profiles)
+            print("{}{}: {:.3f}s".format(fname, args, total))
+            print("   {:40} {:>9} {:>7} {:>7} {:>7}".format(
+                "stage", "time(s)", "blocks", "stmts", "parfors"))
+            for p in profiles:
+                print("   {:40} {:9.3f} {:7} {:7} {:7}".format(
+                    p.name, p.time, p.num_blocks, p.num_stmts,
+                    p.num_parfors))
+                for kind, (count, t) in p.nested.items():
+                    print("      {:37} {:9.3f} (x{})".format(kind, t, count))
@@ -10,9 +10,7 @@ from numba import ir_utils, ir, postproc
 from numba.targets.registry import CPUDispatcher
 from numba.ir_utils import guard, get_definition
 from numba.inline_closurecall import inline_closure_call, InlineClosureCallPass
-from hpat import config
-if config._has_h5py:
-    from hpat import pio
+from hpat import config, compile_profiler
 
 # this is for previous version of pipeline manipulation (numba hpat_req <0.38)
 # def stage_io_pass(pipeline):
@@ -138,6 +136,7 @@ class HPATPipeline(numba.compiler.BasePipeline):
         self.add_preprocessing_stage(pm)
         self.add_pre_typing_stage(pm)
         pm.add_stage(self.stage_inline_pass, "inline funcs")
+        pm.add_stage(self.stage_load_extensions, "load optional extensions")
         pm.add_stage(self.stage_df_pass, "convert DataFrames")
         pm.add_stage(self.stage_io_pass, "replace IO calls")
         # repeat inline closure pass to inline df stencils
@@ -160,6 +159,8 @@ class HPATPipeline(numba.compiler.BasePipeline):
         pm.add_stage(self.stage_distributed_pass, "convert to distributed")
         self.add_lowering_stage(pm)
         self.add_cleanup_stage(pm)
+        if compile_profiler.is_enabled():
+            compile_profiler.add_stage_profiling(pm, self)
 
     def stage_inline_pass(self):
         """
@@ -170,6 +171,15 @@ class HPATPipeline(numba.compiler.BasePipeline):
         inline_calls(self.func_ir)
 
 
+    def stage_load_extensions(self):
+        """
+        Load extensions of optional backends used in the function
+        (e.g. h5py, cv2) before typing since they are not imported with hpat
+        """
+        assert self.func_ir
+        self.loaded_extensions = config.load_extensions(self.func_ir)
+
+
     def stage_df_pass(self):
         """
         Convert DataFrame calls
@@ -187,7 +197,8 @@ class HPATPipeline(numba.compiler.BasePipeline):
         """
         # Ensure we have an IR and type information.
         assert self.func_ir
-        if config._has_h5py:
+        if 'h5py' in self.loaded_extensions:
+            from hpat import pio
             io_pass = pio.PIO(self.func_ir, self.locals)
             io_pass.run()
 
@@ -1,36 +1,76 @@
-try:
-    import hio
-except ImportError:
-    _has_h5py = False
-else:
-    _has_h5py = True
-
-try:
-    import pyarrow
-except ImportError:
-    _has_pyarrow = False
-else:
-    _has_pyarrow = True
-
-try:
-    import ros_cpp
-except ImportError:
-    _has_ros = False
-else:
-    _has_ros = True
-
-try:
-    import cv_wrapper
-except ImportError:
-    _has_opencv = False
-else:
-    _has_opencv = True
-    import hpat.cv_ext
-
-try:
-    import hxe_ext
-except ImportError:
-    _has_xenon = False
-else:
-    _has_xenon = True
-    import hpat.xenon_ext
+import importlib
+import importlib.util
+import os
+import sys
+
+# availability of optional backends is checked without importing them since
+# some (e.g. pyarrow, hdf5) are slow to load. Their HPAT extension modules are
+# loaded when a compiled function references them (see load_extensions).
+
+
+def _is_available(mod_name):
+    return importlib.util.find_spec(mod_name) is not None
+
+
+_has_h5py = _is_available('hio')
+_has_pyarrow = _is_available('pyarrow')
+_has_ros = _is_available('ros_cpp')
+_has_opencv = _is_available('cv_wrapper')
+_has_xenon = _is_available('hxe_ext')
+
+# box string arrays as Arrow-backed pandas arrays that share the offsets and
+# data buffers instead of object arrays (set HPAT_BOX_STR_ARROW=1 or this flag
+# before compilation)
+_box_str_arrow = (_has_pyarrow
+                  and os.environ.get('HPAT_BOX_STR_ARROW', '0') != '0')
+
+# box datetime.date arrays as datetime64[D] arrays instead of object arrays
+# of datetime.date (set HPAT_BOX_DATE_DT64=1 or this flag before compilation)
+_box_date_dt64 = os.environ.get('HPAT_BOX_DATE_DT64', '0') != '0'
+
+# top-level Python module used in user code -> (availability, HPAT extension)
+# parquet, ros and xenon calls are handled in HiFrames which loads their
+# native modules on first use. The xenon extension provides hpat.read_xenon
+# etc. and is imported on first access of these attributes.
+_ext_modules = {
+    'h5py': (_has_h5py, 'hpat.pio'),
+    'cv2': (_has_opencv, 'hpat.cv_ext'),
+    'xenon': (_has_xenon, 'hpat.xenon_ext'),
+}
+
+
+def load_extension(name):
+    """import extension module for backend 'name' if available
+    """
+    available, ext_mod = _ext_modules[name]
+    if not available:
+        return None
+    return importlib.import_module(ext_mod)
+
+
+def _get_global_module(val):
+    if type(val) is type(sys):
+        return val.__name__
+    return getattr(val, '__module__', None)
+
+
+def load_extensions(func_ir):
+    """load the extensions of optional backends referenced in func_ir
+    before typing, and return their names
+    """
+    from numba import ir
+    loaded = set()
+    for block in func_ir.blocks.values():
+        for stmt in block.body:
+            if not (isinstance(stmt, ir.Assign)
+                    and isinstance(stmt.value, (ir.Global, ir.FreeVar))):
+                continue
+            mod_name = _get_global_module(stmt.value.value)
+            if not isinstance(mod_name, str):
+                continue
+            for name in _ext_modules:
+                if ((mod_name == name or mod_name.startswith(name + '.'))
+                        and name not in loaded):
+                    if load_extension(name) is not None:
+                        loaded.add(name)
+    return loaded
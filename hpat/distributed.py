@@ -1,6 +1,7 @@
 from __future__ import print_function, division, absolute_import
 
 import types as pytypes  # avoid confusion with numba.types
+import os
 import copy
 import warnings
 import numba
@@ -10,7 +11,7 @@ from numba.ir_utils import (mk_unique_var, replace_vars_inner, find_topo_order,
                             dprint_func_ir, remove_dead, mk_alloc,
                             get_global_func_typ, find_op_typ, get_name_var_table,
                             get_call_table, get_tuple_table, remove_dels,
-                            compile_to_numba_ir, replace_arg_nodes,
+                            replace_arg_nodes,
                             guard, get_definition, require, GuardException,
                             find_callname, build_definitions)
 from numba.typing import signature
@@ -23,7 +24,7 @@ import hpat
 from hpat import (distributed_api,
                   distributed_lower)  # import lower for module initialization
 from hpat.str_ext import string_type
-from hpat.str_arr_ext import string_array_type
+from hpat.str_arr_ext import string_array_type, dict_str_arr_type
 from hpat.distributed_analysis import (Distribution,
                                        DistributedAnalysis,
                                        get_stencil_accesses)
@@ -32,10 +33,19 @@ import hpat.utils
 from hpat.utils import (get_definitions, is_alloc_callname, is_whole_slice,
                         get_slice_step, is_array, is_np_array, find_build_tuple,
                         debug_prints)
+from hpat.utils import compile_to_numba_ir
 from hpat.distributed_api import Reduce_Type
 
 distributed_run_extensions = {}
 
+# I/O calls timed in hpat.instrument_mode and hpat.trace_mode
+_instrumented_io_calls = {('h5read', 'hpat.pio_api'),
+                          ('h5write', 'hpat.pio_api'),
+                          ('read_parquet', 'hpat.parquet_pio'),
+                          ('read_parquet_str', 'hpat.parquet_pio'),
+                          ('read_parquet_str_dict', 'hpat.parquet_pio'),
+                          ('file_read', 'hpat.io')}
+
 # analysis data for debugging
 dist_analysis = None
 fir_text = None
@@ -121,8 +131,12 @@ class DistributedPass(object):
             for inst in blocks[label].body:
                 if type(inst) in distributed_run_extensions:
                     f = distributed_run_extensions[type(inst)]
-                    new_body += f(inst, self._dist_analysis.array_dists,
+                    out_nodes = f(inst, self._dist_analysis.array_dists,
                                   self.typemap, self.calltypes, self.typingctx, self.targetctx)
+                    if hpat.instrument_mode or hpat.trace_mode:
+                        out_nodes = self._instrument_nodes(
+                            type(inst).__name__, inst.loc, out_nodes)
+                    new_body += out_nodes
                     continue
                 if isinstance(inst, Parfor):
                     new_body += self._run_parfor(inst, namevar_table)
@@ -137,11 +151,20 @@ class DistributedPass(object):
                     rhs = inst.value
                     if isinstance(rhs, ir.Expr):
                         if rhs.op == 'call':
-                            new_body += self._run_call(inst)
+                            fdef = guard(find_callname, self.func_ir, rhs)
+                            out_nodes = self._run_call(inst)
+                            if ((hpat.instrument_mode or hpat.trace_mode)
+                                    and fdef in _instrumented_io_calls):
+                                out_nodes = self._instrument_nodes(
+                                    fdef[0], inst.loc, out_nodes)
+                            new_body += out_nodes
                             continue
                         # we save array start/count for data pointer to enable
                         # file read
-                        if (rhs.op == 'getattr' and rhs.attr == 'ctypes'
+                        # codes of dictionary-encoded arrays are divided
+                        # like the array
+                        if (rhs.op == 'getattr'
+                                and rhs.attr in ('ctypes', 'codes')
                                 and (self._is_1D_arr(rhs.value.name))):
                             arr_name = rhs.value.name
                             self._array_starts[lhs] = self._array_starts[arr_name]
@@ -236,6 +259,29 @@ class DistributedPass(object):
 
         return blocks
 
+    def _instrument_nodes(self, op_name, loc, out_nodes):
+        """time output nodes of an operator in runtime op stats and trace"""
+        name = "{} ({}:{})".format(op_name, os.path.basename(loc.filename),
+                                   loc.line)
+        begin_func = distributed_api.op_stats_begin_named(name)
+
+        def f():  # pragma: no cover
+            op_id = begin_func()
+        f_block = compile_to_numba_ir(f, {'begin_func': begin_func},
+                                      self.typingctx, (), self.typemap,
+                                      self.calltypes).blocks.popitem()[1]
+        begin_nodes = f_block.body[:-3]  # remove none return
+        op_id_var = begin_nodes[-1].target
+
+        def f(op_id):  # pragma: no cover
+            hpat.distributed_api.op_stats_end(op_id)
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}, self.typingctx,
+                                      (types.int32,), self.typemap,
+                                      self.calltypes).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [op_id_var])
+        end_nodes = f_block.body[:-3]  # remove none return
+        return begin_nodes + out_nodes + end_nodes
+
     def _gen_1D_Var_len(self, arr):
         def f(A, op):  # pragma: no cover
             c = len(A)
@@ -354,6 +400,20 @@ class DistributedPass(object):
         size_assign = ir.Assign(size_call, size_var, loc)
         self._size_var = size_var
         out += [size_attr_assign, size_assign]
+        if hpat.instrument_mode:
+            def f():  # pragma: no cover
+                hpat.distributed_api.op_stats_set_enabled(np.int32(1))
+            f_block = compile_to_numba_ir(f, {'hpat': hpat, 'np': np},
+                                          self.typingctx, (), self.typemap,
+                                          self.calltypes).blocks.popitem()[1]
+            out += f_block.body[:-3]  # remove none return
+        if hpat.trace_mode:
+            def f():  # pragma: no cover
+                hpat.distributed_api.op_trace_start()
+            f_block = compile_to_numba_ir(f, {'hpat': hpat}, self.typingctx,
+                                          (), self.typemap,
+                                          self.calltypes).blocks.popitem()[1]
+            out += f_block.body[:-3]  # remove none return
         first_block.body = out + first_block.body
 
     def _run_call(self, assign):
@@ -424,6 +484,85 @@ class DistributedPass(object):
             out[-1].target = assign.target
             self.oneDVar_len_vars[assign.target.name] = arr_var
 
+        if (func_mod == 'hpat.hiframes_rolling'
+                and (func_name.startswith(('roll_fixed_', 'roll_offset_',
+                                           'ewm_'))
+                     or func_name in ['shift_fixed', 'pct_change_fixed',
+                                      'group_shift', 'group_diff'])
+                and (self._is_1D_arr(rhs.args[0].name)
+                     or self._is_1D_Var_arr(rhs.args[0].name))):
+            # kernel exchanges window halos or scan states with other processes
+            in_arr = rhs.args[0].name
+            if self._is_1D_arr(in_arr):
+                self._array_starts[lhs] = self._array_starts[in_arr]
+                self._array_counts[lhs] = self._array_counts[in_arr]
+                self._array_sizes[lhs] = self._array_sizes[in_arr]
+            parallel_var = ir.Var(scope, mk_unique_var("$rolling_parallel"), loc)
+            self.typemap[parallel_var.name] = types.boolean
+            out = [ir.Assign(ir.Const(True, loc), parallel_var, loc), assign]
+            # parallel flag is the last argument
+            rhs.args[-1] = parallel_var
+
+        if (func_mod == 'hpat.hiframes_stats'
+                and func_name in ['describe', 'quantiles', 'approx_quantile',
+                                  'group_approx_quantile', 'approx_nunique',
+                                  'group_approx_nunique']
+                and (self._is_1D_arr(rhs.args[0].name)
+                     or self._is_1D_Var_arr(rhs.args[0].name))):
+            # statistics are combined across processes
+            parallel_var = ir.Var(scope, mk_unique_var("$stats_parallel"), loc)
+            self.typemap[parallel_var.name] = types.boolean
+            out = [ir.Assign(ir.Const(True, loc), parallel_var, loc), assign]
+            rhs.args[-1] = parallel_var
+
+        if (func_mod == 'hpat.hiframes_unique'
+                and func_name in ['unique', 'value_counts', 'shuffle_by_hash',
+                                  'shuffled_first_occurrence', 'select_kept']
+                and (self._is_1D_arr(rhs.args[0].name)
+                     or self._is_1D_Var_arr(rhs.args[0].name))):
+            # values or rows are shuffled to processes owning their hash
+            parallel_var = ir.Var(scope, mk_unique_var("$unique_parallel"), loc)
+            self.typemap[parallel_var.name] = types.boolean
+            out = [ir.Assign(ir.Const(True, loc), parallel_var, loc), assign]
+            rhs.args[-1] = parallel_var
+
+        if (func_mod == 'hpat.hiframes_topk'
+                and func_name in ['select_topk', 'take_topk', 'group_topk']
+                and (self._is_1D_arr(rhs.args[0].name)
+                     or self._is_1D_Var_arr(rhs.args[0].name))):
+            # candidates are gathered to root or shuffled by key
+            parallel_var = ir.Var(scope, mk_unique_var("$topk_parallel"), loc)
+            self.typemap[parallel_var.name] = types.boolean
+            out = [ir.Assign(ir.Const(True, loc), parallel_var, loc), assign]
+            rhs.args[-1] = parallel_var
+
+        if (func_mod == 'hpat.hiframes_unique'
+                and func_name in ['hash_rows', 'first_occurrence']
+                and self._is_1D_arr(lhs)):
+            # output has one value per row of key arrays
+            in_arr = find_build_tuple(self.func_ir, rhs.args[-1])[0].name
+            self._array_starts[lhs] = self._array_starts[in_arr]
+            self._array_counts[lhs] = self._array_counts[in_arr]
+            self._array_sizes[lhs] = self._array_sizes[in_arr]
+
+        if (((func_mod == 'hpat.hiframes_str_match'
+                and func_name in ['str_match_literals', 'str_match_regex'])
+                or (func_mod == 'hpat.hiframes_str_methods'
+                    and func_name in ['str_case', 'str_len', 'str_strip',
+                                      'str_slice', 'str_split_get',
+                                      'str_replace'])
+                or (func_mod == 'hpat.hiframes_datetime'
+                    and func_name == 'parse_dt_str_arr')
+                or (func_mod == 'hpat.hiframes_dict_enc'
+                    and func_name in ['dict_encode_str_arr',
+                                      'decode_dict_str_arr']))
+                and self._is_1D_arr(lhs)):
+            # output has a value per element of string array
+            in_arr = rhs.args[0].name
+            self._array_starts[lhs] = self._array_starts[in_arr]
+            self._array_counts[lhs] = self._array_counts[in_arr]
+            self._array_sizes[lhs] = self._array_sizes[in_arr]
+
         if (hpat.config._has_h5py and (func_mod == 'hpat.pio_api'
                 and func_name in ['h5read', 'h5write'])
                 and self._is_1D_arr(rhs.args[6].name)):
@@ -470,7 +609,8 @@ class DistributedPass(object):
             out = f_block.body[:-2]
 
         if (hpat.config._has_pyarrow
-                and fdef == ('read_parquet_str', 'hpat.parquet_pio')
+                and fdef in [('read_parquet_str', 'hpat.parquet_pio'),
+                             ('read_parquet_str_dict', 'hpat.parquet_pio')]
                 and self._is_1D_arr(lhs)):
             arr = lhs
             size_var = rhs.args[2]
@@ -483,9 +623,14 @@ class DistributedPass(object):
             rhs.args[2] = start_var
             rhs.args.append(count_var)
 
-            def f(fname, cindex, start, count):  # pragma: no cover
-                return hpat.parquet_pio.read_parquet_str_parallel(fname, cindex,
-                                                                  start, count)
+            if func_name == 'read_parquet_str':
+                def f(fname, cindex, start, count):  # pragma: no cover
+                    return hpat.parquet_pio.read_parquet_str_parallel(fname, cindex,
+                                                                      start, count)
+            else:
+                def f(fname, cindex, start, count):  # pragma: no cover
+                    return hpat.parquet_pio.read_parquet_str_dict_parallel(
+                        fname, cindex, start, count)
 
             f_block = compile_to_numba_ir(f, {'hpat': hpat}, self.typingctx,
                                           (self.typemap[rhs.args[0].name], types.intp,
@@ -2082,7 +2227,7 @@ class DistributedPass(object):
         return vals_list
 
     def _get_arr_ndim(self, arrname):
-        if self.typemap[arrname] == string_array_type:
+        if self.typemap[arrname] in (string_array_type, dict_str_arr_type):
             return 1
         return self.typemap[arrname].ndim
 
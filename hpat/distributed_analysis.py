@@ -6,7 +6,7 @@ import warnings
 import numba
 from numba import ir, ir_utils, types
 from numba.ir_utils import (find_topo_order, guard, get_definition, require,
-                            find_callname, mk_unique_var, compile_to_numba_ir,
+                            find_callname, mk_unique_var,
                             replace_arg_nodes, build_definitions)
 from numba.parfor import Parfor
 from numba.parfor import wrap_parfor_blocks, unwrap_parfor_blocks
@@ -17,6 +17,8 @@ import hpat.io
 from hpat.utils import (get_constant, get_definitions, is_alloc_callname,
                         is_whole_slice, update_node_definitions, is_array,
                         is_np_array, find_build_tuple, debug_prints)
+from hpat.utils import compile_to_numba_ir
+from hpat.str_arr_ext import dict_str_arr_type
 
 from enum import Enum
 
@@ -130,6 +132,15 @@ class DistributedAnalysis(object):
             # keep lhs in table for dot() handling
             self._T_arrs.add(lhs)
             return
+        elif (isinstance(rhs, ir.Expr) and rhs.op == 'getattr'
+                and self.typemap.get(rhs.value.name) == dict_str_arr_type):
+            # codes of dictionary-encoded arrays are distributed like the
+            # array, dictionaries are replicated
+            if rhs.attr == 'codes':
+                self._meet_array_dists(lhs, rhs.value.name, array_dists)
+            else:
+                array_dists[lhs] = Distribution.REP
+            return
         elif (isinstance(rhs, ir.Expr) and rhs.op == 'getattr'
                 and rhs.attr in ['shape', 'ndim', 'size', 'strides', 'dtype',
                                  'itemsize', 'astype', 'reshape', 'ctypes',
@@ -243,10 +254,122 @@ class DistributedAnalysis(object):
             # quantile doesn't affect input's distribution
             return
 
+        if (func_mod == 'hpat.hiframes_stats'
+                and func_name in ['describe', 'quantiles']):
+            # output is a small replicated array, input is not affected
+            array_dists[lhs] = Distribution.REP
+            return
+
+        if (func_mod == 'hpat.hiframes_stats'
+                and func_name in ['approx_quantile', 'approx_nunique']):
+            # sketches are merged, input is not affected
+            return
+
+        if (func_mod == 'hpat.hiframes_stats'
+                and func_name in ['group_approx_quantile',
+                                  'group_approx_nunique']):
+            self._analyze_call_shuffle_out(
+                lhs, [args[0].name, args[1].name], array_dists)
+            return
+
+        if (func_mod == 'hpat.hiframes_dict_enc'
+                and func_name in ['dict_encode_str_arr',
+                                  'decode_dict_str_arr']):
+            # output has a value per element of input
+            self._meet_array_dists(lhs, args[0].name, array_dists)
+            return
+
+        if fdef == ('dict_cmp_hits', 'hpat.hiframes_dict_enc'):
+            # one value per dictionary entry, input is not affected
+            array_dists[lhs] = Distribution.REP
+            return
+
+        if (func_mod == 'hpat.hiframes_unique'
+                and func_name in ['unique', 'value_counts']):
+            # value_counts() output is a tuple of values and counts arrays
+            # with the same distribution
+            self._analyze_call_shuffle_out(lhs, [args[0].name], array_dists)
+            return
+
+        if (func_mod == 'hpat.hiframes_unique'
+                and func_name in ['shuffle_by_hash', 'select_kept']):
+            self._analyze_call_shuffle_out(
+                lhs, [args[0].name, args[1].name], array_dists)
+            return
+
+        if (func_mod == 'hpat.hiframes_unique'
+                and func_name in ['hash_rows', 'first_occurrence',
+                                  'shuffled_first_occurrence']):
+            # output has a value per row of hash and key arrays (tuple)
+            arrs = [lhs]
+            for v in args[:2]:
+                if is_array(self.typemap, v.name):
+                    arrs.append(v.name)
+                else:
+                    arrs += [a.name for a in find_build_tuple(self.func_ir, v)]
+            for arr in arrs[1:]:
+                self._meet_array_dists(lhs, arr, array_dists)
+            for arr in arrs:
+                self._meet_array_dists(lhs, arr, array_dists)
+            return
+
+        if ((func_mod == 'hpat.hiframes_str_match'
+                and func_name in ['str_match_literals', 'str_match_regex'])
+                or (func_mod == 'hpat.hiframes_str_methods'
+                    and func_name in ['str_case', 'str_len', 'str_strip',
+                                      'str_slice', 'str_split_get',
+                                      'str_replace'])
+                or fdef == ('parse_dt_str_arr', 'hpat.hiframes_datetime')):
+            # output has a value per element of string array
+            self._meet_array_dists(lhs, args[0].name, array_dists)
+            return
+
+        if fdef == ('local_topk', 'hpat.hiframes_topk'):
+            # candidate positions are local to every process (OneD_Var),
+            # input is not affected
+            out_dist = Distribution.OneD_Var
+            if lhs in array_dists:
+                out_dist = Distribution(min(out_dist.value,
+                                            array_dists[lhs].value))
+            if args[0].name in array_dists:
+                out_dist = Distribution(min(out_dist.value,
+                                            array_dists[args[0].name].value))
+            array_dists[lhs] = out_dist
+            return
+
+        if (func_mod == 'hpat.hiframes_topk'
+                and func_name in ['select_topk', 'take_topk']):
+            # output is small: local candidate rows or replicated top rows,
+            # input is not affected
+            array_dists[lhs] = Distribution.REP
+            return
+
+        if fdef == ('group_topk', 'hpat.hiframes_topk'):
+            self._analyze_call_shuffle_out(
+                lhs, [args[0].name, args[1].name], array_dists)
+            return
+
         if fdef == ('nunique', 'hpat.hiframes_api'):
             # nunique doesn't affect input's distribution
             return
 
+        if (func_mod == 'hpat.hiframes_rolling'
+                and (func_name.startswith('roll_fixed_')
+                     or func_name.startswith('ewm_')
+                     or func_name in ['shift_fixed', 'pct_change_fixed'])):
+            # rolling/shift output has the same distribution as input
+            self._meet_array_dists(lhs, args[0].name, array_dists)
+            return
+
+        if (func_mod == 'hpat.hiframes_rolling'
+                and (func_name.startswith('roll_offset_')
+                     or func_name in ['group_shift', 'group_diff'])):
+            # input, 'on'/key column and output have the same distribution
+            self._meet_array_dists(lhs, args[0].name, array_dists)
+            self._meet_array_dists(lhs, args[1].name, array_dists)
+            self._meet_array_dists(lhs, args[0].name, array_dists)
+            return
+
         if fdef == ('concat', 'hpat.hiframes_api'):
             # hiframes concat is similar to np.concatenate
             self._analyze_call_np_concatenate(lhs, args, array_dists)
@@ -262,7 +385,9 @@ class DistributedAnalysis(object):
         if hpat.config._has_pyarrow and fdef == ('read_parquet', 'hpat.parquet_pio'):
             return
 
-        if hpat.config._has_pyarrow and fdef == ('read_parquet_str', 'hpat.parquet_pio'):
+        if hpat.config._has_pyarrow and fdef in [
+                ('read_parquet_str', 'hpat.parquet_pio'),
+                ('read_parquet_str_dict', 'hpat.parquet_pio')]:
             # string read creates array in output
             if lhs not in array_dists:
                 array_dists[lhs] = Distribution.OneD
@@ -421,6 +546,27 @@ class DistributedAnalysis(object):
         # set REP if not found
         self._analyze_call_set_REP(lhs, args, array_dists)
 
+    def _analyze_call_shuffle_out(self, lhs, in_arrs, array_dists):
+        # inputs have the same distribution, output is shuffled to processes
+        # owning the keys (OneD_Var)
+        in_dist = self._meet_array_dists(in_arrs[0], in_arrs[0], array_dists)
+        for arr in in_arrs[1:]:
+            in_dist = self._meet_array_dists(in_arrs[0], arr, array_dists,
+                                             in_dist)
+        for arr in in_arrs:
+            array_dists[arr] = in_dist
+        out_dist = Distribution.OneD_Var
+        if lhs in array_dists:
+            out_dist = Distribution(min(out_dist.value,
+                                        array_dists[lhs].value))
+        out_dist = Distribution(min(out_dist.value, in_dist.value))
+        array_dists[lhs] = out_dist
+        # output can cause input REP
+        if out_dist != Distribution.OneD_Var:
+            for arr in in_arrs:
+                array_dists[arr] = out_dist
+        return
+
     def _analyze_call_np_concatenate(self, lhs, args, array_dists):
         assert len(args) == 1
         tup_def = guard(get_definition, self.func_ir, args[0])
@@ -508,6 +654,11 @@ class DistributedAnalysis(object):
             array_dists[lhs] = Distribution.REP
 
     def _analyze_getitem(self, inst, lhs, rhs, array_dists):
+        if (rhs.op == 'static_getitem' and rhs.value.name in array_dists
+                and not is_array(self.typemap, rhs.value.name)):
+            # array of a tuple of arrays with the same distribution
+            self._meet_array_dists(lhs, rhs.value.name, array_dists)
+            return
         if rhs.op == 'static_getitem':
             if rhs.index_var is None:
                 # TODO: things like A[0] need broadcast
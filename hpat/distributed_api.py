@@ -10,6 +10,8 @@ from hpat.str_arr_ext import (string_array_type, num_total_chars, StringArray,
                               get_data_ptr, convert_len_arr_to_offset)
 from hpat.utils import debug_prints, empty_like_type
 import time
+import ctypes
+from collections import OrderedDict
 from llvmlite import ir as lir
 import hdist
 import llvmlite.binding as ll
@@ -17,6 +19,14 @@ ll.add_symbol('c_alltoall', hdist.c_alltoall)
 ll.add_symbol('c_gather_scalar', hdist.c_gather_scalar)
 ll.add_symbol('c_gatherv', hdist.c_gatherv)
 ll.add_symbol('c_bcast', hdist.c_bcast)
+ll.add_symbol('hpat_stats_set_enabled', hdist.hpat_stats_set_enabled)
+ll.add_symbol('hpat_stats_begin', hdist.hpat_stats_begin)
+ll.add_symbol('hpat_stats_begin_named', hdist.hpat_stats_begin_named)
+ll.add_symbol('hpat_stats_end', hdist.hpat_stats_end)
+ll.add_symbol('hpat_stats_num_ops', hdist.hpat_stats_num_ops)
+ll.add_symbol('hpat_stats_get', hdist.hpat_stats_get)
+ll.add_symbol('hpat_stats_reset', hdist.hpat_stats_reset)
+ll.add_symbol('hpat_trace_start', hdist.hpat_trace_start)
 
 from enum import Enum
 
@@ -129,7 +139,7 @@ def gatherv_overload(data_t):
             n_all_chars = num_total_chars(data)
 
             # allocate send lens arrays
-            send_arr_lens = np.empty(n_loc, np.uint32)  # XXX offset type is uint32
+            send_arr_lens = np.empty(n_loc, np.uint32)  # lengths are sent as uint32
             send_data_ptr = get_data_ptr(data)
 
             for i in range(n_loc):
@@ -137,6 +147,9 @@ def gatherv_overload(data_t):
                 send_arr_lens[i] = len(_str)
                 del_str(_str)
 
+            # counts and displacements of MPI are int32
+            assert n_loc < INT_MAX
+            assert n_all_chars < INT_MAX
             recv_counts = gather_scalar(np.int32(n_loc))
             recv_counts_char = gather_scalar(np.int32(n_all_chars))
             n_total = recv_counts.sum()
@@ -149,6 +162,8 @@ def gatherv_overload(data_t):
             displs_char = np.empty(1, np.int32)
 
             if rank == MPI_ROOT:
+                assert n_total < INT_MAX
+                assert n_total_char < INT_MAX
                 all_data = pre_alloc_string_array(n_total, n_total_char)
                 displs = hpat.hiframes_join.calc_disp(recv_counts)
                 displs_char = hpat.hiframes_join.calc_disp(recv_counts_char)
@@ -197,7 +212,7 @@ def bcast_overload(data_t):
             data_ptr = get_data_ptr(data)
 
             if rank == MPI_ROOT:
-                send_arr_lens = np.empty(n_loc, np.uint32)  # XXX offset type is uint32
+                send_arr_lens = np.empty(n_loc, np.uint32)  # lengths are sent as uint32
                 for i in range(n_loc):
                     _str = data[i]
                     send_arr_lens[i] = len(_str)
@@ -292,6 +307,121 @@ def alltoallv_tup_overload(send_data_typ, out_data_typ, send_counts_typ, recv_co
     a2a_impl = loc_vars['f']
     return a2a_impl
 
+# runtime operator stats (hpat.instrument_mode)
+# collectives timed in C, same order as HPAT_STATS_OPS in _distributed.cpp
+_collective_op_names = ['alltoallv', 'alltoall', 'gatherv', 'gather',
+                        'bcast', 'allgather', 'allreduce', 'exscan', 'isend',
+                        'irecv', 'wait', 'reshape', 'permutation']
+# HiFrames nodes and I/O calls instrumented by distributed pass are
+# registered by name in hdist at runtime, ids start after collectives
+
+# names are passed to hdist for the trace file written in finalize
+_trace_set_op_name = ctypes.CFUNCTYPE(None, ctypes.c_int, ctypes.c_char_p)(
+    hdist.hpat_trace_set_op_name)
+for _i, _name in enumerate(_collective_op_names):
+    _trace_set_op_name(_i, _name.encode())
+
+_op_stats_op_name = ctypes.CFUNCTYPE(ctypes.c_char_p, ctypes.c_int)(
+    hdist.hpat_stats_op_name)
+
+
+def get_op_stats_name(op_id):
+    name = _op_stats_op_name(op_id).decode()
+    return name if name else "op{}".format(op_id)
+
+
+def op_stats_begin_named(name):
+    """intrinsic that begins timing of operator 'name' and returns its id for
+    op_stats_end. The id is looked up by name at runtime, so compiled code
+    (possibly loaded from cache) doesn't depend on ids of this process.
+    """
+    @intrinsic
+    def _op_stats_begin_named(typingctx):
+        def codegen(context, builder, sig, args):
+            cstr = context.insert_const_string(builder.module, name)
+            fnty = lir.FunctionType(lir.IntType(32),
+                                    [lir.IntType(8).as_pointer()])
+            fn = builder.module.get_or_insert_function(
+                fnty, name="hpat_stats_begin_named")
+            return builder.call(fn, [cstr])
+        return signature(types.int32), codegen
+    return _op_stats_begin_named
+
+
+# returns previous state
+op_stats_set_enabled = types.ExternalFunction("hpat_stats_set_enabled",
+    types.int32(types.int32))
+op_stats_begin = types.ExternalFunction("hpat_stats_begin",
+    types.void(types.int32))
+op_stats_end = types.ExternalFunction("hpat_stats_end",
+    types.void(types.int32))
+_op_stats_num_ops = types.ExternalFunction("hpat_stats_num_ops",
+    types.int64())
+# times, bytes, counts, n
+_op_stats_get = types.ExternalFunction("hpat_stats_get",
+    types.void(types.voidptr, types.voidptr, types.voidptr, types.int64))
+_op_stats_reset = types.ExternalFunction("hpat_stats_reset", types.void())
+# starts recording a timeline trace of operators in hdist (once per process),
+# written to HPAT_TRACE_FILE (default hpat_trace.json) in finalize
+op_trace_start = types.ExternalFunction("hpat_trace_start", types.void())
+
+
+@numba.njit
+def _get_num_op_stats(max_op):  # pragma: no cover
+    return dist_reduce(_op_stats_num_ops(), max_op)
+
+
+@numba.njit
+def _get_op_stats(n, min_op, max_op, sum_op):  # pragma: no cover
+    # stats collectives themselves are not counted
+    prev = op_stats_set_enabled(np.int32(0))
+    times = np.zeros(n, np.float64)
+    nbytes = np.zeros(n, np.int64)
+    counts = np.zeros(n, np.int64)
+    _op_stats_get(times.ctypes, nbytes.ctypes, counts.ctypes, n)
+    n_pes = get_size()
+    min_times = dist_reduce(times.copy(), min_op)
+    max_times = dist_reduce(times.copy(), max_op)
+    avg_times = dist_reduce(times, sum_op) / n_pes
+    min_bytes = dist_reduce(nbytes.copy(), min_op)
+    max_bytes = dist_reduce(nbytes.copy(), max_op)
+    avg_bytes = dist_reduce(nbytes, sum_op) / n_pes
+    max_counts = dist_reduce(counts, max_op)
+    op_stats_set_enabled(prev)
+    return (max_counts, min_times, max_times, avg_times, min_bytes,
+            max_bytes, avg_bytes)
+
+
+@numba.njit
+def reset_op_stats():  # pragma: no cover
+    _op_stats_reset()
+
+
+@numba.njit
+def disable_op_stats():  # pragma: no cover
+    op_stats_set_enabled(np.int32(0))
+
+
+def get_op_stats():
+    """runtime stats of operators and collectives reduced across processes
+    (has to be called on all processes). Returns name -> dict of count,
+    time and bytes (min/max/avg across processes).
+    """
+    n = _get_num_op_stats(np.int32(Reduce_Type.Max.value))
+    res = _get_op_stats(n, np.int32(Reduce_Type.Min.value),
+                        np.int32(Reduce_Type.Max.value),
+                        np.int32(Reduce_Type.Sum.value))
+    keys = ('count', 'time_min', 'time_max', 'time_avg', 'bytes_min',
+            'bytes_max', 'bytes_avg')
+    stats = OrderedDict()
+    for i in range(n):
+        if res[0][i] == 0:
+            continue
+        stats[get_op_stats_name(i)] = OrderedDict(
+            (k, v[i].item()) for k, v in zip(keys, res))
+    return stats
+
+
 def get_rank():  # pragma: no cover
     """dummy function for C mpi get_rank"""
     return 0
@@ -368,25 +368,34 @@ def lower_dist_rebalance_array_parallel(context, builder, sig, args):
 def lower_dist_allgather(context, builder, sig, args):
     arr_typ = sig.args[0]
     val_typ = sig.args[1]
-    assert val_typ == arr_typ.dtype
+
+    if isinstance(val_typ, types.Array):
+        # all values of input array, out has len(val) * n_pes elements
+        assert val_typ.dtype == arr_typ.dtype
+        in_arr = make_array(val_typ)(context, builder, args[1])
+        size_arg = builder.trunc(in_arr.nitems, lir.IntType(32))
+        val_ptr = builder.bitcast(in_arr.data, lir.IntType(8).as_pointer())
+        val_typ = val_typ.dtype
+    else:
+        assert val_typ == arr_typ.dtype
+        # size arg is 1 for scalars
+        size_arg = context.get_constant(types.int32, 1)
+        val_ptr = builder.bitcast(cgutils.alloca_once_value(builder, args[1]),
+                                  lir.IntType(8).as_pointer())
 
     # type enum arg
     assert val_typ in _h5_typ_table, "invalid allgather type"
     typ_enum = _h5_typ_table[val_typ]
     typ_arg = context.get_constant(types.int32, typ_enum)
 
-    # size arg is 1 for now
-    size_arg = context.get_constant(types.int32, 1)
-
-    val_ptr = cgutils.alloca_once_value(builder, args[1])
-
     out = make_array(sig.args[0])(context, builder, args[0])
 
     call_args = [builder.bitcast(out.data, lir.IntType(8).as_pointer()),
                  size_arg, val_ptr, typ_arg]
 
     fnty = lir.FunctionType(lir.VoidType(), [lir.IntType(8).as_pointer(),
-                            lir.IntType(32), val_ptr.type, lir.IntType(32)])
+                            lir.IntType(32), lir.IntType(8).as_pointer(),
+                            lir.IntType(32)])
     fn = builder.module.get_or_insert_function(fnty, name="allgather")
     builder.call(fn, call_args)
     return context.get_dummy_value()
@@ -11,7 +11,7 @@ from numba.ir_utils import (mk_unique_var, replace_vars_inner, find_topo_order,
                             dprint_func_ir, remove_dead, mk_alloc, remove_dels,
                             get_name_var_table, replace_var_names,
                             add_offset_to_labels, get_ir_of_code, find_const,
-                            compile_to_numba_ir, replace_arg_nodes,
+                            replace_arg_nodes,
                             find_callname, guard, require, get_definition,
                             build_definitions, replace_vars_stmt, replace_vars_inner)
 
@@ -20,8 +20,12 @@ from numba.analysis import compute_cfg_from_blocks
 
 import hpat
 from hpat import (hiframes_api, utils, parquet_pio, config, hiframes_filter,
-                  hiframes_join, hiframes_aggregate, hiframes_sort)
+                  hiframes_join, hiframes_aggregate, hiframes_sort,
+                  hiframes_rolling, hiframes_stats, hiframes_unique,
+                  hiframes_topk, hiframes_str_match, hiframes_str_methods,
+                  hiframes_datetime, hiframes_dict_enc)
 from hpat.utils import get_constant, NOT_CONSTANT, get_definitions, debug_prints
+from hpat.utils import compile_to_numba_ir
 from hpat.hiframes_api import PandasDataFrameType
 from hpat.str_ext import string_type
 
@@ -33,8 +37,8 @@ from hpat.pd_timestamp_ext import (datetime_date_type,
 from hpat.pd_series_ext import SeriesType, BoxedSeriesType
 
 df_col_funcs = ['shift', 'pct_change', 'fillna', 'sum', 'mean', 'var', 'std',
-                'quantile', 'count', 'describe', 'nunique']
-LARGE_WIN_SIZE = 10
+                'quantile', 'count', 'describe', 'nunique', 'unique',
+                'value_counts', 'nlargest', 'nsmallest']
 
 
 def remove_hiframes(rhs, lives, call_list):
@@ -50,10 +54,45 @@ def remove_hiframes(rhs, lives, call_list):
         return True
     if (len(call_list) == 3 and call_list[1:] == ['hiframes_api', hpat] and
             call_list[0] in ['fix_df_array', 'fix_rolling_array',
-            'concat', 'count', 'mean', 'quantile', 'var',
-            'str_contains_regex', 'str_contains_noregex', 'column_sum',
+            'concat', 'count', 'mean', 'quantile', 'var', 'column_sum',
             'nunique']):
         return True
+    if (len(call_list) == 3 and call_list[1:] == ['hiframes_rolling', hpat]
+            and (call_list[0].startswith(('roll_fixed_', 'roll_offset_'))
+                 or call_list[0] in ['shift_fixed', 'pct_change_fixed',
+                                     'group_shift', 'group_diff',
+                                     'ewm_sum', 'ewm_mean', 'ewm_var',
+                                     'ewm_std'])):
+        return True
+    if (len(call_list) == 3 and call_list[1:] == ['hiframes_stats', hpat]
+            and call_list[0] in ['describe', 'quantiles', 'approx_quantile',
+                                 'group_approx_quantile', 'approx_nunique',
+                                 'group_approx_nunique']):
+        return True
+    if (len(call_list) == 3 and call_list[1:] == ['hiframes_unique', hpat]
+            and call_list[0] in ['unique', 'value_counts', 'hash_rows',
+                                 'first_occurrence', 'shuffle_by_hash',
+                                 'shuffled_first_occurrence', 'select_kept']):
+        return True
+    if (len(call_list) == 3 and call_list[1:] == ['hiframes_str_match', hpat]
+            and call_list[0] in ['str_match_literals', 'str_match_regex']):
+        return True
+    if (len(call_list) == 3 and call_list[1:] == ['hiframes_str_methods', hpat]
+            and call_list[0] in ['str_case', 'str_len', 'str_strip',
+                                 'str_slice', 'str_split_get', 'str_replace']):
+        return True
+    if (len(call_list) == 3 and call_list[1:] == ['hiframes_datetime', hpat]
+            and (call_list[0] == 'parse_dt_str_arr'
+                 or call_list[0].startswith(('dt64_', 'date_')))):
+        return True
+    if (len(call_list) == 3 and call_list[1:] == ['hiframes_dict_enc', hpat]
+            and call_list[0] in ['dict_encode_str_arr', 'decode_dict_str_arr',
+                                 'dict_cmp_hits']):
+        return True
+    if (len(call_list) == 3 and call_list[1:] == ['hiframes_topk', hpat]
+            and call_list[0] in ['local_topk', 'select_topk', 'take_topk',
+                                 'group_topk']):
+        return True
     if (len(call_list) == 3 and call_list[1:] == ['hiframes_typed', hpat] and
             call_list[0]
             in ['_sum_handle_nan', '_mean_handle_nan', '_var_handle_nan']):
@@ -62,6 +101,8 @@ def remove_hiframes(rhs, lives, call_list):
         return True
     if call_list == ['unbox_df_column', 'hiframes_api', hpat]:
         return True
+    if call_list == ['unbox_df_str_columns', 'hiframes_api', hpat]:
+        return True
     if call_list == [list]:
         return True
     if call_list == ['groupby']:
@@ -84,13 +125,21 @@ class HiFrames(object):
         # currently use to keep lhs of Arg nodes intact
         self.replace_var_dict = {}
 
-        # rolling call name -> [column_varname, win_size]
+        # rolling call name -> [column_varname, win_size, center, on column]
         self.rolling_calls = {}
+        # df rolling call name -> [df_var, win_size, center, on column]
+        self.df_rolling_calls = {}
+        # ewm/expanding call name -> [column_var, kind, decay, min_periods]
+        self.ewm_calls = {}
+        # str.split call name -> [column_var, sep, maxsplit]
+        self.str_split_calls = {}
 
         # df_var -> {col1:col1_var ...}
         self.df_vars = {}
         # df_var -> label where it is defined
         self.df_labels = {}
+        # df/Series var -> constant index labels (e.g. describe() output)
+        self.df_index = {}
         # arrays that are df columns actually (pd.Series)
         self.df_cols = set()
 
@@ -155,6 +204,16 @@ class HiFrames(object):
             if rhs.op == 'call':
                 return self._run_call(assign, label)
 
+            # r = df.rolling('5min', on='ts').A or ...['A']
+            if (rhs.op in ('getattr', 'static_getitem')
+                    and rhs.value.name in self.df_rolling_calls):
+                cname = rhs.attr if rhs.op == 'getattr' else rhs.index
+                df_var, window, center, on = self.df_rolling_calls[
+                    rhs.value.name]
+                col_var = self._get_df_colvar(df_var, cname)
+                self.rolling_calls[lhs] = [col_var, window, center, on]
+                return []  # remove
+
             # d = df['column']
             if (rhs.op == 'static_getitem' and self._is_df_var(rhs.value)
                     and isinstance(rhs.index, str)):
@@ -198,7 +257,12 @@ class HiFrames(object):
                 self.func_ir._definitions[lhs] = [None]
 
             if rhs.op == 'cast' and rhs.value.name in self.df_vars:
-                return self._box_return_df(assign, self.df_vars[rhs.value.name])
+                return self._box_return_df(assign, self.df_vars[rhs.value.name],
+                                           self.df_index.get(rhs.value.name))
+
+            if rhs.op == 'cast' and rhs.value.name in self.df_index:
+                return self._box_return_series_index(
+                    assign, rhs.value, self.df_index[rhs.value.name])
 
         if isinstance(rhs, ir.Arg):
             return self._run_arg(assign, label)
@@ -208,6 +272,8 @@ class HiFrames(object):
             self.df_vars[lhs] = self.df_vars[rhs.name]
         if isinstance(rhs, ir.Var) and rhs.name in self.df_labels:
             self.df_labels[lhs] = self.df_labels[rhs.name]
+        if isinstance(rhs, ir.Var) and rhs.name in self.df_index:
+            self.df_index[lhs] = self.df_index[rhs.name]
         if isinstance(rhs, ir.Var) and rhs.name in self.df_cols:
             self.df_cols.add(lhs)
         if isinstance(rhs, ir.Var) and rhs.name in self.arrow_tables:
@@ -274,7 +340,18 @@ class HiFrames(object):
         # df.describe()
         if (isinstance(func_mod, ir.Var) and self._is_df_var(func_mod)
                 and func_name == 'describe'):
-            return self._handle_df_describe(assign, lhs, rhs, func_mod)
+            return self._handle_df_describe(assign, lhs, rhs, func_mod, label)
+
+        # df.drop_duplicates()
+        if (isinstance(func_mod, ir.Var) and self._is_df_var(func_mod)
+                and func_name == 'drop_duplicates'):
+            return self._handle_df_drop_duplicates(lhs, rhs, func_mod, label)
+
+        # df.nlargest()/df.nsmallest()
+        if (isinstance(func_mod, ir.Var) and self._is_df_var(func_mod)
+                and func_name in ['nlargest', 'nsmallest']):
+            return self._handle_df_nlargest(lhs, rhs, func_mod, func_name,
+                                            label)
 
         # df.sort_values()
         if (isinstance(func_mod, ir.Var) and self._is_df_var(func_mod)
@@ -291,10 +368,21 @@ class HiFrames(object):
                 and func_name == 'pivot_table'):
             return self._handle_df_pivot_table(lhs, rhs, func_mod, label)
 
+        # df.rolling()
+        if (isinstance(func_mod, ir.Var) and self._is_df_var(func_mod)
+                and func_name == 'rolling'):
+            return self._handle_df_rolling_setup(lhs, rhs, func_mod)
+
         res = self._handle_rolling_call(assign.target, rhs)
         if res is not None:
             return res
 
+        # df.column.str.split(',').str.get(0)
+        if (isinstance(func_mod, ir.Var)
+                and func_mod.name in self.str_split_calls
+                and func_name == 'str.get'):
+            return self._handle_str_split_get(lhs, rhs, func_mod)
+
         # groupby aggregate
         # e.g. df.groupby('A')['B'].agg(lambda x: x.max()-x.min())
         if isinstance(func_mod, ir.Var) and self._is_groupby(func_mod):
@@ -691,8 +779,10 @@ class HiFrames(object):
         replace_arg_nodes(f_ir.blocks[topo_order[0]], col_vars)
         return f_ir.blocks
 
-    def _handle_df_describe(self, assign, lhs, rhs, func_mod):
+    def _handle_df_describe(self, assign, lhs, rhs, df_var, label):
         """translate df.describe() call with no input or just include='all'
+        to a DataFrame of describe() outputs of columns (rows are count,
+        mean, std, min, 25%, 50%, 75% and max)
         """
         # check for no arg or just include='all'
         if not (len(rhs.args) == 0 and (len(rhs.kws) == 0 or (len(rhs.kws) == 1
@@ -700,55 +790,136 @@ class HiFrames(object):
                 and get_constant(self.func_ir, rhs.kws[0][1]) == 'all'))):
             raise ValueError("only describe() with include='all' supported")
 
-        col_names = self._get_df_col_names(func_mod)
-        col_name_args = ["c"+str(i) for i in range(len(col_names))]
-        # TODO: pandas returns dataframe, maybe return namedtuple instread of
-        # string?
-
-        func_text = "def f({}):\n".format(', '.join(col_name_args))
-        # compute stat values
-        for c in col_name_args:
-            func_text += "  {}_count = np.float64(hpat.hiframes_api.count({}))\n".format(c, c)
-            func_text += "  {}_min = np.min({})\n".format(c, c)
-            func_text += "  {}_max = np.max({})\n".format(c, c)
-            func_text += "  {}_mean = hpat.hiframes_api.mean({})\n".format(c, c)
-            func_text += "  {}_std = hpat.hiframes_api.var({})**0.5\n".format(c, c)
-            func_text += "  {}_q25 = hpat.hiframes_api.quantile({}, .25)\n".format(c, c)
-            func_text += "  {}_q50 = hpat.hiframes_api.quantile({}, .5)\n".format(c, c)
-            func_text += "  {}_q75 = hpat.hiframes_api.quantile({}, .75)\n".format(c, c)
-
-
-        col_header = "      ".join([c for c in col_names])
-        func_text += "  res = '        {}\\n' + \\\n".format(col_header)
-        count_strs = "+ '   ' + ".join(["str({}_count)".format(c) for c in col_name_args])
-        func_text += "   'count   ' + {} + '\\n' + \\\n".format(count_strs)
-        mean_strs = "+ '   ' + ".join(["str({}_mean)".format(c) for c in col_name_args])
-        func_text += "   'mean    ' + {} + '\\n' + \\\n".format(mean_strs)
-        std_strs = "+ '   ' + ".join(["str({}_std)".format(c) for c in col_name_args])
-        func_text += "   'std     ' + {} + '\\n' + \\\n".format(std_strs)
-        min_strs = "+ '   ' + ".join(["str({}_min)".format(c) for c in col_name_args])
-        func_text += "   'min     ' + {} + '\\n' + \\\n".format(min_strs)
-        q25_strs = "+ '   ' + ".join(["str({}_q25)".format(c) for c in col_name_args])
-        func_text += "   '25%     ' + {} + '\\n' + \\\n".format(q25_strs)
-        q50_strs = "+ '   ' + ".join(["str({}_q50)".format(c) for c in col_name_args])
-        func_text += "   '50%     ' + {} + '\\n' + \\\n".format(q50_strs)
-        q75_strs = "+ '   ' + ".join(["str({}_q75)".format(c) for c in col_name_args])
-        func_text += "   '75%     ' + {} + '\\n' + \\\n".format(q75_strs)
-        max_strs = "+ '   ' + ".join(["str({}_max)".format(c) for c in col_name_args])
-        func_text += "   'max     ' + {}\n".format(max_strs)
+        nodes = []
+        df_col_map = {}
+        for cname, col_var in self._get_df_cols(df_var).items():
+            out_var = ir.Var(lhs.scope, mk_unique_var(cname), lhs.loc)
+            nodes += self._gen_col_describe(out_var, [], col_var)
+            df_col_map[cname] = out_var
+
+        self._create_df(lhs.name, df_col_map, label)
+        self.df_index[lhs.name] = hiframes_stats.describe_labels
+        return nodes
+
+    def _handle_df_drop_duplicates(self, lhs, rhs, df_var, label):
+        """translate df.drop_duplicates(subset=...) to local dedup of rows,
+        shuffle of remaining rows by hash of key columns and dedup of
+        received rows. The first occurrence of every key is kept.
+        """
+        kws = dict(rhs.kws)
+        subset = rhs.args[0] if rhs.args else kws.get('subset', None)
+        keep = guard(find_const, self.func_ir, kws['keep']) if 'keep' in kws else 'first'
+        if keep != 'first':
+            raise ValueError("drop_duplicates() only supports keep='first'")
+        if 'inplace' in kws:
+            raise ValueError("drop_duplicates() inplace not supported")
+
+        df_cols = self._get_df_cols(df_var)
+        col_names = list(df_cols.keys())
+        key_names = col_names
+        if subset is not None:
+            key_names = guard(find_const, self.func_ir, subset)
+            if isinstance(key_names, str):
+                key_names = [key_names]
+            if (not isinstance(key_names, (list, tuple))
+                    or any(c not in df_cols for c in key_names)):
+                raise ValueError("drop_duplicates() subset should be constant"
+                                 " column names")
+        key_inds = [col_names.index(c) for c in key_names]
+        n_cols = len(col_names)
+        keys = "({},)".format(", ".join("a{}".format(i) for i in key_inds))
+        shuff_keys = "({},)".format(", ".join("d{}".format(i) for i in key_inds))
+
+        arg_names = ", ".join("c{}".format(i) for i in range(n_cols))
+        func_text = "def f({}):\n".format(arg_names)
+        for i in range(n_cols):
+            func_text += "  a{0} = hpat.hiframes_api.to_arr_from_series(c{0})\n".format(i)
+        func_text += "  h = hpat.hiframes_unique.hash_rows({})\n".format(keys)
+        func_text += "  keep = hpat.hiframes_unique.first_occurrence(h, {})\n".format(keys)
+        func_text += "  h1 = h[keep]\n"
+        for i in range(n_cols):
+            func_text += "  b{0} = a{0}[keep]\n".format(i)
+        func_text += "  h2 = hpat.hiframes_unique.shuffle_by_hash(h1, h1, False)\n"
+        for i in range(n_cols):
+            func_text += "  d{0} = hpat.hiframes_unique.shuffle_by_hash(b{0}, h1, False)\n".format(i)
+        func_text += "  keep2 = hpat.hiframes_unique.shuffled_first_occurrence(h2, {}, False)\n".format(shuff_keys)
+        for i in range(n_cols):
+            func_text += "  t{0} = hpat.hiframes_unique.select_kept(d{0}, keep2, False)\n".format(i)
+        for i in range(n_cols):
+            func_text += "  o{0} = t{0}\n".format(i)
 
         loc_vars = {}
         exec(func_text, {}, loc_vars)
         f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [df_cols[c] for c in col_names])
+        nodes = f_block.body[:-3]  # remove none return
+        out_df = {}
+        for i, cname in enumerate(col_names):
+            out_var = ir.Var(lhs.scope, mk_unique_var(cname), lhs.loc)
+            nodes[-n_cols + i].target = out_var
+            out_df[cname] = out_var
 
-        f_block = compile_to_numba_ir(
-            f, {'hpat': hpat, 'np': np}).blocks.popitem()[1]
-        col_vars = self._get_df_col_vars(func_mod)
-        replace_arg_nodes(f_block, col_vars)
+        self._create_df(lhs.name, out_df, label)
+        return nodes
+
+    def _handle_df_nlargest(self, lhs, rhs, df_var, func_name, label):
+        """translate df.nlargest(n, 'A')/df.nsmallest(n, 'A') to local top n
+        selection, selection of final rows among gathered candidates and
+        gather of selected rows of every column. Output is replicated.
+        """
+        kws = dict(rhs.kws)
+        n = rhs.args[0] if rhs.args else kws.get('n', None)
+        columns = rhs.args[1] if len(rhs.args) > 1 else kws.get('columns', None)
+        if n is None or columns is None:
+            raise ValueError("{}() requires 'n' and 'columns' arguments"
+                             .format(func_name))
+        self._check_topk_keep(func_name, kws)
+
+        df_cols = self._get_df_cols(df_var)
+        key_name = guard(find_const, self.func_ir, columns)
+        if isinstance(key_name, (list, tuple)) and len(key_name) == 1:
+            key_name = key_name[0]
+        if not isinstance(key_name, str) or key_name not in df_cols:
+            raise ValueError("{}() columns should be a constant column name"
+                             .format(func_name))
+        col_names = list(df_cols.keys())
+        key_ind = col_names.index(key_name)
+        n_cols = len(col_names)
+        largest = func_name == 'nlargest'
+
+        arg_names = ", ".join("c{}".format(i) for i in range(n_cols))
+        func_text = "def f(n, {}):\n".format(arg_names)
+        for i in range(n_cols):
+            func_text += "  a{0} = hpat.hiframes_api.to_arr_from_series(c{0})\n".format(i)
+        func_text += "  inds = hpat.hiframes_topk.local_topk(a{}, n, {})\n".format(key_ind, largest)
+        func_text += "  pos = hpat.hiframes_topk.select_topk(a{}, inds, n, {}, False)\n".format(key_ind, largest)
+        for i in range(n_cols):
+            func_text += "  t{0} = hpat.hiframes_topk.take_topk(a{0}, inds, pos, False)\n".format(i)
+        for i in range(n_cols):
+            func_text += "  o{0} = t{0}\n".format(i)
+
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [n] + [df_cols[c] for c in col_names])
         nodes = f_block.body[:-3]  # remove none return
-        nodes[-1].target = lhs
+        out_df = {}
+        for i, cname in enumerate(col_names):
+            out_var = ir.Var(lhs.scope, mk_unique_var(cname), lhs.loc)
+            nodes[-n_cols + i].target = out_var
+            out_df[cname] = out_var
+
+        self._create_df(lhs.name, out_df, label)
         return nodes
 
+    def _check_topk_keep(self, func_name, kws):
+        if 'keep' in kws and guard(find_const, self.func_ir,
+                                   kws['keep']) != 'first':
+            raise ValueError("{}() only supports keep='first'".format(
+                func_name))
+
     def _handle_df_sort_values(self, assign, lhs, rhs, df, label):
         kws = dict(rhs.kws)
         # find key array for sort ('by' arg)
@@ -828,8 +999,23 @@ class HiFrames(object):
         if func_name == 'rolling':
             return self._handle_rolling_setup(assign, lhs, rhs, col_var)
 
-        if func_name == 'str.contains':
-            return self._handle_str_contains(assign, lhs, rhs, col_var)
+        if func_name in ['ewm', 'expanding']:
+            return self._handle_ewm_setup(lhs, rhs, col_var, func_name)
+
+        if func_name in ['str.contains', 'str.startswith', 'str.endswith',
+                         'str.match']:
+            return self._handle_str_match(lhs, rhs, col_var, func_name)
+
+        if func_name in ['str.lower', 'str.upper', 'str.strip', 'str.lstrip',
+                         'str.rstrip', 'str.slice', 'str.replace', 'str.len']:
+            return self._handle_str_method(lhs, rhs, col_var, func_name)
+
+        if func_name == 'str.split':
+            return self._handle_str_split_setup(lhs, rhs, col_var)
+
+        if (func_name == 'astype' and len(rhs.args) == 1
+                and get_constant(self.func_ir, rhs.args[0]) == 'category'):
+            return self._handle_astype_category(lhs, col_var)
 
         if func_name in df_col_funcs:
             return self._gen_column_call(lhs, rhs.args, col_var, func_name,
@@ -959,7 +1145,27 @@ class HiFrames(object):
         Handle Series rolling calls like:
           r = df.column.rolling(3)
         """
+        window, center, _ = self._get_rolling_setup_args(rhs)
+        self.rolling_calls[lhs.name] = [col_var, window, center, None]
+        return []  # remove
+
+    def _handle_df_rolling_setup(self, lhs, rhs, df_var):
+        """
+        Handle DataFrame rolling calls with time offset windows like:
+          r = df.rolling('5min', on='ts')
+        """
+        window, center, on = self._get_rolling_setup_args(rhs)
+        on_var = None
+        if on is not None:
+            if not self._is_df_colname(df_var, on):
+                raise ValueError("rolling 'on' column {} not found".format(on))
+            on_var = self._get_df_colvar(df_var, on)
+        self.df_rolling_calls[lhs.name] = [df_var, window, center, on_var]
+        return []  # remove
+
+    def _get_rolling_setup_args(self, rhs):
         center = False
+        on = None
         kws = dict(rhs.kws)
         if rhs.args:
             window = rhs.args[0]
@@ -970,8 +1176,11 @@ class HiFrames(object):
         window = get_constant(self.func_ir, window, window)
         if 'center' in kws:
             center = get_constant(self.func_ir, kws['center'], center)
-        self.rolling_calls[lhs.name] = [col_var, window, center]
-        return []  # remove
+        if 'on' in kws:
+            on = get_constant(self.func_ir, kws['on'])
+            if on is NOT_CONSTANT:
+                raise ValueError("rolling 'on' column name should be constant")
+        return window, center, on
 
     def _handle_rolling_call(self, lhs, rhs):
         """
@@ -988,32 +1197,272 @@ class HiFrames(object):
             return self._gen_rolling_call(rhs.args,
                                     *self.rolling_calls[func_def.value.name]
                                     + [func_name, lhs])
+        # df.column.ewm(span=3).mean()
+        if (isinstance(func_def, ir.Expr) and func_def.op == 'getattr'
+                and func_def.value.name in self.ewm_calls):
+            func_name = func_def.attr
+            self.df_cols.add(lhs.name)  # output is Series
+            return self._gen_ewm_call(rhs.args,
+                                      *self.ewm_calls[func_def.value.name]
+                                      + [func_name, lhs])
         return None
 
-    def _handle_str_contains(self, assign, lhs, rhs, str_col):
+    def _handle_ewm_setup(self, lhs, rhs, col_var, kind):
         """
-        Handle string contains like:
-          B = df.column.str.contains('oo*', regex=True)
+        Handle Series ewm and expanding calls like:
+          r = df.column.ewm(span=3)
+          r = df.column.expanding()
         """
         kws = dict(rhs.kws)
-        pat = rhs.args[0]
-        regex = True  # default regex arg is True
-        if 'regex' in kws:
-            regex = get_constant(self.func_ir, kws['regex'], regex)
-        if regex:
-            def f(str_arr, pat):  # pragma: no cover
-                e = hpat.str_ext.compile_regex(pat)
-                hpat.hiframes_api.str_contains_regex(str_arr, e)
+
+        def get_const_kw(name, default):
+            if name not in kws:
+                return default
+            val = get_constant(self.func_ir, kws[name])
+            if val is NOT_CONSTANT:
+                raise ValueError("{} argument of {}() should be constant"
+                                 .format(name, kind))
+            return val
+
+        if rhs.args:
+            raise ValueError("only keyword arguments supported for {}()"
+                             .format(kind))
+        if kind == 'expanding':
+            # all weights are 1
+            decay = 1.0
+            minp = get_const_kw('min_periods', 1)
         else:
-            def f(str_arr, pat):  # pragma: no cover
-                hpat.hiframes_api.str_contains_noregex(str_arr, pat)
+            if not get_const_kw('adjust', True):
+                raise ValueError("ewm(adjust=False) not supported")
+            if get_const_kw('ignore_na', False):
+                raise ValueError("ewm(ignore_na=True) not supported")
+            com = get_const_kw('com', None)
+            span = get_const_kw('span', None)
+            halflife = get_const_kw('halflife', None)
+            alpha = get_const_kw('alpha', None)
+            if (com, span, halflife, alpha).count(None) != 3:
+                raise ValueError("ewm() requires one of com, span, halflife "
+                                 "and alpha")
+            if com is not None:
+                alpha = 1.0 / (1.0 + com)
+            elif span is not None:
+                alpha = 2.0 / (span + 1.0)
+            elif halflife is not None:
+                alpha = 1.0 - math.exp(math.log(0.5) / halflife)
+            if not 0.0 < alpha <= 1.0:
+                raise ValueError("invalid ewm() decay parameter")
+            decay = 1.0 - alpha
+            minp = get_const_kw('min_periods', 0)
+        self.ewm_calls[lhs.name] = [col_var, kind, decay, minp]
+        return []  # remove
+
+    def _gen_ewm_call(self, args, col_var, kind, decay, minp, func, out_var):
+        """
+        call ewm/expanding kernel, which is a scan over decayed weights
+        (distributed pass sets the parallel flag)
+        """
+        supported = ['mean', 'var', 'std']
+        if kind == 'expanding':
+            supported.append('sum')
+        if func not in supported or args:
+            raise ValueError("{} {} not supported".format(kind, func))
+        loc = col_var.loc
+        func_text = "def f(arr, decay, minp):\n"
+        func_text += "  df_arr = hpat.hiframes_api.fix_rolling_array(arr)\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(df_arr)\n"
+        func_text += "  A = hpat.hiframes_rolling.ewm_{}(in_arr, decay, minp, False)\n".format(func)
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [col_var, ir.Const(decay, loc),
+                                    ir.Const(minp, loc)])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = out_var
+        return nodes
+
+    def _handle_str_method(self, lhs, rhs, str_col, func_name):
+        """
+        Handle string methods that return strings or lengths like:
+          B = df.column.str.lower()
+          B = df.column.str.slice(1, 3)
+        """
+        kws = dict(rhs.kws)
+        loc = str_col.loc
+        method = func_name[len('str.'):]
+
+        def get_arg(ind, name, default):
+            if len(rhs.args) > ind:
+                return rhs.args[ind]
+            return kws.get(name, default)
+
+        def get_const_arg(ind, name, default):
+            arg = get_arg(ind, name, None)
+            if arg is None:
+                return default
+            return get_constant(self.func_ir, arg, default)
+
+        func_text = "def f(arr, a0, a1, a2):\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(arr)\n"
+        args = [ir.Const(None, loc) for _ in range(3)]
+        if method in ['lower', 'upper']:
+            call = "str_case(in_arr, {})".format(method == 'upper')
+        elif method == 'len':
+            call = "str_len(in_arr)"
+        elif method in ['strip', 'lstrip', 'rstrip']:
+            if get_arg(0, 'to_strip', None) is not None:
+                raise ValueError("str.{}() to_strip argument not supported"
+                                 .format(method))
+            side = {'strip': hiframes_str_methods.BOTH,
+                    'lstrip': hiframes_str_methods.LEFT,
+                    'rstrip': hiframes_str_methods.RIGHT}[method]
+            call = "str_strip(in_arr, {})".format(side)
+        elif method == 'slice':
+            step = get_arg(2, 'step', None)
+            if (step is not None
+                    and get_constant(self.func_ir, step) not in (None, 1)):
+                raise ValueError("str.slice() step argument not supported")
+            args = [get_arg(0, 'start', ir.Const(None, loc)),
+                    get_arg(1, 'stop', ir.Const(None, loc)),
+                    ir.Const(None, loc)]
+            # None bounds are passed as 0 with has_start/has_stop False
+            has_bounds = [not isinstance(a, ir.Const)
+                          and get_constant(self.func_ir, a, 0) is not None
+                          for a in args]
+            func_text += "  start = {}\n".format("a0" if has_bounds[0] else 0)
+            func_text += "  stop = {}\n".format("a1" if has_bounds[1] else 0)
+            call = "str_slice(in_arr, start, stop, {}, {})".format(*has_bounds)
+        else:
+            assert method == 'replace'
+            args = [get_arg(0, 'pat', None), get_arg(1, 'repl', None),
+                    get_arg(2, 'n', ir.Const(-1, loc))]
+            if get_const_arg(5, 'regex', True):
+                # only regexes that are literals are supported
+                pat = get_constant(self.func_ir, args[0])
+                match = (hiframes_str_match.analyze_pattern(pat)
+                         if isinstance(pat, str) else None)
+                repl = get_constant(self.func_ir, args[1], '')
+                if (match is None or match[0] != hiframes_str_match.CONTAINS
+                        or len(match[1]) != 1
+                        or not isinstance(repl, str) or '\\' in repl):
+                    raise ValueError("str.replace() supports literal patterns"
+                                     " and replacements only")
+                args[0] = ir.Const(match[1][0], loc)
+            call = "str_replace(in_arr, a0, a1, a2)"
+        func_text += "  s = hpat.hiframes_str_methods.{}\n".format(call)
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [str_col] + args)
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = lhs
+        self.df_cols.add(lhs.name)  # output is Series
+        return nodes
+
+    def _handle_str_split_setup(self, lhs, rhs, str_col):
+        """
+        Handle string split like:
+          s = df.column.str.split(',')
+        Only element access is supported: s.str.get(0)
+        """
+        kws = dict(rhs.kws)
+        if ('expand' in kws
+                and get_constant(self.func_ir, kws['expand'], True)):
+            raise ValueError("str.split() expand argument not supported")
+        sep = rhs.args[0] if rhs.args else kws.get('pat', None)
+        maxsplit = rhs.args[1] if len(rhs.args) > 1 else kws.get('n', None)
+        self.str_split_calls[lhs.name] = [str_col, sep, maxsplit]
+        return []  # remove
+
+    def _handle_str_split_get(self, lhs, rhs, split_var):
+        """
+        Handle element access of split strings like:
+          B = df.column.str.split(',').str.get(0)
+        Missing tokens are empty strings.
+        """
+        str_col, sep, maxsplit = self.str_split_calls[split_var.name]
+        loc = str_col.loc
+        ind = rhs.args[0] if rhs.args else dict(rhs.kws)['i']
+        # None separator splits by whitespace
+        if sep is None or get_constant(self.func_ir, sep, '') is None:
+            sep = ir.Const('', loc)
+        if maxsplit is None or get_constant(self.func_ir, maxsplit, 0) is None:
+            maxsplit = ir.Const(-1, loc)
+
+        def f(arr, sep, maxsplit, ind):  # pragma: no cover
+            in_arr = hpat.hiframes_api.to_arr_from_series(arr)
+            s = hpat.hiframes_str_methods.str_split_get(in_arr, sep, maxsplit,
+                                                        ind)
 
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [str_col, sep, maxsplit, ind])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = lhs
+        self.df_cols.add(lhs.name)  # output is Series
+        return nodes
+
+    def _handle_str_match(self, lhs, rhs, str_col, func_name):
+        """
+        Handle string matching like:
+          B = df.column.str.contains('oo*', regex=True)
+          B = df.column.str.startswith('foo')
+        Constant regexes that reduce to literals are matched without regex.
+        """
+        kws = dict(rhs.kws)
+        pat = rhs.args[0] if rhs.args else kws['pat']
+        regex = func_name in ['str.contains', 'str.match']
+        if func_name == 'str.contains' and 'regex' in kws:
+            regex = get_constant(self.func_ir, kws['regex'], True)
+        pat_const = get_constant(self.func_ir, pat)
+
+        match = None
+        if not regex:
+            mode = {'str.contains': hiframes_str_match.CONTAINS,
+                    'str.startswith': hiframes_str_match.STARTSWITH,
+                    'str.endswith': hiframes_str_match.ENDSWITH}[func_name]
+            match = (mode, None)
+        elif isinstance(pat_const, str):
+            match = hiframes_str_match.analyze_pattern(
+                pat_const, func_name == 'str.match')
+
+        func_text = "def f(arr, pat):\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(arr)\n"
+        if match is not None:
+            mode, literals = match
+            pats = "(pat,)" if literals is None else repr(literals)
+            func_text += "  s = hpat.hiframes_str_match.str_match_literals(in_arr, {}, {})\n".format(pats, mode)
+        else:
+            mode = (hiframes_str_match.STARTSWITH if func_name == 'str.match'
+                    else hiframes_str_match.CONTAINS)
+            req = (hiframes_str_match.required_literal(pat_const)
+                   if isinstance(pat_const, str) else '')
+            func_text += "  e = hpat.str_ext.compile_regex(pat)\n"
+            func_text += "  s = hpat.hiframes_str_match.str_match_regex(in_arr, e, {}, {})\n".format(repr(req), mode)
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
         f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
         replace_arg_nodes(f_block, [str_col, pat])
         nodes = f_block.body[:-3]  # remove none return
         nodes[-1].target = lhs
         return nodes
 
+    def _handle_astype_category(self, lhs, str_col):
+        """
+        Handle dictionary encoding of string columns:
+          B = df.column.astype('category')
+        """
+        def f(arr):  # pragma: no cover
+            in_arr = hpat.hiframes_api.to_arr_from_series(arr)
+            s = hpat.hiframes_dict_enc.dict_encode_str_arr(in_arr)
+
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [str_col])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = lhs
+        return nodes
+
     def _get_str_contains_col(self, func_def):
         require(isinstance(func_def, ir.Expr) and func_def.op == 'getattr')
         require(func_def.attr == 'contains')
@@ -1025,7 +1474,8 @@ class HiFrames(object):
         return col
 
     def _gen_column_call(self, out_var, args, col_var, func, kws):
-        if func in ['fillna', 'pct_change', 'shift']:
+        if func in ['fillna', 'pct_change', 'shift', 'value_counts',
+                    'nlargest', 'nsmallest']:
             self.df_cols.add(out_var.name)  # output is Series except sum
         if func == 'count':
             return self._gen_col_count(out_var, args, col_var)
@@ -1040,50 +1490,46 @@ class HiFrames(object):
         if func == 'std':
             return self._gen_col_std(out_var, args, col_var)
         if func == 'quantile':
-            return self._gen_col_quantile(out_var, args, col_var)
+            return self._gen_col_quantile(out_var, args, col_var, kws)
         if func == 'nunique':
-            return self._gen_col_nunique(out_var, args, col_var)
+            return self._gen_col_nunique(out_var, args, col_var, kws)
         if func == 'describe':
             return self._gen_col_describe(out_var, args, col_var)
+        if func in ['unique', 'value_counts']:
+            return self._gen_col_unique(out_var, args, col_var, func, kws)
+        if func in ['nlargest', 'nsmallest']:
+            return self._gen_col_nlargest(out_var, args, col_var, func, kws)
         else:
             assert func in ['pct_change', 'shift']
-            return self._gen_column_shift_pct(out_var, args, col_var, func)
+            return self._gen_column_shift_pct(out_var, args, col_var, func,
+                                              kws)
 
-    def _gen_column_shift_pct(self, out_var, args, col_var, func):
+    def _get_shift_periods(self, args, kws, loc):
+        """periods argument of shift-like calls, which can be a runtime value
+        """
+        if args:
+            return args[0]
+        if 'periods' in kws:
+            return kws['periods']
+        return ir.Const(1, loc)
+
+    def _gen_column_shift_pct(self, out_var, args, col_var, func, kws):
+        assert func in ['pct_change', 'shift']
         loc = col_var.loc
-        if func == 'pct_change':
-            shift_const = 1
-            if args:
-                shift_const = get_constant(self.func_ir, args[0])
-                assert shift_const is not NOT_CONSTANT
-            func_text = 'def g(a):\n  return (a[0]-a[{}])/a[{}]\n'.format(
-                -shift_const, -shift_const)
-        else:
-            assert func == 'shift'
-            shift_const = get_constant(self.func_ir, args[0])
-            assert shift_const is not NOT_CONSTANT
-            func_text = 'def g(a):\n  return a[{}]\n'.format(-shift_const)
+        shift = self._get_shift_periods(args, kws, loc)
 
+        # streaming kernel, distributed pass sets the parallel flag
+        func_text = "def f(arr, shift):\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(arr)\n"
+        func_text += "  A = hpat.hiframes_rolling.{}_fixed(in_arr, shift, False)\n".format(func)
         loc_vars = {}
         exec(func_text, {}, loc_vars)
-        kernel_func = loc_vars['g']
-
-        index_offsets = [0]
-        fir_globals = self.func_ir.func_id.func.__globals__
-        stencil_nodes = gen_stencil_call(
-            col_var, out_var, kernel_func, index_offsets, fir_globals)
-
-        border_text = 'def f(A):\n  A[0:{}] = np.nan\n'.format(shift_const)
-        loc_vars = {}
-        exec(border_text, {}, loc_vars)
-        border_func = loc_vars['f']
-
-        f_blocks = compile_to_numba_ir(border_func, {'np': np}).blocks
-        block = f_blocks[min(f_blocks.keys())]
-        replace_arg_nodes(block, [out_var])
-        setitem_nodes = block.body[:-3]  # remove none return
-
-        return stencil_nodes + setitem_nodes
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [col_var, shift])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = out_var
+        return nodes
 
     def _gen_col_count(self, out_var, args, col_var):
         def f(A):  # pragma: no cover
@@ -1163,19 +1609,40 @@ class HiFrames(object):
         s_nodes[-1].target = out_var
         return v_nodes + s_nodes
 
-    def _gen_col_quantile(self, out_var, args, col_var):
-        def f(A, q):  # pragma: no cover
-            s = hpat.hiframes_api.quantile(A, q)
+    def _gen_col_quantile(self, out_var, args, col_var, kws):
+        q = args[0] if args else kws['q']
+        if self._is_approx(kws):
+            def f(arr, q):  # pragma: no cover
+                in_arr = hpat.hiframes_api.to_arr_from_series(arr)
+                s = hpat.hiframes_stats.approx_quantile(in_arr, q, False)
+        else:
+            def f(A, q):  # pragma: no cover
+                s = hpat.hiframes_api.quantile(A, q)
 
         f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
-        replace_arg_nodes(f_block, [col_var, args[0]])
+        replace_arg_nodes(f_block, [col_var, q])
         nodes = f_block.body[:-3]  # remove none return
         nodes[-1].target = out_var
         return nodes
 
-    def _gen_col_nunique(self, out_var, args, col_var):
-        def f(A):  # pragma: no cover
-            s = hpat.hiframes_api.nunique(A)
+    def _is_approx(self, kws):
+        """value of constant 'approx' argument of quantile/nunique calls
+        """
+        if 'approx' not in kws:
+            return False
+        approx = guard(find_const, self.func_ir, kws['approx'])
+        if not isinstance(approx, bool):
+            raise ValueError("approx argument should be a constant boolean")
+        return approx
+
+    def _gen_col_nunique(self, out_var, args, col_var, kws):
+        if self._is_approx(kws):
+            def f(arr):  # pragma: no cover
+                A = hpat.hiframes_api.to_arr_from_series(arr)
+                s = hpat.hiframes_stats.approx_nunique(A, False)
+        else:
+            def f(A):  # pragma: no cover
+                s = hpat.hiframes_api.nunique(A)
 
         f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
         replace_arg_nodes(f_block, [col_var])
@@ -1183,42 +1650,77 @@ class HiFrames(object):
         nodes[-1].target = out_var
         return nodes
 
+    def _gen_col_unique(self, out_var, args, col_var, func, kws):
+        """unique() output is an array of unique values, value_counts() output
+        is a Series of counts in descending order indexed by the values
+        """
+        if func == 'value_counts' and (args or kws):
+            raise ValueError("value_counts() arguments not supported")
+        func_text = "def f(arr):\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(arr)\n"
+        func_text += "  s = hpat.hiframes_unique.{}(in_arr, False)\n".format(func)
+        if func == 'value_counts':
+            func_text += "  vals = s[0]\n"
+            func_text += "  counts = s[1]\n"
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [col_var])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = out_var
+        if func == 'value_counts':
+            # values are the index of counts, used when output is returned
+            vals_assign = [stmt for stmt in nodes
+                           if isinstance(stmt.value, ir.Expr)
+                           and stmt.value.op == 'static_getitem'
+                           and stmt.value.index == 0][0]
+            self.df_index[out_var.name] = vals_assign.target
+        return nodes
+
+    def _gen_col_nlargest(self, out_var, args, col_var, func, kws):
+        """top n values of column in best-first order (replicated Series)
+        """
+        self._check_topk_keep(func, kws)
+        n = args[0] if args else kws.get('n', ir.Const(5, col_var.loc))
+        largest = func == 'nlargest'
+        func_text = "def f(arr, n):\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(arr)\n"
+        func_text += "  inds = hpat.hiframes_topk.local_topk(in_arr, n, {})\n".format(largest)
+        func_text += "  pos = hpat.hiframes_topk.select_topk(in_arr, inds, n, {}, False)\n".format(largest)
+        func_text += "  s = hpat.hiframes_topk.take_topk(in_arr, inds, pos, False)\n"
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [col_var, n])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = out_var
+        return nodes
+
     def _gen_col_describe(self, out_var, args, col_var):
-        def f(A):  # pragma: no cover
-            a_count = np.float64(hpat.hiframes_api.count(A))
-            a_min = np.min(A)
-            a_max = np.max(A)
-            a_mean = hpat.hiframes_api.mean(A)
-            a_std = hpat.hiframes_api.var(A)**0.5
-            q25 = hpat.hiframes_api.quantile(A, .25)
-            q50 = hpat.hiframes_api.quantile(A, .5)
-            q75 = hpat.hiframes_api.quantile(A, .75)
-            # TODO: pandas returns dataframe, maybe return namedtuple instread of
-            # string?
-            # TODO: fix string formatting to match python/pandas
-            s = "count    " + str(a_count) + "\n"\
-                "mean     " + str(a_mean) + "\n"\
-                "std      " + str(a_std) + "\n"\
-                "min      " + str(a_min) + "\n"\
-                "25%      " + str(q25) + "\n"\
-                "50%      " + str(q50) + "\n"\
-                "75%      " + str(q75) + "\n"\
-                "max      " + str(a_max) + "\n"
+        """fused describe() kernel, output is a Series of count, mean, std,
+        min, 25%, 50%, 75% and max
+        """
+        def f(arr):  # pragma: no cover
+            in_arr = hpat.hiframes_api.to_arr_from_series(arr)
+            s = hpat.hiframes_stats.describe(in_arr, False)
 
-        f_block = compile_to_numba_ir(
-            f, {'hpat': hpat, 'np': np}).blocks.popitem()[1]
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
         replace_arg_nodes(f_block, [col_var])
         nodes = f_block.body[:-3]  # remove none return
         nodes[-1].target = out_var
+        self.df_cols.add(out_var.name)  # output is Series
+        self.df_index[out_var.name] = hiframes_stats.describe_labels
         return nodes
 
     def _is_groupby(self, agg_var):
         """determines whether variable is coming from groupby() or groupby()[]
         """
         var_def = guard(get_definition, self.func_ir, agg_var)
-        # groupby()['B'] case
+        # groupby()['B'] and groupby().B case
         if (isinstance(var_def, ir.Expr)
-                and var_def.op in ['getitem', 'static_getitem']):
+                and var_def.op in ['getitem', 'static_getitem', 'getattr']):
             return self._is_groupby(var_def.value)
         # groupby() called on column or df
         call_def = guard(find_callname, self.func_ir, var_def)
@@ -1284,6 +1786,12 @@ class HiFrames(object):
 
     def _handle_aggregate(self, lhs, rhs, obj_var, func_name, label):
         # format df.groupby('A')['B'].agg(lambda x: x.max()-x.min())
+        if func_name in ['shift', 'diff']:
+            return self._handle_groupby_shift(lhs, rhs, obj_var, func_name)
+        if func_name in ['quantile', 'nunique']:
+            return self._handle_groupby_approx(lhs, rhs, obj_var, func_name)
+        if func_name in ['nlargest', 'nsmallest']:
+            return self._handle_groupby_nlargest(lhs, rhs, obj_var, func_name)
         _supported_agg_funcs = ['agg', 'aggregate', 'sum', 'count', 'mean',
                                 'min', 'max']
         # TODO: support aggregation functions sum, count, etc.
@@ -1328,6 +1836,115 @@ class HiFrames(object):
             in_vars, self.df_vars[df_var.name][key_colname],
             agg_func, out_types, lhs.loc)]
 
+    def _handle_groupby_shift(self, lhs, rhs, obj_var, func_name):
+        """
+        Handle groupby shift/diff calls like:
+          A = df.groupby('sym').B.shift(1)
+        Output is aligned with input rows. Keys don't need to be sorted,
+        distributed data is shuffled by key and results are sent back.
+        """
+        df_var, key_colname, _, out_colnames, explicit_select = \
+            self._analyze_agg_select(obj_var)
+        if not explicit_select or len(out_colnames) != 1:
+            raise ValueError("groupby {} requires one selected column"
+                             .format(func_name))
+        loc = lhs.loc
+        in_var = self.df_vars[df_var.name][out_colnames[0]]
+        key_var = self.df_vars[df_var.name][key_colname]
+        shift = self._get_shift_periods(rhs.args, dict(rhs.kws), loc)
+
+        func_text = "def f(arr, key_arr, shift):\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(arr)\n"
+        func_text += "  keys = hpat.hiframes_api.to_arr_from_series(key_arr)\n"
+        func_text += "  A = hpat.hiframes_rolling.group_{}(in_arr, keys, shift, False)\n".format(func_name)
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [in_var, key_var, shift])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = lhs
+        self.df_cols.add(lhs.name)  # output is Series
+        return nodes
+
+    def _handle_groupby_approx(self, lhs, rhs, obj_var, func_name):
+        """
+        Handle approximate groupby quantile/nunique calls like:
+          A = df.groupby('sym').B.quantile(.95, approx=True)
+          A = df.groupby('sym').B.nunique(approx=True)
+        Output has one value per group, similar to Aggregate output.
+        """
+        kws = dict(rhs.kws)
+        if not self._is_approx(kws):
+            raise ValueError("groupby {} requires approx=True".format(
+                func_name))
+        df_var, key_colname, _, out_colnames, explicit_select = \
+            self._analyze_agg_select(obj_var)
+        if not explicit_select or len(out_colnames) != 1:
+            raise ValueError("groupby {} requires one selected column"
+                             .format(func_name))
+        in_var = self.df_vars[df_var.name][out_colnames[0]]
+        key_var = self.df_vars[df_var.name][key_colname]
+
+        if func_name == 'quantile':
+            q = rhs.args[0] if rhs.args else kws['q']
+            def f(arr, key_arr, q):  # pragma: no cover
+                in_arr = hpat.hiframes_api.to_arr_from_series(arr)
+                keys = hpat.hiframes_api.to_arr_from_series(key_arr)
+                A = hpat.hiframes_stats.group_approx_quantile(
+                    keys, in_arr, q, False)
+            args = [in_var, key_var, q]
+        else:
+            def f(arr, key_arr):  # pragma: no cover
+                in_arr = hpat.hiframes_api.to_arr_from_series(arr)
+                keys = hpat.hiframes_api.to_arr_from_series(key_arr)
+                A = hpat.hiframes_stats.group_approx_nunique(
+                    keys, in_arr, False)
+            args = [in_var, key_var]
+
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, args)
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = lhs
+        self.df_cols.add(lhs.name)  # output is Series
+        return nodes
+
+    def _handle_groupby_nlargest(self, lhs, rhs, obj_var, func_name):
+        """
+        Handle groupby top n calls like:
+          A = df.groupby('sym').B.nlargest(3)
+        Output has top n values of every group (groups in order of
+        appearance) indexed by the group keys.
+        """
+        kws = dict(rhs.kws)
+        self._check_topk_keep(func_name, kws)
+        df_var, key_colname, _, out_colnames, explicit_select = \
+            self._analyze_agg_select(obj_var)
+        if not explicit_select or len(out_colnames) != 1:
+            raise ValueError("groupby {} requires one selected column"
+                             .format(func_name))
+        in_var = self.df_vars[df_var.name][out_colnames[0]]
+        key_var = self.df_vars[df_var.name][key_colname]
+        n = rhs.args[0] if rhs.args else kws.get('n', ir.Const(5, lhs.loc))
+
+        func_text = "def f(arr, key_arr, n):\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(arr)\n"
+        func_text += "  keys = hpat.hiframes_api.to_arr_from_series(key_arr)\n"
+        func_text += "  s = hpat.hiframes_topk.group_topk(keys, in_arr, n, {}, False)\n".format(func_name == 'nlargest')
+        func_text += "  out_keys = s[0]\n"
+        func_text += "  A = s[1]\n"
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [in_var, key_var, n])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = lhs
+        self.df_cols.add(lhs.name)  # output is Series
+        # group keys are the index of output, used when output is returned
+        self.df_index[lhs.name] = nodes[-2].target
+        return nodes
+
     def _analyze_agg_select(self, obj_var):
         """analyze selection of columns in after groupby()
         e.g. groupby('A')['B'], groupby('A')['B', 'C'], groupby('A')
@@ -1343,6 +1960,10 @@ class HiFrames(object):
             if isinstance(out_colnames, str):
                 out_colnames = [out_colnames]
             explicit_select = True
+        elif isinstance(select_def, ir.Expr) and select_def.op == 'getattr':
+            agg_var = select_def.value
+            out_colnames = [select_def.attr]
+            explicit_select = True
         else:
             agg_var = obj_var
 
@@ -1402,9 +2023,13 @@ class HiFrames(object):
 
         return agg_func
 
-    def _gen_rolling_call(self, args, col_var, win_size, center, func, out_var):
+    def _gen_rolling_call(self, args, col_var, win_size, center, on_var,
+                          func, out_var):
         loc = col_var.loc
         scope = col_var.scope
+        if isinstance(win_size, str):
+            return self._gen_rolling_offset_call(args, col_var, win_size,
+                                                 center, on_var, func, out_var)
         if func == 'apply':
             if len(args) != 1:  # pragma: no cover
                 raise ValueError("One argument expected for rolling apply")
@@ -1413,24 +2038,10 @@ class HiFrames(object):
             if len(args) != 0:  # pragma: no cover
                 raise ValueError("No argument expected for rolling {}".format(
                     func))
-            g_pack = "np"
-            if func in ['std', 'var', 'mean']:
-                g_pack = "hpat.hiframes_api"
-            if isinstance(win_size, int) and win_size < LARGE_WIN_SIZE:
-                # unroll if size is less than 5
-                kernel_args = ','.join(['a[{}]'.format(-i)
-                                        for i in range(win_size)])
-                kernel_expr = '{}.{}(np.array([{}]))'.format(
-                    g_pack, func, kernel_args)
-                if func == 'sum':  # simplify sum
-                    kernel_expr = '+'.join(['a[{}]'.format(-i)
-                                            for i in range(win_size)])
-            else:
-                kernel_expr = '{}.{}(a[(-w+1):1])'.format(g_pack, func)
-            func_text = 'def g(a, w):\n  return {}\n'.format(kernel_expr)
-            loc_vars = {}
-            exec(func_text, {}, loc_vars)
-            kernel_func = loc_vars['g']
+            return self._gen_rolling_stream_call(col_var, win_size, center,
+                                                 func, out_var)
+        else:  # pragma: no cover
+            raise ValueError("rolling {} not supported".format(func))
 
         init_nodes = []
         col_var, init_nodes = self._fix_rolling_array(col_var, func)
@@ -1477,6 +2088,58 @@ class HiFrames(object):
 
         return init_nodes + stencil_nodes + setitem_nodes
 
+    def _gen_rolling_stream_call(self, col_var, win_size, center, func,
+                                 out_var):
+        """
+        call O(n) streaming kernel of rolling func, distributed pass sets
+        the parallel flag for distributed arrays
+        """
+        loc = col_var.loc
+        func_text = "def f(arr, w, center):\n"
+        func_text += "  df_arr = hpat.hiframes_api.fix_rolling_array(arr)\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(df_arr)\n"
+        func_text += "  A = hpat.hiframes_rolling.roll_fixed_{}(in_arr, w, center, False)\n".format(func)
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        if isinstance(win_size, int):
+            win_size = ir.Const(win_size, loc)
+        replace_arg_nodes(f_block, [col_var, win_size, ir.Const(center, loc)])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = out_var
+        return nodes
+
+    def _gen_rolling_offset_call(self, args, col_var, win_size, center,
+                                 on_var, func, out_var):
+        """
+        call streaming kernel of time offset window (e.g. '5min'), which
+        sweeps over sorted datetime64 column 'on_var'
+        """
+        if on_var is None:
+            raise ValueError("rolling with offset window requires 'on' column")
+        if center:
+            raise ValueError("center not supported for offset windows")
+        if func not in ['sum', 'mean', 'min', 'max', 'std', 'var'] or args:
+            raise ValueError("rolling {} not supported for offset windows"
+                             .format(func))
+        import pandas as pd
+        win_ns = pd.tseries.frequencies.to_offset(win_size).nanos
+        loc = col_var.loc
+        func_text = "def f(arr, on_arr, w):\n"
+        func_text += "  df_arr = hpat.hiframes_api.fix_rolling_array(arr)\n"
+        func_text += "  in_arr = hpat.hiframes_api.to_arr_from_series(df_arr)\n"
+        func_text += "  on = hpat.hiframes_api.to_arr_from_series(on_arr)\n"
+        func_text += "  A = hpat.hiframes_rolling.roll_offset_{}(in_arr, on, w, False)\n".format(func)
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, [col_var, on_var, ir.Const(win_ns, loc)])
+        nodes = f_block.body[:-3]  # remove none return
+        nodes[-1].target = out_var
+        return nodes
+
     def _fix_rolling_array(self, col_var, func):
         """
         for integers and bools, the output should be converted to float64
@@ -1535,11 +2198,37 @@ class HiFrames(object):
         if isinstance(self.args[arg_ind], PandasDataFrameType):
             df_typ = self.args[arg_ind]
             df_items = {}
+            # string columns are unboxed together to copy them in parallel
+            str_inds = [i for i, t in enumerate(df_typ.col_types)
+                        if t == string_type]
+            if str_inds:
+                func_text = "def f(_df):\n"
+                func_text += "  _str_cols = hpat.hiframes_api.unbox_df_str_columns(_df, {})\n".format(
+                    ", ".join(str(i) for i in str_inds))
+                loc_vars = {}
+                exec(func_text, {}, loc_vars)
+                f = loc_vars['f']
+                f_block = compile_to_numba_ir(f,
+                            {'hpat': hpat}).blocks.popitem()[1]
+                replace_arg_nodes(f_block, [arg_var])
+                nodes += f_block.body[:-3]
+                str_cols_var = nodes[-1].target
             for i, col in enumerate(df_typ.col_names):
                 col_dtype = df_typ.col_types[i]
                 if col_dtype == string_type:
-                    alloc_dt = 11  # dummy string value
-                elif col_dtype == types.boolean:
+                    func_text = "def f(_str_cols):\n"
+                    func_text += "  _col_input_{} = hpat.hiframes_api.to_series_type(_str_cols[{}])\n".format(col, str_inds.index(i))
+                    loc_vars = {}
+                    exec(func_text, {}, loc_vars)
+                    f = loc_vars['f']
+                    f_block = compile_to_numba_ir(f,
+                                {'hpat': hpat}).blocks.popitem()[1]
+                    replace_arg_nodes(f_block, [str_cols_var])
+                    nodes += f_block.body[:-3]
+                    df_items[col] = nodes[-1].target
+                    continue
+
+                if col_dtype == types.boolean:
                     alloc_dt = "np.bool_"
                 elif col_dtype == types.NPDatetime('ns'):
                     alloc_dt = 12  # XXX const code for dt64 since we can't init dt64 dtype
@@ -1577,7 +2266,7 @@ class HiFrames(object):
 
         return nodes
 
-    def _box_return_df(self, cast_assign, df_map):
+    def _box_return_df(self, cast_assign, df_map, index_labels=None):
         #
         arrs = list(df_map.values())
         names = list(df_map.keys())
@@ -1587,7 +2276,11 @@ class HiFrames(object):
         col_names = ", ".join(['"{}"'.format(cname) for cname in names])
 
         func_text = "def f({}):\n".format(arg_names)
-        func_text += "  _dt_arr = hpat.hiframes_api.box_df({}, {})\n".format(col_names, arg_names)
+        func_text += "  _df = hpat.hiframes_api.box_df({}, {})\n".format(col_names, arg_names)
+        if index_labels is not None:
+            func_text += "  hpat.hiframes_api.set_df_index(_df, {})\n".format(
+                ", ".join(['"{}"'.format(l) for l in index_labels]))
+        func_text += "  _dt_arr = _df\n"
         loc_vars = {}
         exec(func_text, {}, loc_vars)
         f = loc_vars['f']
@@ -1601,6 +2294,32 @@ class HiFrames(object):
         return nodes
 
 
+    def _box_return_series_index(self, cast_assign, series_var, index):
+        """box returned Series with its index, which is a variable of index
+        values (e.g. value_counts()) or constant labels (e.g. describe())
+        """
+        args = [series_var]
+        if isinstance(index, ir.Var):
+            args.append(index)
+            index_text = "I"
+        else:
+            index_text = ", ".join(['"{}"'.format(l) for l in index])
+        func_text = "def f(S{}):\n".format(", I" if len(args) == 2 else "")
+        func_text += "  A = hpat.hiframes_api.to_arr_from_series(S)\n"
+        func_text += "  _s = hpat.hiframes_api.box_series_index(A, {})\n".format(
+            index_text)
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+
+        f_block = compile_to_numba_ir(
+            f, {'hpat': hpat}).blocks.popitem()[1]
+        replace_arg_nodes(f_block, args)
+        nodes = f_block.body[:-3]  # remove none return
+        cast_assign.value = nodes[-1].target
+        nodes.append(cast_assign)
+        return nodes
+
     def _add_node_defs(self, nodes):
         # TODO: add node defs for all new nodes
         loc = ir.Loc("", -1)
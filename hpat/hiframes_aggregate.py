@@ -7,7 +7,7 @@ import numpy as np
 import numba
 from numba import typeinfer, ir, ir_utils, config, types, compiler
 from numba.ir_utils import (visit_vars_inner, replace_vars_inner, remove_dead,
-                            compile_to_numba_ir, replace_arg_nodes,
+                            replace_arg_nodes,
                             replace_vars_stmt, find_callname, guard,
                             mk_unique_var, find_topo_order, is_getitem,
                             build_definitions, remove_dels, get_ir_of_code,
@@ -20,13 +20,12 @@ from numba.extending import overload, lower_builtin
 import hpat
 from hpat.utils import (is_call, is_var_assign, is_assign, debug_prints,
         alloc_arr_tup, empty_like_type)
-from hpat import distributed, distributed_analysis
+from hpat.utils import compile_to_numba_ir
+from hpat import distributed, distributed_analysis, compile_profiler
 from hpat.distributed_analysis import Distribution
 from hpat.distributed_lower import _h5_typ_table
 from hpat.str_ext import string_type
-from hpat.set_ext import num_total_chars_set_string
-from hpat.str_arr_ext import (string_array_type, pre_alloc_string_array,
-                            setitem_string_array, get_offset_ptr, get_data_ptr)
+from hpat.str_arr_ext import string_array_type, getitem_view, dict_str_arr_type
 from hpat.pd_series_ext import SeriesType
 from hpat.hiframes_sort import (
     alloc_shuffle_metadata, data_alloc_shuffle_metadata, alltoallv,
@@ -34,6 +33,8 @@ from hpat.hiframes_sort import (
     update_shuffle_meta, update_data_shuffle_meta, finalize_data_shuffle_meta,
     )
 from hpat.hiframes_join import write_send_buff
+from hpat.hiframes_dict_enc import (dict_encode, gen_dict_arrs_to_codes,
+                                    gen_codes_var, gen_codes_to_dict_arr)
 AggFuncStruct = namedtuple('AggFuncStruct',
     ['var_typs', 'init_func', 'update_all_func', 'combine_all_func',
      'eval_all_func'])
@@ -240,7 +241,7 @@ def aggregate_array_analysis(aggregate_node, equiv_set, typemap,
     # arrays of input df have same size in first dimension as key array
     # string array doesn't have shape in array analysis
     key_typ = typemap[aggregate_node.key_arr.name]
-    if key_typ == string_array_type:
+    if key_typ in (string_array_type, dict_str_arr_type):
         all_shapes = []
     else:
         col_shape = equiv_set.get_shape(aggregate_node.key_arr)
@@ -273,7 +274,7 @@ def aggregate_array_analysis(aggregate_node, equiv_set, typemap,
 
     for col_var in out_vars:
         typ = typemap[col_var.name]
-        if typ == string_array_type:
+        if typ in (string_array_type, dict_str_arr_type):
             continue
         (shape, c_post) = array_analysis._gen_shape_call(
             equiv_set, col_var, typ.ndim, None)
@@ -393,6 +394,11 @@ def agg_distributed_run(agg_node, array_dists, typemap, calltypes, typingctx, ta
 
     # TODO: handle key column being part of output
 
+    # dictionary-encoded keys are grouped by codes of a unified dictionary
+    if typemap[agg_node.key_arr.name] == dict_str_arr_type:
+        return _agg_dict_key_run(agg_node, parallel, array_dists, typemap,
+                                 calltypes, typingctx, targetctx)
+
     key_typ = typemap[agg_node.key_arr.name]
     # get column variables
     in_col_vars = [v for (n, v) in sorted(agg_node.df_in_vars.items())]
@@ -460,6 +466,30 @@ def agg_distributed_run(agg_node, array_dists, typemap, calltypes, typingctx, ta
 
 distributed.distributed_run_extensions[Aggregate] = agg_distributed_run
 
+
+def _agg_dict_key_run(agg_node, parallel, array_dists, typemap, calltypes,
+                      typingctx, targetctx):
+    """aggregate with codes of a dictionary-encoded key, which are the same
+    on all processes for the same string
+    """
+    key_arr = agg_node.key_arr
+    nodes, var_codes = gen_dict_arrs_to_codes(
+        [[key_arr]], parallel, array_dists, typemap, calltypes, typingctx)
+    codes_var, dict_var = var_codes[key_arr.name]
+    codes_agg_node = copy.copy(agg_node)
+    codes_agg_node.key_arr = codes_var
+    post_nodes = []
+    if agg_node.out_key_var is not None:
+        out_key_var = agg_node.out_key_var
+        codes_agg_node.out_key_var = gen_codes_var(out_key_var, array_dists,
+                                                   typemap)
+        post_nodes = gen_codes_to_dict_arr(
+            codes_agg_node.out_key_var, dict_var, out_key_var, typemap,
+            calltypes, typingctx)
+    nodes += agg_distributed_run(codes_agg_node, array_dists, typemap,
+                                 calltypes, typingctx, targetctx)
+    return nodes + post_nodes
+
 @numba.njit
 def parallel_agg(key_arr, data_redvar_dummy, out_dummy_tup, data_in, init_vals,
         __update_redvars, __combine_redvars, __eval_res, return_key, pivot_arr):  # pragma: no cover
@@ -468,20 +498,25 @@ def parallel_agg(key_arr, data_redvar_dummy, out_dummy_tup, data_in, init_vals,
     shuffle_meta = alloc_shuffle_metadata(key_arr, n_pes, False)
     data_shuffle_meta = data_alloc_shuffle_metadata(data_redvar_dummy, n_pes, False)
 
+    # encode keys, only unique keys are sent
+    codes, first_rows = dict_encode(key_arr, len(key_arr))
+    n_uniq_keys = len(first_rows)
+    node_ids = np.empty(n_uniq_keys, np.int64)
+
     # calc send/recv counts
-    key_set = get_key_set(key_arr)
-    for i in range(len(key_arr)):
-        val = key_arr[i]
-        if val not in key_set:
-            key_set.add(val)
-            node_id = hash(val) % n_pes
-            update_shuffle_meta(shuffle_meta, node_id, i, val, False)
+    for j in range(n_uniq_keys):
+        i = first_rows[j]
+        val = getitem_view(key_arr, i)
+        node_id = hash(val) % n_pes
+        node_ids[j] = node_id
+        update_shuffle_meta(shuffle_meta, node_id, i, val, False)
         #update_data_shuffle_meta(data_shuffle_meta, node_id, i, data, False)
 
     finalize_shuffle_meta(key_arr, shuffle_meta, False)
     finalize_data_shuffle_meta(data_redvar_dummy, data_shuffle_meta, shuffle_meta, False, init_vals)
 
-    agg_parallel_local_iter(key_arr, data_in, shuffle_meta, data_shuffle_meta, __update_redvars, pivot_arr)
+    agg_parallel_local_iter(key_arr, codes, first_rows, node_ids, data_in,
+        shuffle_meta, data_shuffle_meta, __update_redvars, pivot_arr)
     alltoallv(key_arr, shuffle_meta)
     reduce_recvs = alltoallv_tup(data_redvar_dummy, data_shuffle_meta, shuffle_meta)
     #print(data_shuffle_meta[0].out_arr)
@@ -497,57 +532,34 @@ def parallel_agg(key_arr, data_redvar_dummy, out_dummy_tup, data_in, init_vals,
 
 
 @numba.njit
-def agg_parallel_local_iter(key_arr, data_in, shuffle_meta, data_shuffle_meta,
-                                        __update_redvars, pivot_arr):  # pragma: no cover
-    # _init_val_0 = np.int64(0)
-    # redvar_0_arr = np.full(n_uniq_keys, _init_val_0, np.int64)
-    # _init_val_1 = np.int64(0)
-    # redvar_1_arr = np.full(n_uniq_keys, _init_val_1, np.int64)
-    # out_key = np.empty(n_uniq_keys, np.float64)
-    n_pes = hpat.distributed_api.get_size()
-    key_write_map = get_key_dict(key_arr)#hpat.dict_ext.init_dict_float64_int64()
+def agg_parallel_local_iter(key_arr, codes, first_rows, node_ids, data_in,
+        shuffle_meta, data_shuffle_meta, __update_redvars, pivot_arr):  # pragma: no cover
     redvar_arrs = get_shuffle_send_buffs(data_shuffle_meta)
 
+    # write unique keys to send buffers and find write index of every code
+    w_inds = np.empty(len(first_rows), np.int64)
+    for j in range(len(first_rows)):
+        node_id = node_ids[j]
+        k = getitem_view(key_arr, first_rows[j])
+        w_inds[j] = write_send_buff(shuffle_meta, node_id, k)
+        shuffle_meta.tmp_offset[node_id] += 1
+
     for i in range(len(key_arr)):
-        k = key_arr[i]
-        if k not in key_write_map:
-            node_id = hash(k) % n_pes
-            # w_ind = shuffle_meta.send_disp[node_id] + shuffle_meta.tmp_offset[node_id]
-            # shuffle_meta.send_buff[w_ind] = k
-            w_ind = write_send_buff(shuffle_meta, node_id, k)
-            shuffle_meta.tmp_offset[node_id] += 1
-            key_write_map[k] = w_ind
-        else:
-            w_ind = key_write_map[k]
-        __update_redvars(redvar_arrs, data_in, w_ind, i, pivot_arr)
-        #redvar_arrs[0][w_ind], redvar_arrs[1][w_ind] = __update_redvars(redvar_arrs[0][w_ind], redvar_arrs[1][w_ind], data_in[0][i])
+        __update_redvars(redvar_arrs, data_in, w_inds[codes[i]], i, pivot_arr)
     return
 
 
 @numba.njit
 def agg_parallel_combine_iter(key_arr, reduce_recvs, out_dummy_tup, init_vals,
                 __combine_redvars, __eval_res, return_key, data_in, pivot_arr):  # pragma: no cover
-    key_set = set(key_arr)
-    n_uniq_keys = len(key_set)
-    out_arrs = alloc_agg_output(n_uniq_keys, out_dummy_tup, key_set, data_in,
-                                                                    return_key)
-    # out_arrs = alloc_arr_tup(n_uniq_keys, out_dummy_tup)
+    codes, first_rows = dict_encode(key_arr, len(key_arr))
+    n_uniq_keys = len(first_rows)
+    out_arrs = alloc_agg_output(n_uniq_keys, out_dummy_tup, key_arr,
+                                first_rows, data_in, return_key)
     local_redvars = alloc_arr_tup(n_uniq_keys, reduce_recvs, init_vals)
 
-    key_write_map = get_key_dict(key_arr)
-    curr_write_ind = 0
     for i in range(len(key_arr)):
-        k = key_arr[i]
-        if k not in key_write_map:
-            w_ind = curr_write_ind
-            curr_write_ind += 1
-            key_write_map[k] = w_ind
-            if return_key:
-                setitem_array_with_str(out_arrs[-1], w_ind, k)
-                # out_arrs[-1][w_ind] = k
-        else:
-            w_ind = key_write_map[k]
-        __combine_redvars(local_redvars, reduce_recvs, w_ind, i, pivot_arr)
+        __combine_redvars(local_redvars, reduce_recvs, codes[i], i, pivot_arr)
     for j in range(n_uniq_keys):
         __eval_res(local_redvars, out_arrs, j)
     return out_arrs
@@ -555,27 +567,14 @@ def agg_parallel_combine_iter(key_arr, reduce_recvs, out_dummy_tup, init_vals,
 @numba.njit
 def agg_seq_iter(key_arr, redvar_dummy_tup, out_dummy_tup, data_in, init_vals,
                  __update_redvars, __eval_res, return_key, pivot_arr):  # pragma: no cover
-    key_set = set(key_arr)
-    n_uniq_keys = len(key_set)
-    out_arrs = alloc_agg_output(n_uniq_keys, out_dummy_tup, key_set, data_in,
-                                                                    return_key)
-    # out_arrs = alloc_arr_tup(n_uniq_keys, out_dummy_tup)
+    codes, first_rows = dict_encode(key_arr, len(key_arr))
+    n_uniq_keys = len(first_rows)
+    out_arrs = alloc_agg_output(n_uniq_keys, out_dummy_tup, key_arr,
+                                first_rows, data_in, return_key)
     local_redvars = alloc_arr_tup(n_uniq_keys, redvar_dummy_tup, init_vals)
 
-    key_write_map = get_key_dict(key_arr)
-    curr_write_ind = 0
     for i in range(len(key_arr)):
-        k = key_arr[i]
-        if k not in key_write_map:
-            w_ind = curr_write_ind
-            curr_write_ind += 1
-            key_write_map[k] = w_ind
-            if return_key:
-                setitem_array_with_str(out_arrs[-1], w_ind, k)
-                # out_arrs[-1][w_ind] = k
-        else:
-            w_ind = key_write_map[k]
-        __update_redvars(local_redvars, data_in, w_ind, i, pivot_arr)
+        __update_redvars(local_redvars, data_in, codes[i], i, pivot_arr)
     for j in range(n_uniq_keys):
         __eval_res(local_redvars, out_arrs, j)
     return out_arrs
@@ -611,44 +610,24 @@ def get_key_dict_overload(arr_t):
     return k_dict_impl
 
 
-def get_key_set(arr):  # pragma: no cover
-    return set()
-
-@overload(get_key_set)
-def get_key_set_overload(arr_t):
-    if arr_t == string_array_type:
-        return lambda a: hpat.set_ext.init_set_string()
-
-    # hack to return set with specified type
-    def get_set(arr):
-        s = set()
-        s.add(arr[0])
-        s.remove(arr[0])
-        return s
-
-    return get_set
-
-def alloc_agg_output(n_uniq_keys, out_dummy_tup, key_set, data_in, return_key):  # pragma: no cover
+def alloc_agg_output(n_uniq_keys, out_dummy_tup, key_arr, first_rows, data_in,
+                                                return_key):  # pragma: no cover
     return out_dummy_tup
 
 @overload(alloc_agg_output)
-def alloc_agg_output_overload(n_uniq_keys_t, out_dummy_tup_t, key_set_t,
-                                                      data_in_t, return_key_t):
+def alloc_agg_output_overload(n_uniq_keys_t, out_dummy_tup_t, key_arr_t,
+                                first_rows_t, data_in_t, return_key_t):
 
     # return key is either True or None
     if return_key_t == types.boolean:
         assert out_dummy_tup_t.count == data_in_t.count + 1
-        key_typ = key_set_t.dtype
 
-        func_text = "def out_alloc_f(n_uniq_keys, out_dummy_tup, key_set, data_in, return_key):\n"
+        func_text = "def out_alloc_f(n_uniq_keys, out_dummy_tup, key_arr, first_rows, data_in, return_key):\n"
         for i in range(data_in_t.count):
             func_text += "  c_{} = empty_like_type(n_uniq_keys, out_dummy_tup[{}])\n".format(i, i)
 
-        if key_typ == string_type:
-            func_text += "  num_total_chars = num_total_chars_set_string(key_set)\n"
-            func_text += "  out_key = pre_alloc_string_array(n_uniq_keys, num_total_chars)\n"
-        else:
-            func_text += "  out_key = np.empty(n_uniq_keys, np.{})\n".format(key_typ)
+        # output keys are first rows of codes (in order of appearance)
+        func_text += "  out_key = key_arr[first_rows]\n"
 
         func_text += "  return ({}{}out_key,)\n".format(
             ", ".join(["c_{}".format(i) for i in range(data_in_t.count)]),
@@ -656,15 +635,14 @@ def alloc_agg_output_overload(n_uniq_keys_t, out_dummy_tup_t, key_set_t,
 
         loc_vars = {}
         # print(func_text)
-        exec(func_text, {'empty_like_type': empty_like_type, 'np': np,
-            'pre_alloc_string_array': pre_alloc_string_array,
-            'num_total_chars_set_string': num_total_chars_set_string}, loc_vars)
+        exec(func_text, {'empty_like_type': empty_like_type, 'np': np}, loc_vars)
         alloc_impl = loc_vars['out_alloc_f']
         return alloc_impl
 
     assert return_key_t == types.none
 
-    def no_key_out_alloc(n_uniq_keys, out_dummy_tup, key_set, data_in, return_key):
+    def no_key_out_alloc(n_uniq_keys, out_dummy_tup, key_arr, first_rows,
+                                                        data_in, return_key):
         return alloc_arr_tup(n_uniq_keys, out_dummy_tup)
 
     return no_key_out_alloc
@@ -689,26 +667,6 @@ def lower_column_mean_impl(context, builder, sig, args):
     res = context.compile_internal(builder, lambda a: False, sig, args)
     return res#impl_ret_untracked(context, builder, sig.return_type, res)
 
-def setitem_array_with_str(arr, i, v):  # pragma: no cover
-    return
-
-@overload(setitem_array_with_str)
-def setitem_array_with_str_overload(arr_t, ind_t, val_t):
-    if arr_t == string_array_type:
-        def setitem_str_arr(arr, i, v):
-            setitem_string_array(get_offset_ptr(arr), get_data_ptr(arr), v, i)
-        return setitem_str_arr
-
-    # return_key == False case where val could be string resulting in typing
-    # issue, no need to set
-    if val_t == string_type:
-        return lambda a,i,v: None
-
-    def setitem_impl(arr, i, v):
-        arr[i] = v
-
-    return setitem_impl
-
 
 def gen_top_level_agg_func(key_typ, return_key, red_var_typs, out_typs,
                                         in_col_names, out_col_names, parallel):
@@ -831,8 +789,9 @@ def get_agg_func_struct(agg_func, in_col_types, out_col_typs, typingctx,
     redvar_offsets = [0]
 
     for in_col_typ in in_col_types:
-        f_ir, pm = compile_to_optimized_ir(
-            agg_func, tuple([in_col_typ]), typingctx)
+        with compile_profiler.nested('compile_to_optimized_ir'):
+            f_ir, pm = compile_to_optimized_ir(
+                agg_func, tuple([in_col_typ]), typingctx)
 
         f_ir._definitions = build_definitions(f_ir.blocks)
         # TODO: support multiple top-level blocks
@@ -17,13 +17,14 @@ import llvmlite.llvmpy.core as lc
 
 from hpat.str_ext import StringType, string_type
 from hpat.str_arr_ext import (StringArray, StringArrayType, string_array_type,
-    unbox_str_series, is_str_arr_typ, box_str_arr)
+    unbox_str_series, unbox_str_arrays, is_str_arr_typ, box_str_arr,
+    DictStringArrayType, dict_str_arr_type)
 
 from numba.typing.arraydecl import get_array_index_type
 from numba.targets.imputils import lower_builtin, impl_ret_untracked, impl_ret_borrowed
 import numpy as np
 from hpat.pd_timestamp_ext import (pandas_timestamp_type, datetime_date_type,
-    set_df_datetime_date_lower, unbox_datetime_date_array)
+    set_df_datetime_date_lower, unbox_datetime_date_array, box_date_arr_data)
 import hpat
 from hpat.pd_series_ext import (SeriesType, BoxedSeriesType,
     string_series_type, if_arr_to_series_type, arr_to_boxed_series_type,
@@ -75,14 +76,6 @@ def quantile(A, q):  # pragma: no cover
 def quantile_parallel(A, q):  # pragma: no cover
     return 0
 
-
-def str_contains_regex(str_arr, pat):  # pragma: no cover
-    return 0
-
-
-def str_contains_noregex(str_arr, pat):  # pragma: no cover
-    return 0
-
 def concat(arr_list):
     return pd.concat(arr_list)
 
@@ -166,11 +159,42 @@ def lower_nunique(context, builder, sig, args):
 
 # @overload(nunique)
 def nunique_overload(arr_typ):
-    # TODO: extend to other types like datetime?
+    if is_str_arr_typ(arr_typ):
+        def nunique_str_seq(A):
+            return len(set(A))
+        return nunique_str_seq
+    _check_nunique_type(arr_typ)
     def nunique_seq(A):
-        return len(set(A))
+        return len(set(_nunique_values(A)))
     return nunique_seq
 
+def _check_nunique_type(arr_typ):
+    if not (isinstance(arr_typ, types.Array) and isinstance(arr_typ.dtype,
+            (types.Number, types.Boolean, types.NPDatetime,
+             types.NPTimedelta))):
+        raise ValueError("nunique not supported for {}".format(arr_typ))
+
+def _nunique_values(A):  # pragma: no cover
+    return A
+
+@overload(_nunique_values)
+def _nunique_values_overload(arr_t):
+    """values of A to count in nunique: NaN and NaT are dropped similar to
+    Pandas, datetime values are viewed as int64 to be hashable, and bool or
+    small integers without an MPI type for the shuffle are widened to int64
+    """
+    if isinstance(arr_t.dtype, (types.NPDatetime, types.NPTimedelta)):
+        nat = np.iinfo(np.int64).min
+        def dt_impl(A):
+            B = A.view(np.int64)
+            return B[B != nat]
+        return dt_impl
+    if isinstance(arr_t.dtype, types.Float):
+        return lambda A: A[~np.isnan(A)]
+    if arr_t.dtype not in _h5_typ_table:
+        return lambda A: A.astype(np.int64)
+    return lambda A: A
+
 @lower_builtin(nunique_parallel, types.Any)  # TODO: replace Any with types
 def lower_nunique_parallel(context, builder, sig, args):
     func = nunique_overload_parallel(sig.args[0])
@@ -179,7 +203,6 @@ def lower_nunique_parallel(context, builder, sig, args):
 
 # @overload(nunique_parallel)
 def nunique_overload_parallel(arr_typ):
-    # TODO: extend to other types
     sum_op = hpat.distributed_api.Reduce_Type.Sum.value
     if is_str_arr_typ(arr_typ):
         int32_typ_enum = np.int32(_h5_typ_table[types.int32])
@@ -201,7 +224,7 @@ def nunique_overload_parallel(arr_typ):
             n_all_chars = hpat.str_arr_ext.num_total_chars(uniq_A)
 
             # allocate send recv arrays
-            send_arr_lens = np.empty(n_strs, np.uint32)  # XXX offset type is uint32
+            send_arr_lens = np.empty(n_strs, np.uint32)  # lengths are sent as uint32
             send_arr_chars = np.empty(n_all_chars, np.uint8)
             recv_arr = hpat.str_arr_ext.pre_alloc_string_array(recv_size, recv_num_chars)
 
@@ -233,19 +256,26 @@ def nunique_overload_parallel(arr_typ):
             return hpat.distributed_api.dist_reduce(loc_nuniq, np.int32(sum_op))
         return nunique_par_str
 
-    assert arr_typ == types.Array(types.int64, 1, 'C'), "only in64 for parallel nunique"
+    _check_nunique_type(arr_typ)
     def nunique_par(A):
-        uniq_A = hpat.utils.to_array(set(A))
-        send_counts, recv_counts = hpat.hiframes_join.send_recv_counts_new(uniq_A)
-        send_disp = hpat.hiframes_join.calc_disp(send_counts)
-        recv_disp = hpat.hiframes_join.calc_disp(recv_counts)
-        recv_size = recv_counts.sum()
-        # (send_counts, recv_counts, send_disp, recv_disp,
-        #  recv_size) = hpat.hiframes_join.get_sendrecv_counts(uniq_A)
-        send_arr = np.empty_like(uniq_A)
-        recv_arr = np.empty(recv_size, uniq_A.dtype)
-        hpat.hiframes_join.shuffle_data(send_counts, recv_counts, send_disp, recv_disp, uniq_A, send_arr, recv_arr)
-        loc_nuniq = len(set(recv_arr))
+        uniq_A = hpat.utils.to_array(set(_nunique_values(A)))
+        # shuffle unique values to owner processes by hash
+        n_pes = hpat.distributed_api.get_size()
+        shuffle_meta = hpat.hiframes_sort.alloc_shuffle_metadata(
+            uniq_A, n_pes, False)
+        for i in range(len(uniq_A)):
+            val = uniq_A[i]
+            node_id = hash(val) % n_pes
+            hpat.hiframes_sort.update_shuffle_meta(
+                shuffle_meta, node_id, i, val, False)
+        hpat.hiframes_sort.finalize_shuffle_meta(uniq_A, shuffle_meta, False)
+        for i in range(len(uniq_A)):
+            val = uniq_A[i]
+            node_id = hash(val) % n_pes
+            hpat.hiframes_join.write_send_buff(shuffle_meta, node_id, val)
+            shuffle_meta.tmp_offset[node_id] += 1
+        hpat.hiframes_sort.alltoallv(uniq_A, shuffle_meta)
+        loc_nuniq = len(set(shuffle_meta.out_arr))
         return hpat.distributed_api.dist_reduce(loc_nuniq, np.int32(sum_op))
     return nunique_par
 
@@ -339,15 +369,6 @@ class QuantileType(AbstractTemplate):
         return signature(types.float64, *args)
 
 
-@infer_global(str_contains_regex)
-@infer_global(str_contains_noregex)
-class ContainsType(AbstractTemplate):
-    def generic(self, args, kws):
-        assert not kws
-        assert len(args) == 2
-        # args: str_arr, pat
-        return signature(types.Array(types.boolean, 1, 'C'), *args)
-
 # @jit
 # def describe(a_count, a_mean, a_std, a_min, q25, q50, q75, a_max):
 #     s = "count    "+str(a_count)+"\n"\
@@ -523,8 +544,11 @@ def get_hiframes_dtypes(df):
     col_names = df.columns.tolist()
     hi_typs = []
     for cname, typ in zip(col_names, pd_typ_list):
-        if typ == np.dtype('O'):
+        if (typ == np.dtype('O')
+                or isinstance(typ, pd.api.types.CategoricalDtype)
+                or pd.api.types.is_string_dtype(typ)):
             # XXX assuming the whole column is strings if 1st val is string
+            # (object, Arrow-backed string or categorical columns)
             first_val = df[cname][0]
             if isinstance(first_val, str):
                 hi_typs.append(string_type)
@@ -644,6 +668,8 @@ def lower_box_df(context, builder, sig, args):
         # TODO: datetime.date, DatetimeIndex?
         if arr_typ == string_array_type:
             arr_obj = box_str_arr(arr_typ, arr, c)
+        elif arr_typ == dict_str_arr_type:
+            arr_obj = pyapi.from_native_value(arr_typ, arr, c.env_manager)
         else:
             arr_obj = box_array(arr_typ, arr, c)
         name_str = context.insert_const_string(c.builder.module, cname)
@@ -660,6 +686,115 @@ def lower_box_df(context, builder, sig, args):
 def box_series(typ, val, c):
     return val
 
+
+def _box_index_labels(context, builder, pyapi, labels):
+    # list of label strings
+    n_labels = context.get_constant(types.intp, len(labels))
+    list_obj = pyapi.list_new(n_labels)
+    for i, label in enumerate(labels):
+        label_str = context.insert_const_string(builder.module, label)
+        label_obj = pyapi.string_from_string(label_str)
+        # list_setitem steals the reference
+        pyapi.list_setitem(list_obj, context.get_constant(types.intp, i),
+                           label_obj)
+    return list_obj
+
+
+def set_df_index(df, labels):
+    df.index = labels
+
+@infer_global(set_df_index)
+class SetDfIndexInfer(AbstractTemplate):
+    def generic(self, args, kws):
+        assert not kws
+        assert all(isinstance(a, types.Const) for a in args[1:])
+        return signature(types.none, *args)
+
+SetDfIndexInfer.support_literals = True
+
+@lower_builtin(set_df_index, PandasDataFrameType, types.VarArg(types.Const))
+def set_df_index_lower(context, builder, sig, args):
+    labels = [a.value for a in sig.args[1:]]
+    pyapi = context.get_python_api(builder)
+    gil_state = pyapi.gil_ensure()  # acquire GIL
+    list_obj = _box_index_labels(context, builder, pyapi, labels)
+    pyapi.object_setattr_string(args[0], "index", list_obj)
+    pyapi.decref(list_obj)
+    pyapi.gil_release(gil_state)    # release GIL
+    return context.get_dummy_value()
+
+
+class PandasSeriesType(types.Type):
+    """boxed pd.Series object with index labels, returned as is
+    """
+    def __init__(self, dtype):
+        self.dtype = dtype
+        super(PandasSeriesType, self).__init__(
+            name='PandasSeriesType({})'.format(dtype))
+
+register_model(PandasSeriesType)(models.OpaqueModel)
+
+@box(PandasSeriesType)
+def box_pd_series(typ, val, c):
+    return val
+
+
+def box_series_index(arr, index):
+    """box arr as a pd.Series with index, which is an array of index values
+    (e.g. value_counts() output) or constant labels as separate arguments
+    """
+    return pd.Series(arr, index=index)
+
+@infer_global(box_series_index)
+class BoxSeriesIndexInfer(AbstractTemplate):
+    def generic(self, args, kws):
+        assert not kws
+        assert isinstance(args[0], types.Array)
+        assert (len(args) == 2 and (isinstance(args[1], types.Array)
+                                    or args[1] == string_array_type)
+                or all(isinstance(a, types.Const) for a in args[1:]))
+        return signature(PandasSeriesType(args[0].dtype), *args)
+
+BoxSeriesIndexInfer.support_literals = True
+
+def _box_series_index(context, builder, sig, args, get_index_obj):
+    arr_typ = sig.args[0]
+    pyapi = context.get_python_api(builder)
+    env_manager = context.get_env_manager(builder)
+    gil_state = pyapi.gil_ensure()  # acquire GIL
+
+    if context.enable_nrt:
+        context.nrt.incref(builder, arr_typ, args[0])
+    arr_obj = pyapi.from_native_value(arr_typ, args[0], env_manager)
+    mod_name = context.insert_const_string(builder.module, "pandas")
+    class_obj = pyapi.import_module_noblock(mod_name)
+    res = pyapi.call_method(class_obj, "Series", (arr_obj,))
+    index_obj = get_index_obj(pyapi, env_manager)
+    pyapi.object_setattr_string(res, "index", index_obj)
+
+    pyapi.decref(index_obj)
+    pyapi.decref(arr_obj)
+    pyapi.decref(class_obj)
+    pyapi.gil_release(gil_state)    # release GIL
+    return res
+
+@lower_builtin(box_series_index, types.Array, types.VarArg(types.Const))
+def box_series_index_labels_lower(context, builder, sig, args):
+    labels = [a.value for a in sig.args[1:]]
+    return _box_series_index(context, builder, sig, args,
+        lambda pyapi, env_manager: _box_index_labels(
+            context, builder, pyapi, labels))
+
+@lower_builtin(box_series_index, types.Array, types.Array)
+@lower_builtin(box_series_index, types.Array, string_array_type)
+def box_series_index_arr_lower(context, builder, sig, args):
+    index_typ = sig.args[1]
+    def get_index_obj(pyapi, env_manager):
+        if context.enable_nrt:
+            context.nrt.incref(builder, index_typ, args[1])
+        return pyapi.from_native_value(index_typ, args[1], env_manager)
+    return _box_series_index(context, builder, sig, args, get_index_obj)
+
 from numba.targets.boxing import unbox_array
 
 @lower_builtin(unbox_df_column, PandasDataFrameType, types.Const, types.Any)
@@ -689,6 +824,45 @@ def lower_unbox_df_column(context, builder, sig, args):
     return native_val.value
 
 
+def unbox_df_str_columns(df, *col_inds):
+    return tuple(df.iloc[:, i] for i in col_inds)
+
+@infer_global(unbox_df_str_columns)
+class UnBoxDfStrCols(AbstractTemplate):
+    def generic(self, args, kws):
+        assert not kws
+        assert len(args) >= 2
+        return signature(types.UniTuple(string_array_type, len(args) - 1),
+                         *args)
+
+UnBoxDfStrCols.support_literals = True
+
+@lower_builtin(unbox_df_str_columns, PandasDataFrameType, types.VarArg(types.Any))
+def lower_unbox_df_str_columns(context, builder, sig, args):
+    """unbox all string columns of a dataframe argument together, characters
+    of the columns are copied in parallel
+    """
+    pyapi = context.get_python_api(builder)
+    c = numba.pythonapi._UnboxContext(context, builder, pyapi)
+
+    arr_objs = []
+    for col_ind_typ in sig.args[1:]:
+        col_name = sig.args[0].col_names[col_ind_typ.value]
+        series_obj = c.pyapi.object_getattr_string(args[0], col_name)
+        arr_objs.append(c.pyapi.object_getattr_string(series_obj, "values"))
+        c.pyapi.decref(series_obj)
+
+    native_vals = unbox_str_arrays(arr_objs, c)
+    for arr_obj in arr_objs:
+        c.pyapi.decref(arr_obj)
+    # propagate the Python error set during unboxing (e.g. non-string
+    # values) like unbox_str_series, the wrapper raises it
+    is_error = cgutils.is_not_null(builder, c.pyapi.err_occurred())
+    with cgutils.if_unlikely(builder, is_error):
+        context.call_conv.return_exc(builder)
+    return context.make_tuple(builder, sig.return_type, native_vals)
+
+
 @unbox(BoxedSeriesType)
 def unbox_series(typ, val, c):
     arr_obj = c.pyapi.object_getattr_string(val, "values")
@@ -710,6 +884,12 @@ def box_series(typ, val, c):
     """
     if typ.dtype == string_type:
         arr = box_str_arr(typ, val, c)
+    elif typ.dtype == datetime_date_type:
+        arr_typ = types.Array(typ.dtype, 1, 'C')
+        native_arr = make_array(arr_typ)(c.context, c.builder, val)
+        arr = box_date_arr_data(c.context, c.builder, c.pyapi,
+                                native_arr.data, native_arr.nitems)
+        c.context.nrt.decref(c.builder, arr_typ, val)
     else:
         arr = box_array(types.Array(typ.dtype, 1, 'C'), val, c)
     mod_name = c.context.insert_const_string(c.builder.module, "pandas")
@@ -846,7 +1026,8 @@ def fix_df_array_overload(column):
         return fix_df_array_str_impl
 
     # column is array if not list
-    assert isinstance(column, (types.Array, StringArrayType))
+    assert isinstance(column, (types.Array, StringArrayType,
+                               DictStringArrayType))
     def fix_df_array_impl(column):  # pragma: no cover
         return column
     # FIXME: np.array() for everything else?
@@ -925,7 +1106,7 @@ def typeof_pd_index(val, c):
 # TODO: separate pd.DatetimeIndex type
 #@typeof_impl.register(pd.DatetimeIndex)
 
-def pd_dt_index_stub(data):  # pragma: no cover
+def pd_dt_index_stub(data, format=None):  # pragma: no cover
     return data
 
 @infer_global(pd.DatetimeIndex)
@@ -0,0 +1,154 @@
+"""
+Datetime kernels over whole arrays. Parsing of datetime strings detects a
+fixed layout (e.g. 'YYYY-MM-DD HH:MM:SS[.fffffffff]') from a sample of the
+string array, or takes it from a strptime-like format, and parses fields
+with digit arithmetic at fixed positions directly from the character
+buffer. Repeated values and date prefixes of consecutive elements are
+reused. Strings that don't match the layout go through the general ISO 8601
+parser.
+
+Calendar fields of the .dt accessor are computed for whole arrays in a single
+parfor with branch-free civil-from-days arithmetic.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import numba
+from numba import types
+import llvmlite.binding as ll
+import hdatetime_ext
+import hpat
+from hpat.str_ext import get_str_ptr_len
+from hpat.str_arr_ext import get_offset_ptr, get_data_ptr
+from hpat.pd_timestamp_ext import civil_from_days, days_from_civil
+
+ll.add_symbol('dt_parse_str_arr', hdatetime_ext.dt_parse_str_arr)
+
+# strptime directives supported by format= of pd.DatetimeIndex()
+_FORMAT_DIRECTIVES = 'YmdHMSf%'
+
+# fields of Series.dt supported for datetime64[ns] and datetime.date series
+DT_FIELDS = ('year', 'month', 'day', 'hour', 'minute', 'second',
+             'microsecond', 'nanosecond', 'dayofweek', 'dayofyear', 'quarter')
+DATE_FIELDS = ('year', 'month', 'day', 'dayofweek', 'dayofyear', 'quarter')
+
+_NS_PER_DAY = 24 * 60 * 60 * 1000 * 1000 * 1000
+
+_dt_parse_str_arr = types.ExternalFunction("dt_parse_str_arr",
+    types.int64(types.voidptr, types.voidptr, types.int64, types.voidptr,
+                types.int64, types.voidptr))
+
+
+def check_dt_format(fmt):
+    """raise ValueError if fmt can't be parsed with a fixed layout
+    """
+    i = 0
+    fields = set()
+    while i < len(fmt):
+        if fmt[i] == '%':
+            if i + 1 == len(fmt) or fmt[i + 1] not in _FORMAT_DIRECTIVES:
+                raise ValueError("unsupported datetime format {}, only {} "
+                    "directives are supported".format(repr(fmt), ', '.join(
+                        '%' + c for c in _FORMAT_DIRECTIVES)))
+            if 'f' in fields:
+                raise ValueError("%f should be at the end of datetime format")
+            fields.add(fmt[i + 1])
+            i += 2
+        else:
+            i += 1
+    if not {'Y', 'm', 'd'} <= fields:
+        raise ValueError("datetime format should have %Y, %m and %d")
+
+
+@numba.njit
+def parse_dt_str_arr(str_arr, fmt):  # pragma: no cover
+    """datetime64[ns] values of strings in str_arr, layout detected if fmt
+    is empty. Invalid strings and strings not matching fmt are NaT.
+    """
+    n = len(str_arr)
+    out = np.empty(n, np.int64)
+    p, l = get_str_ptr_len(fmt)
+    status = _dt_parse_str_arr(get_offset_ptr(str_arr), get_data_ptr(str_arr),
+                               n, p, l, out.ctypes)
+    if status != 0:
+        raise ValueError("unsupported datetime format")
+    return hpat.hiframes_api.ts_series_to_arr_typ(out)
+
+
+# datetime64[ns] fields, dt64 is the int64 value
+
+@numba.njit
+def dt64_year(dt64):  # pragma: no cover
+    return civil_from_days(dt64 // _NS_PER_DAY)[0]
+
+@numba.njit
+def dt64_month(dt64):  # pragma: no cover
+    return civil_from_days(dt64 // _NS_PER_DAY)[1]
+
+@numba.njit
+def dt64_day(dt64):  # pragma: no cover
+    return civil_from_days(dt64 // _NS_PER_DAY)[2]
+
+@numba.njit
+def dt64_hour(dt64):  # pragma: no cover
+    return (dt64 // (60 * 60 * 1000000000)) % 24
+
+@numba.njit
+def dt64_minute(dt64):  # pragma: no cover
+    return (dt64 // (60 * 1000000000)) % 60
+
+@numba.njit
+def dt64_second(dt64):  # pragma: no cover
+    return (dt64 // 1000000000) % 60
+
+@numba.njit
+def dt64_microsecond(dt64):  # pragma: no cover
+    return (dt64 // 1000) % 1000000
+
+@numba.njit
+def dt64_nanosecond(dt64):  # pragma: no cover
+    return dt64 % 1000
+
+@numba.njit
+def dt64_dayofweek(dt64):  # pragma: no cover
+    # 1970-01-01 is a Thursday, Monday is 0
+    return (dt64 // _NS_PER_DAY + 3) % 7
+
+@numba.njit
+def dt64_dayofyear(dt64):  # pragma: no cover
+    days = dt64 // _NS_PER_DAY
+    year = civil_from_days(days)[0]
+    return days - days_from_civil(year, 1, 1) + 1
+
+@numba.njit
+def dt64_quarter(dt64):  # pragma: no cover
+    return (civil_from_days(dt64 // _NS_PER_DAY)[1] + 2) // 3
+
+
+# datetime.date fields, v is the packed (year << 32 | month << 16 | day) value
+
+@numba.njit
+def date_year(v):  # pragma: no cover
+    return v >> 32
+
+@numba.njit
+def date_month(v):  # pragma: no cover
+    return (v >> 16) & 0xFFFF
+
+@numba.njit
+def date_day(v):  # pragma: no cover
+    return v & 0xFFFF
+
+@numba.njit
+def date_dayofweek(v):  # pragma: no cover
+    return (days_from_civil(v >> 32, (v >> 16) & 0xFFFF, v & 0xFFFF) + 3) % 7
+
+@numba.njit
+def date_dayofyear(v):  # pragma: no cover
+    year = v >> 32
+    return (days_from_civil(year, (v >> 16) & 0xFFFF, v & 0xFFFF)
+            - days_from_civil(year, 1, 1) + 1)
+
+@numba.njit
+def date_quarter(v):  # pragma: no cover
+    return (((v >> 16) & 0xFFFF) + 2) // 3
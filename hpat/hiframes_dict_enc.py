@@ -0,0 +1,380 @@
+"""
+Dictionary encoding of string columns. Keys are hashed once into int32 codes
+(string keys as views into the array, without allocating strings) and
+operators work on the codes: aggregation and groupby statistics index their
+per-group arrays with codes, and local sort of string keys with few distinct
+values sorts the codes of a sorted dictionary and decodes the keys afterwards.
+
+Columns can also stay dictionary-encoded (dict_str_arr_type: int32 codes and
+a dictionary string array), either read from Parquet dictionary pages or
+created with astype('category'). Filter selects codes and shares the
+dictionary, comparisons with a string compare every dictionary entry once and
+look up codes. Sort, Join and Aggregate unify the dictionaries of their
+encoded columns first: local dictionaries are gathered, deduplicated and
+sorted on all processes, so that codes are equal (and ordered) exactly like
+the values, and only codes are shuffled. Strings are decoded when boxed.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import numba
+from numba import ir, types
+from numba.ir_utils import mk_unique_var, replace_arg_nodes
+from numba.extending import overload, box
+import hpat
+from hpat.str_arr_ext import (string_array_type, get_str_view, getitem_view,
+                              setitem_str_arr_view, pre_alloc_string_array,
+                              num_total_chars, box_str_arr,
+                              DictStringArrayType, dict_str_arr_type,
+                              init_dict_str_arr)
+from hpat.distributed_api import (gatherv, bcast, prealloc_str_for_bcast,
+                                  dist_exscan)
+from hpat.distributed_analysis import Distribution
+from hpat.utils import compile_to_numba_ir
+
+# sort codes of a sorted dictionary instead of strings if there are at least
+# this many rows per distinct key
+_DICT_SORT_MIN_RATIO = 2
+
+
+def dict_encode(arr, max_uniq):  # pragma: no cover
+    """int32 code of every element (codes in order of first appearance) and
+    first row of every code. If there are more than max_uniq distinct values,
+    stops early and returns no codes and max_uniq+1 first rows.
+    """
+    return np.empty(0, np.int32), np.empty(0, np.int64)
+
+
+def _dict_encode_str(arr, max_uniq):  # pragma: no cover
+    # open addressing table of codes, compares views of first rows
+    n = len(arr)
+    n_max = min(n, max_uniq + 1)
+    n_slots = 16
+    while n_slots < 2 * n_max:
+        n_slots *= 2
+    mask = n_slots - 1
+    slots = np.full(n_slots, -1, np.int32)
+    codes = np.empty(n, np.int32)
+    first_rows = np.empty(n_max, np.int64)
+    n_uniq = 0
+    for i in range(n):
+        val = get_str_view(arr, i)
+        s = hash(val) & mask
+        c = slots[s]
+        while c != -1 and get_str_view(arr, first_rows[c]) != val:
+            s = (s + 1) & mask
+            c = slots[s]
+        if c == -1:
+            if n_uniq == max_uniq:
+                first_rows[n_uniq] = i
+                return (np.empty(0, np.int32),
+                        np.ascontiguousarray(first_rows[:n_uniq + 1]))
+            c = n_uniq
+            slots[s] = c
+            first_rows[c] = i
+            n_uniq += 1
+        codes[i] = c
+    return codes, np.ascontiguousarray(first_rows[:n_uniq])
+
+
+@overload(dict_encode)
+def dict_encode_overload(arr_t, max_uniq_t):
+    if arr_t == string_array_type:
+        return _dict_encode_str
+
+    def dict_encode_impl(arr, max_uniq):  # pragma: no cover
+        key_write_map = hpat.hiframes_aggregate.get_key_dict(arr)
+        n = len(arr)
+        codes = np.empty(n, np.int32)
+        first_rows = np.empty(min(n, max_uniq + 1), np.int64)
+        n_uniq = 0
+        for i in range(n):
+            k = arr[i]
+            if k not in key_write_map:
+                if n_uniq == max_uniq:
+                    first_rows[n_uniq] = i
+                    return (np.empty(0, np.int32),
+                            np.ascontiguousarray(first_rows[:n_uniq + 1]))
+                key_write_map[k] = n_uniq
+                first_rows[n_uniq] = i
+                n_uniq += 1
+            codes[i] = key_write_map[k]
+        return codes, np.ascontiguousarray(first_rows[:n_uniq])
+
+    return dict_encode_impl
+
+
+@numba.njit
+def _argsort_rows(arr, rows):  # pragma: no cover
+    """stable argsort of arr[rows] (bottom-up merge sort comparing elements
+    in place, views for strings)
+    """
+    m = len(rows)
+    order = np.arange(m)
+    tmp = np.empty(m, np.int64)
+    width = 1
+    while width < m:
+        lo = 0
+        while lo < m:
+            mid = min(lo + width, m)
+            hi = min(lo + 2 * width, m)
+            a = lo
+            b = mid
+            k = lo
+            while a < mid and b < hi:
+                # take from the right run only if smaller to keep stability
+                if (getitem_view(arr, rows[order[b]])
+                        < getitem_view(arr, rows[order[a]])):
+                    tmp[k] = order[b]
+                    b += 1
+                else:
+                    tmp[k] = order[a]
+                    a += 1
+                k += 1
+            while a < mid:
+                tmp[k] = order[a]
+                a += 1
+                k += 1
+            while b < hi:
+                tmp[k] = order[b]
+                b += 1
+                k += 1
+            lo = hi
+        order, tmp = tmp, order
+        width *= 2
+    return order
+
+
+@numba.njit
+def sort_dict(arr, codes, first_rows):  # pragma: no cover
+    """renumber codes in order of their values so that comparing codes is
+    equivalent to comparing values. Returns new codes and first rows.
+    """
+    order = _argsort_rows(arr, first_rows)
+    n_uniq = len(first_rows)
+    rank = np.empty(n_uniq, np.int32)
+    for j in range(n_uniq):
+        rank[order[j]] = j
+    new_codes = np.empty(len(codes), np.int32)
+    for i in range(len(codes)):
+        new_codes[i] = rank[codes[i]]
+    return new_codes, first_rows[order]
+
+
+@numba.njit
+def dict_local_sort(key_arr, data, codes_sort_f, str_sort_f):  # pragma: no cover
+    """sort string keys and data in place. If there are few distinct keys,
+    codes of a sorted dictionary are sorted instead of strings and keys are
+    decoded afterwards.
+    """
+    n = len(key_arr)
+    max_uniq = n // _DICT_SORT_MIN_RATIO
+    codes, first_rows = dict_encode(key_arr, max_uniq)
+    if len(first_rows) > max_uniq:
+        str_sort_f(key_arr, data)
+        return
+    codes, first_rows = sort_dict(key_arr, codes, first_rows)
+    dictionary = key_arr[first_rows]
+    codes_sort_f(codes, data)
+    # total number of characters is unchanged, rewrite keys in place
+    for i in range(n):
+        setitem_str_arr_view(key_arr, i, get_str_view(dictionary, codes[i]))
+
+
+@numba.njit
+def dict_encode_str_arr(arr):  # pragma: no cover
+    """dictionary-encoded array of a string array (dictionary in order of
+    first appearance)
+    """
+    codes, first_rows = dict_encode(arr, len(arr))
+    return init_dict_str_arr(codes, arr[first_rows])
+
+
+@numba.njit
+def decode_dict_str_arr(A):  # pragma: no cover
+    """string array of a dictionary-encoded array
+    """
+    codes = A.codes
+    dictionary = A.dictionary
+    n = len(codes)
+    n_chars = 0
+    for i in range(n):
+        n_chars += len(get_str_view(dictionary, codes[i]))
+    out_arr = pre_alloc_string_array(n, n_chars)
+    for i in range(n):
+        setitem_str_arr_view(out_arr, i, get_str_view(dictionary, codes[i]))
+    return out_arr
+
+
+@box(DictStringArrayType)
+def box_dict_str_arr(typ, val, c):
+    """boxed as the decoded strings
+    """
+    sig = string_array_type(typ)
+    str_arr = c.context.compile_internal(
+        c.builder, lambda A: decode_dict_str_arr(A), sig, [val])
+    arr = box_str_arr(string_array_type, str_arr, c)
+    c.context.nrt.decref(c.builder, typ, val)
+    return arr
+
+
+# comparison operators of dict_cmp_hits
+CMP_OPS = ('==', '!=', '<', '<=', '>', '>=')
+# operator with swapped operands (string on the left)
+SWAPPED_CMP_OPS = {'==': '==', '!=': '!=', '<': '>', '<=': '>=', '>': '<',
+                   '>=': '<='}
+
+
+@numba.njit
+def dict_cmp_hits(dictionary, val, op):  # pragma: no cover
+    """result of comparing every dictionary entry with val, op is the index
+    of the operator in CMP_OPS
+    """
+    n = len(dictionary)
+    hits = np.empty(n, np.bool_)
+    for j in range(n):
+        s = get_str_view(dictionary, j)
+        if op == 0:
+            hits[j] = s == val
+        elif op == 1:
+            hits[j] = s != val
+        elif op == 2:
+            hits[j] = s < val
+        elif op == 3:
+            hits[j] = s <= val
+        elif op == 4:
+            hits[j] = s > val
+        else:
+            hits[j] = s >= val
+    return hits
+
+
+@numba.njit
+def _gather_dictionary(dictionary, parallel):  # pragma: no cover
+    """dictionaries of all processes (in order of rank) on every process and
+    the position of the local dictionary
+    """
+    if not parallel:
+        return dictionary, 0
+    start = dist_exscan(np.int64(len(dictionary)))
+    all_dict = gatherv(dictionary)
+    all_dict = prealloc_str_for_bcast(all_dict)
+    bcast(all_dict)
+    return all_dict, start
+
+
+@numba.njit
+def _concat_str_arrs(A, B):  # pragma: no cover
+    n_a = len(A)
+    n = n_a + len(B)
+    n_chars = np.int64(num_total_chars(A)) + np.int64(num_total_chars(B))
+    out_arr = pre_alloc_string_array(n, n_chars)
+    for i in range(n_a):
+        setitem_str_arr_view(out_arr, i, get_str_view(A, i))
+    for i in range(len(B)):
+        setitem_str_arr_view(out_arr, n_a + i, get_str_view(B, i))
+    return out_arr
+
+
+@numba.njit
+def _map_codes(codes, new_codes, start):  # pragma: no cover
+    n = len(codes)
+    out = np.empty(n, np.int32)
+    for i in range(n):
+        out[i] = new_codes[start + codes[i]]
+    return out
+
+
+@numba.njit
+def unify_dict_str_arr(A, parallel):  # pragma: no cover
+    """codes of A into a sorted dictionary without repeated values, which is
+    the same on all processes. Returns new codes and the dictionary.
+    """
+    all_dict, start = _gather_dictionary(A.dictionary, parallel)
+    dict_codes, first_rows = dict_encode(all_dict, len(all_dict))
+    dict_codes, first_rows = sort_dict(all_dict, dict_codes, first_rows)
+    return _map_codes(A.codes, dict_codes, start), all_dict[first_rows]
+
+
+@numba.njit
+def unify_dict_str_arr_pair(A, B, parallel):  # pragma: no cover
+    """codes of A and B into one dictionary (see unify_dict_str_arr)
+    """
+    all_a, start_a = _gather_dictionary(A.dictionary, parallel)
+    all_b, start_b = _gather_dictionary(B.dictionary, parallel)
+    all_dict = _concat_str_arrs(all_a, all_b)
+    dict_codes, first_rows = dict_encode(all_dict, len(all_dict))
+    dict_codes, first_rows = sort_dict(all_dict, dict_codes, first_rows)
+    codes_a = _map_codes(A.codes, dict_codes, start_a)
+    codes_b = _map_codes(B.codes, dict_codes, len(all_a) + start_b)
+    return codes_a, codes_b, all_dict[first_rows]
+
+
+def gen_dict_arrs_to_codes(var_groups, parallel, array_dists, typemap,
+                           calltypes, typingctx):
+    """nodes that unify the dictionaries of every group of dictionary-encoded
+    arrays (e.g. the two keys of a join). Returns the nodes and a dict of
+    array name to its (codes, dictionary) variables.
+    """
+    nodes = []
+    var_codes = {}
+    for group in var_groups:
+        if len(group) == 1:
+            def f(A):  # pragma: no cover
+                s = hpat.hiframes_dict_enc.unify_dict_str_arr(A, _parallel)
+        else:
+            def f(A, B):  # pragma: no cover
+                s = hpat.hiframes_dict_enc.unify_dict_str_arr_pair(
+                    A, B, _parallel)
+
+        f_block = compile_to_numba_ir(f, {'hpat': hpat, '_parallel': parallel},
+                                      typingctx,
+                                      tuple(typemap[v.name] for v in group),
+                                      typemap, calltypes).blocks.popitem()[1]
+        replace_arg_nodes(f_block, group)
+        nodes += f_block.body[:-3]
+        tup_var = nodes[-1].target
+        loc = tup_var.loc
+        out_vars = []
+        for i, typ in enumerate(typemap[tup_var.name].types):
+            name = "$dict" if i == len(group) else "$dict_codes"
+            var = ir.Var(tup_var.scope, mk_unique_var(name), loc)
+            typemap[var.name] = typ
+            getitem = ir.Expr.static_getitem(tup_var, i, None, loc)
+            calltypes[getitem] = None
+            nodes.append(ir.Assign(getitem, var, loc))
+            out_vars.append(var)
+
+        dict_var = out_vars[-1]
+        array_dists[dict_var.name] = Distribution.REP
+        for v, codes_var in zip(group, out_vars[:-1]):
+            array_dists[codes_var.name] = array_dists[v.name]
+            var_codes[v.name] = (codes_var, dict_var)
+    return nodes, var_codes
+
+
+def gen_codes_var(out_var, array_dists, typemap):
+    """new codes variable for dictionary-encoded output array out_var
+    """
+    codes_var = ir.Var(out_var.scope, mk_unique_var("$dict_codes"),
+                       out_var.loc)
+    typemap[codes_var.name] = types.Array(types.int32, 1, 'C')
+    array_dists[codes_var.name] = array_dists[out_var.name]
+    return codes_var
+
+
+def gen_codes_to_dict_arr(codes_var, dict_var, out_var, typemap, calltypes,
+                          typingctx):
+    """nodes that set out_var to the dictionary-encoded array of codes_var
+    """
+    def f(codes, dictionary):  # pragma: no cover
+        A = hpat.str_arr_ext.init_dict_str_arr(codes, dictionary)
+
+    f_block = compile_to_numba_ir(f, {'hpat': hpat}, typingctx,
+                                  (typemap[codes_var.name],
+                                   typemap[dict_var.name]),
+                                  typemap, calltypes).blocks.popitem()[1]
+    replace_arg_nodes(f_block, [codes_var, dict_var])
+    nodes = f_block.body[:-3]
+    nodes[-1].target = out_var
+    return nodes
@@ -7,7 +7,7 @@ from numba.typing import signature
 from hpat import distributed, distributed_analysis
 from hpat.distributed_analysis import Distribution
 from hpat.utils import debug_prints
-from hpat.str_arr_ext import string_array_type
+from hpat.str_arr_ext import string_array_type, dict_str_arr_type
 
 
 class Filter(ir.Stmt):
@@ -44,7 +44,7 @@ def filter_array_analysis(filter_node, equiv_set, typemap, array_analysis):
     all_shapes = [col_shape[0]]
     for _, col_var in filter_node.df_in_vars.items():
         typ = typemap[col_var.name]
-        if typ == string_array_type:
+        if typ in (string_array_type, dict_str_arr_type):
             continue
         col_shape = equiv_set.get_shape(col_var)
         all_shapes.append(col_shape[0])
@@ -58,7 +58,7 @@ def filter_array_analysis(filter_node, equiv_set, typemap, array_analysis):
     all_shapes = []
     for _, col_var in filter_node.df_out_vars.items():
         typ = typemap[col_var.name]
-        if typ == string_array_type:
+        if typ in (string_array_type, dict_str_arr_type):
             continue
         (shape, c_post) = array_analysis._gen_shape_call(
             equiv_set, col_var, typ.ndim, None)
@@ -125,6 +125,7 @@ def filter_distributed_run(filter_node, array_dists, typemap, calltypes, typingc
     for col_name, col_in_var in filter_node.df_in_vars.items():
         col_out_var = filter_node.df_out_vars[col_name]
         # using getitem like Numba for filtering arrays
+        # (dictionary-encoded arrays select codes and keep the dictionary)
         # TODO: generate parfor
         getitem_call = ir.Expr.getitem(col_in_var, bool_arr, loc)
         calltypes[getitem_call] = signature(
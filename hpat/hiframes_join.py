@@ -1,13 +1,15 @@
 from __future__ import print_function, division, absolute_import
 
+import copy
 import numba
 from numba import typeinfer, ir, ir_utils, config, types
 from numba.extending import overload
 from numba.ir_utils import (visit_vars_inner, replace_vars_inner,
-                            compile_to_numba_ir, replace_arg_nodes)
+                            replace_arg_nodes)
 import hpat
 from hpat import distributed, distributed_analysis
 from hpat.utils import debug_prints, alloc_arr_tup, empty_like_type
+from hpat.utils import compile_to_numba_ir
 from hpat.distributed_analysis import Distribution
 from hpat.hiframes_sort import (
     alloc_shuffle_metadata, data_alloc_shuffle_metadata, alltoallv,
@@ -18,7 +20,11 @@ from hpat.str_arr_ext import (string_array_type, to_string_list,
                               cp_str_list_to_array, str_list_to_array,
                               get_offset_ptr, get_data_ptr, convert_len_arr_to_offset,
                               pre_alloc_string_array, del_str, num_total_chars,
-                              getitem_str_offset, copy_str_arr_slice, setitem_string_array)
+                              getitem_str_offset, copy_str_arr_slice, setitem_string_array,
+                              getitem_view, dict_str_arr_type)
+from hpat.hiframes_dict_enc import (gen_dict_arrs_to_codes, gen_codes_var,
+                                    gen_codes_to_dict_arr)
+from hpat.str_ext import getpointer
 from hpat.hiframes_api import str_copy_ptr
 from hpat.timsort import copyElement_tup, getitem_arr_tup
 import numpy as np
@@ -67,7 +73,7 @@ def join_array_analysis(join_node, equiv_set, typemap, array_analysis):
     for _, col_var in (list(join_node.left_vars.items())
                        + list(join_node.right_vars.items())):
         typ = typemap[col_var.name]
-        if typ == string_array_type:
+        if typ in (string_array_type, dict_str_arr_type):
             continue
         col_shape = equiv_set.get_shape(col_var)
         all_shapes.append(col_shape[0])
@@ -81,7 +87,7 @@ def join_array_analysis(join_node, equiv_set, typemap, array_analysis):
     all_shapes = []
     for _, col_var in join_node.df_out_vars.items():
         typ = typemap[col_var.name]
-        if typ == string_array_type:
+        if typ in (string_array_type, dict_str_arr_type):
             continue
         (shape, c_post) = array_analysis._gen_shape_call(
             equiv_set, col_var, typ.ndim, None)
@@ -265,6 +271,13 @@ def join_distributed_run(join_node, array_dists, typemap, calltypes, typingctx,
                 and array_dists[v.name] != distributed.Distribution.OneD_Var):
             parallel = False
 
+    # dictionary-encoded columns are joined as codes of unified dictionaries
+    if any(typemap[v.name] == dict_str_arr_type
+           for v in (list(join_node.left_vars.values())
+                     + list(join_node.right_vars.values()))):
+        return _join_dict_arrs_run(join_node, parallel, array_dists, typemap,
+                                   calltypes, typingctx, targetctx)
+
     # TODO: rebalance if output distributions are 1D instead of 1D_Var
     loc = join_node.loc
     # get column variables
@@ -377,6 +390,57 @@ def join_distributed_run(join_node, array_dists, typemap, calltypes, typingctx,
 distributed.distributed_run_extensions[Join] = join_distributed_run
 
 
+def _join_dict_arrs_run(join_node, parallel, array_dists, typemap, calltypes,
+                        typingctx, targetctx):
+    """join codes of dictionary-encoded columns, keys share a dictionary so
+    that equal codes are equal strings on all processes
+    """
+    left_key_var = join_node.left_vars[join_node.left_key]
+    right_key_var = join_node.right_vars[join_node.right_key]
+    is_dict_key = typemap[left_key_var.name] == dict_str_arr_type
+    if is_dict_key != (typemap[right_key_var.name] == dict_str_arr_type):
+        raise ValueError("join keys should be both dictionary-encoded or "
+                         "both not")
+
+    var_groups = []
+    if is_dict_key:
+        var_groups.append([left_key_var, right_key_var])
+    for v in (list(join_node.left_vars.values())
+              + list(join_node.right_vars.values())):
+        if (typemap[v.name] == dict_str_arr_type
+                and v.name not in (left_key_var.name, right_key_var.name)):
+            var_groups.append([v])
+
+    nodes, var_codes = gen_dict_arrs_to_codes(
+        var_groups, parallel, array_dists, typemap, calltypes, typingctx)
+
+    # outputs are set from codes after the join
+    in_vars = dict(join_node.right_vars)
+    in_vars.update(join_node.left_vars)
+    out_vars = {}
+    post_nodes = []
+    for cname, out_var in join_node.df_out_vars.items():
+        if typemap[out_var.name] != dict_str_arr_type:
+            out_vars[cname] = out_var
+            continue
+        _, dict_var = var_codes[in_vars[cname].name]
+        out_vars[cname] = gen_codes_var(out_var, array_dists, typemap)
+        post_nodes += gen_codes_to_dict_arr(out_vars[cname], dict_var,
+                                            out_var, typemap, calltypes,
+                                            typingctx)
+
+    codes_vars = {name: c for name, (c, _) in var_codes.items()}
+    codes_join_node = copy.copy(join_node)
+    codes_join_node.left_vars = {c: codes_vars.get(v.name, v)
+                                 for c, v in join_node.left_vars.items()}
+    codes_join_node.right_vars = {c: codes_vars.get(v.name, v)
+                                  for c, v in join_node.right_vars.items()}
+    codes_join_node.df_out_vars = out_vars
+    nodes += join_distributed_run(codes_join_node, array_dists, typemap,
+                                  calltypes, typingctx, targetctx)
+    return nodes + post_nodes
+
+
 @numba.njit
 def parallel_join(key_arr, data):
     # alloc shuffle meta
@@ -385,8 +449,9 @@ def parallel_join(key_arr, data):
     data_shuffle_meta = data_alloc_shuffle_metadata(data, n_pes, False)
 
     # calc send/recv counts
+    # string keys are accessed as views to avoid allocations
     for i in range(len(key_arr)):
-        val = key_arr[i]
+        val = getitem_view(key_arr, i)
         node_id = hash(val) % n_pes
         update_shuffle_meta(shuffle_meta, node_id, i, val, False)
         update_data_shuffle_meta(data_shuffle_meta, node_id, i, data, False)
@@ -396,7 +461,7 @@ def parallel_join(key_arr, data):
 
     # write send buffers
     for i in range(len(key_arr)):
-        val = key_arr[i]
+        val = getitem_view(key_arr, i)
         node_id = hash(val) % n_pes
         write_send_buff(shuffle_meta, node_id, val)
         write_data_send_buff(data_shuffle_meta, node_id, i, data, shuffle_meta)
@@ -431,7 +496,7 @@ def write_send_buff_overload(meta_t, node_id_t, val_t):
         shuffle_meta.send_arr_lens[ind] = n_chars
         # data buff
         indc = shuffle_meta.send_disp_char[node_id] + shuffle_meta.tmp_offset_char[node_id]
-        str_copy_ptr(shuffle_meta.send_arr_chars, indc, val.c_str(), n_chars)
+        str_copy_ptr(shuffle_meta.send_arr_chars, indc, getpointer(val), n_chars)
         shuffle_meta.tmp_offset_char[node_id] += n_chars
         #del_str(val)
         return ind
@@ -446,7 +511,7 @@ def write_data_send_buff(data_shuffle_meta, node_id, i, data, key_meta):
 def write_data_send_buff_overload(meta_t, node_id_t, ind_t, data_t, key_meta_t):
     func_text = "def f(meta_tup, node_id, ind, data, key_meta):\n"
     for i, typ in enumerate(data_t.types):
-        func_text += "  val_{} = data[{}][ind]\n".format(i, i)
+        func_text += "  val_{} = getitem_view(data[{}], ind)\n".format(i, i)
         func_text += "  ind_{} = key_meta.send_disp[node_id] + key_meta.tmp_offset[node_id]\n".format(i)
         if isinstance(typ, types.Array):
             func_text += "  meta_tup[{}].send_buff[ind_{}] = val_{}\n".format(i, i, i)
@@ -456,13 +521,13 @@ def write_data_send_buff_overload(meta_t, node_id_t, ind_t, data_t, key_meta_t):
             func_text += "  n_chars_{} = len(val_{})\n".format(i, i)
             func_text += "  meta_tup[{}].send_arr_lens[ind_{}] = n_chars_{}\n".format(i, i, i)
             func_text += "  indc_{} = meta_tup[{}].send_disp_char[node_id] + meta_tup[{}].tmp_offset_char[node_id]\n".format(i, i, i)
-            func_text += "  str_copy_ptr(meta_tup[{}].send_arr_chars, indc_{}, val_{}.c_str(), n_chars_{})\n".format(i, i, i, i)
+            func_text += "  str_copy_ptr(meta_tup[{}].send_arr_chars, indc_{}, getpointer(val_{}), n_chars_{})\n".format(i, i, i, i)
             func_text += "  meta_tup[{}].tmp_offset_char[node_id] += n_chars_{}\n".format(i, i)
-            func_text += "  del_str(val_{})\n".format(i)
 
     func_text += "  return\n"
     loc_vars = {}
-    exec(func_text, {'del_str': del_str, 'str_copy_ptr': str_copy_ptr}, loc_vars)
+    exec(func_text, {'getitem_view': getitem_view, 'getpointer': getpointer,
+                     'str_copy_ptr': str_copy_ptr}, loc_vars)
     write_impl = loc_vars['f']
     return write_impl
 
@@ -551,8 +616,7 @@ def send_recv_counts_new(key_arr):
     send_counts = np.zeros(n_pes, np.int32)
     recv_counts = np.empty(n_pes, np.int32)
     for i in range(len(key_arr)):
-        # TODO: delete string
-        node_id = hash(key_arr[i]) % n_pes
+        node_id = hash(getitem_view(key_arr, i)) % n_pes
         send_counts[node_id] += 1
     hpat.distributed_api.alltoall(send_counts, recv_counts, 1)
     return send_counts, recv_counts
@@ -0,0 +1,732 @@
+"""
+Streaming kernels for rolling windows (sum, mean, var, std, min, max) of
+fixed size or time offset (e.g. '5min' over a sorted datetime64 column),
+shift/pct_change, groupby shift/diff (shuffled by key in distributed mode),
+and ewm/expanding windows.
+Each rolling kernel updates its state once per element added to and removed
+from the window, so cost is O(n) independent of window size:
+running sums for sum/mean, Welford updates for var/std and monotonic deques
+for min/max. NaN values are skipped and a window with less than win
+observations is NaN, similar to Pandas with default min_periods.
+In distributed mode, halos are collected from as many processes as the
+window spans.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import numba
+from numba import types
+from numba.extending import overload
+import hpat
+from hpat.distributed_api import (get_rank, get_size, irecv, isend, waitall,
+    comm_req_alloc, comm_req_dealloc, allgather, alltoall, alltoallv)
+from hpat.hiframes_join import parallel_join, calc_disp
+from hpat.hiframes_dict_enc import dict_encode
+
+# tag of halo messages (stencil halos use 22)
+_HALO_TAG = 23
+_MAX_TS = np.iinfo(np.int64).max
+
+
+@numba.njit
+def _get_fixed_halo_counts(all_lens, rank, size, is_left):  # pragma: no cover
+    """number of elements sent to and received from every process for halos
+    of 'size' elements. A halo spans multiple processes if neighbor chunks
+    are smaller than the halo. Left halo data flows to higher ranks.
+    """
+    n_pes = len(all_lens)
+    send_counts = np.zeros(n_pes, np.int64)
+    recv_counts = np.zeros(n_pes, np.int64)
+    step = 1 if is_left else -1
+    # destinations, chunks in between reduce the remaining halo
+    remaining = size
+    r = rank + step
+    while remaining > 0 and r >= 0 and r < n_pes:
+        send_counts[r] = min(remaining, all_lens[rank])
+        remaining -= all_lens[r]
+        r += step
+    # sources
+    remaining = size
+    k = rank - step
+    while remaining > 0 and k >= 0 and k < n_pes:
+        recv_counts[k] = min(remaining, all_lens[k])
+        remaining -= all_lens[k]
+        k -= step
+    return send_counts, recv_counts
+
+
+@numba.njit
+def _exchange_halo_data(in_arr, send_counts, recv_counts, is_left, tag):  # pragma: no cover
+    """send last (first if not is_left) send_counts[r] elements to every
+    process r and receive recv_counts[k] elements from every process k,
+    received data is concatenated in rank order.
+    """
+    N = len(in_arr)
+    n_pes = get_size()
+    halo = np.empty(recv_counts.sum(), in_arr.dtype)
+    comm_reqs = comm_req_alloc(np.int32(2 * n_pes))
+    req_ind = 0
+    ind = 0
+    for k in range(n_pes):
+        count = recv_counts[k]
+        if count > 0:
+            comm_reqs[req_ind] = irecv(halo[ind:ind + count], np.int32(count),
+                                       np.int32(k), tag)
+            req_ind += 1
+            ind += count
+    for r in range(n_pes):
+        count = send_counts[r]
+        if count > 0:
+            if is_left:
+                buff = np.ascontiguousarray(in_arr[N - count:])
+            else:
+                buff = np.ascontiguousarray(in_arr[:count])
+            comm_reqs[req_ind] = isend(buff, np.int32(count), np.int32(r), tag)
+            req_ind += 1
+    waitall(np.int32(req_ind), comm_reqs)
+    comm_req_dealloc(comm_reqs)
+    return halo
+
+
+@numba.njit
+def exchange_halos(in_arr, left_size, right_size, parallel):  # pragma: no cover
+    """get left_size elements before and right_size elements after the local
+    chunk (fewer at the beginning/end of data, empty if not parallel).
+    Halos are collected from as many processes as necessary, so windows
+    can be larger than chunks (e.g. small 1D_Var chunks after filter).
+    """
+    if not parallel:
+        return np.empty(0, in_arr.dtype), np.empty(0, in_arr.dtype)
+    rank = get_rank()
+    n_pes = get_size()
+    all_lens = np.empty(n_pes, np.int64)
+    allgather(all_lens, np.int64(len(in_arr)))
+    tag = np.int32(_HALO_TAG)
+    send_counts, recv_counts = _get_fixed_halo_counts(
+        all_lens, rank, left_size, True)
+    left_halo = _exchange_halo_data(in_arr, send_counts, recv_counts, True,
+                                    tag)
+    send_counts, recv_counts = _get_fixed_halo_counts(
+        all_lens, rank, right_size, False)
+    right_halo = _exchange_halo_data(in_arr, send_counts, recv_counts, False,
+                                     tag)
+    return left_halo, right_halo
+
+
+@numba.njit
+def _stream_get(left, arr, right, i):  # pragma: no cover
+    # element i of left halo + local chunk + right halo
+    nl = len(left)
+    if i < nl:
+        return left[i]
+    i -= nl
+    if i < len(arr):
+        return arr[i]
+    return right[i - len(arr)]
+
+
+@numba.njit
+def _get_center_offset(win, center):  # pragma: no cover
+    # output i is the window ending at i + offset
+    if center:
+        return (win - 1) // 2
+    return 0
+
+
+############################ sum/mean ############################
+
+@numba.njit
+def _add_sum(val, nobs, sum_x):  # pragma: no cover
+    if not np.isnan(val):
+        nobs += 1
+        sum_x += val
+    return nobs, sum_x
+
+
+@numba.njit
+def _remove_sum(val, nobs, sum_x):  # pragma: no cover
+    if not np.isnan(val):
+        nobs -= 1
+        sum_x -= val
+    return nobs, sum_x
+
+
+@numba.njit
+def _calc_sum(minp, nobs, sum_x):  # pragma: no cover
+    return sum_x if nobs >= minp else np.nan
+
+
+@numba.njit
+def _calc_mean(minp, nobs, sum_x):  # pragma: no cover
+    return sum_x / nobs if nobs >= minp and nobs > 0 else np.nan
+
+
+############################ var/std ############################
+
+@numba.njit
+def _add_var(val, nobs, mean_x, ssqdm_x):  # pragma: no cover
+    if not np.isnan(val):
+        nobs += 1
+        delta = val - mean_x
+        mean_x += delta / nobs
+        ssqdm_x += ((nobs - 1) * delta ** 2) / nobs
+    return nobs, mean_x, ssqdm_x
+
+
+@numba.njit
+def _remove_var(val, nobs, mean_x, ssqdm_x):  # pragma: no cover
+    if not np.isnan(val):
+        nobs -= 1
+        if nobs != 0:
+            delta = val - mean_x
+            mean_x -= delta / nobs
+            ssqdm_x -= ((nobs + 1) * delta ** 2) / nobs
+        else:
+            mean_x = 0.0
+            ssqdm_x = 0.0
+    return nobs, mean_x, ssqdm_x
+
+
+@numba.njit
+def _calc_var(minp, nobs, mean_x, ssqdm_x):  # pragma: no cover
+    ddof = 1
+    if nobs < minp or nobs <= ddof:
+        return np.nan
+    # avoid small negative values due to numerical error
+    return max(ssqdm_x / (nobs - ddof), 0.0)
+
+
+@numba.njit
+def _calc_std(minp, nobs, mean_x, ssqdm_x):  # pragma: no cover
+    return np.sqrt(_calc_var(minp, nobs, mean_x, ssqdm_x))
+
+
+# func -> (state names, init values, update functions suffix)
+_linear_funcs = {
+    'sum': (('sum_x',), ('0.0',), 'sum'),
+    'mean': (('sum_x',), ('0.0',), 'sum'),
+    'var': (('mean_x', 'ssqdm_x'), ('0.0', '0.0'), 'var'),
+    'std': (('mean_x', 'ssqdm_x'), ('0.0', '0.0'), 'var'),
+}
+
+
+def _gen_roll_fixed_linear(func):
+    state_names, init_vals, update = _linear_funcs[func]
+    state = ', '.join(('nobs',) + state_names)
+    func_text = "def roll_fixed_{}(in_arr, win, center, parallel):\n".format(func)
+    func_text += "  offset = _get_center_offset(win, center)\n"
+    func_text += "  left, right = exchange_halos(in_arr, win - 1, offset, parallel)\n"
+    func_text += "  N = len(in_arr)\n"
+    func_text += "  nl = len(left)\n"
+    func_text += "  L = nl + N + len(right)\n"
+    func_text += "  out = np.empty(N, np.float64)\n"
+    func_text += "  minp = win\n"
+    func_text += "  nobs = 0\n"
+    for name, val in zip(state_names, init_vals):
+        func_text += "  {} = {}\n".format(name, val)
+    func_text += "  for p in range(L):\n"
+    func_text += "    val = _stream_get(left, in_arr, right, p)\n"
+    func_text += "    {} = _add_{}(val, {})\n".format(state, update, state)
+    func_text += "    if p >= win:\n"
+    func_text += "      val = _stream_get(left, in_arr, right, p - win)\n"
+    func_text += "      {} = _remove_{}(val, {})\n".format(state, update, state)
+    func_text += "    j = p - nl - offset\n"
+    func_text += "    if j >= 0 and j < N:\n"
+    func_text += "      out[j] = _calc_{}(minp, {})\n".format(func, state)
+    # end of data for centered windows
+    func_text += "  for j in range(max(0, L - nl - offset), N):\n"
+    func_text += "    out[j] = np.nan\n"
+    func_text += "  return out\n"
+    loc_vars = {}
+    exec(func_text, {'np': np, 'exchange_halos': exchange_halos,
+                     '_stream_get': _stream_get,
+                     '_get_center_offset': _get_center_offset,
+                     '_add_' + update: globals()['_add_' + update],
+                     '_remove_' + update: globals()['_remove_' + update],
+                     '_calc_' + func: globals()['_calc_' + func]}, loc_vars)
+    return numba.njit(loc_vars['roll_fixed_' + func])
+
+
+############################ min/max ############################
+
+def _gen_roll_fixed_minmax(func):
+    # monotonic deque of window elements as a ring buffer of size win,
+    # elements dominated by a newer element are dropped from the back
+    cmp_op = '<=' if func == 'max' else '>='
+    func_text = "def roll_fixed_{}(in_arr, win, center, parallel):\n".format(func)
+    func_text += "  offset = _get_center_offset(win, center)\n"
+    func_text += "  left, right = exchange_halos(in_arr, win - 1, offset, parallel)\n"
+    func_text += "  N = len(in_arr)\n"
+    func_text += "  nl = len(left)\n"
+    func_text += "  L = nl + N + len(right)\n"
+    func_text += "  out = np.empty(N, np.float64)\n"
+    func_text += "  minp = win\n"
+    func_text += "  nobs = 0\n"
+    func_text += "  q_ind = np.empty(win, np.int64)\n"
+    func_text += "  q_val = np.empty(win, np.float64)\n"
+    func_text += "  head = 0\n"
+    func_text += "  q_size = 0\n"
+    func_text += "  for p in range(L):\n"
+    # remove expired element first so deque never has more than win elements
+    func_text += "    if p >= win:\n"
+    func_text += "      if not np.isnan(_stream_get(left, in_arr, right, p - win)):\n"
+    func_text += "        nobs -= 1\n"
+    func_text += "      while q_size > 0 and q_ind[head] <= p - win:\n"
+    func_text += "        head = (head + 1) % win\n"
+    func_text += "        q_size -= 1\n"
+    func_text += "    val = _stream_get(left, in_arr, right, p)\n"
+    func_text += "    if not np.isnan(val):\n"
+    func_text += "      nobs += 1\n"
+    func_text += "      while q_size > 0 and q_val[(head + q_size - 1) % win] {} val:\n".format(cmp_op)
+    func_text += "        q_size -= 1\n"
+    func_text += "      tail = (head + q_size) % win\n"
+    func_text += "      q_ind[tail] = p\n"
+    func_text += "      q_val[tail] = val\n"
+    func_text += "      q_size += 1\n"
+    func_text += "    j = p - nl - offset\n"
+    func_text += "    if j >= 0 and j < N:\n"
+    func_text += "      out[j] = q_val[head] if nobs >= minp and q_size > 0 else np.nan\n"
+    func_text += "  for j in range(max(0, L - nl - offset), N):\n"
+    func_text += "    out[j] = np.nan\n"
+    func_text += "  return out\n"
+    loc_vars = {}
+    exec(func_text, {'np': np, 'exchange_halos': exchange_halos,
+                     '_stream_get': _stream_get,
+                     '_get_center_offset': _get_center_offset}, loc_vars)
+    return numba.njit(loc_vars['roll_fixed_' + func])
+
+
+############################ shift/pct_change ############################
+
+@numba.njit
+def _shift_get(left, arr, right, i, shift):  # pragma: no cover
+    # element shift positions before element i of local chunk
+    p = len(left) + i - shift
+    if p < 0 or p >= len(left) + len(arr) + len(right):
+        return np.nan
+    return _stream_get(left, arr, right, p)
+
+
+@numba.njit
+def _shift_fill(in_arr, out, shift, parallel, fill):  # pragma: no cover
+    # out[i] is the element shift positions before element i, or fill
+    left, right = exchange_halos(in_arr, max(shift, 0), max(-shift, 0),
+                                 parallel)
+    N = len(in_arr)
+    L = len(left) + N + len(right)
+    for i in range(N):
+        p = len(left) + i - shift
+        if p < 0 or p >= L:
+            out[i] = fill
+        else:
+            out[i] = _stream_get(left, in_arr, right, p)
+
+
+def shift_fixed(in_arr, shift, parallel):  # pragma: no cover
+    return in_arr
+
+
+@overload(shift_fixed)
+def shift_fixed_overload(arr_t, shift_t, parallel_t):
+    """numeric values are shifted to float64 output with NaN fill similar to
+    Pandas, datetime64/timedelta64 keep their dtype with NaT fill
+    """
+    if not isinstance(arr_t, types.Array):
+        raise ValueError("shift not supported for {}".format(arr_t))
+    dtype = arr_t.dtype
+    if isinstance(dtype, (types.NPDatetime, types.NPTimedelta)):
+        nat = np.iinfo(np.int64).min
+        def dt_impl(in_arr, shift, parallel):
+            out = np.empty(len(in_arr), in_arr.dtype)
+            _shift_fill(in_arr.view(np.int64), out.view(np.int64), shift,
+                        parallel, nat)
+            return out
+        return dt_impl
+    if isinstance(dtype, (types.Number, types.Boolean)):
+        def num_impl(in_arr, shift, parallel):
+            out = np.empty(len(in_arr), np.float64)
+            _shift_fill(in_arr, out, shift, parallel, np.nan)
+            return out
+        return num_impl
+    raise ValueError("shift not supported for {}".format(arr_t))
+
+
+@numba.njit
+def pct_change_fixed(in_arr, shift, parallel):  # pragma: no cover
+    left, right = exchange_halos(in_arr, max(shift, 0), max(-shift, 0),
+                                 parallel)
+    N = len(in_arr)
+    out = np.empty(N, np.float64)
+    for i in range(N):
+        prev = _shift_get(left, in_arr, right, i, shift)
+        out[i] = (in_arr[i] - prev) / prev
+    return out
+
+
+@numba.njit
+def _get_group_lags(key_arr, order, shift):  # pragma: no cover
+    """index of the row 'shift' rows before every row in its group (-1 if
+    none), where rows are in original order when visited in 'order'.
+    Keys (int or string) are dict-encoded, so groups don't need to be
+    sorted or contiguous.
+    """
+    N = len(key_arr)
+    codes, _ = dict_encode(key_arr, N)
+    # stable sort by code keeps original row order in groups
+    perm = order[np.argsort(codes[order], kind='mergesort')]
+    lags = np.full(N, -1, np.int64)
+    for j in range(N):
+        lag_j = j - shift
+        if lag_j >= 0 and lag_j < N and codes[perm[lag_j]] == codes[perm[j]]:
+            lags[perm[j]] = perm[lag_j]
+    return lags
+
+
+@numba.njit
+def _group_lag_vals(vals, lags, is_diff):  # pragma: no cover
+    N = len(vals)
+    out = np.empty(N, np.float64)
+    for i in range(N):
+        if lags[i] == -1:
+            out[i] = np.nan
+        elif is_diff:
+            out[i] = vals[i] - vals[lags[i]]
+        else:
+            out[i] = vals[lags[i]]
+    return out
+
+
+@numba.njit
+def _send_to_origin(vals, row_ids, order, all_starts, N):  # pragma: no cover
+    """send values back to the processes that own their global row ids,
+    'order' visits rows in increasing row id order
+    """
+    n_pes = len(all_starts)
+    send_counts = np.zeros(n_pes, np.int32)
+    node_id = 0
+    for j in range(len(order)):
+        row_id = row_ids[order[j]]
+        while node_id < n_pes - 1 and row_id >= all_starts[node_id + 1]:
+            node_id += 1
+        send_counts[node_id] += 1
+    recv_counts = np.empty(n_pes, np.int32)
+    alltoall(send_counts, recv_counts, 1)
+    send_disp = calc_disp(send_counts)
+    recv_disp = calc_disp(recv_counts)
+    recv_vals = np.empty(N, np.float64)
+    recv_ids = np.empty(N, np.int64)
+    alltoallv(vals[order], recv_vals, send_counts, recv_counts, send_disp,
+              recv_disp)
+    alltoallv(row_ids[order], recv_ids, send_counts, recv_counts, send_disp,
+              recv_disp)
+    out = np.empty(N, np.float64)
+    start = all_starts[get_rank()]
+    for i in range(N):
+        out[recv_ids[i] - start] = recv_vals[i]
+    return out
+
+
+@numba.njit
+def _group_shift_diff(in_arr, key_arr, shift, parallel, is_diff):  # pragma: no cover
+    """groupby shift/diff with output aligned with input rows. In parallel,
+    rows are shuffled by key hash with their global row ids so every group
+    is on one process, and results are sent back to the owners of the rows.
+    """
+    if not parallel:
+        lags = _get_group_lags(key_arr, np.arange(len(key_arr)), shift)
+        return _group_lag_vals(in_arr, lags, is_diff)
+    N = len(in_arr)
+    n_pes = get_size()
+    all_lens = np.empty(n_pes, np.int64)
+    allgather(all_lens, np.int64(N))
+    all_starts = np.cumsum(all_lens) - all_lens
+    row_ids = np.arange(N) + all_starts[get_rank()]
+    recv_keys, recv_data = parallel_join(key_arr, (in_arr, row_ids))
+    recv_vals, recv_ids = recv_data
+    order = np.argsort(recv_ids)
+    lags = _get_group_lags(recv_keys, order, shift)
+    out_vals = _group_lag_vals(recv_vals, lags, is_diff)
+    return _send_to_origin(out_vals, recv_ids, order, all_starts, N)
+
+
+@numba.njit
+def group_shift(in_arr, key_arr, shift, parallel):  # pragma: no cover
+    return _group_shift_diff(in_arr, key_arr, shift, parallel, False)
+
+
+@numba.njit
+def group_diff(in_arr, key_arr, shift, parallel):  # pragma: no cover
+    return _group_shift_diff(in_arr, key_arr, shift, parallel, True)
+
+
+############################ ewm/expanding ############################
+
+# ewm (adjust=True) and expanding windows are linear recurrences over
+# exponentially decayed weights (decay = 1 - alpha, expanding has decay 1).
+# The state is (nobs, sum_wt, mean_x, ssqdm_x, sum_wt2), where ssqdm_x is the
+# weighted sum of squared differences from mean. Each process computes the
+# state of its chunk, states are allgathered in one collective and combined,
+# then each process computes its output starting from the prefix state.
+
+@numba.njit
+def _add_ewm(val, decay, nobs, sum_wt, mean_x, ssqdm_x, sum_wt2):  # pragma: no cover
+    # weights of previous observations decay for NaN values too
+    sum_wt *= decay
+    ssqdm_x *= decay
+    sum_wt2 *= decay * decay
+    if not np.isnan(val):
+        nobs += 1
+        sum_wt += 1.0
+        sum_wt2 += 1.0
+        delta = val - mean_x
+        mean_x += delta / sum_wt
+        ssqdm_x += delta * (val - mean_x)
+    return nobs, sum_wt, mean_x, ssqdm_x, sum_wt2
+
+
+@numba.njit
+def _merge_ewm(decay_b, nobs_a, wt_a, mean_a, ssq_a, wt2_a,
+               nobs_b, wt_b, mean_b, ssq_b, wt2_b):  # pragma: no cover
+    # state a followed by state b, decay_b is decay ** len(b)
+    wt_a *= decay_b
+    ssq_a *= decay_b
+    wt2_a *= decay_b * decay_b
+    nobs = nobs_a + nobs_b
+    wt = wt_a + wt_b
+    if wt == 0.0:
+        return nobs, 0.0, 0.0, 0.0, wt2_a + wt2_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * wt_b / wt
+    ssq = ssq_a + ssq_b + delta * delta * wt_a * wt_b / wt
+    return nobs, wt, mean, ssq, wt2_a + wt2_b
+
+
+@numba.njit
+def _ewm_prefix_state(N, decay, nobs, sum_wt, mean_x, ssqdm_x, sum_wt2,
+                      parallel):  # pragma: no cover
+    """combine states of previous processes with a single allgather
+    """
+    if not parallel:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    rank = get_rank()
+    n_pes = get_size()
+    n_state = 6
+    local = np.empty(n_state, np.float64)
+    local[0] = N
+    local[1] = nobs
+    local[2] = sum_wt
+    local[3] = mean_x
+    local[4] = ssqdm_x
+    local[5] = sum_wt2
+    all_states = np.empty(n_state * n_pes, np.float64)
+    allgather(all_states, local)
+    p_nobs = 0
+    p_wt = 0.0
+    p_mean = 0.0
+    p_ssq = 0.0
+    p_wt2 = 0.0
+    for k in range(rank):
+        st = all_states[k * n_state:(k + 1) * n_state]
+        decay_k = decay ** st[0]
+        p_nobs, p_wt, p_mean, p_ssq, p_wt2 = _merge_ewm(
+            decay_k, p_nobs, p_wt, p_mean, p_ssq, p_wt2,
+            np.int64(st[1]), st[2], st[3], st[4], st[5])
+    return p_nobs, p_wt, p_mean, p_ssq, p_wt2
+
+
+@numba.njit
+def _calc_ewm_sum(minp, nobs, sum_wt, mean_x, ssqdm_x, sum_wt2):  # pragma: no cover
+    return mean_x * sum_wt if nobs >= minp else np.nan
+
+
+@numba.njit
+def _calc_ewm_mean(minp, nobs, sum_wt, mean_x, ssqdm_x, sum_wt2):  # pragma: no cover
+    return mean_x if nobs >= minp else np.nan
+
+
+@numba.njit
+def _calc_ewm_var(minp, nobs, sum_wt, mean_x, ssqdm_x, sum_wt2):  # pragma: no cover
+    # unbiased weighted variance, same as Pandas with bias=False
+    num = sum_wt * sum_wt
+    denom = num - sum_wt2
+    if nobs < minp or denom <= 0.0:
+        return np.nan
+    return max(ssqdm_x * sum_wt / denom, 0.0)
+
+
+@numba.njit
+def _calc_ewm_std(minp, nobs, sum_wt, mean_x, ssqdm_x, sum_wt2):  # pragma: no cover
+    return np.sqrt(_calc_ewm_var(minp, nobs, sum_wt, mean_x, ssqdm_x, sum_wt2))
+
+
+def _gen_ewm(func):
+    state = 'nobs, sum_wt, mean_x, ssqdm_x, sum_wt2'
+    func_text = "def ewm_{}(in_arr, decay, minp, parallel):\n".format(func)
+    func_text += "  N = len(in_arr)\n"
+    func_text += "  minp = max(minp, 1)\n"
+    # local state
+    func_text += "  {} = 0, 0.0, 0.0, 0.0, 0.0\n".format(state)
+    func_text += "  if parallel:\n"
+    func_text += "    for i in range(N):\n"
+    func_text += "      {} = _add_ewm(in_arr[i], decay, {})\n".format(state, state)
+    func_text += "  {} = _ewm_prefix_state(N, decay, {}, parallel)\n".format(state, state)
+    func_text += "  out = np.empty(N, np.float64)\n"
+    func_text += "  for i in range(N):\n"
+    func_text += "    {} = _add_ewm(in_arr[i], decay, {})\n".format(state, state)
+    func_text += "    out[i] = _calc_ewm_{}(minp, {})\n".format(func, state)
+    func_text += "  return out\n"
+    loc_vars = {}
+    exec(func_text, {'np': np, '_add_ewm': _add_ewm,
+                     '_ewm_prefix_state': _ewm_prefix_state,
+                     '_calc_ewm_' + func: globals()['_calc_ewm_' + func]},
+         loc_vars)
+    return numba.njit(loc_vars['ewm_' + func])
+
+
+############################ offset windows ############################
+
+@numba.njit
+def exchange_offset_halo(in_arr, on_arr, win, parallel):  # pragma: no cover
+    """get rows of previous processes that are in the window of the first
+    row of this process (variable size halo, possibly from multiple
+    processes), returns values and timestamps.
+    """
+    if not parallel:
+        return np.empty(0, in_arr.dtype), np.empty(0, np.int64)
+    N = len(in_arr)
+    rank = get_rank()
+    n_pes = get_size()
+
+    # first timestamp of every process, empty chunks don't need halos
+    first_ts = np.int64(on_arr[0]) if N > 0 else _MAX_TS
+    all_first_ts = np.empty(n_pes, np.int64)
+    allgather(all_first_ts, first_ts)
+
+    # number of trailing rows in the window of first row of later processes
+    send_counts = np.zeros(n_pes, np.int64)
+    max_count = 0
+    for r in range(rank + 1, n_pes):
+        start_ts = all_first_ts[r] - win
+        count = 0
+        while count < N and np.int64(on_arr[N - 1 - count]) > start_ts:
+            count += 1
+        send_counts[r] = count
+        max_count = max(max_count, count)
+    recv_counts = np.empty(n_pes, np.int64)
+    alltoall(send_counts, recv_counts, 1)
+
+    send_ts = np.empty(max_count, np.int64)
+    for i in range(max_count):
+        send_ts[i] = np.int64(on_arr[N - max_count + i])
+    left_vals = _exchange_halo_data(in_arr, send_counts, recv_counts, True,
+                                    np.int32(_HALO_TAG))
+    left_ts = _exchange_halo_data(send_ts, send_counts, recv_counts, True,
+                                  np.int32(_HALO_TAG + 1))
+    return left_vals, left_ts
+
+
+@numba.njit
+def _stream_get_ts(left_ts, on_arr, i):  # pragma: no cover
+    # timestamp i of left halo + local chunk as int64
+    nl = len(left_ts)
+    if i < nl:
+        return left_ts[i]
+    return np.int64(on_arr[i - nl])
+
+
+def _gen_offset_loop_header():
+    # two-pointer sweep: window of row p is rows with ts in (ts[p] - win, ts[p]]
+    # 'start' is the first row in window
+    func_text = "  left, left_ts = exchange_offset_halo(in_arr, on_arr, win, parallel)\n"
+    func_text += "  empty = in_arr[:0]\n"
+    func_text += "  N = len(in_arr)\n"
+    func_text += "  nl = len(left)\n"
+    func_text += "  L = nl + N\n"
+    func_text += "  out = np.empty(N, np.float64)\n"
+    # default min_periods of offset windows is 1
+    func_text += "  minp = 1\n"
+    func_text += "  nobs = 0\n"
+    func_text += "  start = 0\n"
+    return func_text
+
+
+def _gen_roll_offset_linear(func):
+    state_names, init_vals, update = _linear_funcs[func]
+    state = ', '.join(('nobs',) + state_names)
+    func_text = "def roll_offset_{}(in_arr, on_arr, win, parallel):\n".format(func)
+    func_text += _gen_offset_loop_header()
+    for name, val in zip(state_names, init_vals):
+        func_text += "  {} = {}\n".format(name, val)
+    func_text += "  for p in range(L):\n"
+    func_text += "    val = _stream_get(left, in_arr, empty, p)\n"
+    func_text += "    {} = _add_{}(val, {})\n".format(state, update, state)
+    func_text += "    end_ts = _stream_get_ts(left_ts, on_arr, p) - win\n"
+    func_text += "    while _stream_get_ts(left_ts, on_arr, start) <= end_ts:\n"
+    func_text += "      val = _stream_get(left, in_arr, empty, start)\n"
+    func_text += "      {} = _remove_{}(val, {})\n".format(state, update, state)
+    func_text += "      start += 1\n"
+    func_text += "    if p >= nl:\n"
+    func_text += "      out[p - nl] = _calc_{}(minp, {})\n".format(func, state)
+    func_text += "  return out\n"
+    loc_vars = {}
+    exec(func_text, {'np': np, 'exchange_offset_halo': exchange_offset_halo,
+                     '_stream_get': _stream_get,
+                     '_stream_get_ts': _stream_get_ts,
+                     '_add_' + update: globals()['_add_' + update],
+                     '_remove_' + update: globals()['_remove_' + update],
+                     '_calc_' + func: globals()['_calc_' + func]}, loc_vars)
+    return numba.njit(loc_vars['roll_offset_' + func])
+
+
+def _gen_roll_offset_minmax(func):
+    # monotonic deque, window size is not bounded so deque arrays have
+    # capacity of all rows and head/tail only move forward
+    cmp_op = '<=' if func == 'max' else '>='
+    func_text = "def roll_offset_{}(in_arr, on_arr, win, parallel):\n".format(func)
+    func_text += _gen_offset_loop_header()
+    func_text += "  q_ind = np.empty(L, np.int64)\n"
+    func_text += "  q_val = np.empty(L, np.float64)\n"
+    func_text += "  head = 0\n"
+    func_text += "  tail = 0\n"
+    func_text += "  for p in range(L):\n"
+    func_text += "    val = _stream_get(left, in_arr, empty, p)\n"
+    func_text += "    if not np.isnan(val):\n"
+    func_text += "      nobs += 1\n"
+    func_text += "      while tail > head and q_val[tail - 1] {} val:\n".format(cmp_op)
+    func_text += "        tail -= 1\n"
+    func_text += "      q_ind[tail] = p\n"
+    func_text += "      q_val[tail] = val\n"
+    func_text += "      tail += 1\n"
+    func_text += "    end_ts = _stream_get_ts(left_ts, on_arr, p) - win\n"
+    func_text += "    while _stream_get_ts(left_ts, on_arr, start) <= end_ts:\n"
+    func_text += "      if not np.isnan(_stream_get(left, in_arr, empty, start)):\n"
+    func_text += "        nobs -= 1\n"
+    func_text += "      start += 1\n"
+    func_text += "    while tail > head and q_ind[head] < start:\n"
+    func_text += "      head += 1\n"
+    func_text += "    if p >= nl:\n"
+    func_text += "      out[p - nl] = q_val[head] if nobs >= minp and tail > head else np.nan\n"
+    func_text += "  return out\n"
+    loc_vars = {}
+    exec(func_text, {'np': np, 'exchange_offset_halo': exchange_offset_halo,
+                     '_stream_get': _stream_get,
+                     '_stream_get_ts': _stream_get_ts}, loc_vars)
+    return numba.njit(loc_vars['roll_offset_' + func])
+
+
+roll_fixed_sum = _gen_roll_fixed_linear('sum')
+roll_fixed_mean = _gen_roll_fixed_linear('mean')
+roll_fixed_var = _gen_roll_fixed_linear('var')
+roll_fixed_std = _gen_roll_fixed_linear('std')
+roll_fixed_min = _gen_roll_fixed_minmax('min')
+roll_fixed_max = _gen_roll_fixed_minmax('max')
+roll_offset_sum = _gen_roll_offset_linear('sum')
+roll_offset_mean = _gen_roll_offset_linear('mean')
+roll_offset_var = _gen_roll_offset_linear('var')
+roll_offset_std = _gen_roll_offset_linear('std')
+roll_offset_min = _gen_roll_offset_minmax('min')
+roll_offset_max = _gen_roll_offset_minmax('max')
+ewm_sum = _gen_ewm('sum')
+ewm_mean = _gen_ewm('mean')
+ewm_var = _gen_ewm('var')
+ewm_std = _gen_ewm('std')
@@ -4,19 +4,24 @@ from collections import namedtuple
 import numba
 from numba import typeinfer, ir, ir_utils, config, types
 from numba.ir_utils import (visit_vars_inner, replace_vars_inner,
-                            compile_to_numba_ir, replace_arg_nodes)
+                            replace_arg_nodes)
 from numba.typing import signature
 from numba.extending import overload
 import hpat
 import hpat.timsort
-from hpat import distributed, distributed_analysis
+from hpat import distributed, distributed_analysis, compile_profiler
 from hpat.distributed_api import Reduce_Type, _h5_typ_table
 from hpat.distributed_analysis import Distribution
 from hpat.utils import debug_prints, empty_like_type, get_ctypes_ptr
+from hpat.utils import compile_to_numba_ir
 from hpat.str_arr_ext import (string_array_type, to_string_list,
                               cp_str_list_to_array, str_list_to_array,
                               get_offset_ptr, get_data_ptr, convert_len_arr_to_offset,
-                              pre_alloc_string_array, del_str, num_total_chars)
+                              pre_alloc_string_array, del_str, num_total_chars,
+                              get_str_view, dict_str_arr_type)
+from hpat.str_ext import release_str
+from hpat.hiframes_dict_enc import (dict_local_sort, gen_dict_arrs_to_codes,
+                                    gen_codes_to_dict_arr)
 
 MIN_SAMPLES = 1000000
 #MIN_SAMPLES = 100
@@ -42,14 +47,15 @@ class Sort(ir.Stmt):
 def sort_array_analysis(sort_node, equiv_set, typemap, array_analysis):
 
     # arrays of input df have same size in first dimension as key array
-    col_shape = equiv_set.get_shape(sort_node.key_arr)
-    if typemap[sort_node.key_arr.name] == string_array_type:
+    if typemap[sort_node.key_arr.name] in (string_array_type,
+                                           dict_str_arr_type):
         all_shapes = []
     else:
+        col_shape = equiv_set.get_shape(sort_node.key_arr)
         all_shapes = [col_shape[0]]
     for col_var in sort_node.df_vars.values():
         typ = typemap[col_var.name]
-        if typ == string_array_type:
+        if typ in (string_array_type, dict_str_arr_type):
             continue
         col_shape = equiv_set.get_shape(col_var)
         all_shapes.append(col_shape[0])
@@ -169,6 +175,14 @@ def sort_distributed_run(sort_node, array_dists, typemap, calltypes, typingctx,
                 and array_dists[v.name] != distributed.Distribution.OneD_Var):
             parallel = False
 
+    # dictionary-encoded columns are sorted as codes of a unified dictionary
+    dict_vars = {v.name: v for v in [sort_node.key_arr] + data_vars
+                 if typemap[v.name] == dict_str_arr_type}
+    if dict_vars:
+        return _sort_dict_arrs_run(sort_node, list(dict_vars.values()),
+                                   parallel, array_dists, typemap, calltypes,
+                                   typingctx, targetctx)
+
     key_arr = sort_node.key_arr
 
     col_name_args = ', '.join(["c"+str(i) for i in range(len(data_vars))])
@@ -255,6 +269,29 @@ def sort_distributed_run(sort_node, array_dists, typemap, calltypes, typingctx,
 distributed.distributed_run_extensions[Sort] = sort_distributed_run
 
 
+def _sort_dict_arrs_run(sort_node, dict_vars, parallel, array_dists, typemap,
+                        calltypes, typingctx, targetctx):
+    """sort codes of dictionary-encoded columns and set the columns to the
+    sorted codes afterwards
+    """
+    nodes, var_codes = gen_dict_arrs_to_codes(
+        [[v] for v in dict_vars], parallel, array_dists, typemap, calltypes,
+        typingctx)
+    codes_vars = {name: c for name, (c, _) in var_codes.items()}
+    key_arr = sort_node.key_arr
+    codes_sort_node = Sort(
+        sort_node.df_in, codes_vars.get(key_arr.name, key_arr),
+        {c: codes_vars.get(v.name, v) for c, v in sort_node.df_vars.items()},
+        sort_node.loc)
+    nodes += sort_distributed_run(codes_sort_node, array_dists, typemap,
+                                  calltypes, typingctx, targetctx)
+    for v in dict_vars:
+        codes_var, dict_var = var_codes[v.name]
+        nodes += gen_codes_to_dict_arr(codes_var, dict_var, v, typemap,
+                                       calltypes, typingctx)
+    return nodes
+
+
 def to_string_list_typ(typ):
     if typ == string_array_type:
         return types.List(hpat.str_ext.string_type)
@@ -268,6 +305,24 @@ def to_string_list_typ(typ):
     return typ
 
 def get_local_sort_func(key_typ, data_tup_typ):
+    if key_typ == string_array_type:
+        # string keys with few distinct values are sorted as dictionary codes
+        codes_sort_f = get_local_sort_func(
+            types.Array(types.int32, 1, 'C'), data_tup_typ)
+        str_sort_f = _get_timsort_func(key_typ, data_tup_typ)
+
+        def dict_sort_f(key_arr, data):
+            dict_local_sort(key_arr, data, codes_sort_f, str_sort_f)
+
+        _local_sort_f = numba.njit(dict_sort_f)
+        with compile_profiler.nested('njit compile'):
+            _local_sort_f.compile(signature(types.none, key_typ, data_tup_typ))
+        return _local_sort_f
+
+    return _get_timsort_func(key_typ, data_tup_typ)
+
+
+def _get_timsort_func(key_typ, data_tup_typ):
     sort_state_spec = [
         ('key_arr', to_string_list_typ(key_typ)),
         ('aLength', numba.intp),
@@ -285,7 +340,8 @@ def get_local_sort_func(key_typ, data_tup_typ):
     # XXX: make sure function is not using old SortState
     local_sort.__globals__['SortState'] = SortStateCL
     _local_sort_f = numba.njit(local_sort)
-    _local_sort_f.compile(signature(types.none, key_typ, data_tup_typ))
+    with compile_profiler.nested('njit compile'):
+        _local_sort_f.compile(signature(types.none, key_typ, data_tup_typ))
     return _local_sort_f
 
 
@@ -339,7 +395,8 @@ def parallel_sort(key_arr, data):
     node_id = 0
     for i in range(n_local):
         val = key_arr[i]
-        if node_id < (n_pes - 1) and val >= bounds[node_id]:
+        # skip all bounds <= val (e.g. equal bounds of repeated keys)
+        while node_id < (n_pes - 1) and val >= bounds[node_id]:
             node_id += 1
         update_shuffle_meta(shuffle_meta, node_id, i, val)
         update_data_shuffle_meta(data_shuffle_meta, node_id, i, data)
@@ -399,7 +456,7 @@ def update_shuffle_meta_overload(meta_t, node_id_t, ind_t, val_t, is_contig_t=No
         shuffle_meta.send_counts_char[node_id] += n_chars
         if is_contig:
             shuffle_meta.send_arr_lens[ind] = n_chars
-        del_str(val)
+        release_str(val)
 
     return update_str_impl
 
@@ -669,16 +726,14 @@ def update_data_shuffle_meta_overload(meta_t, node_id_t, ind_t, data_t, is_conti
     func_text = "def f(meta_tup, node_id, ind, data, is_contig=True):\n"
     for i, typ in enumerate(data_t.types):
         if typ == string_array_type:
-            func_text += "  val_{} = data[{}][ind]\n".format(i, i)
-            func_text += "  n_chars_{} = len(val_{})\n".format(i, i)
-            func_text += "  del_str(val_{})\n".format(i)
+            func_text += "  n_chars_{} = len(get_str_view(data[{}], ind))\n".format(i, i)
             func_text += "  meta_tup[{}].send_counts_char[node_id] += n_chars_{}\n".format(i, i)
             func_text += "  if is_contig:\n"
             func_text += "    meta_tup[{}].send_arr_lens[ind] = n_chars_{}\n".format(i, i)
 
     func_text += "  return\n"
     loc_vars = {}
-    exec(func_text, {'del_str': del_str}, loc_vars)
+    exec(func_text, {'get_str_view': get_str_view}, loc_vars)
     update_impl = loc_vars['f']
     return update_impl
 
@@ -0,0 +1,506 @@
+"""
+Fused statistics kernels of Series/DataFrame describe(). count, mean, M2
+(sum of squared differences from mean), min and max are computed in one
+pass, and per-process states are combined with a single allgather.
+Quantiles share one copy of data and selection rounds (quantiles_parallel).
+Approximate quantiles use a mergeable log-bucket sketch with relative error
+_SKETCH_ALPHA and approximate nunique uses HyperLogLog registers. Sketches
+are merged with one array allreduce, or shuffled by key as sparse
+(group, code) entries per group. The distributed pass sets the parallel flag for distributed
+inputs.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import numba
+from numba import types
+from numba.extending import overload
+import llvmlite.binding as ll
+import quantile_alg
+import hpat
+from hpat.distributed_api import (get_size, allgather, get_type_enum,
+                                  dist_reduce, Reduce_Type)
+from hpat.hiframes_sort import (
+    alloc_shuffle_metadata, data_alloc_shuffle_metadata, alltoallv,
+    alltoallv_tup, finalize_shuffle_meta, finalize_data_shuffle_meta,
+    update_shuffle_meta, update_data_shuffle_meta,
+    )
+from hpat.hiframes_join import write_send_buff, write_data_send_buff
+from hpat.hiframes_dict_enc import dict_encode
+from hpat.str_arr_ext import string_array_type, get_str_view
+
+ll.add_symbol('quantiles_parallel', quantile_alg.quantiles_parallel)
+
+# data, local size, quantiles, out, number of quantiles, type enum, parallel
+_quantiles_parallel = types.ExternalFunction(
+    "quantiles_parallel", types.void(types.voidptr, types.int64,
+                                     types.voidptr, types.voidptr, types.int64,
+                                     types.int32, types.int32))
+
+_N_STATE = 5
+# index labels of describe() output
+describe_labels = ('count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max')
+
+_SUM_OP = Reduce_Type.Sum.value
+_MAX_OP = Reduce_Type.Max.value
+
+# value x > 0 is in bucket k if gamma**(k-1) < x <= gamma**k, the bucket's
+# representative value has relative error at most alpha
+_SKETCH_ALPHA = 0.01
+_SKETCH_GAMMA = (1 + _SKETCH_ALPHA) / (1 - _SKETCH_ALPHA)
+_SKETCH_LOG_GAMMA = np.log(_SKETCH_GAMMA)
+_SKETCH_MAX_KEY = int(np.ceil(np.log(np.finfo(np.float64).max)
+                              / _SKETCH_LOG_GAMMA))
+# bucket keys of all float64 magnitudes (including subnormals) plus this
+# offset are positive and less than 2**_SKETCH_CODE_BITS
+_SKETCH_KEY_OFFSET = 1 << 16
+_SKETCH_CODE_BITS = 18
+
+# HyperLogLog with 2**_HLL_P registers, standard error 1.04/sqrt(2**_HLL_P)
+_HLL_P = 14
+_HLL_M = 1 << _HLL_P
+_HLL_MASK = np.uint64(_HLL_M - 1)
+_HLL_ALPHA = 0.7213 / (1.0 + 1.079 / _HLL_M)
+_HLL_MIX1 = np.uint64(0xbf58476d1ce4e5b9)
+_HLL_MIX2 = np.uint64(0x94d049bb133111eb)
+
+
+@numba.njit
+def quantiles(in_arr, q_arr, parallel):  # pragma: no cover
+    """linear interpolation quantiles of in_arr for all values of q_arr,
+    NaN values are ignored
+    """
+    data = np.ascontiguousarray(in_arr)
+    qs = np.ascontiguousarray(q_arr).astype(np.float64)
+    out = np.empty(len(qs), np.float64)
+    _quantiles_parallel(data.ctypes, len(data), qs.ctypes, out.ctypes,
+                        len(qs), get_type_enum(data), np.int32(parallel))
+    return out
+
+
+@numba.njit
+def _merge_describe(nobs_a, mean_a, m2_a, min_a, max_a,
+                    nobs_b, mean_b, m2_b, min_b, max_b):  # pragma: no cover
+    nobs = nobs_a + nobs_b
+    if nobs == 0:
+        return 0.0, 0.0, 0.0, min_a, max_a
+    delta = mean_b - mean_a
+    mean = mean_a + delta * nobs_b / nobs
+    m2 = m2_a + m2_b + delta * delta * nobs_a * nobs_b / nobs
+    return nobs, mean, m2, min(min_a, min_b), max(max_a, max_b)
+
+
+@numba.njit
+def _describe_state(in_arr):  # pragma: no cover
+    # one pass Welford update, NaNs are skipped
+    nobs = 0.0
+    mean = 0.0
+    m2 = 0.0
+    min_val = np.inf
+    max_val = -np.inf
+    for i in range(len(in_arr)):
+        val = in_arr[i]
+        if not np.isnan(val):
+            nobs += 1.0
+            delta = val - mean
+            mean += delta / nobs
+            m2 += delta * (val - mean)
+            min_val = min(min_val, val)
+            max_val = max(max_val, val)
+    return nobs, mean, m2, min_val, max_val
+
+
+@numba.njit
+def describe(in_arr, parallel):  # pragma: no cover
+    """count, mean, std, min, 25%, 50%, 75% and max of in_arr
+    """
+    nobs, mean, m2, min_val, max_val = _describe_state(in_arr)
+    if parallel:
+        n_pes = get_size()
+        local = np.empty(_N_STATE, np.float64)
+        local[0] = nobs
+        local[1] = mean
+        local[2] = m2
+        local[3] = min_val
+        local[4] = max_val
+        all_states = np.empty(_N_STATE * n_pes, np.float64)
+        allgather(all_states, local)
+        nobs, mean, m2, min_val, max_val = 0.0, 0.0, 0.0, np.inf, -np.inf
+        for k in range(n_pes):
+            st = all_states[k * _N_STATE:(k + 1) * _N_STATE]
+            nobs, mean, m2, min_val, max_val = _merge_describe(
+                nobs, mean, m2, min_val, max_val,
+                st[0], st[1], st[2], st[3], st[4])
+
+    qs = quantiles(in_arr, np.array([.25, .5, .75]), parallel)
+    out = np.empty(8, np.float64)
+    out[0] = nobs
+    out[1] = mean if nobs > 0 else np.nan
+    out[2] = np.sqrt(max(m2 / (nobs - 1), 0.0)) if nobs > 1 else np.nan
+    out[3] = min_val if nobs > 0 else np.nan
+    out[4] = qs[0]
+    out[5] = qs[1]
+    out[6] = qs[2]
+    out[7] = max_val if nobs > 0 else np.nan
+    return out
+
+
+@numba.njit
+def _sketch_code(val):  # pragma: no cover
+    """signed bucket code of a non-NaN value, ordered by value. 0 is the zero
+    bucket, negative values have negative codes
+    """
+    if val == 0.0:
+        return 0
+    key = np.log(abs(val)) / _SKETCH_LOG_GAMMA
+    code = _SKETCH_MAX_KEY
+    if key < _SKETCH_MAX_KEY:
+        code = np.int64(np.ceil(key))
+    code += _SKETCH_KEY_OFFSET
+    if val < 0.0:
+        return -code
+    return code
+
+
+@numba.njit
+def _sketch_value(code):  # pragma: no cover
+    """representative value of bucket code
+    """
+    if code == 0:
+        return 0.0
+    key = abs(code) - _SKETCH_KEY_OFFSET
+    val = 2.0 * np.exp(key * _SKETCH_LOG_GAMMA) / (1.0 + _SKETCH_GAMMA)
+    if code < 0:
+        return -val
+    return val
+
+
+@numba.njit
+def approx_quantile(in_arr, q, parallel):  # pragma: no cover
+    """approximate q quantile of in_arr with relative error _SKETCH_ALPHA,
+    NaN values are ignored
+    """
+    # bucket codes of values and range of code magnitudes
+    codes = np.empty(len(in_arr), np.int64)
+    n = 0
+    bounds = np.zeros(2, np.int64)
+    bounds[0] = -(_SKETCH_MAX_KEY + _SKETCH_KEY_OFFSET)
+    for i in range(len(in_arr)):
+        val = np.float64(in_arr[i])
+        if not np.isnan(val):
+            code = _sketch_code(val)
+            codes[n] = code
+            n += 1
+            if code != 0:
+                bounds[0] = max(bounds[0], -abs(code))
+                bounds[1] = max(bounds[1], abs(code))
+    if parallel:
+        bounds = dist_reduce(bounds, np.int32(_MAX_OP))
+    lo = -bounds[0]
+    nb = max(bounds[1] - lo + 1, 0)
+
+    # dense sketch: negative buckets in value order, zero, positive buckets
+    counts = np.zeros(2 * nb + 1, np.int64)
+    for i in range(n):
+        code = codes[i]
+        slot = nb
+        if code > 0:
+            slot = nb + 1 + code - lo
+        elif code < 0:
+            slot = nb - 1 + code + lo
+        counts[slot] += 1
+    if parallel:
+        counts = dist_reduce(counts, np.int32(_SUM_OP))
+
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    rank = q * (total - 1)
+    cum = 0
+    for slot in range(len(counts)):
+        cum += counts[slot]
+        if cum > rank:
+            break
+    if slot > nb:
+        return _sketch_value(slot - nb - 1 + lo)
+    if slot < nb:
+        return _sketch_value(slot - nb + 1 - lo)
+    return 0.0
+
+
+@numba.njit
+def _merge_sketch_entries(entries, weights, use_max):  # pragma: no cover
+    """sort (group, code) entries and sum (or max) weights of equal entries
+    """
+    order = np.argsort(entries)
+    out_entries = np.empty(len(entries), np.int64)
+    out_weights = np.empty(len(entries), np.int64)
+    n = 0
+    for i in range(len(order)):
+        e = entries[order[i]]
+        w = weights[order[i]]
+        if n > 0 and out_entries[n - 1] == e:
+            if use_max:
+                out_weights[n - 1] = max(out_weights[n - 1], w)
+            else:
+                out_weights[n - 1] += w
+        else:
+            out_entries[n] = e
+            out_weights[n] = w
+            n += 1
+    return out_entries[:n], out_weights[:n]
+
+
+@numba.njit
+def _get_group_ids(key_arr):  # pragma: no cover
+    """group id of every row (in order of first appearance of keys) and first
+    row of every group
+    """
+    codes, first_rows = dict_encode(key_arr, len(key_arr))
+    # int64 since ids are shifted to combine with sketch codes
+    return codes.astype(np.int64), first_rows
+
+
+@numba.njit
+def _shuffle_group_entries(key_arr, first_rows, entries, weights, code_bits,
+                           use_max):  # pragma: no cover
+    """send sparse (group, code) sketch entries to the process owning the
+    group key, and merge received entries of each key. Returns entries with
+    new group ids, their weights and the number of groups.
+    """
+    code_mask = (1 << code_bits) - 1
+    codes = entries & code_mask
+    n_pes = get_size()
+    shuffle_meta = alloc_shuffle_metadata(key_arr, n_pes, False)
+    data = (codes, weights)
+    data_shuffle_meta = data_alloc_shuffle_metadata(data, n_pes, False)
+    for i in range(len(entries)):
+        val = key_arr[first_rows[entries[i] >> code_bits]]
+        node_id = hash(val) % n_pes
+        update_shuffle_meta(shuffle_meta, node_id, i, val, False)
+        update_data_shuffle_meta(data_shuffle_meta, node_id, i, data, False)
+
+    finalize_shuffle_meta(key_arr, shuffle_meta, False)
+    finalize_data_shuffle_meta(data, data_shuffle_meta, shuffle_meta, False)
+
+    for i in range(len(entries)):
+        val = key_arr[first_rows[entries[i] >> code_bits]]
+        node_id = hash(val) % n_pes
+        write_send_buff(shuffle_meta, node_id, val)
+        write_data_send_buff(data_shuffle_meta, node_id, i, data, shuffle_meta)
+        shuffle_meta.tmp_offset[node_id] += 1
+
+    alltoallv(key_arr, shuffle_meta)
+    recv_codes, recv_weights = alltoallv_tup(data, data_shuffle_meta,
+                                             shuffle_meta)
+    recv_keys = shuffle_meta.out_arr
+
+    gids, first_rows = _get_group_ids(recv_keys)
+    recv_entries = (gids << code_bits) + recv_codes
+    entries, weights = _merge_sketch_entries(recv_entries, recv_weights,
+                                             use_max)
+    return entries, weights, len(first_rows)
+
+
+@numba.njit
+def _group_sketch_entries(gids, n_groups, in_arr):  # pragma: no cover
+    """sparse per-group sketches as sorted (group, code) entries and counts.
+    Every group has a zero count entry so groups of all NaN values are kept
+    """
+    n = len(in_arr)
+    entries = np.empty(n + n_groups, np.int64)
+    weights = np.empty(n + n_groups, np.int64)
+    code_bias = 1 << (_SKETCH_CODE_BITS - 1)
+    for g in range(n_groups):
+        entries[g] = (g << _SKETCH_CODE_BITS) + code_bias
+        weights[g] = 0
+    n_ent = n_groups
+    for i in range(n):
+        val = np.float64(in_arr[i])
+        if not np.isnan(val):
+            entries[n_ent] = ((gids[i] << _SKETCH_CODE_BITS)
+                              + _sketch_code(val) + code_bias)
+            weights[n_ent] = 1
+            n_ent += 1
+    return _merge_sketch_entries(entries[:n_ent], weights[:n_ent], False)
+
+
+@numba.njit
+def _group_sketch_quantiles(entries, weights, n_groups, q):  # pragma: no cover
+    code_bias = 1 << (_SKETCH_CODE_BITS - 1)
+    code_mask = (1 << _SKETCH_CODE_BITS) - 1
+    out = np.full(n_groups, np.nan)
+    start = 0
+    while start < len(entries):
+        g = entries[start] >> _SKETCH_CODE_BITS
+        end = start
+        total = 0
+        while end < len(entries) and (entries[end] >> _SKETCH_CODE_BITS) == g:
+            total += weights[end]
+            end += 1
+        if total > 0:
+            rank = q * (total - 1)
+            cum = 0
+            for j in range(start, end):
+                cum += weights[j]
+                if cum > rank:
+                    out[g] = _sketch_value((entries[j] & code_mask) - code_bias)
+                    break
+        start = end
+    return out
+
+
+@numba.njit
+def group_approx_quantile(key_arr, in_arr, q, parallel):  # pragma: no cover
+    """approximate q quantile of in_arr per group of key_arr. In parallel,
+    sparse group sketches are shuffled to the process owning the key.
+    """
+    gids, first_rows = _get_group_ids(key_arr)
+    n_groups = len(first_rows)
+    entries, weights = _group_sketch_entries(gids, n_groups, in_arr)
+    if parallel:
+        entries, weights, n_groups = _shuffle_group_entries(
+            key_arr, first_rows, entries, weights, _SKETCH_CODE_BITS, False)
+    return _group_sketch_quantiles(entries, weights, n_groups, q)
+
+
+@numba.njit
+def _mix64(x):  # pragma: no cover
+    # splitmix64 finalizer, spreads bits of keys like small integers
+    x = (x ^ (x >> np.uint64(30))) * _HLL_MIX1
+    x = (x ^ (x >> np.uint64(27))) * _HLL_MIX2
+    return x ^ (x >> np.uint64(31))
+
+
+def _hll_hash(arr, i):  # pragma: no cover
+    """64-bit hash of arr[i] and whether it is a valid (not NaN/NaT) value
+    """
+    return np.uint64(0), True
+
+
+@overload(_hll_hash)
+def _hll_hash_overload(arr_t, ind_t):
+    if arr_t == string_array_type:
+        def str_impl(arr, i):
+            h = hash(get_str_view(arr, i))
+            return _mix64(np.uint64(h)), True
+        return str_impl
+
+    dtype = arr_t.dtype
+    if isinstance(dtype, (types.NPDatetime, types.NPTimedelta)):
+        nat = np.iinfo(np.int64).min
+        def dt_impl(arr, i):
+            val = np.int64(arr[i])
+            return _mix64(np.uint64(val)), val != nat
+        return dt_impl
+
+    if isinstance(dtype, types.Float):
+        def float_impl(arr, i):
+            val = arr[i]
+            h = hash(val)
+            # -1 is reserved in hash() and mapped to -2
+            if val == -1.0:
+                h = -1
+            return _mix64(np.uint64(h)), not np.isnan(val)
+        return float_impl
+
+    return lambda arr, i: (_mix64(np.uint64(arr[i])), True)
+
+
+@numba.njit
+def _hll_register(h):  # pragma: no cover
+    """register index (low bits) and rank of first set bit of other bits
+    """
+    ind = np.int64(h & _HLL_MASK)
+    w = h >> np.uint64(_HLL_P)
+    rho = 1
+    while rho <= 64 - _HLL_P and (w & np.uint64(1)) == np.uint64(0):
+        w = w >> np.uint64(1)
+        rho += 1
+    return ind, rho
+
+
+@numba.njit
+def _hll_estimate(inv_sum, n_zero):  # pragma: no cover
+    """HyperLogLog estimate from sum of 2**-register and number of empty
+    registers (linear counting for small cardinalities)
+    """
+    m = float(_HLL_M)
+    est = _HLL_ALPHA * m * m / inv_sum
+    if est <= 2.5 * m and n_zero > 0:
+        est = m * np.log(m / n_zero)
+    return np.int64(np.round(est))
+
+
+@numba.njit
+def approx_nunique(in_arr, parallel):  # pragma: no cover
+    """approximate number of unique values of in_arr using HyperLogLog, NaN
+    values are ignored. Registers are merged with one max allreduce.
+    """
+    regs = np.zeros(_HLL_M, np.uint8)
+    for i in range(len(in_arr)):
+        h, valid = _hll_hash(in_arr, i)
+        if valid:
+            ind, rho = _hll_register(h)
+            regs[ind] = max(regs[ind], np.uint8(rho))
+    if parallel:
+        regs = dist_reduce(regs, np.int32(_MAX_OP))
+    inv_sum = 0.0
+    n_zero = 0
+    for j in range(_HLL_M):
+        inv_sum += 2.0 ** -np.float64(regs[j])
+        if regs[j] == 0:
+            n_zero += 1
+    return _hll_estimate(inv_sum, n_zero)
+
+
+@numba.njit
+def _group_hll_estimates(entries, weights, n_groups):  # pragma: no cover
+    # sparse registers, absent (or zero) registers contribute 2**0
+    out = np.zeros(n_groups, np.int64)
+    start = 0
+    while start < len(entries):
+        g = entries[start] >> _HLL_P
+        end = start
+        n_set = 0
+        inv_sum = 0.0
+        while end < len(entries) and (entries[end] >> _HLL_P) == g:
+            if weights[end] > 0:
+                n_set += 1
+                inv_sum += 2.0 ** -np.float64(weights[end])
+            end += 1
+        n_zero = _HLL_M - n_set
+        out[g] = _hll_estimate(inv_sum + n_zero, n_zero)
+        start = end
+    return out
+
+
+@numba.njit
+def group_approx_nunique(key_arr, in_arr, parallel):  # pragma: no cover
+    """approximate number of unique values of in_arr per group of key_arr.
+    Groups have sparse HyperLogLog registers that are shuffled to the process
+    owning the key and merged with max.
+    """
+    gids, first_rows = _get_group_ids(key_arr)
+    n_groups = len(first_rows)
+    n = len(in_arr)
+    entries = np.empty(n + n_groups, np.int64)
+    weights = np.empty(n + n_groups, np.int64)
+    # zero entry for every group so groups of all NaN values are kept
+    for g in range(n_groups):
+        entries[g] = g << _HLL_P
+        weights[g] = 0
+    n_ent = n_groups
+    for i in range(n):
+        h, valid = _hll_hash(in_arr, i)
+        if valid:
+            ind, rho = _hll_register(h)
+            entries[n_ent] = (gids[i] << _HLL_P) + ind
+            weights[n_ent] = rho
+            n_ent += 1
+    entries, weights = _merge_sketch_entries(entries[:n_ent], weights[:n_ent],
+                                             True)
+    if parallel:
+        entries, weights, n_groups = _shuffle_group_entries(
+            key_arr, first_rows, entries, weights, _HLL_P, True)
+    return _group_hll_estimates(entries, weights, n_groups)
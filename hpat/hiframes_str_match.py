@@ -0,0 +1,164 @@
+"""
+Kernels of Series.str.contains(), startswith(), endswith() and match().
+Constant patterns are analyzed at compile time: literals and regexes that
+reduce to (anchored) alternations of literals are matched with a memchr
+search over the character buffer of the string array, without std::regex or
+string allocation. Other regexes use a cached compiled pattern that runs
+over the characters of each element, and only on elements that contain a
+literal required by the pattern if there is one.
+"""
+from __future__ import print_function, division, absolute_import
+
+import sre_parse
+import sre_constants
+import numpy as np
+import numba
+from numba import types
+import llvmlite.binding as ll
+import hstr_ext
+from hpat.str_ext import get_str_ptr_len, regex_type
+from hpat.str_arr_ext import get_offset_ptr, get_data_ptr
+
+ll.add_symbol('str_arr_match_literal', hstr_ext.str_arr_match_literal)
+ll.add_symbol('str_arr_match_regex', hstr_ext.str_arr_match_regex)
+
+# match modes, same values as _str_ext.cpp
+CONTAINS = 0
+STARTSWITH = 1
+ENDSWITH = 2
+FULLMATCH = 3
+
+# alternations with more literals than this are left to regex
+_MAX_LITERALS = 32
+
+_str_arr_match_literal = types.ExternalFunction("str_arr_match_literal",
+    types.void(types.voidptr, types.voidptr, types.int64, types.voidptr,
+               types.int64, types.int64, types.voidptr))
+_str_arr_match_regex = types.ExternalFunction("str_arr_match_regex",
+    types.void(types.voidptr, types.voidptr, types.int64, regex_type,
+               types.int64, types.voidptr))
+
+
+def _parse_pattern(pat):
+    """parsed regex items, or None if not supported by the analysis
+    (e.g. case insensitive)
+    """
+    try:
+        parsed = sre_parse.parse(pat)
+    except sre_constants.error:
+        return None
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    if state.flags & (sre_constants.SRE_FLAG_IGNORECASE
+                      | sre_constants.SRE_FLAG_MULTILINE
+                      | sre_constants.SRE_FLAG_VERBOSE):
+        return None
+    return list(parsed)
+
+
+def _expand_literals(items):
+    """all strings matched by a sequence of regex items if they are literals
+    or alternations of literals, otherwise None
+    """
+    outs = ['']
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            alts = [chr(av)]
+        elif (op == sre_constants.IN
+                and all(o == sre_constants.LITERAL for o, _ in av)):
+            alts = [chr(c) for _, c in av]
+        elif op == sre_constants.BRANCH:
+            alts = []
+            for branch in av[1]:
+                b_alts = _expand_literals(branch)
+                if b_alts is None:
+                    return None
+                alts += b_alts
+        elif op == sre_constants.SUBPATTERN:
+            # (group, add_flags, del_flags, pattern) or (group, pattern)
+            if len(av) == 4 and (av[1] or av[2]):
+                return None
+            alts = _expand_literals(av[-1])
+            if alts is None:
+                return None
+        else:
+            return None
+        outs = [o + a for o in outs for a in alts]
+        if len(outs) > _MAX_LITERALS:
+            return None
+    return outs
+
+
+def analyze_pattern(pat, anchored=False):
+    """match mode and literals if regex pat reduces to an alternation of
+    literals (with optional ^ and $ anchors), otherwise None. anchored is
+    True for str.match() which matches at the start of strings.
+    """
+    items = _parse_pattern(pat)
+    if items is None:
+        return None
+    if items and items[0] in [(sre_constants.AT, sre_constants.AT_BEGINNING),
+                              (sre_constants.AT,
+                               sre_constants.AT_BEGINNING_STRING)]:
+        anchored = True
+        items = items[1:]
+    end = False
+    if items and items[-1] in [(sre_constants.AT, sre_constants.AT_END),
+                               (sre_constants.AT,
+                                sre_constants.AT_END_STRING)]:
+        end = True
+        items = items[:-1]
+    literals = _expand_literals(items)
+    if literals is None:
+        return None
+    mode = [[CONTAINS, ENDSWITH], [STARTSWITH, FULLMATCH]][anchored][end]
+    return mode, tuple(literals)
+
+
+def required_literal(pat):
+    """longest literal that every match of regex pat contains ('' if none),
+    used to skip elements before running the regex
+    """
+    items = _parse_pattern(pat)
+    if items is None:
+        return ''
+    best = ''
+    curr = ''
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            curr += chr(av)
+            if len(curr) > len(best):
+                best = curr
+        else:
+            curr = ''
+    return best
+
+
+@numba.njit
+def str_match_literals(str_arr, pats, mode):  # pragma: no cover
+    """elements of str_arr that match any of the literals in pats
+    """
+    n = len(str_arr)
+    out = np.zeros(n, np.bool_)
+    for pat in pats:
+        p, l = get_str_ptr_len(pat)
+        _str_arr_match_literal(get_offset_ptr(str_arr), get_data_ptr(str_arr),
+                               n, p, l, mode, out.ctypes)
+    return out
+
+
+@numba.njit
+def str_match_regex(str_arr, e, req, mode):  # pragma: no cover
+    """elements of str_arr that match compiled regex e anywhere (CONTAINS) or
+    at the start (STARTSWITH). req is a literal required by the pattern.
+    """
+    n = len(str_arr)
+    if len(req) == 0:
+        out = np.ones(n, np.bool_)
+    else:
+        out = np.zeros(n, np.bool_)
+        p, l = get_str_ptr_len(req)
+        _str_arr_match_literal(get_offset_ptr(str_arr), get_data_ptr(str_arr),
+                               n, p, l, CONTAINS, out.ctypes)
+    _str_arr_match_regex(get_offset_ptr(str_arr), get_data_ptr(str_arr), n, e,
+                         mode, out.ctypes)
+    return out
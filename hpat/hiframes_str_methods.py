@@ -0,0 +1,140 @@
+"""
+Kernels of Series.str methods that return strings or lengths: lower(),
+upper(), strip(), slice(), replace(), len() and split().str.get(). Output
+lengths are computed in a first pass to allocate the output string array,
+then characters are written directly to its buffer, so no string is
+allocated per element. Lengths and slices count UTF-8 code points, case
+mapping and stripping handle ASCII characters only.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import numba
+from numba import types
+import llvmlite.binding as ll
+import hstr_ext
+from hpat.str_ext import get_str_ptr_len
+from hpat.str_arr_ext import (get_offset_ptr, get_data_ptr, num_total_chars,
+                              pre_alloc_string_array)
+
+ll.add_symbol('str_arr_case', hstr_ext.str_arr_case)
+ll.add_symbol('str_arr_len', hstr_ext.str_arr_len)
+ll.add_symbol('str_arr_strip_ranges', hstr_ext.str_arr_strip_ranges)
+ll.add_symbol('str_arr_slice_ranges', hstr_ext.str_arr_slice_ranges)
+ll.add_symbol('str_arr_split_ranges', hstr_ext.str_arr_split_ranges)
+ll.add_symbol('str_arr_copy_ranges', hstr_ext.str_arr_copy_ranges)
+ll.add_symbol('str_arr_replace_chars', hstr_ext.str_arr_replace_chars)
+ll.add_symbol('str_arr_replace', hstr_ext.str_arr_replace)
+
+# strip sides
+LEFT = 1
+RIGHT = 2
+BOTH = 3
+
+_str_arr_case = types.ExternalFunction("str_arr_case",
+    types.void(types.voidptr, types.voidptr, types.voidptr, types.voidptr,
+               types.int64, types.boolean))
+_str_arr_len = types.ExternalFunction("str_arr_len",
+    types.void(types.voidptr, types.voidptr, types.int64, types.voidptr))
+_str_arr_strip_ranges = types.ExternalFunction("str_arr_strip_ranges",
+    types.void(types.voidptr, types.voidptr, types.int64, types.int64,
+               types.voidptr, types.voidptr))
+_str_arr_slice_ranges = types.ExternalFunction("str_arr_slice_ranges",
+    types.void(types.voidptr, types.voidptr, types.int64, types.int64,
+               types.int64, types.boolean, types.boolean, types.voidptr,
+               types.voidptr))
+_str_arr_split_ranges = types.ExternalFunction("str_arr_split_ranges",
+    types.void(types.voidptr, types.voidptr, types.int64, types.voidptr,
+               types.int64, types.int64, types.int64, types.voidptr,
+               types.voidptr))
+_str_arr_copy_ranges = types.ExternalFunction("str_arr_copy_ranges",
+    types.void(types.voidptr, types.voidptr, types.voidptr, types.int64,
+               types.voidptr, types.voidptr))
+_str_arr_replace_chars = types.ExternalFunction("str_arr_replace_chars",
+    types.int64(types.voidptr, types.voidptr, types.int64, types.voidptr,
+                types.int64, types.int64, types.int64))
+_str_arr_replace = types.ExternalFunction("str_arr_replace",
+    types.void(types.voidptr, types.voidptr, types.voidptr, types.voidptr,
+               types.int64, types.voidptr, types.int64, types.voidptr,
+               types.int64, types.int64))
+
+
+@numba.njit
+def _copy_ranges(str_arr, starts, lens):  # pragma: no cover
+    """string array of str_arr characters [starts[i], starts[i]+lens[i])
+    """
+    n = len(str_arr)
+    out_arr = pre_alloc_string_array(n, lens.sum())
+    _str_arr_copy_ranges(get_offset_ptr(out_arr), get_data_ptr(out_arr),
+                         get_data_ptr(str_arr), n, starts.ctypes, lens.ctypes)
+    return out_arr
+
+
+@numba.njit
+def str_case(str_arr, upper):  # pragma: no cover
+    n = len(str_arr)
+    out_arr = pre_alloc_string_array(n, np.int64(num_total_chars(str_arr)))
+    _str_arr_case(get_offset_ptr(out_arr), get_data_ptr(out_arr),
+                  get_offset_ptr(str_arr), get_data_ptr(str_arr), n, upper)
+    return out_arr
+
+
+@numba.njit
+def str_len(str_arr):  # pragma: no cover
+    n = len(str_arr)
+    out = np.empty(n, np.int64)
+    _str_arr_len(get_offset_ptr(str_arr), get_data_ptr(str_arr), n,
+                 out.ctypes)
+    return out
+
+
+@numba.njit
+def str_strip(str_arr, side):  # pragma: no cover
+    n = len(str_arr)
+    starts = np.empty(n, np.int64)
+    lens = np.empty(n, np.int64)
+    _str_arr_strip_ranges(get_offset_ptr(str_arr), get_data_ptr(str_arr), n,
+                          side, starts.ctypes, lens.ctypes)
+    return _copy_ranges(str_arr, starts, lens)
+
+
+@numba.njit
+def str_slice(str_arr, start, stop, has_start, has_stop):  # pragma: no cover
+    n = len(str_arr)
+    starts = np.empty(n, np.int64)
+    lens = np.empty(n, np.int64)
+    _str_arr_slice_ranges(get_offset_ptr(str_arr), get_data_ptr(str_arr), n,
+                          start, stop, has_start, has_stop, starts.ctypes,
+                          lens.ctypes)
+    return _copy_ranges(str_arr, starts, lens)
+
+
+@numba.njit
+def str_split_get(str_arr, sep, maxsplit, ind):  # pragma: no cover
+    """token ind of every element split by sep (whitespace if sep is empty),
+    empty string if there is no such token
+    """
+    n = len(str_arr)
+    starts = np.empty(n, np.int64)
+    lens = np.empty(n, np.int64)
+    p, l = get_str_ptr_len(sep)
+    _str_arr_split_ranges(get_offset_ptr(str_arr), get_data_ptr(str_arr), n,
+                          p, l, maxsplit, ind, starts.ctypes, lens.ctypes)
+    return _copy_ranges(str_arr, starts, lens)
+
+
+@numba.njit
+def str_replace(str_arr, pat, repl, max_repl):  # pragma: no cover
+    """replace literal pat with repl, at most max_repl times per element if
+    not negative
+    """
+    n = len(str_arr)
+    p, pl = get_str_ptr_len(pat)
+    r, rl = get_str_ptr_len(repl)
+    n_chars = _str_arr_replace_chars(get_offset_ptr(str_arr),
+        get_data_ptr(str_arr), n, p, pl, rl, max_repl)
+    out_arr = pre_alloc_string_array(n, n_chars)
+    _str_arr_replace(get_offset_ptr(out_arr), get_data_ptr(out_arr),
+                     get_offset_ptr(str_arr), get_data_ptr(str_arr), n, p, pl,
+                     r, rl, max_repl)
+    return out_arr
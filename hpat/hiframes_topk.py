@@ -0,0 +1,192 @@
+"""
+Kernels of nlargest()/nsmallest() without a full sort. Every process selects
+its top n candidates with a bounded heap, only candidates are gathered to
+the root which selects the final rows, and the (small) result is broadcast.
+The groupby variant keeps a bounded heap per group and shuffles only the
+candidates of every group to the process owning the key, and returns the key
+of every output row as well. Ties keep the first
+row in order (pandas keep='first') and NaN values are dropped.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import numba
+from hpat.distributed_api import (get_rank, gatherv, bcast, bcast_scalar,
+                                  prealloc_str_for_bcast, MPI_ROOT)
+from hpat.hiframes_stats import _get_group_ids
+from hpat.hiframes_unique import _isna, _hash_values, shuffle_by_hash
+from hpat.utils import empty_like_type
+
+
+@numba.njit
+def _is_worse(vals, i, j, largest):  # pragma: no cover
+    """row i ranks after row j (later rows rank after equal values)
+    """
+    if vals[i] == vals[j]:
+        return i > j
+    if largest:
+        return vals[i] < vals[j]
+    return vals[i] > vals[j]
+
+
+@numba.njit
+def _heap_push(heap, off, size, i, vals, largest):  # pragma: no cover
+    """push row i to heap[off:off+size] which has the worst row on top
+    """
+    k = size
+    heap[off + k] = i
+    while k > 0:
+        parent = (k - 1) // 2
+        if not _is_worse(vals, heap[off + k], heap[off + parent], largest):
+            break
+        tmp = heap[off + k]
+        heap[off + k] = heap[off + parent]
+        heap[off + parent] = tmp
+        k = parent
+
+
+@numba.njit
+def _heap_sift_down(heap, off, size, vals, largest):  # pragma: no cover
+    k = 0
+    while True:
+        worst = k
+        for c in (2 * k + 1, 2 * k + 2):
+            if c < size and _is_worse(vals, heap[off + c], heap[off + worst],
+                                      largest):
+                worst = c
+        if worst == k:
+            break
+        tmp = heap[off + k]
+        heap[off + k] = heap[off + worst]
+        heap[off + worst] = tmp
+        k = worst
+
+
+@numba.njit
+def _heap_add(heap, off, size, n, i, vals, largest):  # pragma: no cover
+    """add row i to bounded heap of n rows, returns new size
+    """
+    if size < n:
+        _heap_push(heap, off, size, i, vals, largest)
+        return size + 1
+    if size > 0 and _is_worse(vals, heap[off], i, largest):
+        heap[off] = i
+        _heap_sift_down(heap, off, size, vals, largest)
+    return size
+
+
+@numba.njit
+def _heap_pop_all(heap, off, size, out, out_off, vals,
+                  largest):  # pragma: no cover
+    """write heap rows to out[out_off:out_off+size] in best-first order
+    """
+    while size > 0:
+        size -= 1
+        out[out_off + size] = heap[off]
+        heap[off] = heap[off + size]
+        _heap_sift_down(heap, off, size, vals, largest)
+
+
+@numba.njit
+def _topk_positions(vals, n, largest):  # pragma: no cover
+    """positions of the n best non-NaN values in best-first order
+    """
+    n = max(min(n, len(vals)), 0)
+    heap = np.empty(n, np.int64)
+    size = 0
+    for i in range(len(vals)):
+        if not _isna(vals, i):
+            size = _heap_add(heap, 0, size, n, i, vals, largest)
+    out = np.empty(size, np.int64)
+    _heap_pop_all(heap, 0, size, out, 0, vals, largest)
+    return out
+
+
+@numba.njit
+def local_topk(key_arr, n, largest):  # pragma: no cover
+    """local candidate rows of top n selection in row order
+    """
+    return np.sort(_topk_positions(key_arr, n, largest))
+
+
+@numba.njit
+def select_topk(key_arr, inds, n, largest, parallel):  # pragma: no cover
+    """positions of the top n rows among candidate rows in best-first order.
+    In parallel, positions refer to candidates gathered in rank order, which
+    keeps the global row order for ties.
+    """
+    cands = key_arr[inds]
+    if not parallel:
+        return _topk_positions(cands, n, largest)
+    all_cands = gatherv(cands)
+    pos = _topk_positions(all_cands, n, largest)
+    n_out = bcast_scalar(len(pos))
+    if get_rank() != MPI_ROOT:
+        pos = np.empty(n_out, np.int64)
+    bcast(pos)
+    return pos
+
+
+@numba.njit
+def take_topk(arr, inds, pos, parallel):  # pragma: no cover
+    """values of selected rows of arr, replicated on all processes
+    """
+    cands = arr[inds]
+    if not parallel:
+        return cands[pos]
+    all_cands = gatherv(cands)
+    if get_rank() == MPI_ROOT:
+        out = all_cands[pos]
+    else:
+        out = empty_like_type(len(pos), cands)
+    out = prealloc_str_for_bcast(out)
+    bcast(out)
+    return out
+
+
+@numba.njit
+def _group_topk_heaps(gids, n_groups, in_arr, n, largest):  # pragma: no cover
+    """bounded heap of top n rows of every group (flat n_groups*n array)
+    """
+    heaps = np.empty(n_groups * n, np.int64)
+    sizes = np.zeros(n_groups, np.int64)
+    for i in range(len(in_arr)):
+        if not _isna(in_arr, i):
+            g = gids[i]
+            sizes[g] = _heap_add(heaps, g * n, sizes[g], n, i, in_arr,
+                                 largest)
+    return heaps, sizes
+
+
+@numba.njit
+def group_topk(key_arr, in_arr, n, largest, parallel):  # pragma: no cover
+    """top n values of in_arr per group of key_arr, groups in order of
+    appearance and values in best-first order. Returns the group key of every
+    output row along with the values. In parallel, only candidate rows of
+    local heaps are shuffled to the process owning the key.
+    """
+    n = max(n, 0)
+    gids, first_rows = _get_group_ids(key_arr)
+    n_groups = len(first_rows)
+    heaps, sizes = _group_topk_heaps(gids, n_groups, in_arr, n, largest)
+    if parallel:
+        # candidates in row order so ties keep the global row order
+        keep = np.zeros(len(in_arr), np.bool_)
+        for g in range(n_groups):
+            for j in range(sizes[g]):
+                keep[heaps[g * n + j]] = True
+        cand_keys = key_arr[keep]
+        h = _hash_values(cand_keys)
+        key_arr = shuffle_by_hash(cand_keys, h, True)
+        in_arr = shuffle_by_hash(in_arr[keep], h, True)
+        gids, first_rows = _get_group_ids(key_arr)
+        n_groups = len(first_rows)
+        heaps, sizes = _group_topk_heaps(gids, n_groups, in_arr, n, largest)
+
+    out_rows = np.empty(sizes.sum(), np.int64)
+    out_off = 0
+    for g in range(n_groups):
+        _heap_pop_all(heaps, g * n, sizes[g], out_rows, out_off, in_arr,
+                      largest)
+        out_off += sizes[g]
+    return key_arr[out_rows], in_arr[out_rows]
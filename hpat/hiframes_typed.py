@@ -4,7 +4,7 @@ import numpy as np
 import warnings
 import numba
 from numba import ir, ir_utils, types
-from numba.ir_utils import (replace_arg_nodes, compile_to_numba_ir,
+from numba.ir_utils import (replace_arg_nodes,
                             find_topo_order, gen_np_call, get_definition, guard,
                             find_callname, mk_alloc, find_const, is_setitem,
                             is_getitem)
@@ -12,12 +12,17 @@ from numba.typing.templates import Signature, bound_function, signature
 from numba.typing.arraydecl import ArrayAttribute
 import hpat
 from hpat.utils import get_definitions, debug_prints
+from hpat.utils import compile_to_numba_ir
 from hpat.hiframes import include_new_blocks, gen_empty_like
 from hpat.str_ext import string_type
-from hpat.str_arr_ext import string_array_type, StringArrayType, is_str_arr_typ
+from hpat.str_arr_ext import (string_array_type, StringArrayType,
+                              is_str_arr_typ, dict_str_arr_type)
+from hpat.hiframes_dict_enc import CMP_OPS, SWAPPED_CMP_OPS
 from hpat.pd_series_ext import (SeriesType, string_series_type,
     series_to_array_type, BoxedSeriesType, dt_index_series_type,
-    if_series_to_array_type, if_series_to_unbox)
+    if_series_to_array_type, if_series_to_unbox, DatetimePropertiesType)
+from hpat.pd_timestamp_ext import datetime_date_type
+from hpat.hiframes_datetime import DT_FIELDS
 
 
 class HiFramesTyped(object):
@@ -132,10 +137,28 @@ class HiFramesTyped(object):
                 assign.value = rhs.value
                 return [assign]
 
+            # S.dt is the Series itself, S.dt.year etc. become parfors
+            if (rhs.op == 'getattr' and rhs.attr in DT_FIELDS
+                    and isinstance(self.typemap[rhs.value.name],
+                                   (DatetimePropertiesType, SeriesType))
+                    and self.typemap[rhs.value.name].dtype in (
+                        types.NPDatetime('ns'), datetime_date_type)):
+                return self._run_dt_field(assign, rhs)
+            if (rhs.op == 'getattr' and rhs.attr == 'dt'
+                    and isinstance(self.typemap[lhs], DatetimePropertiesType)):
+                self.typemap.pop(lhs)
+                self.typemap[lhs] = self.typemap[rhs.value.name]
+                assign.value = rhs.value
+                return [assign]
+
             res = self._handle_string_array_expr(lhs, rhs, assign)
             if res is not None:
                 return res
 
+            res = self._handle_dict_str_arr_expr(lhs, rhs, assign)
+            if res is not None:
+                return res
+
             res = self._handle_df_col_filter(lhs, rhs, assign)
             if res is not None:
                 return res
@@ -197,9 +220,6 @@ class HiFramesTyped(object):
             assign.value = rhs.args[0]
             return [assign]
 
-        if func_name in ('str_contains_regex', 'str_contains_noregex'):
-            return self._handle_str_contains(assign, lhs, rhs, func_name)
-
         # arr = fix_df_array(col) -> arr=col if col is array
         if (func_name == 'fix_df_array'
                 and isinstance(self.typemap[rhs.args[0].name],
@@ -242,22 +262,63 @@ class HiFramesTyped(object):
                     "data argument in pd.DatetimeIndex() expected")
             data = rhs.args[0]
 
-        def f(str_arr):
-            numba.parfor.init_prange()
-            n = len(str_arr)
-            S = numba.unsafe.ndarray.empty_inferred((n,))
-            for i in numba.parfor.internal_prange(n):
-                S[i] = hpat.pd_timestamp_ext.parse_datetime_str(str_arr[i])
-            ret = S
+        arg_typs = (if_series_to_array_type(self.typemap[data.name]),)
+        args = [data]
+        if 'format' in kws:
+            fmt = kws['format']
+            fmt_const = guard(find_const, self.func_ir, fmt)
+            if isinstance(fmt_const, str):
+                hpat.hiframes_datetime.check_dt_format(fmt_const)
+            def f(str_arr, fmt):  # pragma: no cover
+                ret = hpat.hiframes_datetime.parse_dt_str_arr(str_arr, fmt)
+            arg_typs += (string_type,)
+            args.append(fmt)
+        else:
+            # layout is detected from the data
+            def f(str_arr):  # pragma: no cover
+                ret = hpat.hiframes_datetime.parse_dt_str_arr(str_arr, '')
+
+        f_block = compile_to_numba_ir(f, {'hpat': hpat}, self.typingctx,
+                                      arg_typs, self.typemap,
+                                      self.calltypes).blocks.popitem()[1]
+        replace_arg_nodes(f_block, args)
+        nodes = f_block.body[:-3]
+        nodes[-1].target = lhs
+        return nodes
 
-        f_ir = compile_to_numba_ir(f, {'hpat': hpat, 'numba': numba},
+    def _run_dt_field(self, assign, rhs):
+        """compute a field like S.dt.year for all elements in one parfor.
+        Fields of datetime64 values are float64 with NaN for NaT like Pandas.
+        """
+        dtype = self.typemap[rhs.value.name].dtype
+        func_text = 'def f(dt_arr):\n'
+        func_text += '  n = len(dt_arr)\n'
+        if dtype == datetime_date_type:
+            func_text += '  S = np.empty(n, np.int64)\n'
+            func_text += '  for i in numba.parfor.internal_prange(n):\n'
+            func_text += '    v = hpat.pd_timestamp_ext.datetime_date_to_int(dt_arr[i])\n'
+            func_text += '    S[i] = hpat.hiframes_datetime.date_{}(v)\n'.format(rhs.attr)
+        else:
+            func_text += '  S = np.empty(n, np.float64)\n'
+            func_text += '  for i in numba.parfor.internal_prange(n):\n'
+            func_text += '    v = np.int64(dt_arr[i])\n'
+            func_text += '    if v == nat:\n'
+            func_text += '      S[i] = np.nan\n'
+            func_text += '    else:\n'
+            func_text += '      S[i] = hpat.hiframes_datetime.dt64_{}(v)\n'.format(rhs.attr)
+        loc_vars = {}
+        exec(func_text, {}, loc_vars)
+        f = loc_vars['f']
+        f_blocks = compile_to_numba_ir(f,
+                                        {'numba': numba, 'np': np, 'hpat': hpat,
+                                         'nat': np.iinfo(np.int64).min},
                                         self.typingctx,
-                                        (if_series_to_array_type(self.typemap[data.name]),),
-                                        self.typemap, self.calltypes)
-        topo_order = find_topo_order(f_ir.blocks)
-        f_ir.blocks[topo_order[-1]].body[-4].target = lhs
-        replace_arg_nodes(f_ir.blocks[topo_order[0]], [data])
-        return f_ir.blocks
+                                        (types.Array(dtype, 1, 'C'),),
+                                        self.typemap, self.calltypes).blocks
+        replace_arg_nodes(f_blocks[min(f_blocks.keys())], [rhs.value])
+        # S is target of last statement in 1st block of f
+        assign.value = f_blocks[min(f_blocks.keys())].body[-2].target
+        return (f_blocks, [assign])
 
     def _is_dt_index_binop(self, rhs):
         if rhs.op != 'binop' or rhs.fn not in ('==', '!=', '>=', '>', '<=', '<'):
@@ -318,14 +379,15 @@ class HiFramesTyped(object):
             arg1_access = 'A'
             arg2_access = 'B'
             len_call = 'len(A)'
+            # string array elements are compared as views (no allocation)
             if is_str_arr_typ(self.typemap[arg1.name]):
-                arg1_access = 'A[i]'
+                arg1_access = 'hpat.str_arr_ext.get_str_view(A, i)'
                 # replace type now for correct typing of len, etc.
                 self.typemap.pop(arg1.name)
                 self.typemap[arg1.name] = string_array_type
 
             if is_str_arr_typ(self.typemap[arg2.name]):
-                arg1_access = 'B[i]'
+                arg2_access = 'hpat.str_arr_ext.get_str_view(B, i)'
                 len_call = 'len(B)'
                 self.typemap.pop(arg2.name)
                 self.typemap[arg2.name] = string_array_type
@@ -341,7 +403,8 @@ class HiFramesTyped(object):
             exec(func_text, {}, loc_vars)
             f = loc_vars['f']
             f_blocks = compile_to_numba_ir(f,
-                                           {'numba': numba, 'np': np}, self.typingctx,
+                                           {'numba': numba, 'np': np, 'hpat': hpat},
+                                           self.typingctx,
                                            (if_series_to_array_type(self.typemap[arg1.name]),
                                             if_series_to_array_type(self.typemap[arg2.name])),
                                            self.typemap, self.calltypes).blocks
@@ -353,6 +416,47 @@ class HiFramesTyped(object):
 
         return None
 
+    def _handle_dict_str_arr_expr(self, lhs, rhs, assign):
+        # convert dict_str_arr==str into a comparison of every dictionary
+        # entry and a parfor looking up codes
+        if (rhs.op == 'binop'
+                and rhs.fn in ['==', '!=', '>=', '>', '<=', '<']
+                and (self.typemap[rhs.lhs.name] == dict_str_arr_type
+                     or self.typemap[rhs.rhs.name] == dict_str_arr_type)):
+            arr = rhs.lhs
+            val = rhs.rhs
+            op = rhs.fn
+            if self.typemap[rhs.rhs.name] == dict_str_arr_type:
+                arr = rhs.rhs
+                val = rhs.lhs
+                op = SWAPPED_CMP_OPS[op]
+
+            func_text = 'def f(A, val):\n'
+            func_text += '  hits = hpat.hiframes_dict_enc.dict_cmp_hits(A.dictionary, val, {})\n'.format(
+                CMP_OPS.index(op))
+            func_text += '  codes = A.codes\n'
+            func_text += '  l = len(codes)\n'
+            func_text += '  S = np.empty(l, dtype=np.bool_)\n'
+            func_text += '  for i in numba.parfor.internal_prange(l):\n'
+            func_text += '    S[i] = hits[codes[i]]\n'
+
+            loc_vars = {}
+            exec(func_text, {}, loc_vars)
+            f = loc_vars['f']
+            f_blocks = compile_to_numba_ir(f,
+                                           {'numba': numba, 'np': np, 'hpat': hpat},
+                                           self.typingctx,
+                                           (dict_str_arr_type,
+                                            self.typemap[val.name]),
+                                           self.typemap, self.calltypes).blocks
+            replace_arg_nodes(f_blocks[min(f_blocks.keys())], [arr, val])
+            # replace == expression with result of parfor (S)
+            # S is target of last statement in 1st block of f
+            assign.value = f_blocks[min(f_blocks.keys())].body[-2].target
+            return (f_blocks, [assign])
+
+        return None
+
     def _handle_empty_like(self, assign, lhs, rhs):
         # B = empty_like(A) -> B = empty(len(A), dtype)
         in_arr = rhs.args[0]
@@ -374,37 +478,6 @@ class HiFramesTyped(object):
         nodes[-1].target = assign.target
         return nodes
 
-    def _handle_str_contains(self, assign, lhs, rhs, fname):
-
-        if fname == 'str_contains_regex':
-            comp_func = 'hpat.str_ext.contains_regex'
-        elif fname == 'str_contains_noregex':
-            comp_func = 'hpat.str_ext.contains_noregex'
-        else:
-            assert False
-
-        str_arr = rhs.args[0]
-        pat = rhs.args[1]
-        func_text = 'def f(str_arr, pat):\n'
-        func_text += '  l = len(str_arr)\n'
-        func_text += '  S = np.empty(l, dtype=np.bool_)\n'
-        func_text += '  for i in numba.parfor.internal_prange(l):\n'
-        func_text += '    S[i] = {}(str_arr[i], pat)\n'.format(comp_func)
-        loc_vars = {}
-        exec(func_text, {}, loc_vars)
-        f = loc_vars['f']
-        f_blocks = compile_to_numba_ir(f,
-                                       {'numba': numba, 'np': np,
-                                           'hpat': hpat}, self.typingctx,
-                                       (if_series_to_array_type(self.typemap[str_arr.name]),
-                                        if_series_to_array_type(self.typemap[pat.name])),
-                                       self.typemap, self.calltypes).blocks
-        replace_arg_nodes(f_blocks[min(f_blocks.keys())], [str_arr, pat])
-        # replace call with result of parfor (S)
-        # S is target of last statement in 1st block of f
-        assign.value = f_blocks[min(f_blocks.keys())].body[-2].target
-        return (f_blocks, [assign])
-
     def _handle_df_col_filter(self, lhs_name, rhs, assign):
         # find df['col2'] = df['col1'][arr]
         # since columns should have the same size, output is filled with NaNs
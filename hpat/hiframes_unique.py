@@ -0,0 +1,243 @@
+"""
+Kernels of Series.unique(), Series.value_counts() and
+DataFrame.drop_duplicates(). Duplicates are combined locally before the
+shuffle, so only unique values (with their counts) or locally first rows are
+sent to the process owning their hash, where they are combined again.
+Shuffled data keeps the global row order (ranks are in order and local order
+is preserved), so the first row received for a key is its first row
+globally. Pandas semantics are kept: unique() and drop_duplicates() treat NaN
+as a value and value_counts() drops NaN.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+import numba
+from numba import types
+from numba.extending import overload
+import hpat
+from hpat.distributed_api import get_size
+from hpat.hiframes_sort import (alloc_shuffle_metadata, alltoallv,
+                                finalize_shuffle_meta, update_shuffle_meta,
+                                parallel_sort)
+from hpat.hiframes_join import write_send_buff
+from hpat.hiframes_aggregate import get_key_dict
+from hpat.hiframes_stats import _hll_hash, _mix64
+from hpat.str_arr_ext import getitem_view
+
+_HASH_SEED = np.uint64(0x9e3779b97f4a7c15)
+
+
+def _isna(arr, i):  # pragma: no cover
+    return False
+
+
+@overload(_isna)
+def _isna_overload(arr_t, ind_t):
+    if isinstance(arr_t, types.Array) and isinstance(arr_t.dtype, types.Float):
+        return lambda arr, i: np.isnan(arr[i])
+    return lambda arr, i: False
+
+
+def _get_weight(weights, i):  # pragma: no cover
+    return 1
+
+
+@overload(_get_weight)
+def _get_weight_overload(weights_t, ind_t):
+    if weights_t == types.none:
+        return lambda weights, i: 1
+    return lambda weights, i: weights[i]
+
+
+@numba.njit
+def _local_value_counts(in_arr, weights, dropna):  # pragma: no cover
+    """unique values of in_arr in order of first appearance and their counts
+    (sum of weights, which is None for counts of 1)
+    """
+    key_write_map = get_key_dict(in_arr)
+    n = len(in_arr)
+    first_rows = np.empty(n, np.int64)
+    counts = np.zeros(n, np.int64)
+    nan_ind = -1
+    n_uniq = 0
+    for i in range(n):
+        if _isna(in_arr, i):
+            if dropna:
+                continue
+            if nan_ind == -1:
+                nan_ind = n_uniq
+                first_rows[n_uniq] = i
+                n_uniq += 1
+            counts[nan_ind] += _get_weight(weights, i)
+            continue
+        k = in_arr[i]
+        if k not in key_write_map:
+            key_write_map[k] = n_uniq
+            first_rows[n_uniq] = i
+            n_uniq += 1
+        counts[key_write_map[k]] += _get_weight(weights, i)
+    uniq = in_arr[np.ascontiguousarray(first_rows[:n_uniq])]
+    return uniq, counts[:n_uniq]
+
+
+@numba.njit
+def _hash_values(arr):  # pragma: no cover
+    h = np.empty(len(arr), np.int64)
+    for i in range(len(arr)):
+        h[i] = np.int64(_hll_hash(arr, i)[0])
+    return h
+
+
+@numba.njit
+def shuffle_by_hash(arr, h, parallel):  # pragma: no cover
+    """send every element of arr to process h[i] % n_pes. Rows with equal
+    hash go to the same process in global row order, so columns of a table
+    shuffled with the same hashes stay aligned.
+    """
+    if not parallel:
+        return arr
+    n_pes = get_size()
+    shuffle_meta = alloc_shuffle_metadata(arr, n_pes, False)
+    for i in range(len(arr)):
+        val = getitem_view(arr, i)
+        node_id = h[i] % n_pes
+        update_shuffle_meta(shuffle_meta, node_id, i, val, False)
+    finalize_shuffle_meta(arr, shuffle_meta, False)
+    for i in range(len(arr)):
+        val = getitem_view(arr, i)
+        node_id = h[i] % n_pes
+        write_send_buff(shuffle_meta, node_id, val)
+        shuffle_meta.tmp_offset[node_id] += 1
+    alltoallv(arr, shuffle_meta)
+    return shuffle_meta.out_arr
+
+
+@numba.njit
+def unique(in_arr, parallel):  # pragma: no cover
+    """unique values of in_arr in order of appearance (including NaN once)
+    """
+    uniq, counts = _local_value_counts(in_arr, None, False)
+    if parallel:
+        h = _hash_values(uniq)
+        uniq = shuffle_by_hash(uniq, h, True)
+        uniq, counts = _local_value_counts(uniq, None, False)
+    return uniq
+
+
+@numba.njit
+def value_counts(in_arr, parallel):  # pragma: no cover
+    """unique values of in_arr and their counts in descending order of
+    counts, NaN values are dropped. Only (value, count) pairs are shuffled.
+    In parallel, counts are sample sorted so that the chunks are in descending
+    order across processes (in order of rank).
+    """
+    uniq, counts = _local_value_counts(in_arr, None, True)
+    if parallel:
+        h = _hash_values(uniq)
+        uniq = shuffle_by_hash(uniq, h, True)
+        counts = shuffle_by_hash(counts, h, True)
+        uniq, counts = _local_value_counts(uniq, counts, True)
+    order = np.argsort(-counts, kind='mergesort')
+    uniq = uniq[order]
+    counts = counts[order]
+    if parallel:
+        # parallel_sort expects locally sorted keys
+        neg_counts, out_data = parallel_sort(-counts, (uniq,))
+        order = np.argsort(neg_counts, kind='mergesort')
+        uniq = out_data[0][order]
+        counts = -neg_counts[order]
+    return uniq, counts
+
+
+def hash_rows(keys):  # pragma: no cover
+    """64-bit hash of rows of key arrays (tuple)
+    """
+    return np.empty(0, np.int64)
+
+
+@overload(hash_rows)
+def hash_rows_overload(keys_t):
+    func_text = "def f(keys):\n"
+    func_text += "  n = len(keys[0])\n"
+    func_text += "  h = np.empty(n, np.int64)\n"
+    func_text += "  for i in range(n):\n"
+    func_text += "    v = _HASH_SEED\n"
+    for k in range(keys_t.count):
+        func_text += "    v = _mix64(v ^ _hll_hash(keys[{}], i)[0])\n".format(k)
+    func_text += "    h[i] = np.int64(v)\n"
+    func_text += "  return h\n"
+    loc_vars = {}
+    exec(func_text, {'np': np, '_HASH_SEED': _HASH_SEED, '_mix64': _mix64,
+                     '_hll_hash': _hll_hash}, loc_vars)
+    return loc_vars['f']
+
+
+def _value_equal(arr, i, j):  # pragma: no cover
+    return arr[i] == arr[j]
+
+
+@overload(_value_equal)
+def _value_equal_overload(arr_t, i_t, j_t):
+    if isinstance(arr_t, types.Array) and isinstance(arr_t.dtype, types.Float):
+        # NaN values are duplicates of each other
+        return lambda arr, i, j: (arr[i] == arr[j]
+                                  or (np.isnan(arr[i]) and np.isnan(arr[j])))
+    return lambda arr, i, j: arr[i] == arr[j]
+
+
+def _rows_equal(keys, i, j):  # pragma: no cover
+    return True
+
+
+@overload(_rows_equal)
+def _rows_equal_overload(keys_t, i_t, j_t):
+    func_text = "def f(keys, i, j):\n"
+    for k in range(keys_t.count):
+        func_text += "  if not _value_equal(keys[{}], i, j):\n".format(k)
+        func_text += "    return False\n"
+    func_text += "  return True\n"
+    loc_vars = {}
+    exec(func_text, {'_value_equal': _value_equal}, loc_vars)
+    return loc_vars['f']
+
+
+@numba.njit
+def first_occurrence(h, keys):  # pragma: no cover
+    """mask of first rows of every distinct key. Rows are grouped by hash
+    with a stable sort and compared to kept rows of the same hash, so hash
+    collisions don't drop rows.
+    """
+    n = len(h)
+    keep = np.ones(n, np.bool_)
+    order = np.argsort(h, kind='mergesort')
+    start = 0
+    while start < n:
+        end = start + 1
+        while end < n and h[order[end]] == h[order[start]]:
+            end += 1
+        for a in range(start + 1, end):
+            i = order[a]
+            for b in range(start, a):
+                j = order[b]
+                if keep[j] and _rows_equal(keys, i, j):
+                    keep[i] = False
+                    break
+        start = end
+    return keep
+
+
+@numba.njit
+def shuffled_first_occurrence(h, keys, parallel):  # pragma: no cover
+    """first occurrence mask of rows after shuffle (empty if not parallel
+    since local rows are already unique)
+    """
+    if not parallel:
+        return np.empty(0, np.bool_)
+    return first_occurrence(h, keys)
+
+
+@numba.njit
+def select_kept(arr, keep, parallel):  # pragma: no cover
+    if not parallel:
+        return arr
+    return arr[keep]
@@ -6,8 +6,9 @@ from numba.targets.arrayobj import make_array
 from numba.extending import overload, intrinsic, overload_method
 from hpat.str_ext import string_type
 
-from numba.ir_utils import (compile_to_numba_ir, replace_arg_nodes,
+from numba.ir_utils import (replace_arg_nodes,
                             find_callname, guard)
+from hpat.utils import compile_to_numba_ir
 
 get_file_size = types.ExternalFunction("get_file_size", types.int64(string_type))
 _file_read = types.ExternalFunction("file_read",
@@ -44,6 +45,17 @@ _file_write_parallel = types.ExternalFunction("file_write_parallel",
 #
 #     return fromfile_impl
 
+def register_file_io_symbols():
+    # FIXME: import here since hio has hdf5 which might not be available
+    import hio
+    import llvmlite.binding as ll
+    ll.add_symbol('get_file_size', hio.get_file_size)
+    ll.add_symbol('file_read', hio.file_read)
+    ll.add_symbol('file_read_parallel', hio.file_read_parallel)
+    ll.add_symbol('file_write', hio.file_write)
+    ll.add_symbol('file_write_parallel', hio.file_write_parallel)
+
+
 def _handle_np_fromfile(assign, lhs, rhs):
     """translate np.fromfile() to native
     """
@@ -52,12 +64,7 @@ def _handle_np_fromfile(assign, lhs, rhs):
         raise ValueError(
             "np.fromfile(): file name and dtype expected")
 
-    # FIXME: import here since hio has hdf5 which might not be available
-    import hio
-    import llvmlite.binding as ll
-    ll.add_symbol('get_file_size', hio.get_file_size)
-    ll.add_symbol('file_read', hio.file_read)
-    ll.add_symbol('file_read_parallel', hio.file_read_parallel)
+    register_file_io_symbols()
     _fname = rhs.args[0]
     _dtype = rhs.args[1]
 
@@ -87,11 +94,7 @@ def get_dtype_size(typingctx, dtype):
 
 @overload_method(types.Array, 'tofile')
 def tofile_overload(arr_ty, fname_ty):
-    # FIXME: import here since hio has hdf5 which might not be available
-    import hio
-    import llvmlite.binding as ll
-    ll.add_symbol('file_write', hio.file_write)
-    ll.add_symbol('file_write_parallel', hio.file_write_parallel)
+    register_file_io_symbols()
     if fname_ty == string_type:
         def tofile_impl(arr, fname):
             A = np.ascontiguousarray(arr)
@@ -4,8 +4,9 @@ from numba.ir_utils import (mk_unique_var, replace_vars_inner, find_topo_order,
                             dprint_func_ir, remove_dead, mk_alloc, remove_dels,
                             get_name_var_table, replace_var_names,
                             add_offset_to_labels, get_ir_of_code,
-                            compile_to_numba_ir, replace_arg_nodes,
+                            replace_arg_nodes,
                             find_callname, guard, require, get_definition)
+from hpat.utils import compile_to_numba_ir
 
 from numba.typing.templates import infer_global, AbstractTemplate
 from numba.typing import signature
@@ -14,7 +15,7 @@ import numpy as np
 import hpat
 from hpat.str_ext import StringType, string_type
 from hpat.str_arr_ext import StringArray, StringArrayPayloadType, construct_string_array
-from hpat.str_arr_ext import string_array_type
+from hpat.str_arr_ext import string_array_type, dict_str_arr_type
 
 _pq_type_to_numba = {'BOOLEAN': types.Array(types.boolean, 1, 'C'),
                      'INT32': types.Array(types.int32, 1, 'C'),
@@ -49,6 +50,14 @@ def read_parquet_parallel():
     return 0
 
 
+def read_parquet_str_dict():
+    return 0
+
+
+def read_parquet_str_dict_parallel():
+    return 0
+
+
 def get_column_size_parquet():
     return 0
 
@@ -59,7 +68,7 @@ def remove_parquet(rhs, lives, call_list):
         return True
     if call_list == [get_column_size_parquet]:
         return True
-    if call_list == [read_parquet_str]:
+    if call_list == [read_parquet_str] or call_list == [read_parquet_str_dict]:
         return True
     return False
 
@@ -78,6 +87,7 @@ class ParquetHandler(object):
         self.reverse_copies = _reverse_copies
 
     def gen_parquet_read(self, file_name, lhs):
+        register_parquet_symbols()
         scope = file_name.scope
         loc = file_name.loc
 
@@ -155,6 +165,10 @@ def get_column_read_nodes(c_type, cvar, arrow_readers_var, i):
         # pass size for easier allocation and distributed analysis
         func_text += '  column = read_parquet_str(arrow_readers, {}, col_size)\n'.format(
             i)
+    elif c_type == dict_str_arr_type:
+        # codes and dictionary decoded from dictionary pages
+        func_text += '  column = read_parquet_str_dict(arrow_readers, {}, col_size)\n'.format(
+            i)
     else:
         el_type = get_element_type(c_type.dtype)
         if el_type == 'datetime64(ns)':
@@ -174,6 +188,7 @@ def get_column_read_nodes(c_type, cvar, arrow_readers_var, i):
                                      {'get_column_size_parquet': get_column_size_parquet,
                                       'read_parquet': read_parquet,
                                       'read_parquet_str': read_parquet_str,
+                                      'read_parquet_str_dict': read_parquet_str_dict,
                                       'np': np,
                                       'hpat': hpat,
                                       'StringArray': StringArray}).blocks.popitem()
@@ -254,6 +269,22 @@ class ReadParquetStrParallelInfer(AbstractTemplate):
         return signature(string_array_type, *args)
 
 
+@infer_global(read_parquet_str_dict)
+class ReadParquetStrDictInfer(AbstractTemplate):
+    def generic(self, args, kws):
+        assert not kws
+        assert len(args) == 3
+        return signature(dict_str_arr_type, *args)
+
+
+@infer_global(read_parquet_str_dict_parallel)
+class ReadParquetStrDictParallelInfer(AbstractTemplate):
+    def generic(self, args, kws):
+        assert not kws
+        assert len(args) == 4
+        return signature(dict_str_arr_type, *args)
+
+
 @infer_global(read_parquet_parallel)
 class ReadParallelParquetInfer(AbstractTemplate):
     def generic(self, args, kws):
@@ -265,12 +296,22 @@ class ReadParallelParquetInfer(AbstractTemplate):
 
 from numba import cgutils
 from numba.targets.imputils import lower_builtin
-from numba.targets.arrayobj import make_array
+from numba.targets.arrayobj import make_array, _empty_nd_impl
 from llvmlite import ir as lir
 import llvmlite.binding as ll
 
 from hpat.config import _has_pyarrow
-if _has_pyarrow:
+
+_parquet_symbols_registered = False
+
+def register_parquet_symbols():
+    # parquet_cpp links to arrow which is slow to load, so it is imported
+    # the first time a parquet read is compiled
+    global _parquet_symbols_registered
+    if _parquet_symbols_registered:
+        return
+    if not _has_pyarrow:
+        raise ValueError("Parquet support not available (pyarrow not found)")
     import parquet_cpp
     ll.add_symbol('get_arrow_readers', parquet_cpp.get_arrow_readers)
     ll.add_symbol('del_arrow_readers', parquet_cpp.del_arrow_readers)
@@ -279,6 +320,10 @@ if _has_pyarrow:
     ll.add_symbol('pq_get_size', parquet_cpp.get_size)
     ll.add_symbol('pq_read_string', parquet_cpp.read_string)
     ll.add_symbol('pq_read_string_parallel', parquet_cpp.read_string_parallel)
+    ll.add_symbol('pq_read_string_dict', parquet_cpp.read_string_dict)
+    ll.add_symbol('pq_read_string_dict_parallel',
+                  parquet_cpp.read_string_dict_parallel)
+    _parquet_symbols_registered = True
 
 
 @lower_builtin(get_column_size_parquet, types.Opaque('arrow_reader'), types.intp)
@@ -332,7 +377,7 @@ def pq_read_string_lower(context, builder, sig, args):
 
     fnty = lir.FunctionType(lir.IntType(32),
                             [lir.IntType(8).as_pointer(), lir.IntType(64),
-                             lir.IntType(32).as_pointer().as_pointer(),
+                             lir.IntType(64).as_pointer().as_pointer(),
                              lir.IntType(8).as_pointer().as_pointer()])
 
     fn = builder.module.get_or_insert_function(fnty, name="pq_read_string")
@@ -344,8 +389,8 @@ def pq_read_string_lower(context, builder, sig, args):
     string_array.meminfo = meminfo
     string_array.offsets = str_arr_payload.offsets
     string_array.data = str_arr_payload.data
-    string_array.num_total_chars = builder.zext(builder.load(
-        builder.gep(string_array.offsets, [string_array.num_items])), lir.IntType(64))
+    string_array.num_total_chars = builder.load(
+        builder.gep(string_array.offsets, [string_array.num_items]))
     ret = string_array._getvalue()
     return impl_ret_new_ref(context, builder, typ, ret)
 
@@ -361,7 +406,7 @@ def pq_read_string_parallel_lower(context, builder, sig, args):
 
     fnty = lir.FunctionType(lir.IntType(32),
                             [lir.IntType(8).as_pointer(), lir.IntType(64),
-                             lir.IntType(32).as_pointer().as_pointer(),
+                             lir.IntType(64).as_pointer().as_pointer(),
                              lir.IntType(8).as_pointer().as_pointer(), lir.IntType(64), lir.IntType(64)])
 
     fn = builder.module.get_or_insert_function(
@@ -376,7 +421,64 @@ def pq_read_string_parallel_lower(context, builder, sig, args):
     string_array.meminfo = meminfo
     string_array.offsets = str_arr_payload.offsets
     string_array.data = str_arr_payload.data
-    string_array.num_total_chars = builder.zext(builder.load(
-        builder.gep(string_array.offsets, [string_array.num_items])), lir.IntType(64))
+    string_array.num_total_chars = builder.load(
+        builder.gep(string_array.offsets, [string_array.num_items]))
     ret = string_array._getvalue()
     return impl_ret_new_ref(context, builder, typ, ret)
+
+
+# read dictionary-encoded strings
+
+
+def _gen_pq_read_string_dict(context, builder, fn_name, args, count):
+    """call fn_name to read int32 codes and the dictionary of a string column
+    and return a dictionary-encoded array
+    """
+    codes_typ = types.Array(types.int32, 1, 'C')
+    codes = _empty_nd_impl(context, builder, codes_typ, [count])
+
+    meminfo, meminfo_data_ptr = construct_string_array(context, builder)
+    str_arr_payload = cgutils.create_struct_proxy(StringArrayPayloadType())(
+        context, builder)
+    dictionary = context.make_helper(builder, string_array_type)
+
+    fnty = lir.FunctionType(lir.IntType(64),
+                            [lir.IntType(8).as_pointer(), lir.IntType(64),
+                             lir.IntType(32).as_pointer(),
+                             lir.IntType(64).as_pointer().as_pointer(),
+                             lir.IntType(8).as_pointer().as_pointer()]
+                            + [lir.IntType(64)] * (len(args) - 2))
+    fn = builder.module.get_or_insert_function(fnty, name=fn_name)
+    n_dict = builder.call(fn, [args[0], args[1],
+                               builder.bitcast(codes.data,
+                                               lir.IntType(32).as_pointer()),
+                               str_arr_payload._get_ptr_by_name('offsets'),
+                               str_arr_payload._get_ptr_by_name('data')]
+                          + list(args[2:]))
+    builder.store(str_arr_payload._getvalue(), meminfo_data_ptr)
+
+    dictionary.num_items = n_dict
+    dictionary.meminfo = meminfo
+    dictionary.offsets = str_arr_payload.offsets
+    dictionary.data = str_arr_payload.data
+    dictionary.num_total_chars = builder.load(
+        builder.gep(dictionary.offsets, [n_dict]))
+
+    dict_arr = cgutils.create_struct_proxy(dict_str_arr_type)(context, builder)
+    dict_arr.codes = codes._getvalue()
+    dict_arr.dictionary = dictionary._getvalue()
+    ret = dict_arr._getvalue()
+    return impl_ret_new_ref(context, builder, dict_str_arr_type, ret)
+
+
+@lower_builtin(read_parquet_str_dict, types.Opaque('arrow_reader'), types.intp, types.intp)
+def pq_read_string_dict_lower(context, builder, sig, args):
+    return _gen_pq_read_string_dict(context, builder, "pq_read_string_dict",
+                                    args[:2], args[2])
+
+
+@lower_builtin(read_parquet_str_dict_parallel, types.Opaque('arrow_reader'), types.intp, types.intp, types.intp)
+def pq_read_string_dict_parallel_lower(context, builder, sig, args):
+    return _gen_pq_read_string_dict(context, builder,
+                                    "pq_read_string_dict_parallel", args,
+                                    args[3])
@@ -15,6 +15,7 @@ from hpat.str_ext import string_type
 from hpat.str_arr_ext import (string_array_type, offset_typ, char_typ,
     str_arr_payload_type, StringArrayType, GetItemStringArray)
 from hpat.pd_timestamp_ext import pandas_timestamp_type, datetime_date_type
+from hpat.hiframes_datetime import DT_FIELDS, DATE_FIELDS
 
 # TODO: implement type inference instead of subtyping array since Pandas as of
 # 0.23 is deprecating things like itemsize etc.
@@ -189,6 +190,17 @@ class UnBoxedSeriesType(types.Type):
 
 register_model(UnBoxedSeriesType)(SeriesModel)
 
+class DatetimePropertiesType(types.Type):
+    """Type of the Series.dt accessor of datetime64[ns] and datetime.date
+    series, replaced with the Series in hiframes_typed.
+    """
+    def __init__(self, dtype):
+        self.dtype = dtype
+        name = "DatetimePropertiesType({})".format(dtype)
+        super(DatetimePropertiesType, self).__init__(name)
+
+register_model(DatetimePropertiesType)(SeriesModel)
+
 def series_to_array_type(typ, replace_boxed=False):
     if typ.dtype == string_type:
         new_typ = string_array_type
@@ -280,6 +292,10 @@ class SeriesAttribute(AttributeTemplate):
     def resolve_values(self, ary):
         return series_to_array_type(ary, True)
 
+    def resolve_dt(self, ary):
+        if ary.dtype in (types.NPDatetime('ns'), datetime_date_type):
+            return DatetimePropertiesType(ary.dtype)
+
     @bound_function("array.argsort")
     def resolve_argsort(self, ary, args, kws):
         resolver = ArrayAttribute.resolve_argsort.__wrapped__
@@ -294,6 +310,17 @@ class SeriesAttribute(AttributeTemplate):
         sig.return_type = if_arr_to_series_type(sig.return_type)
         return sig
 
+@infer_getattr
+class DatetimePropertiesAttribute(AttributeTemplate):
+    key = DatetimePropertiesType
+
+    def generic_resolve(self, ary, attr):
+        # fields of NaT are NaN, datetime.date values can't be NaT
+        if ary.dtype == types.NPDatetime('ns') and attr in DT_FIELDS:
+            return SeriesType(types.float64, 1, 'C')
+        if ary.dtype == datetime_date_type and attr in DATE_FIELDS:
+            return SeriesType(types.int64, 1, 'C')
+
 # TODO: use ops logic from pandas/core/ops.py
 # # called from numba/numpy_support.py:resolve_output_type
 # # similar to SmartArray (targets/smartarray.py)
@@ -30,6 +30,7 @@ import llvmlite.binding as ll
 ll.add_symbol('parse_iso_8601_datetime', hdatetime_ext.parse_iso_8601_datetime)
 ll.add_symbol('convert_datetimestruct_to_datetime', hdatetime_ext.convert_datetimestruct_to_datetime)
 ll.add_symbol('np_datetime_date_array_from_packed_ints', hdatetime_ext.np_datetime_date_array_from_packed_ints)
+ll.add_symbol('np_datetime64_D_array_from_packed_ints', hdatetime_ext.np_datetime64_D_array_from_packed_ints)
 
 #--------------------------------------------------------------
 
@@ -125,7 +126,16 @@ def datetime_get_year(context, builder, typ, val):
 
 @numba.njit
 def convert_datetime_date_array_to_native(x):
-    return np.array([(val.day + (val.month << 16) + (val.year << 32)) for val in x], dtype=np.int64)
+    """packed datetime.date values (see unbox_datetime_date) of a
+    datetime64[D] array, computed from day counts without date objects
+    """
+    days = x.view(np.int64)
+    n = len(days)
+    out = np.empty(n, np.int64)
+    for i in range(n):
+        year, month, day = civil_from_days(days[i])
+        out[i] = day + (month << 16) + (year << 32)
+    return out
 
 @unbox(DatetimeDateType)
 def unbox_datetime_date(typ, val, c):
@@ -230,6 +240,25 @@ def int_to_datetime_date(typingctx, dt_date_tp):
         return args[0]
     return signature(datetime_date_type, types.int64), codegen
 
+def box_date_arr_data(context, builder, pyapi, data_ptr, n):
+    """box n packed datetime.date values at data_ptr as a datetime64[D]
+    array if hpat.config._box_date_dt64 is set, otherwise as an object
+    array of datetime.date
+    """
+    if hpat.config._box_date_dt64:
+        fnty = lir.FunctionType(lir.IntType(8).as_pointer(),
+                                [lir.IntType(64).as_pointer(), lir.IntType(64)])
+        fn = builder.module.get_or_insert_function(fnty,
+            name="np_datetime64_D_array_from_packed_ints")
+        return builder.call(fn, [data_ptr, n])
+
+    dt_class = pyapi.unserialize(pyapi.serialize_object(datetime.date))
+
+    fnty = lir.FunctionType(lir.IntType(8).as_pointer(), [lir.IntType(64).as_pointer(), lir.IntType(64),
+                                                lir.IntType(8).as_pointer()])
+    fn = builder.module.get_or_insert_function(fnty, name="np_datetime_date_array_from_packed_ints")
+    return builder.call(fn, [data_ptr, n, dt_class])
+
 def set_df_datetime_date(df, cname, arr):
     df[cname] = arr
 
@@ -253,12 +282,8 @@ def set_df_datetime_date_lower(context, builder, sig, args):
     pyapi = context.get_python_api(builder)
     gil_state = pyapi.gil_ensure()  # acquire GIL
 
-    dt_class = pyapi.unserialize(pyapi.serialize_object(datetime.date))
-
-    fnty = lir.FunctionType(lir.IntType(8).as_pointer(), [lir.IntType(64).as_pointer(), lir.IntType(64),
-                                                lir.IntType(8).as_pointer()])
-    fn = builder.module.get_or_insert_function(fnty, name="np_datetime_date_array_from_packed_ints")
-    py_arr = builder.call(fn, [data_arr.data, num_elems, dt_class])
+    py_arr = box_date_arr_data(context, builder, pyapi, data_arr.data,
+                               num_elems)
 
     # get column as string obj
     cstr = context.insert_const_string(builder.module, col_name)
@@ -512,54 +537,42 @@ def dt64_to_integer(context, builder, fromty, toty, val):
     # dt64 is stored as int64 so just return value
     return val
 
+@numba.njit
+def days_from_civil(year, month, day):
+    """days since 1970-01-01 of a proleptic Gregorian date, without
+    branches or tables (H. Hinnant's algorithm)
+    """
+    a = (14 - month) // 12  # 1 for January and February
+    year -= a
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + 12 * a - 3) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+@numba.njit
+def civil_from_days(days):
+    """(year, month, day) of days since 1970-01-01, inverse of
+    days_from_civil
+    """
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153  # month starting from March
+    a = mp // 10  # 1 for January and February
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 - 12 * a
+    year = yoe + era * 400 + a
+    return year, month, day
+
 @numba.njit
 def convert_datetime64_to_timestamp(dt64):
-    # pandas 0.23 np_datetime.c:762
     perday = 24 * 60 * 60 * 1000 * 1000 * 1000
-
-    if dt64 >= 0:
-        in_day = dt64 % perday
-        dt64 = dt64 // perday
-    else:
-        in_day = (perday - 1) + (dt64 + 1) % perday
-        dt64 = dt64 // perday - (0 if (dt64 % perday == 0) else 1)
-
-    # pandas 0.23np_datetime.c:173
-    days400years = 146097
-    days = dt64 - 10957
-    if days >= 0:
-        year = 400 * (days // days400years)
-        days = days % days400years
-    else:
-        year = 400 * ((days - (days400years - 1)) // days400years)
-        days = days % days400years
-        if days < 0:
-            days += days400years
-
-    if days >= 366:
-        year += 100 * ((days - 1) // 36524)
-        days = (days - 1) % 36524
-        if days >= 365:
-            year += 4 * ((days + 1) // 1461)
-            days = (days + 1) % 1461
-            if days >= 366:
-                year += (days - 1) // 365
-                days = (days - 1) % 365
-
-    year = year + 2000
-    # pandas 0.23 np_datetime.c:237
-    leapyear = (year % 400 == 0) or (year %4 == 0 and year %100 != 0)
-    month_len = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-    if leapyear:
-        month_len[1] = 29
-
-    for i in range(12):
-        if days < month_len[i]:
-            month = i + 1
-            day = days + 1
-            break
-        else:
-            days = days - month_len[i]
+    days = dt64 // perday
+    in_day = dt64 - days * perday
+    year, month, day = civil_from_days(days)
 
     return pd.Timestamp(year, month, day,
                         in_day // (60 * 60 * 1000000000), #hour
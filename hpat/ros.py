@@ -1,5 +1,6 @@
 from numba import types, ir_utils, ir
-from numba.ir_utils import (compile_to_numba_ir, replace_arg_nodes)
+from numba.ir_utils import (replace_arg_nodes)
+from hpat.utils import compile_to_numba_ir
 from numba.typing import signature
 from numba.typing.templates import infer_global, AbstractTemplate
 from numba.extending import models, register_model, lower_builtin
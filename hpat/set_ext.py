@@ -13,6 +13,7 @@ import llvmlite.binding as ll
 import hset_ext
 ll.add_symbol('init_set_string', hset_ext.init_set_string)
 ll.add_symbol('insert_set_string', hset_ext.insert_set_string)
+ll.add_symbol('insert_set_chars', hset_ext.insert_set_chars)
 ll.add_symbol('len_set_string', hset_ext.len_set_string)
 ll.add_symbol('set_in_string', hset_ext.set_in_string)
 ll.add_symbol('set_iterator_string', hset_ext.set_iterator_string)
@@ -26,7 +27,7 @@ from hpat.utils import to_array
 from hpat.str_ext import StringType, string_type
 from hpat.str_arr_ext import (StringArray, StringArrayType, string_array_type,
                               pre_alloc_string_array, StringArrayPayloadType,
-                              is_str_arr_typ)
+                              is_str_arr_typ, get_str_view)
 from hpat.hiframes_api import dummy_unbox_series
 
 # similar to types.Container.Set
@@ -70,6 +71,10 @@ def init_set_overload():
 add_set_string = types.ExternalFunction("insert_set_string",
                                     types.void(set_string_type, string_type))
 
+# add characters of a view without creating a string
+add_set_chars = types.ExternalFunction("insert_set_chars",
+                    types.void(set_string_type, types.voidptr, types.int64))
+
 len_set_string = types.ExternalFunction("len_set_string",
                                     types.intp(set_string_type))
 
@@ -86,9 +91,8 @@ def init_set_string_array(in_typ):
             str_set = init_set_string()
             n = len(str_arr)
             for i in range(n):
-                str = str_arr[i]
-                str_set.add(str)
-                hpat.str_ext.del_str(str)
+                s = get_str_view(str_arr, i)
+                add_set_chars(str_set, s._data, s._length)
             return str_set
         return f
 
@@ -159,7 +163,7 @@ def populate_str_arr_from_set(typingctx, in_set_typ, in_str_arr_typ=None):
 
         fnty = lir.FunctionType( lir.VoidType(),
                                 [lir.IntType(8).as_pointer(),
-                                 lir.IntType(32).as_pointer(),
+                                 lir.IntType(64).as_pointer(),
                                  lir.IntType(8).as_pointer(),
                                 ])
         fn_getitem = builder.module.get_or_insert_function(fnty,
@@ -209,9 +213,9 @@ def iternext_setiter(context, builder, sig, args, result):
     result.set_valid(is_valid)
 
     fnty = lir.FunctionType(lir.IntType(8).as_pointer(),
-                    [lir.IntType(8).as_pointer()])
+                    [lir.IntType(8).as_pointer(), lir.IntType(8).as_pointer()])
     fn = builder.module.get_or_insert_function(fnty, name="set_nextval_string")
 
     with builder.if_then(is_valid):
-        val = builder.call(fn, [iterobj.itp])
+        val = builder.call(fn, [iterobj.itp, iterobj.set])
         result.yield_(val)
@@ -9,13 +9,13 @@ from numba.extending import (typeof_impl, type_callable, models, register_model,
                              make_attribute_wrapper, lower_builtin, box, unbox,
                              lower_getattr, intrinsic, overload_method, overload, overload_attribute)
 from numba import cgutils
-from hpat.str_ext import string_type, del_str
+from hpat.str_ext import string_type, del_str, string_view_type
 from numba.targets.imputils import impl_ret_new_ref, impl_ret_borrowed, iternext_impl
 import llvmlite.llvmpy.core as lc
 from glob import glob
 
 char_typ = types.uint8
-offset_typ = types.uint32
+offset_typ = types.uint64
 
 data_ctypes_type = types.ArrayCTypes(types.Array(char_typ, 1, 'C'))
 offset_ctypes_type = types.ArrayCTypes(types.Array(offset_typ, 1, 'C'))
@@ -170,7 +170,7 @@ def get_offset_ptr(typingctx, str_arr_typ=None):
         #return string_array.offsets
         # # Create new ArrayCType structure
         ctinfo = context.make_helper(builder, offset_ctypes_type)
-        ctinfo.data = builder.bitcast(string_array.offsets, lir.IntType(32).as_pointer())
+        ctinfo.data = builder.bitcast(string_array.offsets, lir.IntType(64).as_pointer())
         ctinfo.meminfo = string_array.meminfo
         res = ctinfo._getvalue()
         return impl_ret_borrowed(context, builder, offset_ctypes_type, res)
@@ -201,10 +201,44 @@ def getitem_str_offset(typingctx, str_arr_typ, ind_t):
         in_str_arr, ind = args
 
         string_array = context.make_helper(builder, string_array_type, in_str_arr)
-        offsets = builder.bitcast(string_array.offsets, lir.IntType(32).as_pointer())
+        offsets = builder.bitcast(string_array.offsets, lir.IntType(64).as_pointer())
         return builder.load(builder.gep(offsets, [ind]))
 
-    return types.uint32(string_array_type, ind_t), codegen
+    # signed to avoid float results of mixed uint64/int64 arithmetic
+    return types.int64(string_array_type, ind_t), codegen
+
+@intrinsic
+def get_str_view(typingctx, str_arr_typ, ind_t=None):
+    """view of element ind (pointer and length into the data buffer)
+    without allocating a string
+    """
+    assert is_str_arr_typ(str_arr_typ)
+    def codegen(context, builder, sig, args):
+        in_str_arr, ind = args
+
+        string_array = context.make_helper(builder, string_array_type, in_str_arr)
+        offsets = builder.bitcast(string_array.offsets, lir.IntType(64).as_pointer())
+        ind_p1 = builder.add(ind, context.get_constant(ind_t, 1))
+        start = builder.load(builder.gep(offsets, [ind]))
+        end = builder.load(builder.gep(offsets, [ind_p1]))
+        view = cgutils.create_struct_proxy(string_view_type)(context, builder)
+        view.data = builder.gep(string_array.data, [start])
+        view.length = builder.sub(end, start)
+        return view._getvalue()
+
+    return string_view_type(str_arr_typ, ind_t), codegen
+
+
+def getitem_view(arr, ind):  # pragma: no cover
+    return arr[ind]
+
+@overload(getitem_view)
+def getitem_view_overload(arr_typ, ind_typ):
+    """element of array, which is a view for string arrays
+    """
+    if is_str_arr_typ(arr_typ):
+        return lambda arr, ind: get_str_view(arr, ind)
+    return lambda arr, ind: arr[ind]
 
 @intrinsic
 def copy_str_arr_slice(typingctx, str_arr_typ, out_str_arr_typ, ind_t=None):
@@ -215,8 +249,8 @@ def copy_str_arr_slice(typingctx, str_arr_typ, out_str_arr_typ, ind_t=None):
 
         out_string_array = context.make_helper(builder, string_array_type, out_str_arr)
 
-        in_offsets = builder.bitcast(in_string_array.offsets, lir.IntType(32).as_pointer())
-        out_offsets = builder.bitcast(out_string_array.offsets, lir.IntType(32).as_pointer())
+        in_offsets = builder.bitcast(in_string_array.offsets, lir.IntType(64).as_pointer())
+        out_offsets = builder.bitcast(out_string_array.offsets, lir.IntType(64).as_pointer())
 
         ind_p1 = builder.add(ind, context.get_constant(types.intp, 1))
         cgutils.memcpy(builder, out_offsets, in_offsets, ind_p1)
@@ -327,6 +361,13 @@ class GetItemStringArray(AbstractTemplate):
                 return signature(string_array_type, *args)
             elif idx == types.Array(types.intp, 1, 'C'):
                 return signature(string_array_type, *args)
+        if isinstance(ary, DictStringArrayType):
+            if isinstance(idx, types.Integer):
+                return signature(string_type, *args)
+            elif idx == types.Array(types.bool_, 1, 'C'):
+                return signature(dict_str_arr_type, *args)
+            elif idx == types.Array(types.intp, 1, 'C'):
+                return signature(dict_str_arr_type, *args)
 
 
 @infer
@@ -344,6 +385,40 @@ class CmpOpEqStringArray(AbstractTemplate):
             return signature(types.Array(types.boolean, 1, 'C'), va, vb)
 
 
+@infer
+class CmpOpEqDictStringArray(AbstractTemplate):
+    key = '=='
+
+    def generic(self, args, kws):
+        assert not kws
+        [va, vb] = args
+        # dictionary-encoded array compared to a string, see hiframes_typed
+        if ((va == dict_str_arr_type and vb == string_type)
+                or (va == string_type and vb == dict_str_arr_type)):
+            return signature(types.Array(types.boolean, 1, 'C'), va, vb)
+
+
+@infer
+class CmpOpNEqDictStringArray(CmpOpEqDictStringArray):
+    key = '!='
+
+@infer
+class CmpOpGEDictStringArray(CmpOpEqDictStringArray):
+    key = '>='
+
+@infer
+class CmpOpGTDictStringArray(CmpOpEqDictStringArray):
+    key = '>'
+
+@infer
+class CmpOpLEDictStringArray(CmpOpEqDictStringArray):
+    key = '<='
+
+@infer
+class CmpOpLTDictStringArray(CmpOpEqDictStringArray):
+    key = '<'
+
+
 @infer
 class CmpOpNEqStringArray(CmpOpEqStringArray):
     key = '!='
@@ -457,20 +532,79 @@ def str_arr_len_overload(str_arr):
         return str_arr_len
 
 
+class DictStringArrayType(types.Type):
+    """dictionary-encoded string array: int32 code of every element into a
+    dictionary string array. The dictionary can repeat values (e.g. one set
+    of values per Parquet file), operators that compare codes of different
+    arrays or processes unify dictionaries first (see hiframes_dict_enc).
+    """
+    def __init__(self):
+        super(DictStringArrayType, self).__init__(
+            name='DictStringArrayType()')
+
+    @property
+    def dtype(self):
+        return string_type
+
+
+dict_str_arr_type = DictStringArrayType()
+
+
+@register_model(DictStringArrayType)
+class DictStringArrayModel(models.StructModel):
+    def __init__(self, dmm, fe_type):
+        members = [
+            ('codes', types.Array(types.int32, 1, 'C')),
+            ('dictionary', string_array_type),
+        ]
+        models.StructModel.__init__(self, dmm, fe_type, members)
+
+make_attribute_wrapper(DictStringArrayType, 'codes', 'codes')
+make_attribute_wrapper(DictStringArrayType, 'dictionary', 'dictionary')
+
+
+@intrinsic
+def init_dict_str_arr(typingctx, codes_typ, dict_typ=None):
+    """dictionary-encoded string array from codes and a dictionary
+    """
+    assert codes_typ == types.Array(types.int32, 1, 'C')
+    assert dict_typ == string_array_type
+    def codegen(context, builder, sig, args):
+        codes, dictionary = args
+        dict_arr = cgutils.create_struct_proxy(sig.return_type)(
+            context, builder)
+        dict_arr.codes = codes
+        dict_arr.dictionary = dictionary
+        context.nrt.incref(builder, sig.args[0], codes)
+        context.nrt.incref(builder, sig.args[1], dictionary)
+        return dict_arr._getvalue()
+
+    return dict_str_arr_type(codes_typ, dict_typ), codegen
+
+
+@overload(len)
+def dict_str_arr_len_overload(dict_arr):
+    if dict_arr == dict_str_arr_type:
+        return lambda A: len(A.codes)
+
+
 from numba.targets.listobj import ListInstance
 from llvmlite import ir as lir
 import llvmlite.binding as ll
+from numba.targets.arrayobj import make_array
+from numba.targets.boxing import box_array
 import hstr_ext
 ll.add_symbol('get_str_len', hstr_ext.get_str_len)
 ll.add_symbol('allocate_string_array', hstr_ext.allocate_string_array)
 ll.add_symbol('setitem_string_array', hstr_ext.setitem_string_array)
 ll.add_symbol('getitem_string_array', hstr_ext.getitem_string_array)
 ll.add_symbol('getitem_string_array_std', hstr_ext.getitem_string_array_std)
-ll.add_symbol('string_array_from_sequence', hstr_ext.string_array_from_sequence)
+ll.add_symbol('string_arrays_from_sequences', hstr_ext.string_arrays_from_sequences)
 ll.add_symbol('np_array_from_string_array', hstr_ext.np_array_from_string_array)
 ll.add_symbol('print_int', hstr_ext.print_int)
 ll.add_symbol('convert_len_arr_to_offset', hstr_ext.convert_len_arr_to_offset)
 ll.add_symbol('set_string_array_range', hstr_ext.set_string_array_range)
+ll.add_symbol('setitem_string_array_chars', hstr_ext.setitem_string_array_chars)
 
 convert_len_arr_to_offset = types.ExternalFunction("convert_len_arr_to_offset", types.void(types.voidptr, types.intp))
 
@@ -480,6 +614,23 @@ ll.add_symbol('c_glob', hstr_ext.c_glob)
 
 setitem_string_array = types.ExternalFunction("setitem_string_array",
             types.void(types.voidptr, types.voidptr, string_type, types.intp))
+setitem_string_array_chars = types.ExternalFunction("setitem_string_array_chars",
+            types.void(types.voidptr, types.voidptr, types.voidptr, types.int64,
+                       types.intp))
+
+
+def setitem_str_arr_view(str_arr, ind, view):  # pragma: no cover
+    return
+
+@overload(setitem_str_arr_view)
+def setitem_str_arr_view_overload(arr_typ, ind_typ, view_typ):
+    """copy characters of a view to element ind of a pre-allocated string
+    array (set in order similar to setitem_string_array)
+    """
+    def setitem_view_impl(str_arr, ind, view):
+        setitem_string_array_chars(get_offset_ptr(str_arr),
+            get_data_ptr(str_arr), view._data, view._length, ind)
+    return setitem_view_impl
 
 def construct_string_array(context, builder):
     """Creates meminfo and sets dtor.
@@ -545,7 +696,7 @@ def impl_string_array_single(context, builder, sig, args):
 
     # allocate string array
     fnty = lir.FunctionType(lir.VoidType(),
-                            [lir.IntType(32).as_pointer().as_pointer(),
+                            [lir.IntType(64).as_pointer().as_pointer(),
                              lir.IntType(8).as_pointer().as_pointer(),
                              lir.IntType(64),
                              lir.IntType(64)])
@@ -557,7 +708,7 @@ def impl_string_array_single(context, builder, sig, args):
 
     # set string array values
     fnty = lir.FunctionType(lir.VoidType(),
-                            [lir.IntType(32).as_pointer(),
+                            [lir.IntType(64).as_pointer(),
                              lir.IntType(8).as_pointer(),
                              lir.IntType(8).as_pointer(),
                              lir.IntType(64)])
@@ -594,7 +745,7 @@ def pre_alloc_string_array(typingctx, num_strs_typ, num_total_chars_typ=None):
 
         # allocate string array
         fnty = lir.FunctionType(lir.VoidType(),
-                                [lir.IntType(32).as_pointer().as_pointer(),
+                                [lir.IntType(64).as_pointer().as_pointer(),
                                  lir.IntType(8).as_pointer().as_pointer(),
                                  lir.IntType(64),
                                  lir.IntType(64)])
@@ -632,9 +783,9 @@ def set_string_array_range(typingctx, out_typ, in_typ, curr_str_typ, curr_chars_
         in_string_array = context.make_helper(builder, string_array_type, in_arr)
 
         fnty = lir.FunctionType(lir.VoidType(),
-                                [lir.IntType(32).as_pointer(),
+                                [lir.IntType(64).as_pointer(),
                                  lir.IntType(8).as_pointer(),
-                                 lir.IntType(32).as_pointer(),
+                                 lir.IntType(64).as_pointer(),
                                  lir.IntType(8).as_pointer(),
                                  lir.IntType(64),
                                  lir.IntType(64),
@@ -656,16 +807,87 @@ def set_string_array_range(typingctx, out_typ, in_typ, curr_str_typ, curr_chars_
 
     return types.void(string_array_type, string_array_type, types.intp, types.intp), codegen
 
+def arrow_str_arr_supported():
+    """pandas has Arrow-backed string arrays (pandas 0.23 of the conda recipe
+    doesn't, string arrays are boxed as object arrays then)
+    """
+    import pandas as pd
+    return hasattr(pd, 'arrays') and hasattr(pd.arrays, 'ArrowStringArray')
+
+
+def arrow_str_arr_from_buffers(offsets, data):
+    """pandas array backed by an Arrow string array that shares the offsets
+    and data buffers of a boxed string array. Elements are converted to
+    Python strings only when pandas needs objects.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    n = len(offsets) - 1
+    # uint64 offsets are less than 2^63, int64 view is exact
+    offsets = offsets.view(np.int64)
+    if hasattr(pd, 'ArrowDtype'):
+        arr = pa.LargeStringArray.from_buffers(n, pa.py_buffer(offsets),
+                                               pa.py_buffer(data))
+        return pd.arrays.ArrowExtensionArray(arr)
+    # older pandas supports 32-bit offsets only, narrow them if they fit
+    # (data buffer is still shared)
+    if offsets[-1] <= np.iinfo(np.int32).max:
+        arr = pa.StringArray.from_buffers(
+            n, pa.py_buffer(offsets.astype(np.int32)), pa.py_buffer(data))
+        return pd.arrays.ArrowStringArray(arr)
+    arr = pa.LargeStringArray.from_buffers(n, pa.py_buffer(offsets),
+                                           pa.py_buffer(data))
+    return arr.to_pandas().values
+
+
+def _box_buffer(c, arr_typ, ptr, n, meminfo):
+    """numpy array of n elements at ptr that keeps meminfo alive
+    """
+    ary = make_array(arr_typ)(c.context, c.builder)
+    itemsize = c.context.get_constant(types.intp, c.context.get_abi_sizeof(
+        c.context.get_data_type(arr_typ.dtype)))
+    c.context.populate_array(ary, data=ptr, shape=[n], strides=[itemsize],
+                             itemsize=itemsize, meminfo=meminfo)
+    # box_array consumes a reference, string array keeps its own
+    c.context.nrt.incref(c.builder, arr_typ, ary._getvalue())
+    return box_array(arr_typ, ary._getvalue(), c)
+
+
+def _box_str_arr_arrow(typ, val, c):
+    string_array = c.context.make_helper(c.builder, typ, val)
+    n_plus_1 = c.builder.add(string_array.num_items,
+                             lir.Constant(lir.IntType(64), 1))
+    offsets_obj = _box_buffer(c, types.Array(offset_typ, 1, 'C'),
+                              string_array.offsets, n_plus_1,
+                              string_array.meminfo)
+    data_obj = _box_buffer(c, types.Array(char_typ, 1, 'C'),
+                           string_array.data, string_array.num_total_chars,
+                           string_array.meminfo)
+    mod_name = c.context.insert_const_string(c.builder.module,
+                                             "hpat.str_arr_ext")
+    mod_obj = c.pyapi.import_module_noblock(mod_name)
+    arr = c.pyapi.call_method(mod_obj, "arrow_str_arr_from_buffers",
+                              (offsets_obj, data_obj))
+    c.pyapi.decref(mod_obj)
+    c.pyapi.decref(offsets_obj)
+    c.pyapi.decref(data_obj)
+    return arr
+
+
 @box(StringArrayType)
 def box_str_arr(typ, val, c):
     """
     """
+    if hpat.config._box_str_arrow and arrow_str_arr_supported():
+        arr = _box_str_arr_arrow(typ, val, c)
+        c.context.nrt.decref(c.builder, typ, val)
+        return arr
 
     string_array = c.context.make_helper(c.builder, typ, val)
 
     fnty = lir.FunctionType(c.context.get_argument_type(types.pyobject), #lir.IntType(8).as_pointer(),
                             [lir.IntType(64),
-                             lir.IntType(32).as_pointer(),
+                             lir.IntType(64).as_pointer(),
                              lir.IntType(8).as_pointer()])
     fn_get = c.builder.module.get_or_insert_function(fnty, name="np_array_from_string_array")
 
@@ -682,7 +904,7 @@ def lower_string_arr_getitem(context, builder, sig, args):
     string_array = context.make_helper(builder, typ, args[0])
 
     fnty = lir.FunctionType(lir.IntType(8).as_pointer(),
-                            [lir.IntType(32).as_pointer(),
+                            [lir.IntType(64).as_pointer(),
                              lir.IntType(8).as_pointer(),
                              lir.IntType(64)])
     fn_getitem = builder.module.get_or_insert_function(fnty,
@@ -701,19 +923,14 @@ def lower_string_arr_getitem_bool(context, builder, sig, args):
         n_chars = 0
         for i in range(n):
             if bool_arr[i] == True:
-                # TODO: use get_cstr_and_len instead of getitem
-                str = str_arr[i]
                 n_strs += 1
-                n_chars += len(str)
-                del_str(str)
+                n_chars += len(get_str_view(str_arr, i))
         out_arr = pre_alloc_string_array(n_strs, n_chars)
         str_ind = 0
         for i in range(n):
             if bool_arr[i] == True:
-                str = str_arr[i]
-                setitem_string_array(get_offset_ptr(out_arr), get_data_ptr(out_arr), str, str_ind)
+                setitem_str_arr_view(out_arr, str_ind, get_str_view(str_arr, i))
                 str_ind += 1
-                del_str(str)
         return out_arr
     res = context.compile_internal(builder, str_arr_bool_impl, sig, args)
     return res
@@ -727,24 +944,38 @@ def lower_string_arr_getitem_arr(context, builder, sig, args):
         n_strs = 0
         n_chars = 0
         for i in range(n):
-            # TODO: use get_cstr_and_len instead of getitem
-            _str = str_arr[ind_arr[i]]
             n_strs += 1
-            n_chars += len(_str)
-            del_str(_str)
+            n_chars += len(get_str_view(str_arr, ind_arr[i]))
 
         out_arr = pre_alloc_string_array(n_strs, n_chars)
         str_ind = 0
         for i in range(n):
-            _str = str_arr[ind_arr[i]]
-            setitem_string_array(get_offset_ptr(out_arr), get_data_ptr(out_arr), _str, str_ind)
+            setitem_str_arr_view(out_arr, str_ind, get_str_view(str_arr, ind_arr[i]))
             str_ind += 1
-            del_str(_str)
         return out_arr
     res = context.compile_internal(builder, str_arr_arr_impl, sig, args)
     return res
 
 
+@lower_builtin('getitem', DictStringArrayType, types.Integer)
+def lower_dict_str_arr_getitem(context, builder, sig, args):
+    def dict_str_arr_getitem_impl(A, ind):
+        return A.dictionary[A.codes[ind]]
+    return context.compile_internal(builder, dict_str_arr_getitem_impl, sig,
+                                    args)
+
+
+@lower_builtin('getitem', DictStringArrayType, types.Array(types.bool_, 1, 'C'))
+@lower_builtin('getitem', DictStringArrayType, types.Array(types.intp, 1, 'C'))
+def lower_dict_str_arr_getitem_arr(context, builder, sig, args):
+    # only codes are selected, the dictionary is shared
+    def dict_str_arr_getitem_arr_impl(A, ind):
+        return init_dict_str_arr(A.codes[ind], A.dictionary)
+    res = context.compile_internal(builder, dict_str_arr_getitem_arr_impl,
+                                   sig, args)
+    return res
+
+
 @typeof_impl.register(np.ndarray)
 def typeof_np_string(val, c):
     if val.ndim == 1 and isinstance(val[0], str):  # and isinstance(val[-1], str):
@@ -753,43 +984,120 @@ def typeof_np_string(val, c):
         return numba.typing.typeof._typeof_ndarray(val, c)
 
 
-@unbox(StringArrayType)
-def unbox_str_series(typ, val, c):
+def _get_arrow_str_array(arr):
+    """pyarrow string array of an Arrow-backed pandas array, None otherwise
     """
-    Unbox a Pandas String Series. We just redirect to StringArray implementation.
+    if not hpat.config._has_pyarrow:
+        return None
+    chunked = getattr(arr, '_pa_array', None)
+    if chunked is None:
+        chunked = getattr(arr, '_data', None)
+    import pyarrow as pa
+    if not (isinstance(chunked, pa.ChunkedArray)
+            and (pa.types.is_string(chunked.type)
+                 or pa.types.is_large_string(chunked.type))):
+        return None
+    return chunked.combine_chunks()
+
+
+def get_str_col_buffers(arr):
+    """representation of a string column for string_arrays_from_sequences:
+    (0, object array), (1, offsets, data) for Arrow-backed arrays, or
+    (2, offsets, data, codes) for categoricals where offsets and data are of
+    the categories. Offsets are uint64 starting at 0 and data is uint8.
     """
-    dtype = StringArrayPayloadType()
-    payload = cgutils.create_struct_proxy(dtype)(c.context, c.builder)
-    string_array = c.context.make_helper(c.builder, typ)
+    import pandas as pd
+    if isinstance(arr, (pd.Series, pd.Index)):
+        arr = arr.values
+    if isinstance(arr, pd.Categorical):
+        cats = [v.encode('utf-8') for v in arr.categories]
+        offsets = np.zeros(len(cats) + 1, np.uint64)
+        offsets[1:] = np.cumsum([len(v) for v in cats])
+        data = np.frombuffer(b''.join(cats), np.uint8)
+        return 2, offsets, data, arr.codes.astype(np.int64)
+    pa_arr = _get_arrow_str_array(arr)
+    if pa_arr is not None:
+        n = len(pa_arr)
+        if n == 0:
+            return 1, np.zeros(1, np.uint64), np.empty(0, np.uint8)
+        import pyarrow as pa
+        _, offs_buf, data_buf = pa_arr.buffers()
+        offs_dtype = (np.int64 if pa.types.is_large_string(pa_arr.type)
+                      else np.int32)
+        offsets = np.frombuffer(offs_buf, offs_dtype)[
+            pa_arr.offset:pa_arr.offset + n + 1]
+        data = np.empty(0, np.uint8)
+        if data_buf is not None:
+            data = np.frombuffer(data_buf, np.uint8)[offsets[0]:offsets[-1]]
+        return 1, (offsets - offsets[0]).astype(np.uint64), data
+    return 0, np.ascontiguousarray(arr, dtype=object)
+
+
+def unbox_str_arrays(arr_objs, c):
+    """unbox string columns with one call so that characters of all columns
+    are copied in parallel without the GIL, returns native string arrays
+    """
+    n_cols = len(arr_objs)
+    i8_ptr = lir.IntType(8).as_pointer()
+    i64 = lir.IntType(64)
+    objs = cgutils.alloca_once(c.builder, lir.ArrayType(i8_ptr, n_cols))
+    n_strs = cgutils.alloca_once(c.builder, lir.ArrayType(i64, n_cols))
+    offsets = cgutils.alloca_once(c.builder,
+                                  lir.ArrayType(i64.as_pointer(), n_cols))
+    datas = cgutils.alloca_once(c.builder, lir.ArrayType(i8_ptr, n_cols))
+    zero = lir.Constant(lir.IntType(32), 0)
+    get_ptr = lambda arr, i: c.builder.gep(
+        arr, [zero, lir.Constant(lir.IntType(32), i)])
+    for i, obj in enumerate(arr_objs):
+        c.builder.store(obj, get_ptr(objs, i))
 
-    # function signature of string_array_from_sequence
     # we use void* instead of PyObject*
     fnty = lir.FunctionType(lir.VoidType(),
-                            [lir.IntType(8).as_pointer(),
-                             lir.IntType(64).as_pointer(),
-                             lir.IntType(32).as_pointer().as_pointer(),
-                             lir.IntType(8).as_pointer().as_pointer(),])
-    fn = c.builder.module.get_or_insert_function(fnty, name="string_array_from_sequence")
-    c.builder.call(fn, [val,
-                        string_array._get_ptr_by_name('num_items'),
-                        payload._get_ptr_by_name('offsets'),
-                        payload._get_ptr_by_name('data'),])
-
-    # the raw data is now copied to payload
-    # The native representation is a proxy to the payload, we need to
-    # get a proxy and attach the payload and meminfo
-    meminfo, meminfo_data_ptr = construct_string_array(c.context, c.builder)
-    c.builder.store(payload._getvalue(), meminfo_data_ptr)
+                            [i8_ptr.as_pointer(),
+                             i64,
+                             i64.as_pointer(),
+                             i64.as_pointer().as_pointer(),
+                             i8_ptr.as_pointer()])
+    fn = c.builder.module.get_or_insert_function(
+        fnty, name="string_arrays_from_sequences")
+    c.builder.call(fn, [get_ptr(objs, 0),
+                        lir.Constant(i64, n_cols),
+                        get_ptr(n_strs, 0),
+                        get_ptr(offsets, 0),
+                        get_ptr(datas, 0)])
+
+    out_arrs = []
+    for i in range(n_cols):
+        # the raw data is now copied to payload
+        # The native representation is a proxy to the payload, we need to
+        # get a proxy and attach the payload and meminfo
+        payload = cgutils.create_struct_proxy(str_arr_payload_type)(
+            c.context, c.builder)
+        payload.offsets = c.builder.load(get_ptr(offsets, i))
+        payload.data = c.builder.load(get_ptr(datas, i))
+        meminfo, meminfo_data_ptr = construct_string_array(c.context,
+                                                           c.builder)
+        c.builder.store(payload._getvalue(), meminfo_data_ptr)
+
+        string_array = c.context.make_helper(c.builder, string_array_type)
+        string_array.num_items = c.builder.load(get_ptr(n_strs, i))
+        string_array.meminfo = meminfo
+        string_array.offsets = payload.offsets
+        string_array.data = payload.data
+        string_array.num_total_chars = c.builder.load(
+            c.builder.gep(string_array.offsets, [string_array.num_items]))
+        out_arrs.append(string_array._getvalue())
+    return out_arrs
 
-    string_array.meminfo = meminfo
-    string_array.offsets = payload.offsets
-    string_array.data = payload.data
-    string_array.num_total_chars = c.builder.zext(c.builder.load(
-        c.builder.gep(string_array.offsets, [string_array.num_items])), lir.IntType(64))
 
-    # FIXME how to check that the returned size is > 0?
+@unbox(StringArrayType)
+def unbox_str_series(typ, val, c):
+    """
+    Unbox a Pandas String Series. We just redirect to StringArray implementation.
+    """
+    out_arr, = unbox_str_arrays([val], c)
     is_error = cgutils.is_not_null(c.builder, c.pyapi.err_occurred())
-    return NativeValue(string_array._getvalue(), is_error=is_error)
+    return NativeValue(out_arr, is_error=is_error)
 
 # zero = context.get_constant(types.intp, 0)
 # cond = builder.icmp_signed('>=', size, zero)
@@ -817,7 +1125,7 @@ def lower_glob(context, builder, sig, args):
 
     # call glob in C
     fnty = lir.FunctionType(lir.VoidType(),
-                            [lir.IntType(32).as_pointer().as_pointer(),
+                            [lir.IntType(64).as_pointer().as_pointer(),
                              lir.IntType(8).as_pointer().as_pointer(),
                              lir.IntType(64).as_pointer(),
                              lir.IntType(8).as_pointer()])
@@ -832,8 +1140,8 @@ def lower_glob(context, builder, sig, args):
     string_array.meminfo = meminfo
     string_array.offsets = str_arr_payload.offsets
     string_array.data = str_arr_payload.data
-    string_array.num_total_chars = builder.zext(builder.load(
-        builder.gep(string_array.offsets, [string_array.num_items])), lir.IntType(64))
+    string_array.num_total_chars = builder.load(
+        builder.gep(string_array.offsets, [string_array.num_items]))
 
     ret = string_array._getvalue()
     #context.nrt.decref(builder, ty, ret)
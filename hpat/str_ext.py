@@ -1,7 +1,8 @@
 import numba
 from numba.extending import (box, unbox, typeof_impl, register_model, models,
                              NativeValue, lower_builtin, lower_cast, overload,
-                             type_callable, overload_method)
+                             type_callable, overload_method,
+                             make_attribute_wrapper, intrinsic)
 from numba.targets.imputils import lower_constant, impl_ret_new_ref, impl_ret_untracked
 from numba import types, typing
 from numba.typing.templates import (signature, AbstractTemplate, infer, infer_getattr,
@@ -16,6 +17,10 @@ ll.add_symbol('get_char_from_string', hstr_ext.get_char_from_string)
 ll.add_symbol('get_char_ptr', hstr_ext.get_char_ptr)
 ll.add_symbol('del_str', hstr_ext.del_str)
 ll.add_symbol('_hash_str', hstr_ext.hash_str)
+ll.add_symbol('hash_chars', hstr_ext.hash_chars)
+ll.add_symbol('str_view_compare', hstr_ext.str_view_compare)
+ll.add_symbol('str_view_find', hstr_ext.str_view_find)
+ll.add_symbol('str_view_contains_regex', hstr_ext.str_view_contains_regex)
 
 class StringType(types.Opaque):
     def __init__(self):
@@ -31,6 +36,30 @@ def _typeof_str(val, c):
 
 register_model(StringType)(models.OpaqueModel)
 
+class StringViewType(types.Type):
+    """non-owning view of a string array element (pointer and length into
+    the array's data buffer), which avoids allocating a std::string per
+    element. Only valid while the array is alive.
+    """
+    def __init__(self):
+        super(StringViewType, self).__init__(name='StringViewType')
+
+string_view_type = StringViewType()
+
+
+@register_model(StringViewType)
+class StringViewModel(models.StructModel):
+    def __init__(self, dmm, fe_type):
+        members = [
+            ('data', types.voidptr),
+            ('length', types.int64),
+        ]
+        models.StructModel.__init__(self, dmm, fe_type, members)
+
+make_attribute_wrapper(StringViewType, 'data', '_data')
+make_attribute_wrapper(StringViewType, 'length', '_length')
+
+
 # XXX: should be subtype of StringType?
 class CharType(types.Type):
     def __init__(self):
@@ -101,6 +130,100 @@ def hash_overload(str_typ):
     if str_typ == string_type:
         return lambda s: _hash_str(s)
 
+# string values and views of the same characters have the same hash
+_hash_chars = types.ExternalFunction("hash_chars",
+                                     types.int64(types.voidptr, types.int64))
+str_view_compare = types.ExternalFunction("str_view_compare",
+    types.int32(types.voidptr, types.int64, types.voidptr, types.int64))
+str_view_find = types.ExternalFunction("str_view_find",
+    types.int64(types.voidptr, types.int64, types.voidptr, types.int64))
+init_string = types.ExternalFunction("init_string",
+                                     string_type(types.voidptr, types.int64))
+
+
+@overload(hash)
+def hash_view_overload(str_typ):
+    if str_typ == string_view_type:
+        return lambda s: _hash_chars(s._data, s._length)
+
+
+@overload(len)
+def len_view_overload(str_typ):
+    if str_typ == string_view_type:
+        return lambda s: s._length
+
+
+def get_str_ptr_len(s):  # pragma: no cover
+    return 0, 0
+
+
+@overload(get_str_ptr_len)
+def get_str_ptr_len_overload(str_typ):
+    """character pointer and length of string or string view
+    """
+    if str_typ == string_view_type:
+        return lambda s: (s._data, s._length)
+    if str_typ == string_type:
+        return lambda s: (get_c_str(s), len(s))
+
+
+def str_view_to_str(s):  # pragma: no cover
+    return s
+
+
+@overload(str_view_to_str)
+def str_view_to_str_overload(str_typ):
+    """materialize a std::string from a view, e.g. when it escapes
+    """
+    if str_typ == string_view_type:
+        return lambda s: init_string(s._data, s._length)
+    return lambda s: s
+
+
+def release_str(s):  # pragma: no cover
+    return
+
+
+@overload(release_str)
+def release_str_overload(str_typ):
+    """delete string values, views don't own their characters
+    """
+    if str_typ == string_type:
+        return lambda s: del_str(s)
+    return lambda s: None
+
+
+@overload_method(StringViewType, 'startswith')
+def str_view_startswith(str_typ, prefix_typ):
+    def startswith_impl(s, prefix):
+        p, l = get_str_ptr_len(prefix)
+        return l <= s._length and str_view_compare(s._data, l, p, l) == 0
+    return startswith_impl
+
+
+@overload_method(StringViewType, 'endswith')
+def str_view_endswith(str_typ, suffix_typ):
+    def endswith_impl(s, suffix):
+        p, l = get_str_ptr_len(suffix)
+        if l > s._length:
+            return False
+        start = get_view_char_ptr(s, s._length - l)
+        return str_view_compare(start, l, p, l) == 0
+    return endswith_impl
+
+
+@intrinsic
+def get_view_char_ptr(typingctx, view_typ, ind_typ=None):
+    """pointer to character ind of view
+    """
+    def codegen(context, builder, sig, args):
+        view, ind = args
+        s = cgutils.create_struct_proxy(string_view_type)(
+            context, builder, value=view)
+        return builder.gep(s.data, [ind])
+
+    return types.voidptr(string_view_type, ind_typ), codegen
+
 @infer
 class StringAdd(ConcreteTemplate):
     key = "+"
@@ -114,7 +237,8 @@ class StringOpEq(AbstractTemplate):
     def generic(self, args, kws):
         assert not kws
         (arg1, arg2) = args
-        if isinstance(arg1, StringType) and isinstance(arg2, StringType):
+        if (isinstance(arg1, (StringType, StringViewType))
+                and isinstance(arg2, (StringType, StringViewType))):
             return signature(types.boolean, arg1, arg2)
         if arg1 == char_type and arg2 == char_type:
             return signature(types.boolean, arg1, arg2)
@@ -412,6 +536,39 @@ def string_lt_impl(context, builder, sig, args):
     return res
 
 
+def _str_view_cmp(s1, s2):  # pragma: no cover
+    p1, l1 = get_str_ptr_len(s1)
+    p2, l2 = get_str_ptr_len(s2)
+    return str_view_compare(p1, l1, p2, l2)
+
+
+def _str_view_eq(s1, s2):  # pragma: no cover
+    p1, l1 = get_str_ptr_len(s1)
+    p2, l2 = get_str_ptr_len(s2)
+    return l1 == l2 and str_view_compare(p1, l1, p2, l2) == 0
+
+
+def _make_str_view_cmp_impl(op):
+    def str_view_cmp_impl(context, builder, sig, args):
+        if op in ('==', '!='):
+            res = context.compile_internal(builder, _str_view_eq, sig, args)
+            return res if op == '==' else builder.not_(res)
+        cmp_sig = signature(types.int32, *sig.args)
+        comp_val = context.compile_internal(builder, _str_view_cmp, cmp_sig,
+                                            args)
+        zero = context.get_constant(types.int32, 0)
+        return builder.icmp_signed(op, comp_val, zero)
+    return str_view_cmp_impl
+
+
+# comparisons of views with views or string values don't allocate
+for _op in ('==', '!=', '>=', '>', '<=', '<'):
+    for _typs in ((string_view_type, string_view_type),
+                  (string_view_type, string_type),
+                  (string_type, string_view_type)):
+        lower_builtin(_op, *_typs)(_make_str_view_cmp_impl(_op))
+
+
 @lower_builtin("str.split", string_type, string_type)
 def string_split_impl(context, builder, sig, args):
     nitems = cgutils.alloca_once(builder, lir.IntType(64))
@@ -489,3 +646,30 @@ def impl_string_concat(context, builder, sig, args):
     fn = builder.module.get_or_insert_function(
         fnty, name="str_contains_noregex")
     return builder.call(fn, args)
+
+
+@lower_builtin(contains_regex, string_view_type, regex_type)
+def impl_str_view_contains_regex(context, builder, sig, args):
+    view = cgutils.create_struct_proxy(string_view_type)(
+        context, builder, value=args[0])
+    fnty = lir.FunctionType(lir.IntType(1),
+                            [lir.IntType(8).as_pointer(), lir.IntType(64),
+                             lir.IntType(8).as_pointer()])
+    fn = builder.module.get_or_insert_function(
+        fnty, name="str_view_contains_regex")
+    return builder.call(fn, [view.data, view.length, args[1]])
+
+
+@lower_builtin(contains_noregex, string_view_type, string_type)
+def impl_str_view_contains_noregex(context, builder, sig, args):
+    def contains_impl(s, pat):
+        p, l = get_str_ptr_len(pat)
+        return str_view_find(s._data, s._length, p, l) != -1
+    return context.compile_internal(builder, contains_impl, sig, args)
+
+
+@lower_builtin(getpointer, StringViewType)
+def getpointer_from_string_view(context, builder, sig, args):
+    view = cgutils.create_struct_proxy(string_view_type)(
+        context, builder, value=args[0])
+    return view.data
@@ -1,4 +1,11 @@
 import unittest
+import os
+import json
+import shutil
+import subprocess
+import tempfile
+import sys
+import time
 import pandas as pd
 import numpy as np
 import itertools
@@ -44,6 +51,21 @@ class BaseTest(unittest.TestCase):
     def _rank_bounds(self, arr_len):
         return self._rank_begin(arr_len), self._rank_end(arr_len)
 
+    def _mkdtemp_shared(self):
+        """temporary directory created by root and shared by all ranks
+        """
+        buf = np.zeros(4096, np.uint8)
+        if self.rank == 0:
+            path = tempfile.mkdtemp().encode()
+            buf[:len(path)] = np.frombuffer(path, np.uint8)
+        hpat.jit(lambda A: hpat.distributed_api.bcast(A))(buf)
+        return bytes(buf[buf != 0]).decode()
+
+    def _rmtree_shared(self, path):
+        hpat.jit(lambda: hpat.distributed_api.barrier())()
+        if self.rank == 0:
+            shutil.rmtree(path, ignore_errors=True)
+
     def _follow_cpython(self, ptr, seed=2):
         r = random.Random(seed)
         _copy_py_state(r, ptr)
@@ -397,5 +419,125 @@ class TestBasic(BaseTest):
             A, B, _ = hpat_func3(arr_len)
             np.testing.assert_allclose(A, B)
 
+    def test_jit_cache(self):
+        def test_impl(n):
+            A = np.ones(n)
+            s = A.sum()
+            return s
+
+        # fresh cache directory so that results of previous runs are not
+        # loaded
+        cache_dir = self._mkdtemp_shared()
+        old_cache_dir = numba.config.CACHE_DIR
+        numba.config.CACHE_DIR = cache_dir
+        try:
+            hpat_func1 = hpat.jit(cache=True)(test_impl)
+            hpat_func2 = hpat.jit(cache=True)(test_impl)
+            n = 11
+            self.assertEqual(hpat_func1(n), test_impl(n))
+            self.assertEqual(sum(hpat_func1.stats.cache_hits.values()), 0)
+            # second dispatcher loads the result saved by the first one
+            self.assertEqual(hpat_func2(n), test_impl(n))
+            self.assertEqual(sum(hpat_func2.stats.cache_hits.values()), 1)
+            # different locals should not share the cache entry
+            hpat_func3 = hpat.jit(cache=True, locals={'s': numba.float64})(
+                test_impl)
+            self.assertEqual(hpat_func3(n), test_impl(n))
+            self.assertEqual(sum(hpat_func3.stats.cache_hits.values()), 0)
+        finally:
+            numba.config.CACHE_DIR = old_cache_dir
+            self._rmtree_shared(cache_dir)
+
+    def test_jit_cache_compile_error(self):
+        def test_impl(n):
+            return np.ones(n).undefined_attr
+
+        # root's compile error should not leave other ranks waiting
+        cache_dir = self._mkdtemp_shared()
+        old_cache_dir = numba.config.CACHE_DIR
+        numba.config.CACHE_DIR = cache_dir
+        try:
+            hpat_func = hpat.jit(cache=True)(test_impl)
+            with self.assertRaises(numba.errors.TypingError):
+                hpat_func(11)
+        finally:
+            numba.config.CACHE_DIR = old_cache_dir
+            self._rmtree_shared(cache_dir)
+
+    def test_compile_profiler(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.ones(n)})
+            return df.A.sum()
+
+        hpat.compile_profiler.enable()
+        try:
+            hpat_func = hpat.jit(test_impl)
+            n = 11
+            self.assertEqual(hpat_func(n), test_impl(n))
+        finally:
+            hpat.compile_profiler.disable()
+        _, profiles = hpat.compile_profiler.compile_profiles[
+            test_impl.__qualname__][-1]
+        stages = {p.name: p for p in profiles}
+        self.assertIn("convert to distributed", stages)
+        self.assertGreater(stages["convert to parfors"].num_parfors, 0)
+        typed_pass = stages["typed hiframes pass"]
+        self.assertIn("compile_to_numba_ir", typed_pass.nested)
+        # nested compilation time is not counted in the stage's own time
+        nested_time = sum(t for _, t in typed_pass.nested.values())
+        self.assertLessEqual(typed_pass.time + nested_time,
+                             typed_pass.total_time + 1e-6)
+
+    def test_trace_mode(self):
+        # trace file is written in finalize when the process exits
+        code = (
+            "import numpy as np, pandas as pd, hpat\n"
+            "hpat.trace_mode = True\n"
+            "@hpat.jit\n"
+            "def f(n):\n"
+            "    df = pd.DataFrame({'A': np.ones(n, np.int64), 'B': np.arange(n)})\n"
+            "    return df.groupby('A')['B'].sum().sum()\n"
+            "f(11)\n")
+        trace_dir = tempfile.mkdtemp()
+        trace_file = os.path.join(trace_dir, "hpat_test_trace.json")
+        env = dict(os.environ, HPAT_TRACE_FILE=trace_file)
+        try:
+            subprocess.check_call([sys.executable, '-c', code], env=env)
+            with open(trace_file) as f:
+                events = json.load(f)['traceEvents']
+        finally:
+            shutil.rmtree(trace_dir, ignore_errors=True)
+        names = set(e['name'] for e in events if e['ph'] == 'X')
+        self.assertTrue(any(n.startswith('Aggregate') for n in names))
+        self.assertIn('alltoallv', names)
+        self.assertIn({'name': 'rank 0'},
+                      [e['args'] for e in events if e['ph'] == 'M'])
+
+
+# upper bound in seconds for the time "import hpat" adds to importing its
+# dependencies (numba, pandas), can be changed per machine
+IMPORT_TIME_LIMIT = float(os.environ.get('HPAT_IMPORT_TIME_LIMIT', 2.0))
+
+
+class TestImport(unittest.TestCase):
+    def test_import_optional_backends(self):
+        # native modules of optional backends are loaded on first use only
+        code = ("import sys, hpat; print(' '.join(m for m in {!r} "
+                "if m in sys.modules))").format(
+                ['pyarrow', 'parquet_cpp', 'h5py', 'hio', 'cv2', 'cv_wrapper',
+                 'ros_cpp', 'hxe_ext'])
+        out = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(out.decode().strip(), '')
+
+    def _import_time(self, modules):
+        t0 = time.time()
+        subprocess.check_call([sys.executable, '-c', 'import ' + modules])
+        return time.time() - t0
+
+    def test_import_time(self):
+        deps_time = self._import_time('numba, pandas')
+        hpat_time = self._import_time('hpat')
+        self.assertLess(hpat_time - deps_time, IMPORT_TIME_LIMIT)
+
 if __name__ == "__main__":
     unittest.main()
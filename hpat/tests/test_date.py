@@ -29,6 +29,44 @@ class TestDate(unittest.TestCase):
         df = self._gen_str_date_df()
         np.testing.assert_array_equal(hpat_func(df), test_impl(df))
 
+    def test_datetime_index_format(self):
+        def test_impl(df):
+            return pd.DatetimeIndex(df['str_date'], format='%d/%m/%Y %H:%M').values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'str_date': ['03/01/2017 10:15', '28/02/2016 23:59',
+                                        '03/01/2017 10:15', '01/12/1999 00:00']})
+        np.testing.assert_array_equal(
+            hpat_func(df),
+            pd.to_datetime(df['str_date'], format='%d/%m/%Y %H:%M').values)
+
+    def test_datetime_index_format_nomatch(self):
+        def test_impl(df, fmt):
+            return pd.DatetimeIndex(df['str_date'], format=fmt).values
+
+        hpat_func = hpat.jit(test_impl)
+        # strings that don't match the format are NaT, even if valid ISO 8601
+        df = pd.DataFrame({'str_date': ['03/01/2017 10:15', '2017-01-03 10:15',
+                                        '28/02/2016 23:59', '31/02/2016 23:59']})
+        fmt = '%d/%m/%Y %H:%M'
+        np.testing.assert_array_equal(
+            hpat_func(df, fmt),
+            pd.to_datetime(df['str_date'], format=fmt, errors='coerce').values)
+        with self.assertRaises(ValueError):
+            hpat_func(df, '%d/%m/%Y %I:%M')
+
+    def test_datetime_index_repeated(self):
+        def test_impl(df):
+            return pd.DatetimeIndex(df['str_date']).values
+
+        hpat_func = hpat.jit(test_impl)
+        # repeated dates and fractions, the string that doesn't match the
+        # layout is after the sample used for detecting it
+        data = ['2017-03-0{} 1{}:30:00.{}'.format(d, h, '5' * (h + 1))
+                for d in range(1, 4) for h in range(6)] * 4
+        df = pd.DataFrame({'str_date': data + ['2017-03-04']})
+        np.testing.assert_array_equal(hpat_func(df), test_impl(df))
+
     def test_datetime_arg(self):
         def test_impl(A):
             return A
@@ -139,6 +177,63 @@ class TestDate(unittest.TestCase):
         hpat_func = hpat.jit(test_impl)
         np.testing.assert_array_equal(hpat_func(df), test_impl(df))
 
+    def test_dt_fields(self):
+        def test_impl(df):
+            A = df.A.dt
+            return (A.year.values, A.month.values, A.day.values,
+                    A.hour.values, A.minute.values, A.second.values,
+                    A.microsecond.values, A.nanosecond.values,
+                    A.dayofweek.values, A.dayofyear.values, A.quarter.values)
+
+        df = pd.DataFrame({'A': pd.DatetimeIndex(['1969-12-31 23:59:59.999999999',
+            '2000-02-29 12:30:45.123456789', '1900-03-01', '2017-12-31 01:02:03'])})
+        hpat_func = hpat.jit(test_impl)
+        for res, expected in zip(hpat_func(df), test_impl(df)):
+            np.testing.assert_array_equal(res, expected)
+
+    def test_dt_fields_nat(self):
+        def test_impl(df):
+            A = df.A.dt
+            return A.year.values, A.hour.values, A.dayofweek.values
+
+        df = pd.DataFrame({'A': pd.DatetimeIndex(['2017-12-31 10:00', None,
+                                                  '1969-12-31 23:00'])})
+        hpat_func = hpat.jit(test_impl)
+        for res, expected in zip(hpat_func(df), test_impl(df)):
+            np.testing.assert_array_equal(res, expected)
+
+    def test_date_dt_fields(self):
+        def test_impl(A):
+            S = A.map(lambda x: x.date()).dt
+            return S.year.values, S.dayofyear.values, S.dayofweek.values
+
+        hpat_func = hpat.jit(test_impl)
+        df = self._gen_str_date_df()
+        A = pd.DatetimeIndex(df['str_date']).to_series()
+        year, dayofyear, dayofweek = hpat_func(A)
+        np.testing.assert_array_equal(year, A.dt.year.values)
+        np.testing.assert_array_equal(dayofyear, A.dt.dayofyear.values)
+        np.testing.assert_array_equal(dayofweek, A.dt.dayofweek.values)
+
+    def test_box_date_dt64(self):
+        def test_impl(A):
+            return A.map(lambda x: x.date())
+
+        df = self._gen_str_date_df()
+        A = pd.DatetimeIndex(df['str_date']).to_series()
+        box_date_dt64 = hpat.config._box_date_dt64
+        hpat.config._box_date_dt64 = True
+        try:
+            hpat_func = hpat.jit(test_impl)
+            res = hpat_func(A)
+        finally:
+            hpat.config._box_date_dt64 = box_date_dt64
+        # boxed as a datetime64[D] array instead of datetime.date objects,
+        # pd.Series() stores it with ns precision
+        self.assertEqual(res.dtype.kind, 'M')
+        np.testing.assert_array_equal(res.values.astype('datetime64[D]'),
+                                      A.values.astype('datetime64[D]'))
+
     def _gen_str_date_df(self):
         rows = 10
         data = []
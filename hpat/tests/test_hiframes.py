@@ -281,6 +281,34 @@ class TestHiFrames(unittest.TestCase):
         A = np.arange(0, n, 1, np.float64)
         np.testing.assert_almost_equal(hpat_func(A), test_impl(A))
 
+    def test_quantile_approx(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) - 300.5})
+            return df.A.quantile(.95, approx=True) + df.A.quantile(.1, approx=True)
+
+        def pd_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) - 300.5})
+            return df.A.quantile(.95) + df.A.quantile(.1)
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        np.testing.assert_allclose(hpat_func(n), pd_impl(n), rtol=0.02)
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_groupby_quantile_approx(self):
+        def test_impl(df):
+            return df.groupby('A')['B'].quantile(.5, approx=True).values
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1000
+        B = np.arange(n) * 1.5 + 1.0
+        B[7] = np.nan
+        df = pd.DataFrame({'A': np.arange(n) % 3, 'B': B})
+        res = df.groupby('A')['B'].quantile(.5).values
+        np.testing.assert_allclose(np.sort(hpat_func(df)), np.sort(res),
+                                   rtol=0.02)
+
     def test_nunique(self):
         def test_impl(n):
             df = pd.DataFrame({'A': np.arange(n)})
@@ -320,6 +348,266 @@ class TestHiFrames(unittest.TestCase):
         self.assertEqual(hpat_func(), test_impl())
         self.assertEqual(count_array_REPs(), 0)
 
+    def test_nunique_float_nan(self):
+        def test_impl(n):
+            A = (np.arange(n) % 37) * 0.5
+            A[3:20] = np.nan
+            df = pd.DataFrame({'A': A})
+            return df.A.nunique()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        self.assertEqual(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_nunique_datetime(self):
+        def test_impl(df):
+            return df.A.nunique()
+
+        hpat_func = hpat.jit(test_impl)
+        A = pd.to_datetime(np.arange(20) % 7, unit='D').values
+        A[2] = np.datetime64('NaT')
+        df = pd.DataFrame({'A': A})
+        self.assertEqual(hpat_func(df), test_impl(df))
+
+    def test_nunique_bool_parallel(self):
+        # every process has a copy of the data, which doesn't change nunique
+        def test_impl(A):
+            df = pd.DataFrame({'A': A})
+            return df.A.nunique()
+
+        hpat_func = hpat.jit(locals={'A:input': 'distributed'})(test_impl)
+        A = np.arange(101) % 3 == 0
+        self.assertEqual(hpat_func(A), test_impl(A))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_nunique_small_int_parallel(self):
+        def test_impl(A):
+            df = pd.DataFrame({'A': A})
+            return df.A.nunique()
+
+        hpat_func = hpat.jit(locals={'A:input': 'distributed'})(test_impl)
+        for dtype in [np.int16, np.uint16]:
+            A = (np.arange(101) % 37).astype(dtype)
+            self.assertEqual(hpat_func(A), test_impl(A))
+            self.assertEqual(count_array_REPs(), 0)
+
+    def test_nunique_datetime_parallel(self):
+        def test_impl(A):
+            df = pd.DataFrame({'A': A})
+            return df.A.nunique()
+
+        hpat_func = hpat.jit(locals={'A:input': 'distributed'})(test_impl)
+        A = pd.to_datetime(np.arange(101) % 7, unit='D').values
+        A[2] = np.datetime64('NaT')
+        self.assertEqual(hpat_func(A), test_impl(A))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_nunique_approx(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 5000})
+            return df.A.nunique(approx=True)
+
+        hpat_func = hpat.jit(test_impl)
+        n = 20011
+        np.testing.assert_allclose(hpat_func(n), 5000, rtol=0.03)
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_groupby_nunique_approx(self):
+        def test_impl(df):
+            return df.groupby('A')['B'].nunique(approx=True).values
+
+        hpat_func = hpat.jit(test_impl)
+        n = 3000
+        B = (np.arange(n) // 3) % 500 * 1.5
+        B[7] = np.nan
+        df = pd.DataFrame({'A': np.arange(n) % 3, 'B': B})
+        res = df.groupby('A')['B'].nunique().values
+        np.testing.assert_allclose(np.sort(hpat_func(df)), np.sort(res),
+                                   rtol=0.03)
+
+    def test_unique(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 17 * 2.0})
+            U = df.A.unique()
+            return len(U), U.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        self.assertEqual(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_unique_nan_seq(self):
+        def test_impl(df):
+            return df.A.unique()
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': [2.0, np.nan, 1.0, 2.0, np.nan, 3.0]})
+        np.testing.assert_array_equal(hpat_func(df), test_impl(df))
+
+    def test_unique_str(self):
+        def test_impl(df):
+            return df.A.unique()
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': ['aa', 'bb', 'aa', 'cc', 'bb', 'dd']})
+        self.assertEqual(list(hpat_func(df)), list(test_impl(df)))
+
+    def test_value_counts(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 7 + (np.arange(n) % 3 == 0)})
+            S = df.A.value_counts()
+            return S.sum(), S.max()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        self.assertEqual(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_value_counts_seq(self):
+        def test_impl(df):
+            return df.A.value_counts().values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': [3, 1, 3, 2, 3, 1]})
+        np.testing.assert_array_equal(hpat_func(df), test_impl(df))
+
+    def test_value_counts_index(self):
+        def test_impl(df):
+            return df.A.value_counts()
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': [3, 1, 3, 2, 3, 1, 4, 4, 4, 4, np.nan]})
+        res = hpat_func(df)
+        expected = test_impl(df)
+        np.testing.assert_array_equal(res.values, expected.values)
+        self.assertEqual(dict(zip(res.index, res.values)),
+                         dict(zip(expected.index, expected.values)))
+
+    def test_value_counts_index_str(self):
+        def test_impl(df):
+            return df.A.value_counts()
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': ['aa', 'b', 'aa', 'cc', 'b', 'aa']})
+        res = hpat_func(df)
+        expected = test_impl(df)
+        self.assertEqual(list(res.index), list(expected.index))
+        np.testing.assert_array_equal(res.values, expected.values)
+
+    def test_value_counts_index_parallel(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 7 + (np.arange(n) % 3 == 0)})
+            return df.A.value_counts()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        res = hpat_func(n)
+        expected = test_impl(n)
+        self.assertEqual(dict(zip(res.index, res.values)),
+                         dict(zip(expected.index, expected.values)))
+
+    def test_value_counts_order_parallel(self):
+        def test_impl(n):
+            # value k appears 2k+1 times, counts are distinct
+            df = pd.DataFrame({'A': np.sqrt(np.arange(n)).astype(np.int64)})
+            return df.A.value_counts()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        res = hpat_func(n)
+        expected = test_impl(n)
+        np.testing.assert_array_equal(res.values, expected.values)
+        self.assertEqual(list(res.index), list(expected.index))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_drop_duplicates(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 13, 'B': np.arange(n) % 7,
+                               'C': np.arange(n) * 2.0})
+            df2 = df.drop_duplicates(subset=['A', 'B'])
+            return len(df2.C), df2.C.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        self.assertEqual(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_drop_duplicates_seq(self):
+        def test_impl(df):
+            df2 = df.drop_duplicates()
+            return df2.B.values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': [1.0, 2.0, np.nan, 1.0, np.nan, 2.0],
+                           'B': [1, 2, 3, 1, 3, 4]})
+        np.testing.assert_array_equal(hpat_func(df), test_impl(df))
+
+    def test_nlargest(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 97 * 1.5, 'B': np.arange(n)})
+            df2 = df.nlargest(10, 'A')
+            return df2.B.values
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        np.testing.assert_array_equal(hpat_func(n), test_impl(n))
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_nlargest_columns_list(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 97 * 1.5, 'B': np.arange(n)})
+            df2 = df.nlargest(10, ['A'])
+            return df2.B.values
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        np.testing.assert_array_equal(hpat_func(n), test_impl(n))
+
+    def test_nlargest_multi_columns(self):
+        def test_impl(df):
+            df2 = df.nlargest(3, ['A', 'B'])
+            return df2.B.values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': [1.0, 3.0, 2.0], 'B': [4, 5, 6]})
+        with self.assertRaises(ValueError):
+            hpat_func(df)
+
+    def test_nsmallest_seq(self):
+        def test_impl(df):
+            return df.A.nsmallest(3).values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': [2.0, np.nan, 1.0, 4.0, 1.0, -3.0]})
+        np.testing.assert_array_equal(hpat_func(df), test_impl(df))
+
+    def test_groupby_nlargest(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 5, 'B': np.arange(n) % 11})
+            S = df.groupby('A').B.nlargest(3)
+            return len(S), S.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        self.assertEqual(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_groupby_nlargest_index(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 5, 'B': np.arange(n) % 11})
+            return df.groupby('A').B.nlargest(2)
+
+        hpat_func = hpat.jit(test_impl)
+        n = 1001
+        res = hpat_func(n)
+        expected = test_impl(n)
+        # group keys are the first level of pandas' index
+        self.assertEqual(sorted(zip(res.index, res.values)),
+                         sorted(zip(expected.index.get_level_values(0),
+                                    expected.values)))
+
     def test_describe(self):
         def test_impl(n):
             df = pd.DataFrame({'A': np.arange(0, n, 1, np.float64)})
@@ -327,9 +615,11 @@ class TestHiFrames(unittest.TestCase):
 
         hpat_func = hpat.jit(test_impl)
         n = 1001
-        hpat_func(n)
-        # XXX: test actual output
-        self.assertEqual(count_array_REPs(), 0)
+        res = hpat_func(n)
+        np.testing.assert_almost_equal(res.values, test_impl(n).values)
+        self.assertEqual(list(res.index), list(test_impl(n).index))
+        # output of describe is a small replicated array
+        self.assertEqual(count_array_REPs(), 1)
         self.assertEqual(count_parfor_REPs(), 0)
 
     def test_df_describe(self):
@@ -341,11 +631,23 @@ class TestHiFrames(unittest.TestCase):
 
         hpat_func = hpat.jit(test_impl)
         n = 1001
-        hpat_func(n)
-        # XXX: test actual output
-        self.assertEqual(count_array_REPs(), 0)
+        res = hpat_func(n)
+        np.testing.assert_almost_equal(res.values, test_impl(n).values,
+                                       decimal=4)
+        self.assertEqual(list(res.index), list(test_impl(n).index))
+        self.assertEqual(count_array_REPs(), 2)
         self.assertEqual(count_parfor_REPs(), 0)
 
+    def test_describe_nan(self):
+        def test_impl(df):
+            return df.A.describe()
+
+        hpat_func = hpat.jit(test_impl)
+        A = np.arange(40.0) % 7
+        A[[3, 20, 21]] = np.nan
+        df = pd.DataFrame({'A': A})
+        np.testing.assert_almost_equal(hpat_func(df), test_impl(df).values)
+
     def test_str_contains_regex(self):
         def test_impl():
             A = StringArray(['ABC', 'BB', 'ADEF'])
@@ -366,6 +668,74 @@ class TestHiFrames(unittest.TestCase):
         hpat_func = hpat.jit(test_impl)
         self.assertEqual(hpat_func(), 1)
 
+    def test_str_contains_alternation(self):
+        def test_impl():
+            A = StringArray(['ABC', 'BB', 'ADEF', 'XBBY', 'CD'])
+            df = pd.DataFrame({'A': A})
+            B = df.A.str.contains('BB|DE')
+            C = df.A.str.contains('^(AB|CD)$')
+            D = df.A.str.contains('A.C')
+            return B.sum(), C.sum(), D.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(), (3, 1, 1))
+
+    def test_str_startswith_endswith(self):
+        def test_impl():
+            A = StringArray(['ABC', 'BB', 'ADEF', 'XBBY', ''])
+            df = pd.DataFrame({'A': A})
+            B = df.A.str.startswith('A')
+            C = df.A.str.endswith('BY')
+            return B.sum(), C.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(), (2, 1))
+
+    def test_str_match(self):
+        def test_impl():
+            A = StringArray(['ABC', 'BB', 'ADEF', 'XABY'])
+            df = pd.DataFrame({'A': A})
+            B = df.A.str.match('AB')
+            C = df.A.str.match('A[BD]+')
+            return B.sum(), C.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(), (1, 2))
+
+    def test_str_methods(self):
+        def test_impl(df):
+            B = df.A.str.strip().str.lower()
+            C = df.A.str.slice(1, -1).str.upper()
+            D = df.A.str.replace('b', 'XY', regex=False)
+            return B.values, C.values, D.values, df.A.str.len().values
+
+        df = pd.DataFrame({'A': [' aBc ', 'b', '', 'CCb\t', 'ab b']})
+        hpat_func = hpat.jit(test_impl)
+        B, C, D, L = hpat_func(df)
+        self.assertEqual(list(B), list(df.A.str.strip().str.lower()))
+        self.assertEqual(list(C), list(df.A.str.slice(1, -1).str.upper()))
+        self.assertEqual(list(D), list(df.A.str.replace('b', 'XY', regex=False)))
+        np.testing.assert_array_equal(L, df.A.str.len().values)
+
+    def test_str_split_get(self):
+        def test_impl(df):
+            B = df.A.str.split(',').str.get(1)
+            return B.values
+
+        df = pd.DataFrame({'A': ['AB,CC', 'C,ABB,D', 'G', '', 'CC,']})
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(list(hpat_func(df)),
+                         ['CC', 'ABB', '', '', ''])
+
+    def test_str_compare_const(self):
+        def test_impl():
+            A = StringArray(['ABC', 'BB', 'ADEF', 'B'])
+            df = pd.DataFrame({'A': A})
+            return (df.A == 'BB').sum() + (df.A > 'AD').sum()
+
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(), 4)
+
     def test_filter1(self):
         def test_impl(n):
             df = pd.DataFrame({'A': np.ones(n), 'B': np.ones(n)})
@@ -435,8 +805,7 @@ class TestHiFrames(unittest.TestCase):
         hpat_func = hpat.jit(test_impl)
         n = 121
         self.assertEqual(hpat_func(n), test_impl(n))
-        # small input array to mean is REP
-        self.assertEqual(count_array_REPs(), 1)
+        self.assertEqual(count_array_REPs(), 0)
         self.assertEqual(count_parfor_REPs(), 0)
 
     def test_rolling3(self):
@@ -451,6 +820,98 @@ class TestHiFrames(unittest.TestCase):
         self.assertEqual(count_array_REPs(), 0)
         self.assertEqual(count_parfor_REPs(), 0)
 
+    def test_rolling_large_win(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 17 + 0.5, 'B': np.random.ranf(n)})
+            V = df.A.rolling(30).var()
+            S = df.A.rolling(31, center=True).std()
+            M1 = df.A.rolling(30).min()
+            M2 = df.A.rolling(30).max()
+            return V.sum() + S.sum() + M1.sum() + M2.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 121
+        np.testing.assert_almost_equal(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_rolling_nan(self):
+        def test_impl(df):
+            Ac = df.A.rolling(12).mean()
+            return Ac.values
+
+        hpat_func = hpat.jit(test_impl)
+        A = np.arange(40.0) % 7
+        A[[3, 20, 21]] = np.nan
+        df = pd.DataFrame({'A': A})
+        np.testing.assert_almost_equal(hpat_func(df), test_impl(df))
+
+    def test_rolling_offset(self):
+        def test_impl(df):
+            R1 = df.rolling('2s', on='time').B.sum()
+            R2 = df.rolling('3s', on='time')['B'].max()
+            return R1.values + R2.values
+
+        hpat_func = hpat.jit(test_impl)
+        n = 40
+        secs = np.cumsum(np.random.randint(0, 3, n))
+        B = np.arange(n) % 7 + 0.5
+        B[5] = np.nan
+        df = pd.DataFrame({'B': B, 'time': pd.to_datetime(secs, unit='s')})
+        np.testing.assert_almost_equal(hpat_func(df), test_impl(df))
+
+    def test_rolling_win_gt_chunk(self):
+        # window spans multiple processes
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 5 + 0.5})
+            S = df.A.rolling(15).sum()
+            M = df.A.rolling(15, center=True).max()
+            return S.sum() + M.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 20
+        np.testing.assert_almost_equal(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_rolling_filter_small_chunks(self):
+        # 1D_Var chunks after filter are smaller than window
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 11 + 0.5})
+            df2 = df[df.A > 8.0]
+            return df2.A.rolling(6).mean().sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 121
+        np.testing.assert_almost_equal(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_ewm(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) % 13 + 0.5})
+            M = df.A.ewm(span=10).mean()
+            V = df.A.ewm(com=2.5, min_periods=3).var()
+            S = df.A.ewm(alpha=0.3).std()
+            return M.sum() + V.sum() + S.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 121
+        np.testing.assert_almost_equal(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_expanding(self):
+        def test_impl(df):
+            M = df.A.expanding().mean()
+            S = df.A.expanding(min_periods=3).std()
+            return M.values + S.values
+
+        hpat_func = hpat.jit(test_impl)
+        A = np.arange(40.0) % 7
+        A[[3, 20, 21]] = np.nan
+        df = pd.DataFrame({'A': A})
+        np.testing.assert_almost_equal(hpat_func(df), test_impl(df))
+
     def test_shift1(self):
         def test_impl(n):
             df = pd.DataFrame({'A': np.ones(n), 'B': np.random.ranf(n)})
@@ -475,6 +936,107 @@ class TestHiFrames(unittest.TestCase):
         self.assertEqual(count_array_REPs(), 0)
         self.assertEqual(count_parfor_REPs(), 0)
 
+    def test_shift_gt_chunk(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) + 1.0})
+            S = df.A.shift(13)
+            P = df.A.pct_change(9)
+            return S.sum() + P.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 20
+        np.testing.assert_almost_equal(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_shift_runtime(self):
+        def test_impl(n, k):
+            df = pd.DataFrame({'A': np.arange(n) + 1.0})
+            S = df.A.shift(k)
+            P = df.A.pct_change(periods=k)
+            return S.sum() + P.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 111
+        for k in [1, 7, -3]:
+            np.testing.assert_almost_equal(hpat_func(n, k), test_impl(n, k))
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_shift_datetime(self):
+        def test_impl(df):
+            return df.A.shift(2).values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': pd.date_range('2017-01-03', periods=11)})
+        np.testing.assert_array_equal(hpat_func(df), test_impl(df))
+
+    def test_shift_str_unsupported(self):
+        def test_impl(df):
+            return df.A.shift(1)
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': ['aa', 'b', 'cc']})
+        with self.assertRaises(Exception):
+            hpat_func(df)
+
+    def test_groupby_shift(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.arange(n) // 23, 'B': np.arange(n) % 7 + 0.5})
+            S = df.groupby('A').B.shift(2)
+            D = df.groupby('A')['B'].diff()
+            return S.sum() + D.sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 121
+        np.testing.assert_almost_equal(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_groupby_shift_seq(self):
+        def test_impl(df):
+            return df.groupby('A').B.shift(1).values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': [2, 1, 1, 3, 2, 1, 3, 2],
+                           'B': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]})
+        np.testing.assert_almost_equal(hpat_func(df), test_impl(df))
+
+    def test_groupby_shift_unsorted(self):
+        # every group spans all processes
+        def test_impl(n):
+            df = pd.DataFrame({'A': (np.arange(n) * 7) % 5, 'B': np.arange(n) + 0.5})
+            S = df.groupby('A').B.shift(2)
+            D = df.groupby('A')['B'].diff(-1)
+            return (S * df.B).sum() + (D * df.B).sum()
+
+        hpat_func = hpat.jit(test_impl)
+        n = 121
+        np.testing.assert_almost_equal(hpat_func(n), test_impl(n))
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_groupby_shift_str_seq(self):
+        def test_impl(df):
+            return df.groupby('A').B.shift(1).values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': ['bb', 'a', 'a', 'ccc', 'bb', 'a', 'ccc', 'bb'],
+                           'B': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]})
+        np.testing.assert_almost_equal(hpat_func(df), test_impl(df))
+
+    def test_groupby_shift_str_parallel(self):
+        def test_impl():
+            df = pq.read_table("groupby3.pq").to_pandas()
+            S = df.groupby('A').B.shift(1)
+            D = df.groupby('A')['B'].diff()
+            return (S * df.B).sum() + (D * df.B).sum()
+
+        hpat_func = hpat.jit(test_impl)
+        np.testing.assert_almost_equal(hpat_func(), test_impl())
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
     def test_df_input(self):
         def test_impl(df):
             return df.B.sum()
@@ -494,6 +1056,17 @@ class TestHiFrames(unittest.TestCase):
         hpat_func = hpat.jit(test_impl)
         np.testing.assert_almost_equal(hpat_func(df), test_impl(df))
 
+    def test_df_input_str_cols(self):
+        def test_impl(df):
+            return (df.B == 'two').sum() + (df.C == 'a').sum()
+
+        n = 11
+        df = pd.DataFrame({'A': np.random.ranf(3*n),
+                           'B': ['one', 'two', 'thr\u00e9e']*n,
+                           'C': pd.Categorical(['a', 'bb', 'a']*n)})
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(df), test_impl(df))
+
     def test_join1(self):
         def test_impl(n):
             df1 = pd.DataFrame({'key1': np.arange(n)+3, 'A': np.arange(n)+1.0})
@@ -673,6 +1246,29 @@ class TestHiFrames(unittest.TestCase):
         self.assertEqual(count_array_REPs(), 0)
         self.assertEqual(count_parfor_REPs(), 0)
 
+    def test_agg_parallel_instrument(self):
+        def test_impl(n):
+            df = pd.DataFrame({'A': np.ones(n, np.int64), 'B': np.arange(n)})
+            A = df.groupby('A')['B'].sum()
+            return A.sum()
+
+        hpat.instrument_mode = True
+        try:
+            hpat.distributed_api.reset_op_stats()
+            hpat_func = hpat.jit(test_impl)
+            n = 11
+            self.assertEqual(hpat_func(n), test_impl(n))
+        finally:
+            hpat.instrument_mode = False
+        stats = hpat.distributed_api.get_op_stats()
+        agg_ops = [k for k in stats if k.startswith('Aggregate')]
+        self.assertEqual(len(agg_ops), 1)
+        self.assertEqual(stats[agg_ops[0]]['count'], 1)
+        self.assertIn('alltoallv', stats)
+        self.assertGreaterEqual(stats['alltoallv']['bytes_max'], 0)
+        hpat.distributed_api.reset_op_stats()
+        hpat.distributed_api.disable_op_stats()
+
     def test_agg_parallel_sum(self):
         def test_impl(n):
             df = pd.DataFrame({'A': np.ones(n, np.int64), 'B': np.arange(n)})
@@ -744,6 +1340,86 @@ class TestHiFrames(unittest.TestCase):
         self.assertEqual(count_array_REPs(), 0)
         self.assertEqual(count_parfor_REPs(), 0)
 
+    def test_dict_enc_pq_filter(self):
+        def test_impl():
+            df = pq.read_table("groupby3.pq").to_pandas()
+            df2 = df[(df.A == 'bc') | (df.B > 6)]
+            return df2.B.sum()
+
+        hpat_func = hpat.jit(locals={'df:convert': {'A': hpat.dict_str_arr_type}})(test_impl)
+        self.assertEqual(hpat_func(), test_impl())
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
+    def test_dict_enc_pq_box(self):
+        def test_impl():
+            df = pq.read_table("groupby3.pq").to_pandas()
+            return df[df.A >= 'b']
+
+        hpat_func = hpat.jit(locals={'df:convert': {'A': hpat.dict_str_arr_type}})(test_impl)
+        res = hpat_func()
+        self.assertEqual(list(res.A), list(test_impl().A))
+        self.assertEqual(list(res.B), list(test_impl().B))
+
+    def test_dict_enc_sort(self):
+        def test_impl(df):
+            df2 = pd.DataFrame({'A': df.A.astype('category'), 'B': df.B})
+            df2.sort_values('A', inplace=True)
+            return df2
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': ['bb', 'a', 'a', 'ccc', 'bb', 'a', 'ccc', 'bb'],
+                           'B': [1, 2, 3, 4, 5, 6, 7, 8]})
+        self.assertEqual(list(hpat_func(df).A), list(test_impl(df).A))
+
+    def test_dict_enc_join(self):
+        def test_impl(df1, df2):
+            df3 = pd.DataFrame({'key1': df1.key1.astype('category'), 'A': df1.A})
+            df4 = pd.DataFrame({'key2': df2.key2.astype('category'), 'B': df2.B})
+            return pd.merge(df3, df4, left_on='key1', right_on='key2')
+
+        hpat_func = hpat.jit(test_impl)
+        df1 = pd.DataFrame({'key1': ['foo', 'bar', 'baz', 'qux'], 'A': [1, 2, 3, 4]})
+        df2 = pd.DataFrame({'key2': ['baz', 'bar', 'baz', 'foo', 'quux'],
+                            'B': [10, 20, 30, 40, 50]})
+        res = hpat_func(df1, df2)
+        expected = test_impl(df1, df2)
+        self.assertEqual(
+            sorted(zip(res.key1, res.key2, res.A, res.B)),
+            sorted(zip(expected.key1, expected.key2, expected.A, expected.B)))
+
+    def test_dict_enc_join_parallel(self):
+        def test_impl():
+            df1 = pq.read_table("groupby3.pq").to_pandas()
+            df2 = pd.DataFrame({'key2': df1.A, 'C': df1.B + 1})
+            df3 = pd.merge(df1, df2, left_on='A', right_on='key2')
+            return (df3.B * df3.C).sum()
+
+        hpat_func = hpat.jit(locals={'df1:convert': {'A': hpat.dict_str_arr_type}})(test_impl)
+        self.assertEqual(hpat_func(), test_impl())
+        self.assertEqual(count_array_REPs(), 0)
+
+    def test_dict_enc_groupby(self):
+        def test_impl(df):
+            df2 = pd.DataFrame({'A': df.A.astype('category'), 'B': df.B})
+            return df2.groupby('A')['B'].sum().values
+
+        hpat_func = hpat.jit(test_impl)
+        df = pd.DataFrame({'A': ['bb', 'a', 'a', 'ccc', 'bb', 'a', 'ccc', 'bb'],
+                           'B': [1, 2, 3, 4, 5, 6, 7, 8]})
+        self.assertEqual(set(hpat_func(df)), set(test_impl(df)))
+
+    def test_dict_enc_groupby_parallel(self):
+        def test_impl():
+            df = pq.read_table("groupby3.pq").to_pandas()
+            A = df.groupby('A')['B'].agg(lambda x: x.max()-x.min())
+            return A.sum()
+
+        hpat_func = hpat.jit(locals={'df:convert': {'A': hpat.dict_str_arr_type}})(test_impl)
+        self.assertEqual(hpat_func(), test_impl())
+        self.assertEqual(count_array_REPs(), 0)
+        self.assertEqual(count_parfor_REPs(), 0)
+
     def test_agg_parallel_all_col(self):
         def test_impl(n):
             df = pd.DataFrame({'A': np.ones(n, np.int64), 'B': np.arange(n)})
@@ -894,6 +1570,23 @@ class TestHiFrames(unittest.TestCase):
         hpat_func = hpat.jit(test_impl)
         self.assertTrue((hpat_func(df) == sorted_df.B.values).all())
 
+    def test_sort_values_str_dict(self):
+        # few distinct keys, sorted using dictionary codes
+        def test_impl(df):
+            df.sort_values('A', inplace=True)
+            return df.A.values, df.B.values
+
+        n = 1211
+        random.seed(2)
+        keys = ['CC', 'A', 'BBB', '', 'AB']
+        df = pd.DataFrame({'A': [random.choice(keys) for _ in range(n)],
+                           'B': np.arange(n)})
+        sorted_df = df.sort_values('A', inplace=False, kind='mergesort')
+        hpat_func = hpat.jit(test_impl)
+        A, B = hpat_func(df)
+        self.assertEqual(list(A), list(sorted_df.A.values))
+        np.testing.assert_array_equal(B, sorted_df.B.values)
+
     def test_sort_parallel_single_col(self):
         # TODO: better parallel sort test
         def test_impl():
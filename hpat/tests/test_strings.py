@@ -3,7 +3,18 @@ import hpat
 import numpy as np
 import pandas as pd
 import gc
-from hpat.str_arr_ext import StringArray
+from hpat.str_arr_ext import StringArray, get_str_view
+from hpat.str_ext import (str_view_to_str, contains_regex, contains_noregex,
+                          compile_regex)
+
+
+def _fnv1a(s):
+    # 64-bit FNV-1a of characters as a signed value, same as hash_chars()
+    h = 14695981039346656037
+    for c in s.encode():
+        h = ((h ^ c) * 1099511628211) % 2**64
+    return h - 2**64 if h >= 2**63 else h
+
 
 class TestString(unittest.TestCase):
     def test_pass_return(self):
@@ -123,5 +134,100 @@ class TestString(unittest.TestCase):
         hpat_func = hpat.jit(test_impl)
         self.assertEqual(hpat_func(), True)
 
+    def test_string_array_set(self):
+        def test_impl(ds):
+            return len(set(ds)), hpat.utils.to_array(set(ds))
+        hpat_func = hpat.jit(test_impl)
+        # enough distinct values to grow the hash table
+        ds = pd.Series(['s{}'.format(i % 100) for i in range(1000)] + [''])
+        n, A = hpat_func(ds)
+        self.assertEqual(n, 101)
+        self.assertEqual(list(A), list(ds.unique()))
+
+    def test_string_view_hash(self):
+        def test_impl():
+            A = StringArray(['ABC', 'BB', '', 'ADEF'])
+            n_eq = 0
+            for i in range(len(A)):
+                if hash(get_str_view(A, i)) == hash(A[i]):
+                    n_eq += 1
+            s = 'BB'
+            return n_eq, hash(get_str_view(A, 1)), hash(s)
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(), (4, _fnv1a('BB'), _fnv1a('BB')))
+
+    def test_string_view_set_lookup(self):
+        def test_impl(ds):
+            # set is built from views of elements and looked up by strings
+            S = set(ds)
+            return 'BB' in S, '' in S, 'B' in S, 'BBB' in S
+        hpat_func = hpat.jit(test_impl)
+        ds = pd.Series(['ABC', 'BB', '', 'ABC'])
+        self.assertEqual(hpat_func(ds), (True, True, False, False))
+
+    def test_string_view_dict_lookup(self):
+        def test_impl():
+            A = StringArray(['ABC', 'BB', '', 'ADEF'])
+            D = hpat.dict_ext.init_dict_StringType_int64()
+            for i in range(len(A)):
+                D[str_view_to_str(get_str_view(A, i))] = i
+            s = 'BB'
+            return D[s], D[A[3]], D[str_view_to_str(get_str_view(A, 2))]
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(), (1, 3, 2))
+
+    def test_string_view_startswith_endswith(self):
+        def test_impl():
+            A = StringArray(['ABC', 'BB', '', 'ADEF', 'A'])
+            n_start = 0
+            n_end = 0
+            n_long = 0
+            for i in range(len(A)):
+                v = get_str_view(A, i)
+                if v.startswith('A'):
+                    n_start += 1
+                if v.endswith('B'):
+                    n_end += 1
+                # pattern longer than the element
+                if v.startswith('ABCD') or v.endswith('XABC'):
+                    n_long += 1
+            return n_start, n_end, n_long
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(), (3, 1, 0))
+
+    def test_string_view_contains(self):
+        def test_impl():
+            A = StringArray(['ABC', 'BB', '', 'ADEF', 'AXC'])
+            e = compile_regex('A.C')
+            n_lit = 0
+            n_regex = 0
+            for i in range(len(A)):
+                v = get_str_view(A, i)
+                if contains_noregex(v, 'B'):
+                    n_lit += 1
+                if contains_regex(v, e):
+                    n_regex += 1
+            return n_lit, n_regex
+        hpat_func = hpat.jit(test_impl)
+        self.assertEqual(hpat_func(), (2, 2))
+
+    @unittest.skipUnless(hpat.config._has_pyarrow
+                         and hpat.str_arr_ext.arrow_str_arr_supported(),
+                         "pyarrow or pandas Arrow string arrays not available")
+    def test_string_series_box_arrow(self):
+        def test_impl(ds):
+            return ds
+        box_str_arrow = hpat.config._box_str_arrow
+        hpat.config._box_str_arrow = True
+        try:
+            hpat_func = hpat.jit(test_impl)
+            ds = pd.Series(['one', '', 'three', 'f\u00f6ur'] * 25)
+            res = hpat_func(ds)
+            gc.collect()
+        finally:
+            hpat.config._box_str_arrow = box_str_arrow
+        self.assertFalse(res.dtype == np.object_)
+        self.assertEqual(list(res), list(ds))
+
 if __name__ == "__main__":
     unittest.main()
@@ -9,7 +9,9 @@ from numba.extending import overload, intrinsic
 import collections
 import numpy as np
 from hpat.str_ext import string_type
-from hpat.str_arr_ext import string_array_type, num_total_chars, pre_alloc_string_array
+from hpat.str_arr_ext import (string_array_type, dict_str_arr_type,
+                              num_total_chars, pre_alloc_string_array)
+from hpat import compile_profiler
 
 # silence Numba error messages for now
 # TODO: customize through @hpat.jit
@@ -24,6 +26,12 @@ NOT_CONSTANT = NotConstant()
 
 np_alloc_callnames = ('empty', 'zeros', 'ones', 'full')
 
+def compile_to_numba_ir(*args, **kwargs):
+    """ir_utils.compile_to_numba_ir() timed by the compile profiler
+    """
+    with compile_profiler.nested('compile_to_numba_ir'):
+        return ir_utils.compile_to_numba_ir(*args, **kwargs)
+
 def get_constant(func_ir, var, default=NOT_CONSTANT):
     def_node = guard(get_definition, func_ir, var)
     if def_node is None:
@@ -162,6 +170,25 @@ def distribution_report():
         print("   {0:<20} {1}".format(p, print_dist(dist)))
 
 
+def op_stats_report():
+    """print runtime stats of operators and collectives collected in
+    hpat.instrument_mode (has to be called on all processes)
+    """
+    import hpat.distributed_api
+    import hpat.caching
+    stats = hpat.distributed_api.get_op_stats()
+    # enabled again when an instrumented function starts
+    hpat.distributed_api.disable_op_stats()
+    if hpat.caching._get_rank() != hpat.distributed_api.MPI_ROOT:
+        return
+    print("{:40} {:>7} {:>28} {:>40}".format(
+        "operator", "count", "time(s) min/avg/max", "bytes min/avg/max"))
+    for name, s in stats.items():
+        print("{:40} {:7} {:9.4f}/{:9.4f}/{:9.4f} {:>12}/{:>12}/{:>12}".format(
+            name, s['count'], s['time_min'], s['time_avg'], s['time_max'],
+            s['bytes_min'], int(s['bytes_avg']), s['bytes_max']))
+
+
 def is_whole_slice(typemap, func_ir, var, accept_stride=False):
     """ return True if var can be determined to be a whole slice """
     require(typemap[var.name] == types.slice2_type
@@ -187,7 +214,8 @@ def get_slice_step(typemap, func_ir, var):
 def is_array(typemap, varname):
     return (varname in typemap
             and (is_np_array(typemap, varname)
-                or typemap[varname] == string_array_type))
+                or typemap[varname] == string_array_type
+                or typemap[varname] == dict_str_arr_type))
 
 def is_np_array(typemap, varname):
     return (varname in typemap
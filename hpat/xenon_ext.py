@@ -4,7 +4,7 @@ from numba.ir_utils import (mk_unique_var, replace_vars_inner, find_topo_order,
                             dprint_func_ir, remove_dead, mk_alloc, remove_dels,
                             get_name_var_table, replace_var_names,
                             add_offset_to_labels, get_ir_of_code,
-                            compile_to_numba_ir, replace_arg_nodes,
+                            replace_arg_nodes,
                             find_callname, guard, require, get_definition,
                             build_definitions, replace_vars_stmt, replace_vars_inner)
 
@@ -20,6 +20,7 @@ from numba.targets.arrayobj import make_array
 import numpy as np
 import hpat
 from hpat.utils import get_constant, NOT_CONSTANT
+from hpat.utils import compile_to_numba_ir
 from hpat.str_ext import string_type
 from hpat.str_arr_ext import StringArray, StringArrayPayloadType, construct_string_array
 from hpat.str_arr_ext import string_array_type
@@ -41,10 +42,7 @@ numba.ir_utils.remove_call_handlers.append(remove_xenon)
 def read_xenon():
     return
 
-def _handle_read(assign, lhs, rhs, func_ir):
-    if not hpat.config._has_xenon:
-        raise ValueError("Xenon support not available")
-
+def register_xenon_symbols():
     # TODO: init only once
     import hxe_ext
     ll.add_symbol('get_column_size_xenon', hxe_ext.get_column_size_xenon)
@@ -56,6 +54,12 @@ def _handle_read(assign, lhs, rhs, func_ir):
     ll.add_symbol('c_xe_open', hxe_ext.c_xe_open)
     ll.add_symbol('c_xe_close', hxe_ext.c_xe_close)
 
+def _handle_read(assign, lhs, rhs, func_ir):
+    if not hpat.config._has_xenon:
+        raise ValueError("Xenon support not available")
+
+    register_xenon_symbols()
+
     if len(rhs.args) not in [1, 3]:
         raise ValueError("read_xenon expects one or three argument but received {}".format(len(rhs.args)))
 
@@ -331,8 +335,8 @@ def read_xenon_str(typingctx, connect_tp, dset_tp, col_id_tp, size_tp, schema_ar
         string_array.meminfo = meminfo
         string_array.offsets = str_arr_payload.offsets
         string_array.data = str_arr_payload.data
-        string_array.num_total_chars = builder.zext(builder.load(
-            builder.gep(string_array.offsets, [string_array.num_items])), lir.IntType(64))
+        string_array.num_total_chars = builder.load(
+            builder.gep(string_array.offsets, [string_array.num_items]))
         ret = string_array._getvalue()
         return impl_ret_new_ref(context, builder, typ, ret)
     return signature(string_array_type, connect_tp, dset_tp, col_id_tp, size_tp, schema_arr_tp), codegen
@@ -369,8 +373,8 @@ def read_xenon_str_parallel(typingctx, connect_tp, dset_tp, col_id_tp, schema_ar
         string_array.meminfo = meminfo
         string_array.offsets = str_arr_payload.offsets
         string_array.data = str_arr_payload.data
-        string_array.num_total_chars = builder.zext(builder.load(
-            builder.gep(string_array.offsets, [string_array.num_items])), lir.IntType(64))
+        string_array.num_total_chars = builder.load(
+            builder.gep(string_array.offsets, [string_array.num_items]))
         ret = string_array._getvalue()
         return impl_ret_new_ref(context, builder, typ, ret)
     return signature(string_array_type, connect_tp, dset_tp, col_id_tp, schema_arr_tp, start_tp, count_tp), codegen
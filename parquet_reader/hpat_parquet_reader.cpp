@@ -2,6 +2,7 @@
 #include <iostream>
 #include <cstring>
 #include <cmath>
+#include <algorithm>
 
 #if _MSC_VER >= 1900
   #undef timezone
@@ -25,11 +26,14 @@ int pq_read_parallel_single_file(std::shared_ptr<FileReader> arrow_reader, int64
                 uint8_t* out_data, int out_dtype, int64_t start, int64_t count);
 
 int64_t pq_read_string_single_file(std::shared_ptr<FileReader> arrow_reader, int64_t column_idx,
-                                uint32_t **out_offsets, uint8_t **out_data,
-    std::vector<uint32_t> *offset_vec=NULL, std::vector<uint8_t> *data_vec=NULL);
+                                uint64_t **out_offsets, uint8_t **out_data,
+    std::vector<uint64_t> *offset_vec=NULL, std::vector<uint8_t> *data_vec=NULL);
 int pq_read_string_parallel_single_file(std::shared_ptr<FileReader> arrow_reader, int64_t column_idx,
-        uint32_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count,
-        std::vector<uint32_t> *offset_vec=NULL, std::vector<uint8_t> *data_vec=NULL);
+        uint64_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count,
+        std::vector<uint64_t> *offset_vec=NULL, std::vector<uint8_t> *data_vec=NULL);
+int64_t pq_read_string_dict_single_file(std::shared_ptr<FileReader> arrow_reader,
+        int64_t column_idx, int32_t *out_codes, int64_t start, int64_t count,
+        std::vector<uint64_t> *dict_offsets, std::vector<uint8_t> *dict_data);
 
 }  // extern "C"
 
@@ -283,8 +287,8 @@ inline void copy_data(uint8_t* out_data, const uint8_t* buff,
 }
 
 int64_t pq_read_string_single_file(std::shared_ptr<FileReader> arrow_reader, int64_t column_idx,
-                                    uint32_t **out_offsets, uint8_t **out_data,
-    std::vector<uint32_t> *offset_vec, std::vector<uint8_t> *data_vec)
+                                    uint64_t **out_offsets, uint8_t **out_data,
+    std::vector<uint64_t> *offset_vec, std::vector<uint8_t> *data_vec)
 {
     // std::cout << "string read file" << *file_name << '\n';
     //
@@ -318,10 +322,12 @@ int64_t pq_read_string_single_file(std::shared_ptr<FileReader> arrow_reader, int
         if (data_vec!=NULL)
             std::cerr << "parquet read string input error" << '\n';
 
-        *out_offsets = new uint32_t[offsets_size/sizeof(uint32_t)];
+        // Arrow offsets are 32-bit, widen to 64-bit string array offsets
+        *out_offsets = new uint64_t[offsets_size/sizeof(uint32_t)];
         *out_data = new uint8_t[data_size];
 
-        memcpy(*out_offsets, offsets_buff, offsets_size);
+        std::copy(offsets_buff, offsets_buff+offsets_size/sizeof(uint32_t),
+                                                            *out_offsets);
         memcpy(*out_data, data_buff, data_size);
     }
     else
@@ -334,8 +340,8 @@ int64_t pq_read_string_single_file(std::shared_ptr<FileReader> arrow_reader, int
 }
 
 int pq_read_string_parallel_single_file(std::shared_ptr<FileReader> arrow_reader, int64_t column_idx,
-        uint32_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count,
-    std::vector<uint32_t> *offset_vec, std::vector<uint8_t> *data_vec)
+        uint64_t **out_offsets, uint8_t **out_data, int64_t start, int64_t count,
+    std::vector<uint64_t> *offset_vec, std::vector<uint8_t> *data_vec)
 {
     if (count==0) {
         if (offset_vec==NULL)
@@ -353,7 +359,7 @@ int pq_read_string_parallel_single_file(std::shared_ptr<FileReader> arrow_reader
 
     if (offset_vec==NULL)
     {
-        *out_offsets = new uint32_t[count+1];
+        *out_offsets = new uint64_t[count+1];
         data_vec = new std::vector<uint8_t>();
     }
 
@@ -379,7 +385,7 @@ int pq_read_string_parallel_single_file(std::shared_ptr<FileReader> arrow_reader
 
     // printf("first row group: %d skipped_rows: %lld nrows_in_group: %lld\n", row_group_index, skipped_rows, nrows_in_group);
 
-    uint32_t curr_offset = 0;
+    uint64_t curr_offset = 0;
 
     /* ------- read offsets and data ------ */
     while (read_rows<count)
@@ -419,7 +425,7 @@ int pq_read_string_parallel_single_file(std::shared_ptr<FileReader> arrow_reader
             curr_offset += str_size;
         }
 
-        int data_size = offsets_buff[rows_to_skip+rows_to_read]
+        int64_t data_size = offsets_buff[rows_to_skip+rows_to_read]
                                     - offsets_buff[rows_to_skip];
 
         data_vec->insert(data_vec->end(),
@@ -461,6 +467,148 @@ int pq_read_string_parallel_single_file(std::shared_ptr<FileReader> arrow_reader
     return 0;
 }
 
+// open addressing table of the distinct strings of a column, appended to
+// dictionary offsets/data buffers
+class str_dict_table
+{
+public:
+    str_dict_table(std::vector<uint64_t> *offsets, std::vector<uint8_t> *data)
+        : offsets(offsets), data(data), code_start(offsets->size()-1),
+          slots(16, -1) {}
+
+    int32_t get_code(const uint8_t *ptr, uint32_t len)
+    {
+        uint64_t h = hash_str(ptr, len);
+        size_t mask = slots.size()-1;
+        size_t s = h & mask;
+        int32_t c = slots[s];
+        while (c!=-1 && !equals(c, h, ptr, len)) {
+            s = (s+1) & mask;
+            c = slots[s];
+        }
+        if (c!=-1)
+            return code_start + c;
+        c = (int32_t)hashes.size();
+        slots[s] = c;
+        hashes.push_back(h);
+        data->insert(data->end(), ptr, ptr+len);
+        offsets->push_back(data->size());
+        if (2*hashes.size() > slots.size())
+            grow();
+        return code_start + c;
+    }
+
+private:
+    std::vector<uint64_t> *offsets;
+    std::vector<uint8_t> *data;
+    int32_t code_start;  // code of first value added by this table
+    std::vector<int32_t> slots;
+    std::vector<uint64_t> hashes;
+
+    static uint64_t hash_str(const uint8_t *ptr, uint32_t len)
+    {
+        // FNV-1a
+        uint64_t h = 14695981039346656037ULL;
+        for (uint32_t i=0; i<len; i++)
+            h = (h ^ ptr[i]) * 1099511628211ULL;
+        return h;
+    }
+
+    bool equals(int32_t c, uint64_t h, const uint8_t *ptr, uint32_t len)
+    {
+        uint64_t start = (*offsets)[code_start+c];
+        return hashes[c]==h && (*offsets)[code_start+c+1]-start==len
+            && memcmp(data->data()+start, ptr, len)==0;
+    }
+
+    void grow()
+    {
+        std::vector<int32_t> new_slots(2*slots.size(), -1);
+        size_t mask = new_slots.size()-1;
+        for (size_t c=0; c<hashes.size(); c++) {
+            size_t s = hashes[c] & mask;
+            while (new_slots[s]!=-1)
+                s = (s+1) & mask;
+            new_slots[s] = (int32_t)c;
+        }
+        slots.swap(new_slots);
+    }
+};
+
+// Reads rows [start, start+count) of a string column as int32 codes, new
+// distinct values are appended to the dictionary buffers. Values are decoded
+// by the column reader from the pages directly (values of dictionary pages
+// point to the dictionary), a string array of all rows is never created.
+// Null values are empty strings like pq_read_string.
+int64_t pq_read_string_dict_single_file(std::shared_ptr<FileReader> arrow_reader,
+        int64_t column_idx, int32_t *out_codes, int64_t start, int64_t count,
+        std::vector<uint64_t> *dict_offsets, std::vector<uint8_t> *dict_data)
+{
+    if (count==0)
+        return 0;
+
+    auto pq_reader = arrow_reader->parquet_reader();
+    int dtype = pq_reader->metadata()->RowGroup(0)->ColumnChunk(column_idx)->type();
+    if (dtype!=6) // TODO: get constant from parquet-cpp
+        std::cerr << "Invalid Parquet string data type" << '\n';
+
+    str_dict_table table(dict_offsets, dict_data);
+    const int64_t batch_size = 4096;
+    std::vector<int16_t> def_levels(batch_size);
+    std::vector<parquet::ByteArray> values(batch_size);
+
+    int64_t n_row_groups = pq_reader->metadata()->num_row_groups();
+    int64_t group_start = 0;
+    int64_t read_rows = 0;
+    for (int row_group_index=0; row_group_index<n_row_groups && read_rows<count;
+                                                            row_group_index++)
+    {
+        int64_t nrows_in_group = pq_reader->metadata()->RowGroup(row_group_index)->
+                                            ColumnChunk(column_idx)->num_values();
+        int64_t rows_to_skip = std::max(start-group_start, (int64_t)0);
+        group_start += nrows_in_group;
+        // skip whole row groups if no need to read any rows
+        if (rows_to_skip >= nrows_in_group)
+            continue;
+        int64_t rows_to_read = std::min(count-read_rows, nrows_in_group-rows_to_skip);
+
+        std::shared_ptr<parquet::ColumnReader> col_reader =
+            pq_reader->RowGroup(row_group_index)->Column(column_idx);
+        parquet::ByteArrayReader *reader =
+            static_cast<parquet::ByteArrayReader*>(col_reader.get());
+        int16_t max_def_level = reader->descr()->max_definition_level();
+        if (rows_to_skip>0)
+            reader->Skip(rows_to_skip);
+
+        int64_t group_read = 0;
+        while (group_read<rows_to_read)
+        {
+            int64_t values_read = 0;
+            int64_t levels_read = reader->ReadBatch(
+                std::min(batch_size, rows_to_read-group_read),
+                def_levels.data(), NULL, values.data(), &values_read);
+            if (levels_read==0)
+                break;
+            int32_t *codes = out_codes + read_rows + group_read;
+            int64_t v = 0;
+            for (int64_t i=0; i<levels_read; i++) {
+                if (max_def_level>0 && def_levels[i]<max_def_level) {
+                    codes[i] = table.get_code(NULL, 0);
+                }
+                else {
+                    codes[i] = table.get_code(values[v].ptr, values[v].len);
+                    v++;
+                }
+            }
+            group_read += levels_read;
+        }
+        read_rows += group_read;
+    }
+    if (read_rows!=count)
+        std::cerr << "parquet read incomplete" << '\n';
+    return read_rows;
+}
+
 void pq_init_reader(const char* file_name,
         std::shared_ptr<FileReader> *a_reader)
 {
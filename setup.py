@@ -18,6 +18,16 @@ def readme():
         return f.read()
 
 
+def version():
+    # hpat/__init__.py is the single source of the version, it can't be
+    # imported here since extensions are not built yet
+    with open(os.path.join('hpat', '__init__.py')) as f:
+        for line in f:
+            if line.startswith('__version__'):
+                return line.split('=')[1].strip().strip("'\"")
+    raise RuntimeError("__version__ not found in hpat/__init__.py")
+
+
 _has_h5py = False
 HDF5_DIR = ""
 
@@ -130,6 +140,7 @@ ext_chiframes = Extension(name="chiframes",
 
 ext_dict = Extension(name="hdict_ext",
                      sources=["hpat/_dict_ext.cpp"],
+                     depends=["hpat/_str_arena.h"],
                      extra_compile_args = eca,
                      extra_link_args = ela,
                      include_dirs = ind,
@@ -138,18 +149,22 @@ ext_dict = Extension(name="hdict_ext",
 
 ext_set = Extension(name="hset_ext",
                      sources=["hpat/_set_ext.cpp"],
+                     depends=["hpat/_str_arena.h"],
                      extra_compile_args = eca,
                      extra_link_args = ela,
                      include_dirs = ind,
                      library_dirs = lid,
 )
 
+# string columns are unboxed with multiple threads
+str_ela = ela if is_win else ela + ['-pthread']
+
 ext_str = Extension(name="hstr_ext",
                     sources=["hpat/_str_ext.cpp"],
                     libraries=['boost_regex'] + np_compile_args['libraries'],
                     define_macros = np_compile_args['define_macros'] + [('USE_BOOST_REGEX', None)],
                     extra_compile_args = eca,
-                    extra_link_args = ela,
+                    extra_link_args = str_ela,
                     include_dirs = np_compile_args['include_dirs'] + ind,
                     library_dirs = np_compile_args['library_dirs'] + lid,
 )
@@ -256,7 +271,7 @@ if _has_xenon:
     _ext_mods.append(ext_xenon_wrapper)
 
 setup(name='hpat',
-      version='0.23.1',
+      version=version(),
       description='compiling Python code for clusters',
       long_description=readme(),
       classifiers=[